@@ -20,12 +20,24 @@ pytest-dsl-ui 工具集
     
 命令:
     convert      - 转换Playwright脚本为DSL格式
+    run          - 多进程并行执行DSL文件
+    profile      - 汇总关键字耗时记录
+    bench        - 对本地夹具应用运行核心关键字基准
     help         - 显示帮助信息
     
 示例:
     # 转换Playwright脚本
     python -m pytest_dsl_ui convert script.py output.dsl
     
+    # 使用4个工作进程并行执行目录中的DSL文件，并合并Allure结果
+    python -m pytest_dsl_ui run tests/ -n 4 --alluredir allure-results
+
+    # 汇总关键字耗时记录（PYTEST_DSL_UI_PROFILE或[配置性能分析]生成）
+    python -m pytest_dsl_ui profile profile/ --top 20
+
+    # 运行基准并与上一版本的结果对比
+    python -m pytest_dsl_ui bench -o bench.json --compare bench-0.1.0.json
+
     # 显示帮助
     python -m pytest_dsl_ui help
     """
@@ -82,6 +94,151 @@ def convert_command(args):
         return 1
 
 
+def run_command(args):
+    """处理并行执行命令"""
+    parser = argparse.ArgumentParser(
+        prog='python -m pytest_dsl_ui run',
+        description='将DSL文件分片到多个工作进程并行执行'
+    )
+    parser.add_argument('paths', nargs='+', help='DSL文件或目录')
+    parser.add_argument('-n', '--workers', type=int, default=None,
+                        help='工作进程数量，默认为CPU核数')
+    parser.add_argument('--alluredir', default=None,
+                        help='合并后的Allure结果目录')
+    parser.add_argument('--no-browser-pool', action='store_true',
+                        help='不在工作进程内复用浏览器')
+    parser.add_argument('--report', default=None,
+                        help='将各工作进程的利用率报告保存为JSON文件')
+    parser.add_argument('--pytest-args', default='',
+                        help='传给每个工作进程中pytest的额外参数')
+    options = parser.parse_args(args)
+
+    from .utils.parallel_runner import (
+        run_parallel, format_report, save_report
+    )
+    import shlex
+
+    try:
+        report = run_parallel(
+            options.paths,
+            workers=options.workers,
+            alluredir=options.alluredir,
+            pytest_args=shlex.split(options.pytest_args),
+            pool_options=None if options.no_browser_pool else {'max_size': 2}
+        )
+    except (FileNotFoundError, ValueError) as e:
+        print(f"错误: {e}")
+        return 1
+
+    print(format_report(report))
+    if options.report:
+        save_report(report, options.report)
+        print(f"利用率报告已保存到: {options.report}")
+
+    return report['exit_code']
+
+
+def profile_command(args):
+    """处理耗时报告命令"""
+    parser = argparse.ArgumentParser(
+        prog='python -m pytest_dsl_ui profile',
+        description='汇总关键字耗时记录，输出各关键字的p50/p95/p99和最慢步骤'
+    )
+    parser.add_argument('paths', nargs='+', help='JSONL/CSV记录文件或目录')
+    parser.add_argument('--top', type=int, default=20,
+                        help='显示的关键字和最慢步骤数量')
+    parser.add_argument('--sort', default='total',
+                        choices=['total', 'p95', 'p99', 'count'],
+                        help='关键字排序依据')
+    parser.add_argument('--json', default=None,
+                        help='将汇总结果保存为JSON文件')
+    options = parser.parse_args(args)
+
+    from .utils.profile_report import load_records, build_report, format_report
+    import json
+
+    try:
+        records = load_records(options.paths)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"错误: {e}")
+        return 1
+    if not records:
+        print("错误: 没有找到耗时记录")
+        return 1
+
+    report = build_report(records, top=options.top, sort=options.sort)
+    print(format_report(report, top=options.top))
+    if options.json:
+        with open(options.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"耗时报告已保存到: {options.json}")
+    return 0
+
+
+def bench_command(args):
+    """处理基准命令"""
+    parser = argparse.ArgumentParser(
+        prog='python -m pytest_dsl_ui bench',
+        description='对本地夹具应用运行核心关键字基准，结果保存为JSON'
+    )
+    parser.add_argument('-o', '--output', default=None,
+                        help='将基准结果保存为JSON文件')
+    parser.add_argument('--compare', default=None,
+                        help='与之对比的基线结果JSON文件')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='p50变慢超过该比例视为回归（默认0.1）')
+    parser.add_argument('-i', '--iterations', type=int, default=5,
+                        help='每个用例的执行次数')
+    parser.add_argument('--case', action='append', default=None,
+                        help='只执行指定的用例，可重复指定')
+    parser.add_argument('--scale', action='append', default=[],
+                        metavar='NAME=N',
+                        help='夹具应用规模，如 rows=5000（rows、fields、xhr、batch）')
+    parser.add_argument('--headed', action='store_true',
+                        help='使用有头模式运行浏览器')
+    options = parser.parse_args(args)
+
+    from .utils.benchmark import run_benchmarks, compare_results, format_results
+    import json
+
+    try:
+        scale = {name: int(value) for name, value in
+                 (item.split('=', 1) for item in options.scale)}
+    except ValueError:
+        print("错误: --scale 格式应为 NAME=N")
+        return 1
+
+    baseline = None
+    if options.compare:
+        try:
+            with open(options.compare, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"错误: 无法读取基线结果 {options.compare}: {e}")
+            return 1
+
+    try:
+        results = run_benchmarks(options.iterations, options.case, scale,
+                                 headless=not options.headed)
+    except ValueError as e:
+        print(f"错误: {e}")
+        return 1
+
+    comparison = compare_results(results, baseline, options.threshold) \
+        if baseline else None
+    print(format_results(results, comparison))
+    if options.output:
+        with open(options.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"基准结果已保存到: {options.output}")
+
+    if any('error' in stats for stats in results['results'].values()):
+        return 1
+    if comparison and any(c['regression'] for c in comparison):
+        return 2
+    return 0
+
+
 def main():
     """主函数"""
     if len(sys.argv) < 2:
@@ -93,6 +250,12 @@ def main():
     
     if command == 'convert':
         return convert_command(args)
+    elif command == 'run':
+        return run_command(args)
+    elif command == 'profile':
+        return profile_command(args)
+    elif command == 'bench':
+        return bench_command(args)
     elif command == 'help':
         show_help()
         return 0
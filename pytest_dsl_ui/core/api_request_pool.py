@@ -0,0 +1,104 @@
+"""独立APIRequestContext池
+
+纯接口步骤不需要浏览器：通过playwright.request.new_context()创建独立的
+APIRequestContext发送请求。相同认证状态和HTTPS设置的客户端共用同一个
+APIRequestContext，保持Cookie和keep-alive连接。
+
+认证状态直接读取AuthManager保存的文件，文件更新（例如重新登录）后
+下一次获取时自动用新状态重建上下文。
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from .auth_manager import auth_manager
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[Optional[str], bool]
+
+
+class APIRequestContextPool:
+    """独立APIRequestContext池"""
+
+    def __init__(self):
+        """初始化上下文池"""
+        # 键: (认证状态名称, 是否忽略HTTPS错误)，值: (上下文, 认证文件修改时间)
+        self._contexts: Dict[PoolKey, Tuple[Any, Optional[float]]] = {}
+        self._lock = threading.Lock()
+        self.stats = {'created': 0, 'reused': 0, 'refreshed': 0}
+
+    @staticmethod
+    def _state_mtime(auth_state: Optional[str]) -> Optional[float]:
+        if not auth_state:
+            return None
+        state_file = auth_manager.get_state_path(auth_state)
+        if not state_file.exists():
+            raise ValueError(f"认证状态不存在: {auth_state}")
+        return state_file.stat().st_mtime
+
+    @staticmethod
+    def _load_storage_state(auth_state: Optional[str]) -> Optional[Dict[str, Any]]:
+        """读取认证文件中Playwright可用的部分（去掉元数据）"""
+        if not auth_state:
+            return None
+        state = auth_manager.load_auth_state(auth_state)
+        if not state:
+            raise ValueError(f"无法加载认证状态: {auth_state}")
+        return {'cookies': state.get('cookies', []),
+                'origins': state.get('origins', [])}
+
+    def acquire(self, playwright, auth_state: Optional[str] = None,
+                ignore_https_errors: bool = False):
+        """获取APIRequestContext，不存在或认证文件已更新时创建
+
+        Args:
+            playwright: 已启动的Playwright实例
+            auth_state: AuthManager中的认证状态名称
+            ignore_https_errors: 是否忽略HTTPS错误
+
+        Returns:
+            APIRequestContext: 请求上下文
+        """
+        key = (auth_state or None, bool(ignore_https_errors))
+        mtime = self._state_mtime(auth_state)
+
+        with self._lock:
+            entry = self._contexts.get(key)
+            if entry is not None:
+                context, loaded_mtime = entry
+                if loaded_mtime == mtime:
+                    self.stats['reused'] += 1
+                    return context
+                # 认证文件已更新，用新状态重建
+                self._dispose(context)
+                self.stats['refreshed'] += 1
+
+            context = playwright.request.new_context(
+                storage_state=self._load_storage_state(auth_state),
+                ignore_https_errors=bool(ignore_https_errors))
+            self._contexts[key] = (context, mtime)
+            self.stats['created'] += 1
+            logger.info(f"已创建独立APIRequestContext "
+                        f"(认证状态: {auth_state or '无'})")
+            return context
+
+    @staticmethod
+    def _dispose(context):
+        try:
+            context.dispose()
+        except Exception as e:
+            logger.debug(f"释放APIRequestContext失败: {str(e)}")
+
+    def clear(self):
+        """释放所有上下文"""
+        with self._lock:
+            for context, _ in self._contexts.values():
+                self._dispose(context)
+            self._contexts.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        with self._lock:
+            return dict(self.stats, size=len(self._contexts))
@@ -0,0 +1,257 @@
+"""截图写入管道
+
+截图在调用线程中截取为内存中的字节，编码和写入磁盘交给后台写入线程：
+
+- png、jpeg由浏览器直接编码（jpeg支持质量设置），webp由写入线程用Pillow编码
+- 自动命名的截图：与上一帧相同（按SHA-1判断）时不再写入，返回上一帧的路径；
+  ring_size大于0时只在内存中保留最近N帧，步骤失败时才写入磁盘和报告
+- 指定路径的截图总是写入该路径，可以用wait_for等待该帧写入完成
+
+Allure附件挂在当前线程的步骤上，因此附件仍在调用线程中写入，
+但直接使用已截取的字节，不再读取截图文件；webp附件在报告确定写入时才等待编码结果。
+通过环境变量PYTEST_DSL_UI_SCREENSHOT_FORMAT、PYTEST_DSL_UI_SCREENSHOT_QUALITY、
+PYTEST_DSL_UI_SCREENSHOT_RING或artifact_writer.configure设置。
+"""
+
+import atexit
+import hashlib
+import io
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Tuple
+
+import allure
+
+from .reporting import reporter
+
+logger = logging.getLogger(__name__)
+
+SCREENSHOT_FORMATS = ('png', 'jpeg', 'webp')
+
+_ATTACHMENT_TYPES = {
+    'png': (allure.attachment_type.PNG, None),
+    'jpeg': (allure.attachment_type.JPG, None),
+    'webp': (None, 'webp'),
+}
+
+
+def _encode(data: bytes, image_format: str, quality: Optional[int]) -> bytes:
+    """在写入线程中把浏览器输出的PNG转换为webp"""
+    if image_format != 'webp':
+        return data
+    from PIL import Image
+    output = io.BytesIO()
+    Image.open(io.BytesIO(data)).save(
+        output, format='WEBP', quality=quality if quality is not None else 80)
+    return output.getvalue()
+
+
+class ArtifactWriter:
+    """截图写入管道"""
+
+    def __init__(self, image_format: Optional[str] = None,
+                 quality: Optional[int] = None,
+                 ring_size: Optional[int] = None):
+        """初始化写入管道
+
+        Args:
+            image_format: 截图格式（png、jpeg或webp），None时读取环境变量，默认png
+            quality: jpeg/webp质量（0-100），None时读取环境变量，默认使用编码器默认值
+            ring_size: 环形缓冲帧数，0表示立即写入，None时读取环境变量，默认0
+        """
+        self.image_format = 'png'
+        self.quality: Optional[int] = None
+        self.ring_size = 0
+        self._queue: "queue.Queue[Tuple]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._ring: deque = deque()
+        # 上一帧：(SHA-1, 路径)，帧在环形缓冲中未写入时路径为None
+        self._last: Optional[Tuple[str, Optional[str]]] = None
+        # 尚未写入完成的帧：路径 -> 编码结果
+        self._pending: Dict[str, Future] = {}
+        self.stats = {'captured': 0, 'written': 0, 'deduplicated': 0,
+                      'buffered': 0, 'failed': 0}
+        quality = quality if quality is not None else \
+            os.environ.get('PYTEST_DSL_UI_SCREENSHOT_QUALITY')
+        self.configure(
+            image_format or os.environ.get('PYTEST_DSL_UI_SCREENSHOT_FORMAT', 'png'),
+            int(quality) if quality not in (None, '') else None,
+            ring_size if ring_size is not None
+            else int(os.environ.get('PYTEST_DSL_UI_SCREENSHOT_RING', 0)))
+        reporter.add_failure_hook(self.flush_ring)
+
+    def configure(self, image_format: Optional[str] = None,
+                  quality: Optional[int] = None,
+                  ring_size: Optional[int] = None):
+        """设置截图格式、质量和环形缓冲帧数"""
+        if image_format is not None:
+            image_format = 'jpeg' if image_format == 'jpg' else image_format
+            if image_format not in SCREENSHOT_FORMATS:
+                raise ValueError(f"不支持的截图格式: {image_format}，"
+                                 f"可选: {', '.join(SCREENSHOT_FORMATS)}")
+            self.image_format = image_format
+        if quality is not None:
+            if not 0 <= int(quality) <= 100:
+                raise ValueError(f"截图质量必须在0到100之间: {quality}")
+            self.quality = int(quality)
+        if ring_size is not None:
+            if int(ring_size) < 0:
+                raise ValueError(f"环形缓冲帧数不能为负数: {ring_size}")
+            self.ring_size = int(ring_size)
+            with self._lock:
+                self._ring = deque(self._ring, maxlen=self.ring_size or None)
+                if not self.ring_size:
+                    self._ring.clear()
+
+    @property
+    def extension(self) -> str:
+        return 'jpg' if self.image_format == 'jpeg' else self.image_format
+
+    def format_for(self, path: Optional[str]) -> str:
+        """路径扩展名对应的截图格式，不是图片扩展名时使用默认格式"""
+        ext = os.path.splitext(path or '')[1].lower().lstrip('.')
+        ext = 'jpeg' if ext == 'jpg' else ext
+        return ext if ext in SCREENSHOT_FORMATS else self.image_format
+
+    def screenshot_options(self, image_format: Optional[str] = None) -> Dict[str, Any]:
+        """传给Playwright screenshot的编码参数"""
+        if (image_format or self.image_format) == 'jpeg':
+            options = {'type': 'jpeg'}
+            if self.quality is not None:
+                options['quality'] = self.quality
+            return options
+        return {'type': 'png'}
+
+    def submit(self, data: bytes, path: str, name: str = "页面截图",
+               image_format: Optional[str] = None,
+               auto_named: bool = False) -> Optional[str]:
+        """提交一帧截图
+
+        Args:
+            data: 浏览器按screenshot_options输出的截图字节
+            path: 写入路径
+            name: Allure附件名称
+            image_format: 截图格式，None时使用默认格式
+            auto_named: 路径是否为自动生成；只有自动命名的帧参与去重和环形缓冲
+
+        Returns:
+            Optional[str]: 截图路径；自动命名的帧与上一帧相同时为上一帧的路径，
+                放入环形缓冲（暂不写入）时为None
+        """
+        image_format = image_format or self.image_format
+        digest = hashlib.sha1(data).hexdigest()
+        with self._lock:
+            self.stats['captured'] += 1
+            if auto_named:
+                if self._last is not None and self._last[0] == digest:
+                    self.stats['deduplicated'] += 1
+                    return self._last[1]
+
+                if self.ring_size:
+                    self._ring.append((data, path, name, image_format, self.quality))
+                    self.stats['buffered'] += 1
+                    self._last = (digest, None)
+                    return None
+
+            future = self._enqueue(data, path, image_format, self.quality)
+            self._last = (digest, path)
+
+        self._attach(data, future, name, image_format)
+        return path
+
+    def _enqueue(self, data: bytes, path: str, image_format: str,
+                 quality: Optional[int]) -> Future:
+        future: Future = Future()
+        self._pending[path] = future
+        future.add_done_callback(lambda f: self._forget(path, f))
+        self._ensure_thread()
+        self._queue.put((data, path, image_format, quality, future))
+        return future
+
+    def _forget(self, path: str, future: Future):
+        with self._lock:
+            if self._pending.get(path) is future:
+                del self._pending[path]
+
+    def wait_for(self, path: str):
+        """等待写入指定路径的帧完成，写入失败时抛出异常"""
+        with self._lock:
+            future = self._pending.get(path)
+        if future is not None:
+            future.result()
+
+    def _attach(self, data: bytes, future: Future, name: str, image_format: str):
+        attachment_type, extension = _ATTACHMENT_TYPES[image_format]
+        body = (lambda: future.result()) if image_format == 'webp' else data
+        reporter.attach(body, name=name, attachment_type=attachment_type,
+                        extension=extension)
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name='artifact-writer',
+                                        daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            data, path, image_format, quality, future = self._queue.get()
+            try:
+                try:
+                    encoded = _encode(data, image_format, quality)
+                    directory = os.path.dirname(path)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    with open(path, 'wb') as f:
+                        f.write(encoded)
+                    self.stats['written'] += 1
+                    future.set_result(encoded)
+                except Exception as e:
+                    self.stats['failed'] += 1
+                    logger.warning(f"写入截图失败({path}): {str(e)}")
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def flush_ring(self):
+        """写入环形缓冲中的帧并附加到报告，步骤失败时自动调用"""
+        with self._lock:
+            frames = list(self._ring)
+            self._ring.clear()
+            futures = [self._enqueue(data, path, image_format, quality)
+                       for data, path, _, image_format, quality in frames]
+        for (data, _, name, image_format, _), future in zip(frames, futures):
+            self._attach(data, future, name, image_format)
+        if frames:
+            logger.info(f"已写入环形缓冲中的 {len(frames)} 帧截图")
+
+    def discard_ring(self):
+        """丢弃环形缓冲中的帧并清除去重用的上一帧，用例结束时由pytest_plugin调用
+
+        避免通过的用例缓冲的帧在下一个失败用例中写入，以及下一个用例的
+        第一帧因与上一个用例的最后一帧相同而被去重。
+        """
+        with self._lock:
+            self._ring.clear()
+            self._last = None
+
+    def wait(self):
+        """等待已提交的截图全部写入磁盘"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取截图写入统计"""
+        with self._lock:
+            return dict(self.stats, pending=self._queue.qsize(),
+                        ring=len(self._ring))
+
+
+# 全局截图写入管道
+artifact_writer = ArtifactWriter()
+atexit.register(artifact_writer.wait)
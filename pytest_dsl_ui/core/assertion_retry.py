@@ -0,0 +1,242 @@
+"""断言重试调度器
+
+轮询异步任务状态一类的断言需要反复请求直到满足条件。调度器：
+
+- 只执行一次断言就区分通过、可重试失败和不可重试失败
+- 等待间隔支持固定、指数退避和带抖动的指数退避，并受总期限限制
+- GET/HEAD请求使用ETag/Last-Modified发送条件请求，304时跳过断言评估
+- 每次重试只重新评估仍失败的断言，全部通过后对最终响应做一次完整校验
+- 每次尝试的等待、请求和评估耗时记录到Allure报告
+"""
+
+import json
+import random
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import allure
+
+from .reporting import reporter
+
+BACKOFF_MODES = ('fixed', 'exponential', 'jitter')
+
+
+class RetryPolicy:
+    """重试等待策略"""
+
+    def __init__(self, interval: float = 1.0, backoff: str = 'fixed',
+                 multiplier: float = 2.0, max_interval: float = 30.0,
+                 deadline: Optional[float] = None):
+        """初始化策略
+
+        Args:
+            interval: 首次等待间隔（秒）
+            backoff: fixed（固定间隔）、exponential（指数退避）或
+                jitter（指数退避，在首次间隔和退避值之间随机取值）
+            multiplier: 指数退避倍数
+            max_interval: 单次等待上限（秒）
+            deadline: 从首次断言失败起的总期限（秒），None表示不限制
+        """
+        if backoff not in BACKOFF_MODES:
+            raise ValueError(f"不支持的退避策略: {backoff}")
+        self.interval = float(interval)
+        self.backoff = backoff
+        self.multiplier = float(multiplier)
+        self.max_interval = float(max_interval)
+        self.deadline = float(deadline) if deadline else None
+
+    def delay(self, attempt: int) -> float:
+        """计算第attempt次重试（从1开始）前的等待时间"""
+        if self.backoff == 'fixed':
+            return self.interval
+        delay = min(self.interval * self.multiplier ** (attempt - 1),
+                    self.max_interval)
+        if self.backoff == 'jitter':
+            delay = random.uniform(min(self.interval, delay), delay)
+        return delay
+
+    def delays(self, start: float) -> Iterator[float]:
+        """依次生成各次重试前的等待时间，超过总期限时停止
+
+        Args:
+            start: 计时起点（time.monotonic()）
+        """
+        attempt = 1
+        while True:
+            delay = self.delay(attempt)
+            if self.deadline is not None:
+                remaining = self.deadline - (time.monotonic() - start)
+                if remaining <= 0:
+                    return
+                delay = min(delay, remaining)
+            yield delay
+            attempt += 1
+
+
+class AssertionRetryScheduler:
+    """断言重试调度器"""
+
+    def __init__(self, request, retry_config: Dict[str, Any],
+                 disable_auth: bool = False):
+        """初始化调度器
+
+        Args:
+            request: BrowserHTTPRequest实例，已执行过请求
+            retry_config: _normalize_retry_config返回的标准重试配置
+            disable_auth: 是否禁用认证
+        """
+        self.request = request
+        self.retry_config = retry_config
+        self.disable_auth = disable_auth
+        self.conditional = retry_config.get('conditional', True)
+        self.attempts: List[Dict[str, Any]] = []
+        self.results: List[Dict[str, Any]] = []
+
+    def _is_retryable(self, index: int) -> bool:
+        config = self.retry_config
+        return (str(index) in config['specific'] or index in config['indices']
+                or config['all'])
+
+    def _retry_settings(self, index: int) -> Dict[str, float]:
+        count = self.retry_config['count']
+        interval = self.retry_config['interval']
+        spec = self.retry_config['specific'].get(str(index))
+        if isinstance(spec, dict):
+            count = spec.get('count', count)
+            interval = spec.get('interval', interval)
+        return {'count': int(count), 'interval': float(interval)}
+
+    def _evaluate(self, indexes: List[int]) -> List[int]:
+        """评估指定断言，返回失败的断言索引"""
+        asserts = self.request.config.get('asserts', [])
+        self.results, _ = self.request.process_asserts(
+            specific_asserts=[asserts[i] for i in indexes],
+            index_mapping=dict(enumerate(indexes)),
+            collect_only=True)
+        return [r['index'] for r in self.results if not r.get('passed')]
+
+    def _raise_for(self, indexes: List[int], summary: str):
+        """对失败的断言执行一次正常断言以获得标准错误信息并抛出"""
+        asserts = self.request.config.get('asserts', [])
+        try:
+            self.request.process_asserts(
+                specific_asserts=[asserts[i] for i in indexes],
+                index_mapping=dict(enumerate(indexes)))
+        except AssertionError as e:
+            message = f"{summary}:\n\n{str(e)}"
+            reporter.attach(message, name="重试后仍失败的断言",
+                            attachment_type=allure.attachment_type.TEXT)
+            raise AssertionError(message) from e
+        raise AssertionError(summary)
+
+    def run(self) -> List[Dict[str, Any]]:
+        """执行断言，失败时按策略重试
+
+        Returns:
+            List[Dict[str, Any]]: 最终响应上的断言结果
+
+        Raises:
+            AssertionError: 存在不可重试的失败断言，或重试次数/期限用完
+        """
+        all_indexes = list(range(len(self.request.config.get('asserts', []))))
+        failed = self._evaluate(all_indexes)
+        if not failed:
+            return self.results
+
+        fatal = [i for i in failed if not self._is_retryable(i)]
+        if fatal:
+            self._raise_for(fatal, "断言验证失败（不可重试）")
+
+        settings = {i: self._retry_settings(i) for i in failed}
+        policy = RetryPolicy(
+            interval=max(s['interval'] for s in settings.values()),
+            backoff=self.retry_config.get('backoff', 'fixed'),
+            multiplier=self.retry_config.get('multiplier', 2.0),
+            max_interval=self.retry_config.get('max_interval', 30.0),
+            deadline=self.retry_config.get('deadline'))
+        max_count = max(s['count'] for s in settings.values())
+
+        reporter.attach(
+            "\n".join(f"断言 #{i + 1}: 最多重试 {settings[i]['count']} 次"
+                      for i in failed)
+            + f"\n退避策略: {policy.backoff}, 首次间隔: {policy.interval}秒"
+            + (f", 总期限: {policy.deadline}秒" if policy.deadline else ""),
+            name="重试断言列表",
+            attachment_type=allure.attachment_type.TEXT)
+
+        pending = failed
+        start = time.monotonic()
+        for attempt, delay in enumerate(policy.delays(start), 1):
+            # 任一失败断言不可重试或重试次数用完时，结果已确定为失败
+            if any(not self._is_retryable(i) or attempt > settings[i]['count']
+                   for i in pending):
+                break
+
+            with reporter.step(f"断言重试 (尝试 {attempt}/{max_count})"):
+                record = self._attempt(attempt, delay, pending)
+            self.attempts.append(record)
+            if record['error'] is not None:
+                continue
+
+            pending = record['failed']
+            if not pending:
+                # 每次只重新评估失败的断言，最终响应上再完整校验一次
+                pending = self._evaluate(all_indexes)
+                if not pending:
+                    self._attach_summary(start, passed=True)
+                    return self.results
+                for i in pending:
+                    settings.setdefault(i, self._retry_settings(i))
+
+        self._attach_summary(start, passed=False)
+        self._raise_for(
+            pending, f"断言验证失败 (已重试 {len(self.attempts)} 次，"
+                     f"耗时 {time.monotonic() - start:.2f}秒)")
+
+    def _attempt(self, attempt: int, delay: float,
+                 pending: List[int]) -> Dict[str, Any]:
+        """等待、重新请求并评估仍失败的断言"""
+        record = {'attempt': attempt, 'wait_s': round(delay, 3), 'error': None}
+        time.sleep(delay)
+
+        try:
+            changed, info = self.request.refetch(
+                disable_auth=self.disable_auth, conditional=self.conditional)
+        except Exception as e:
+            record['error'] = str(e)
+            reporter.attach(f"重试执行请求失败: {type(e).__name__}: {str(e)}",
+                            name=f"重试请求执行失败 #{attempt}",
+                            attachment_type=allure.attachment_type.TEXT)
+            return record
+
+        record.update(status=info['status'],
+                      fetch_ms=round(info['elapsed_ms'], 2),
+                      not_modified=not changed)
+        if changed:
+            started = time.monotonic()
+            record['failed'] = self._evaluate(pending)
+            record['eval_ms'] = round((time.monotonic() - started) * 1000, 2)
+        else:
+            # 304：响应未变化，断言结果不变
+            record['failed'] = pending
+
+        reporter.attach(lambda: json.dumps(record, ensure_ascii=False, indent=2),
+                        name=f"重试耗时 #{attempt}",
+                        attachment_type=allure.attachment_type.JSON)
+        return record
+
+    def _attach_summary(self, start: float, passed: bool):
+        lines = [f"结果: {'通过' if passed else '失败'}, "
+                 f"总耗时: {time.monotonic() - start:.2f}秒"]
+        for record in self.attempts:
+            if record.get('error') is not None:
+                detail = f"请求失败: {record['error']}"
+            elif record['not_modified']:
+                detail = f"304未变化, 请求 {record['fetch_ms']}ms"
+            else:
+                detail = (f"状态 {record['status']}, 请求 {record['fetch_ms']}ms, "
+                          f"评估 {record['eval_ms']}ms, "
+                          f"仍失败 {len(record['failed'])} 个")
+            lines.append(f"#{record['attempt']}: 等待 {record['wait_s']}s, {detail}")
+        reporter.attach("\n".join(lines), name="断言重试汇总",
+                        attachment_type=allure.attachment_type.TEXT)
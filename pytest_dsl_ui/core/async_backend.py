@@ -0,0 +1,632 @@
+"""异步Playwright后端
+
+基于playwright.async_api提供BrowserManager、ElementLocator、PageContext和
+BrowserHTTPClient的异步版本，使互不依赖的操作（多页面检查、并行API调用、
+后台截图等）可以在同一事件循环中重叠执行。
+
+异步对象必须在同一个事件循环中使用。同步关键字层通过core.async_bridge中的
+async_bridge调用，例如::
+
+    from pytest_dsl_ui.core.async_bridge import async_bridge
+    from pytest_dsl_ui.core.async_backend import async_browser_manager
+
+    async_bridge.run(async_browser_manager.launch_browser("chromium"))
+    titles = async_bridge.gather(*(page.title() for page in pages))
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from playwright.async_api import (
+    async_playwright, Locator,
+    TimeoutError as PlaywrightTimeoutError
+)
+
+from .browser_manager import BrowserRegistry
+from .element_states import (
+    BATCH_STATES_JS, DEFAULT_PROPERTIES, ELEMENT_STATES_JS,
+    build_query, state_spec
+)
+from .locator_plan import locator_plan_cache
+from .clickable_resolver import resolve_clickable_async
+from .har_replay import create_replayer
+from .browser_http_client import (
+    DEFAULT_HEAD_SIZE, BrowserHTTPClient, BrowserResponse)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBrowserManager(BrowserRegistry):
+    """异步浏览器管理器
+
+    与BrowserManager共用BrowserRegistry的ID生成规则和查询接口（get_page、
+    switch_page等），启动、创建和关闭操作为协程。
+    浏览器池、上下文复用、视频保留策略和开始/停止录制只由同步的BrowserManager提供，
+    异步管理器不提供这些方法。
+    """
+
+    async def _ensure_playwright(self):
+        """确保Playwright实例已启动"""
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
+
+    async def launch_browser(self, browser_type: str = "chromium",
+                             **config) -> str:
+        """启动浏览器
+
+        Args:
+            browser_type: 浏览器类型 (chromium, firefox, webkit)
+            **config: 浏览器启动配置
+
+        Returns:
+            str: 浏览器ID
+        """
+        await self._ensure_playwright()
+
+        browser_launcher = self._get_browser_launcher(browser_type)
+        launch_config = self._build_launch_config(config)
+        browser = await browser_launcher.launch(**launch_config)
+
+        browser_id = self._next_id(browser_type)
+        self.browsers[browser_id] = browser
+        self.current_browser = browser_id
+
+        logger.info(f"已启动浏览器(异步): {browser_id}")
+        return browser_id
+
+    async def create_context(self, browser_id: Optional[str] = None,
+                             **config) -> str:
+        """创建浏览器上下文
+
+        Args:
+            browser_id: 浏览器ID，如果为None则使用当前浏览器
+            **config: 上下文配置
+
+        Returns:
+            str: 上下文ID
+        """
+        if browser_id is None:
+            browser_id = self.current_browser
+
+        if browser_id is None:
+            raise ValueError("没有可用的浏览器实例")
+
+        if browser_id not in self.browsers:
+            raise ValueError(f"浏览器 {browser_id} 不存在")
+
+        context_config = self._build_context_config(config)
+        context = await self.browsers[browser_id].new_context(**context_config)
+
+        replayer = create_replayer(config)
+        if replayer is not None:
+            await replayer.attach_async(context)
+
+        context_id = self._next_id(f"{browser_id}_ctx")
+        self.contexts[context_id] = context
+        self.current_context = context_id
+
+        if context_config.get('ignore_https_errors', False):
+            setattr(context, '_ignore_https_errors', True)
+
+        logger.info(f"已创建浏览器上下文(异步): {context_id}")
+        return context_id
+
+    async def create_page(self, context_id: Optional[str] = None) -> str:
+        """创建页面
+
+        Args:
+            context_id: 上下文ID，如果为None则使用当前上下文
+
+        Returns:
+            str: 页面ID
+        """
+        if context_id is None:
+            context_id = self.current_context
+
+        if context_id is None:
+            raise ValueError("没有可用的浏览器上下文")
+
+        if context_id not in self.contexts:
+            raise ValueError(f"浏览器上下文 {context_id} 不存在")
+
+        page = await self.contexts[context_id].new_page()
+
+        page_id = self._next_id(f"{context_id}_page")
+        self.pages[page_id] = page
+        self.current_page = page_id
+
+        logger.info(f"已创建页面(异步): {page_id}")
+        return page_id
+
+    async def close_context(self, context_id: Optional[str] = None):
+        """关闭浏览器上下文
+
+        Args:
+            context_id: 上下文ID，如果为None则关闭当前上下文
+        """
+        if context_id is None:
+            context_id = self.current_context
+
+        if context_id is None or context_id not in self.contexts:
+            logger.warning("没有可关闭的浏览器上下文")
+            return
+
+        context = self.contexts.pop(context_id)
+        for page_id in [p for p in self.pages
+                        if p.startswith(f"{context_id}_page_")]:
+            del self.pages[page_id]
+        await context.close()
+
+        if self.current_context == context_id:
+            self.current_context = None
+            self.current_page = None
+
+        logger.info(f"已关闭浏览器上下文(异步): {context_id}")
+
+    async def close_browser(self, browser_id: Optional[str] = None):
+        """关闭浏览器
+
+        Args:
+            browser_id: 浏览器ID，如果为None则关闭当前浏览器
+        """
+        if browser_id is None:
+            browser_id = self.current_browser
+
+        if browser_id is None or browser_id not in self.browsers:
+            logger.warning("没有可关闭的浏览器实例")
+            return
+
+        await self.browsers.pop(browser_id).close()
+
+        for ctx_id in [c for c in self.contexts if c.startswith(f"{browser_id}_ctx_")]:
+            del self.contexts[ctx_id]
+        for page_id in [p for p in self.pages if p.startswith(f"{browser_id}_ctx_")]:
+            del self.pages[page_id]
+
+        if self.current_browser == browser_id:
+            self.current_browser = None
+            self.current_context = None
+            self.current_page = None
+
+        logger.info(f"已关闭浏览器(异步): {browser_id}")
+
+    async def close_all(self):
+        """关闭所有浏览器实例"""
+        for browser in self.browsers.values():
+            await browser.close()
+
+        if self.playwright:
+            await self.playwright.stop()
+
+        self.browsers.clear()
+        self.contexts.clear()
+        self.pages.clear()
+        self.playwright = None
+        self.current_browser = None
+        self.current_context = None
+        self.current_page = None
+        logger.info("已关闭所有浏览器实例(异步)")
+
+
+class AsyncElementLocator:
+    """异步元素定位器
+
+    异步API中创建Locator本身是同步的，因此与ElementLocator共用编译后的定位计划；
+    需要与浏览器交互的查询（数量、可见性、文本等）为协程。
+    clickable=选择器需要查询元素状态，只能通过resolve()解析。
+    不继承ElementLocator，避免误用其中直接调用同步API的方法。
+    """
+
+    def __init__(self, page):
+        """初始化异步元素定位器
+
+        Args:
+            page: Playwright异步页面实例
+        """
+        self.page = page
+        self.default_timeout = 30000  # 默认超时30秒
+
+    def set_default_timeout(self, timeout: float):
+        """设置默认超时时间（秒）"""
+        self.default_timeout = int(timeout * 1000)
+
+    def locate(self, selector: str) -> Locator:
+        """定位元素（不支持clickable=，需要时使用resolve()）"""
+        plan = locator_plan_cache.get(selector)
+        if plan.is_clickable:
+            raise ValueError(f"clickable=选择器需要通过resolve()解析: {selector}")
+        return plan.apply(self)
+
+    async def resolve(self, selector: str) -> Locator:
+        """解析选择器，支持所有选择器格式（包括clickable=）
+
+        Args:
+            selector: 元素选择器
+
+        Returns:
+            Locator: Playwright异步定位器对象
+        """
+        plan = locator_plan_cache.get(selector)
+        if plan.is_clickable:
+            locator = await self.locate_clickable_element(*plan.base[1])
+            return plan.apply_modifiers(locator)
+        return plan.apply(self)
+
+    async def locate_clickable_element(self, text: str,
+                                       prefer_interactive: bool = True
+                                       ) -> Locator:
+        """智能定位可点击元素
+
+        与同步版本共用同一套优先级规则，每个阶段只需一次evaluate_all往返。
+
+        Args:
+            text: 要匹配的文本
+            prefer_interactive: 是否优先选择交互性元素
+
+        Returns:
+            Locator: 最适合点击的元素定位器
+        """
+        return await resolve_clickable_async(self.page, text)
+
+    async def wait_for_element(self, selector: str, state: str = "visible",
+                               timeout: Optional[float] = None) -> bool:
+        """等待元素达到指定状态
+
+        Args:
+            selector: 元素选择器
+            state: 等待状态 (visible, hidden, attached, detached)
+            timeout: 超时时间（秒），如果为None则使用默认超时
+
+        Returns:
+            bool: 是否在超时时间内达到指定状态
+        """
+        timeout_ms = int((timeout * 1000) if timeout else self.default_timeout)
+        try:
+            locator = await self.resolve(selector)
+            await locator.wait_for(state=state, timeout=timeout_ms)
+            return True
+        except PlaywrightTimeoutError:
+            logger.debug(f"等待元素超时: {selector}, 状态: {state}")
+            return False
+        except Exception as e:
+            logger.warning(f"等待元素时发生异常: {selector}, 错误: {str(e)}")
+            return False
+
+    async def wait_for_text(self, text: str,
+                            timeout: Optional[float] = None) -> bool:
+        """等待文本在页面中出现"""
+        timeout_ms = int((timeout * 1000) if timeout else self.default_timeout)
+        try:
+            await self.page.get_by_text(text).wait_for(
+                state="visible", timeout=timeout_ms)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
+    async def is_element_visible(self, selector: str) -> bool:
+        """检查元素是否可见"""
+        try:
+            locator = await self.resolve(selector)
+            if selector.startswith("clickable="):
+                locator = locator.first
+            return await locator.is_visible()
+        except Exception as e:
+            logger.debug(f"检查元素可见性失败: {selector}, 错误: {e}")
+            return False
+
+    async def is_element_enabled(self, selector: str) -> bool:
+        """检查元素是否启用"""
+        try:
+            locator = await self.resolve(selector)
+            if selector.startswith("clickable="):
+                locator = locator.first
+            return await locator.is_enabled()
+        except Exception as e:
+            logger.debug(f"检查元素启用状态失败: {selector}, 错误: {e}")
+            return False
+
+    async def is_element_checked(self, selector: str) -> bool:
+        """检查元素是否被选中"""
+        try:
+            return await (await self.resolve(selector)).is_checked()
+        except Exception:
+            return False
+
+    async def get_element_count(self, selector: str) -> int:
+        """获取匹配选择器的元素数量"""
+        try:
+            return await (await self.resolve(selector)).count()
+        except Exception:
+            return 0
+
+    async def get_element_text(self, selector: str) -> str:
+        """获取元素文本内容"""
+        try:
+            locator = await self.resolve(selector)
+            if await locator.count() == 0:
+                return ""
+            return await locator.text_content() or ""
+        except Exception:
+            return ""
+
+    async def get_element_attribute(self, selector: str,
+                                    attribute: str) -> Optional[str]:
+        """获取元素属性值"""
+        locator = await self.resolve(selector)
+        return await locator.get_attribute(attribute)
+
+    async def get_element_value(self, selector: str) -> str:
+        """获取输入元素的值"""
+        locator = await self.resolve(selector)
+        return await locator.input_value()
+
+    async def get_all_elements_text(self, selector: str) -> List[str]:
+        """获取所有匹配元素的文本内容"""
+        locator = await self.resolve(selector)
+        return [text or "" for text in await locator.all_text_contents()]
+
+    async def query_states(self, selectors: Sequence[str],
+                           properties: Sequence[str] = DEFAULT_PROPERTIES,
+                           attributes: Sequence[str] = ()
+                           ) -> Dict[str, Dict[str, Any]]:
+        """批量查询元素状态，规则与ElementLocator.query_states相同"""
+        spec = state_spec(properties, attributes)
+        selectors = list(dict.fromkeys(selectors))
+
+        batched = []
+        for selector in selectors:
+            query = build_query(locator_plan_cache.get(selector))
+            if query is not None:
+                batched.append((selector, query))
+
+        states: Dict[str, Dict[str, Any]] = {}
+        if batched:
+            results = await self.page.evaluate(
+                BATCH_STATES_JS,
+                dict(spec, queries=[query for _, query in batched])
+            )
+            for (selector, _), result in zip(batched, results):
+                if result is not None:
+                    states[selector] = result
+
+        for selector in selectors:
+            if selector not in states:
+                locator = await self.resolve(selector)
+                states[selector] = await locator.evaluate_all(
+                    ELEMENT_STATES_JS, spec)
+
+        return {selector: states[selector] for selector in selectors}
+
+
+class AsyncPageContext:
+    """异步页面上下文管理器
+
+    不继承PageContext，避免误用其中直接调用同步API的方法；
+    截图直接写入文件，不经过后台写入管道。录制视频只由同步后端提供。
+    """
+
+    def __init__(self, page):
+        """初始化异步页面上下文
+
+        Args:
+            page: Playwright异步页面实例
+        """
+        self.page = page
+        self.screenshots_dir = Path("screenshots")
+        self.screenshots_dir.mkdir(exist_ok=True)
+
+    async def navigate(self, url: str, wait_until: str = "load",
+                       timeout: Optional[float] = None):
+        """导航到指定URL"""
+        timeout_ms = int(timeout * 1000) if timeout else 30000
+        await self.page.goto(url, wait_until=wait_until, timeout=timeout_ms)
+        logger.info(f"已导航到: {url}")
+
+    async def reload(self, wait_until: str = "load",
+                     timeout: Optional[float] = None):
+        """重新加载页面"""
+        timeout_ms = int(timeout * 1000) if timeout else 30000
+        await self.page.reload(wait_until=wait_until, timeout=timeout_ms)
+        logger.info("页面已重新加载")
+
+    async def go_back(self, wait_until: str = "load",
+                      timeout: Optional[float] = None):
+        """浏览器后退"""
+        timeout_ms = int(timeout * 1000) if timeout else 30000
+        await self.page.go_back(wait_until=wait_until, timeout=timeout_ms)
+        logger.info("浏览器已后退")
+
+    async def go_forward(self, wait_until: str = "load",
+                         timeout: Optional[float] = None):
+        """浏览器前进"""
+        timeout_ms = int(timeout * 1000) if timeout else 30000
+        await self.page.go_forward(wait_until=wait_until, timeout=timeout_ms)
+        logger.info("浏览器已前进")
+
+    async def get_title(self) -> str:
+        """获取页面标题"""
+        return await self.page.title()
+
+    def get_url(self) -> str:
+        """获取当前页面URL"""
+        return self.page.url
+
+    async def screenshot(self, path: Optional[str] = None,
+                         element_selector: Optional[str] = None,
+                         full_page: bool = False) -> str:
+        """截图
+
+        Args:
+            path: 截图保存路径
+            element_selector: 要截图的元素选择器
+            full_page: 是否截取整页
+
+        Returns:
+            str: 截图文件路径
+        """
+        if path is None:
+            import datetime
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            path = str(self.screenshots_dir / f"screenshot_{timestamp}.png")
+        elif not os.path.isabs(path):
+            path = str(self.screenshots_dir / path)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        if element_selector:
+            locator = await AsyncElementLocator(self.page).resolve(
+                element_selector)
+            await locator.screenshot(path=path)
+        else:
+            await self.page.screenshot(path=path, full_page=full_page)
+
+        return path
+
+    async def wait_for_load_state(self, state: str = "load",
+                                  timeout: Optional[float] = None):
+        """等待页面加载状态"""
+        timeout_ms = int(timeout * 1000) if timeout else 30000
+        await self.page.wait_for_load_state(state, timeout=timeout_ms)
+        logger.info(f"页面已达到加载状态: {state}")
+
+    async def evaluate(self, expression: str) -> Any:
+        """执行JavaScript表达式"""
+        return await self.page.evaluate(expression)
+
+    async def set_viewport_size(self, width: int, height: int):
+        """设置视口大小"""
+        await self.page.set_viewport_size({"width": width, "height": height})
+        logger.info(f"视口大小已设置为: {width}x{height}")
+
+    def get_viewport_size(self) -> Dict[str, int]:
+        """获取当前视口大小"""
+        viewport = self.page.viewport_size
+        if viewport:
+            return {"width": viewport["width"], "height": viewport["height"]}
+        return {"width": 0, "height": 0}
+
+
+class _BufferedAPIResponse:
+    """已读取响应体的APIResponse
+
+    为BrowserResponse提供与同步APIResponse相同的接口，
+    使异步请求的结果可以直接交给同步的提取和断言逻辑处理。
+    """
+
+    def __init__(self, response, body: bytes):
+        self.status = response.status
+        self.status_text = response.status_text
+        self.headers = response.headers
+        self.url = response.url
+        self._body = body
+
+    def body(self) -> bytes:
+        return self._body
+
+    def text(self) -> str:
+        return self._body.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.text())
+
+    def dispose(self):
+        self._body = b''
+
+
+class AsyncBrowserHTTPClient(BrowserHTTPClient):
+    """异步浏览器HTTP客户端
+
+    请求参数的处理与BrowserHTTPClient一致。返回的BrowserResponse已读取完整
+    响应体，可以在同步线程中直接用于提取和断言。
+    Allure记录依赖当前线程的测试上下文，异步请求不写入Allure，
+    需要时由调用方在同步线程中调用_log_request_to_allure/_log_response_to_allure。
+    """
+
+    async def make_request(self, method: str, url: str,
+                           **request_kwargs) -> BrowserResponse:
+        """发送HTTP请求
+
+        Args:
+            method: HTTP方法
+            url: 请求URL
+            **request_kwargs: 请求参数
+
+        Returns:
+            BrowserResponse: 包装的响应对象
+        """
+        url, playwright_kwargs = self._prepare_request(
+            method, url, request_kwargs)
+
+        start_time = time.time()
+        try:
+            request_func = self._get_request_func(method)
+            response = await request_func(url, **playwright_kwargs)
+            body = await response.body()
+        except Exception as e:
+            raise ValueError(f"浏览器HTTP请求失败: {str(e)}") from e
+
+        browser_response = BrowserResponse(_BufferedAPIResponse(response, body))
+        browser_response._elapsed_ms = (time.time() - start_time) * 1000
+        if request_kwargs.get('save_to') and response.status != 304:
+            browser_response.save_body(
+                request_kwargs['save_to'],
+                request_kwargs.get('head_size', DEFAULT_HEAD_SIZE))
+        return browser_response
+
+    async def make_requests(self, requests: List[Tuple[str, str, Dict[str, Any]]],
+                            concurrency: int = 8) -> List[Any]:
+        """以有限并发发送一批请求
+
+        Args:
+            requests: (HTTP方法, URL, 请求参数)列表
+            concurrency: 最大并发请求数
+
+        Returns:
+            List[Any]: 与请求顺序一致的BrowserResponse，请求失败时为异常对象
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def send(method, url, request_kwargs):
+            async with semaphore:
+                return await self.make_request(method, url, **request_kwargs)
+
+        return await asyncio.gather(
+            *(send(*request) for request in requests), return_exceptions=True)
+
+
+async def run_request_batch(client: BrowserHTTPClient,
+                            requests: List[Tuple[str, str, Dict[str, Any]]],
+                            concurrency: int,
+                            storage_state: Dict[str, Any]) -> Tuple[List[Any], List[Dict]]:
+    """在独立的APIRequestContext中并发发送同步客户端的一批请求
+
+    同步浏览器上下文不能在异步驱动中使用，这里用其存储状态创建异步的
+    APIRequestContext，批内请求共享同一个Cookie存储。
+
+    Args:
+        client: 提供基础URL、默认请求头等配置的同步客户端
+        requests: (HTTP方法, URL, 请求参数)列表
+        concurrency: 最大并发请求数
+        storage_state: 浏览器上下文的存储状态
+
+    Returns:
+        Tuple[List[Any], List[Dict]]: 按顺序的响应或异常，以及批次结束时的Cookie
+    """
+    await async_browser_manager._ensure_playwright()
+    request_context = await async_browser_manager.playwright.request.new_context(
+        storage_state=storage_state)
+    try:
+        batch_client = AsyncBrowserHTTPClient.from_client(client, request_context)
+        results = await batch_client.make_requests(requests, concurrency)
+        cookies = (await request_context.storage_state()).get('cookies', [])
+    finally:
+        await request_context.dispose()
+    return results, cookies
+
+
+# 全局异步浏览器管理器实例（只能在async_bridge的事件循环中使用）
+async_browser_manager = AsyncBrowserManager()
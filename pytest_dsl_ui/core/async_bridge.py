@@ -0,0 +1,131 @@
+"""事件循环桥接器
+
+在后台线程中运行独立的asyncio事件循环，供同步关键字层调用异步后端。
+同步代码可以阻塞等待单个协程，也可以一次提交多个协程并发执行，
+或者提交后立即返回、稍后再取结果（例如测试继续执行时在后台截图）。
+
+注意：同步Playwright与异步Playwright是两套独立的驱动连接，
+同步browser_manager中的页面对象不能直接在异步后端中使用。
+"""
+
+import asyncio
+import atexit
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncLoopBridge:
+    """事件循环桥接器
+
+    懒启动后台事件循环线程，线程为守护线程，进程退出时自动停止。
+    """
+
+    def __init__(self, name: str = "pytest-dsl-ui-async"):
+        """初始化桥接器
+
+        Args:
+            name: 后台线程名称
+        """
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """获取后台事件循环，首次访问时启动"""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    self._start()
+        return self._loop
+
+    @property
+    def is_running(self) -> bool:
+        """后台事件循环是否在运行"""
+        return self._loop is not None and self._loop.is_running()
+
+    def _start(self):
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run_loop():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(started.set)
+            loop.run_forever()
+
+        thread = threading.Thread(target=run_loop, name=self.name, daemon=True)
+        thread.start()
+        started.wait()
+
+        self._loop = loop
+        self._thread = thread
+        logger.info("后台异步事件循环已启动")
+
+    def submit(self, coro: Awaitable[Any]) -> Future:
+        """提交协程到后台事件循环，立即返回
+
+        Args:
+            coro: 协程对象
+
+        Returns:
+            Future: 可以在稍后调用result()获取结果
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """在后台事件循环中执行协程并阻塞等待结果
+
+        Args:
+            coro: 协程对象
+            timeout: 超时时间（秒）
+
+        Returns:
+            Any: 协程返回值
+        """
+        if self._thread is not None and threading.current_thread() is self._thread:
+            raise RuntimeError("不能在后台事件循环线程中阻塞等待协程")
+        return self.submit(coro).result(timeout)
+
+    def gather(self, *coros: Awaitable[Any], timeout: Optional[float] = None,
+               return_exceptions: bool = False) -> List[Any]:
+        """并发执行多个协程并按提交顺序返回结果
+
+        Args:
+            *coros: 协程对象
+            timeout: 总超时时间（秒）
+            return_exceptions: 为True时异常作为结果返回而不是抛出
+
+        Returns:
+            List[Any]: 各协程的返回值
+        """
+        async def _gather():
+            return await asyncio.gather(
+                *coros, return_exceptions=return_exceptions)
+
+        return self.run(_gather(), timeout)
+
+    def shutdown(self, timeout: float = 5.0):
+        """停止后台事件循环"""
+        if self._loop is None:
+            return
+
+        loop, thread = self._loop, self._thread
+        self._loop = None
+        self._thread = None
+
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+        logger.info("后台异步事件循环已停止")
+
+
+# 全局事件循环桥接器实例
+async_bridge = AsyncLoopBridge()
+atexit.register(async_bridge.shutdown)
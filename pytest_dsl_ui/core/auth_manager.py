@@ -2,16 +2,143 @@
 
 基于Playwright的storage_state功能，提供登录状态的保存和重用机制。
 参考: https://playwright.net.cn/python/docs/auth
+
+已读取的认证状态按(文件路径, 修改时间, 大小)缓存在进程内，文件被替换或改写后自动重新读取。
+认证目录的文件列表按目录修改时间缓存，最多每watch_interval秒检查一次目录。
+状态文件通过临时文件替换写入，其他进程不会读到写了一半的文件。
+
+除缩进的JSON（{name}.json）外，可选紧凑格式（{name}.state）：第一行为格式标识和压缩算法，
+第二行为元数据、保存时间和统计信息组成的JSON头，其后是压缩的最小化JSON。
+列出认证状态时只读取头部，不解压整个状态。两种格式读取时自动识别。
+
+并行执行时可用acquire_login实现"一次登录，多处复用"：第一个需要状态的工作进程
+持有文件锁执行登录，其他进程阻塞在锁上，获得锁后发现状态已更新即直接复用。
+
+状态的剩余有效期由保存时间（max_age）和持久Cookie的过期时间中较早者决定，
+不需要打开页面。剩余有效期进入提前刷新窗口时，只有一个进程重新登录，
+其他进程不等待，继续使用仍然有效的旧状态。
 """
 
+import gzip
 import json
 import logging
+import os
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from playwright.sync_api import BrowserContext
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
+# 认证状态存储格式：json为缩进的JSON文件，gzip和zstd为对应压缩算法的紧凑格式
+STATE_FORMATS = ('json', 'gzip', 'zstd')
+
+_COMPACT_SUFFIX = '.state'
+_COMPACT_MAGIC = b'PDUI-AUTH'
+_COMPACT_VERSION = b'1'
+# 紧凑格式中写在头部、不压缩的字段
+_HEADER_FIELDS = ('metadata', 'saved_at', 'include_indexed_db')
+
+# 文件标识：(修改时间纳秒, 文件大小)
+FileKey = Tuple[int, int]
+
+
+def _file_key(path: Path) -> Optional[FileKey]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ImportError("zstd格式需要安装zstandard: pip install zstandard")
+        return zstandard.ZstdCompressor().compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(data: bytes, compression: str) -> bytes:
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ImportError("读取zstd格式的认证状态需要安装zstandard: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return gzip.decompress(data)
+
+
+def _write_compact(f, storage_state: Dict[str, Any], compression: str):
+    """写入紧凑格式：标识行、JSON头、压缩的状态"""
+    header = {field: storage_state[field] for field in _HEADER_FIELDS
+              if field in storage_state}
+    payload = {k: v for k, v in storage_state.items() if k not in _HEADER_FIELDS}
+    f.write(b' '.join([_COMPACT_MAGIC, _COMPACT_VERSION,
+                       compression.encode('ascii')]) + b'\n')
+    f.write(json.dumps(header, ensure_ascii=False,
+                       separators=(',', ':')).encode('utf-8') + b'\n')
+    f.write(_compress(json.dumps(payload, ensure_ascii=False,
+                                 separators=(',', ':')).encode('utf-8'),
+                      compression))
+
+
+def _read_compact_header(f) -> Tuple[str, Dict[str, Any]]:
+    """读取紧凑格式的标识行和JSON头，返回(压缩算法, 头部)"""
+    parts = f.readline().split()
+    if len(parts) != 3 or parts[0] != _COMPACT_MAGIC:
+        raise ValueError("不是有效的紧凑格式认证状态文件")
+    if parts[1] != _COMPACT_VERSION:
+        raise ValueError(f"不支持的认证状态文件版本: {parts[1].decode()}")
+    return parts[2].decode('ascii'), json.loads(f.readline())
+
+
+def _read_compact(path: Path) -> Dict[str, Any]:
+    with open(path, 'rb') as f:
+        compression, header = _read_compact_header(f)
+        state = json.loads(_decompress(f.read(), compression))
+    state.update(header)
+    return state
+
+
+def _earliest_expiry(cookies, cookie_names=None) -> Optional[float]:
+    """持久Cookie中最早的过期时间（Unix时间戳），会话Cookie（expires为-1）不计入"""
+    expiries = [c['expires'] for c in cookies
+                if (c.get('expires') or -1) > 0
+                and (not cookie_names or c.get('name') in cookie_names)]
+    return min(expiries) if expiries else None
+
+
+def _try_lock(f) -> bool:
+    """非阻塞地获取文件的排他锁"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
 
 class AuthManager:
     """认证状态管理器
@@ -19,14 +146,33 @@ class AuthManager:
     提供登录状态的保存、加载和重用功能。
     """
 
-    def __init__(self, auth_dir: str = "playwright/.auth"):
+    def __init__(self, auth_dir: str = "playwright/.auth",
+                 watch_interval: float = 1.0,
+                 state_format: Optional[str] = None):
         """初始化认证管理器
 
         Args:
             auth_dir: 认证状态文件存储目录
+            watch_interval: 检查认证目录变化的最短间隔（秒）
+            state_format: 默认存储格式（json、gzip或zstd），
+                为空时使用环境变量PYTEST_DSL_UI_AUTH_FORMAT，默认json
         """
         self.auth_dir = Path(auth_dir)
         self.auth_dir.mkdir(parents=True, exist_ok=True)
+        self.watch_interval = watch_interval
+        self.state_format = self._check_format(
+            state_format or os.environ.get('PYTEST_DSL_UI_AUTH_FORMAT', 'json'))
+
+        self._lock = threading.RLock()
+        # 文件路径 -> (文件标识, 认证状态)
+        self._states: Dict[str, Tuple[FileKey, Dict[str, Any]]] = {}
+        # 认证目录的文件列表：状态名称 -> 文件标识
+        self._index: Dict[str, FileKey] = {}
+        self._index_dir: Optional[Tuple[str, Optional[FileKey]]] = None
+        self._index_checked = 0.0
+        # 当前进程持有的登录锁：状态名称 -> 锁文件
+        self._login_locks: Dict[str, Any] = {}
+        self.stats = {'hits': 0, 'misses': 0}
 
         # 确保.gitignore包含认证目录
         self._ensure_gitignore()
@@ -49,10 +195,32 @@ class AuthManager:
                 f.write(f"# Playwright认证状态文件\n{auth_pattern}\n")
             logger.info(f"已创建 .gitignore 并添加 {auth_pattern}")
 
+    @staticmethod
+    def _check_format(state_format: str) -> str:
+        if state_format not in STATE_FORMATS:
+            raise ValueError(f"不支持的认证状态存储格式: {state_format}，"
+                             f"可选: {', '.join(STATE_FORMATS)}")
+        return state_format
+
+    def get_state_path(self, state_name: str,
+                       state_format: Optional[str] = None) -> Path:
+        """获取认证状态文件路径
+
+        Args:
+            state_name: 状态名称
+            state_format: 存储格式，为空时返回已存在的文件（都不存在时为JSON文件）
+        """
+        json_path = self.auth_dir / f"{state_name}.json"
+        compact_path = self.auth_dir / f"{state_name}{_COMPACT_SUFFIX}"
+        if state_format:
+            return json_path if state_format == 'json' else compact_path
+        return compact_path if compact_path.exists() else json_path
+
     def save_auth_state(self, context: BrowserContext,
                         state_name: str,
                         metadata: Optional[Dict[str, Any]] = None,
-                        include_indexed_db: bool = True) -> str:
+                        include_indexed_db: bool = True,
+                        state_format: Optional[str] = None) -> str:
         """保存认证状态
 
         Args:
@@ -60,13 +228,15 @@ class AuthManager:
             state_name: 状态名称（用于标识不同的认证状态）
             metadata: 元数据（如用户名、网站信息等）
             include_indexed_db: 是否包含IndexedDB数据（Playwright 1.20+支持）
+            state_format: 存储格式（json、gzip或zstd），为空时使用默认格式
 
         Returns:
             str: 状态文件路径
         """
         try:
             # 生成状态文件路径
-            state_file = self.auth_dir / f"{state_name}.json"
+            state_format = self._check_format(state_format or self.state_format)
+            state_file = self.get_state_path(state_name, state_format)
 
             # 保存存储状态 - 根据Playwright版本支持IndexedDB
             try:
@@ -99,6 +269,7 @@ class AuthManager:
             stats = {
                 "cookies_count": len(storage_state.get("cookies", [])),
                 "origins_count": len(storage_state.get("origins", [])),
+                "expires_at": _earliest_expiry(storage_state.get("cookies", [])),
                 "file_path": str(state_file)
             }
             
@@ -106,11 +277,26 @@ class AuthManager:
                 storage_state["metadata"] = {}
             storage_state["metadata"].update(stats)
 
-            # 写入文件
-            with open(state_file, 'w', encoding='utf-8') as f:
-                json.dump(storage_state, f, indent=2, ensure_ascii=False)
+            # 写入临时文件后替换，其他进程不会读到写了一半的文件
+            tmp_file = state_file.with_name(f".{state_file.name}.{os.getpid()}.tmp")
+            if state_format == 'json':
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(storage_state, f, indent=2, ensure_ascii=False)
+            else:
+                with open(tmp_file, 'wb') as f:
+                    _write_compact(f, storage_state, state_format)
+            os.replace(tmp_file, state_file)
+
+            # 删除另一种格式的旧文件，避免读取到过期的状态
+            other = self.get_state_path(
+                state_name, 'gzip' if state_format == 'json' else 'json')
+            if other.exists():
+                other.unlink()
+
+            self.invalidate(state_name)
 
             logger.info(f"认证状态已保存: {state_file} (cookies: {stats['cookies_count']}, origins: {stats['origins_count']})")
+            self.release_login(state_name)
             return str(state_file)
 
         except Exception as e:
@@ -120,6 +306,8 @@ class AuthManager:
     def load_auth_state(self, state_name: str) -> Optional[Dict[str, Any]]:
         """加载认证状态
 
+        文件未变化时返回缓存的状态，返回的字典在进程内共享，调用方不应修改。
+
         Args:
             state_name: 状态名称
 
@@ -127,14 +315,28 @@ class AuthManager:
             Optional[Dict[str, Any]]: 认证状态数据，如果不存在则返回None
         """
         try:
-            state_file = self.auth_dir / f"{state_name}.json"
+            state_file = self.get_state_path(state_name)
+            key = _file_key(state_file)
 
-            if not state_file.exists():
+            if key is None:
                 logger.warning(f"认证状态文件不存在: {state_file}")
                 return None
 
-            with open(state_file, 'r', encoding='utf-8') as f:
-                storage_state = json.load(f)
+            with self._lock:
+                cached = self._states.get(str(state_file))
+                if cached and cached[0] == key:
+                    self.stats['hits'] += 1
+                    return cached[1]
+
+            if state_file.suffix == _COMPACT_SUFFIX:
+                storage_state = _read_compact(state_file)
+            else:
+                with open(state_file, 'r', encoding='utf-8') as f:
+                    storage_state = json.load(f)
+
+            with self._lock:
+                self.stats['misses'] += 1
+                self._states[str(state_file)] = (key, storage_state)
 
             logger.info(f"认证状态已加载: {state_file}")
             return storage_state
@@ -152,8 +354,55 @@ class AuthManager:
         Returns:
             bool: 是否存在
         """
-        state_file = self.auth_dir / f"{state_name}.json"
-        return state_file.exists()
+        return state_name in self._get_index()
+
+    def _get_index(self, force: bool = False) -> Dict[str, FileKey]:
+        """认证目录的文件列表，目录修改时间变化时重新扫描"""
+        with self._lock:
+            now = time.monotonic()
+            if (not force and self._index_dir is not None
+                    and self._index_dir[0] == str(self.auth_dir)
+                    and now - self._index_checked < self.watch_interval):
+                return self._index
+
+            dir_state = (str(self.auth_dir), _file_key(self.auth_dir))
+            if force or dir_state != self._index_dir:
+                index = {}
+                files = [f for f in self.auth_dir.iterdir()
+                         if f.suffix in ('.json', _COMPACT_SUFFIX)]
+                names = {f.name for f in files}
+                for state_file in files:
+                    # 两种格式同时存在时以紧凑格式为准，与get_state_path一致
+                    if (state_file.suffix == '.json'
+                            and state_file.stem + _COMPACT_SUFFIX in names):
+                        continue
+                    key = _file_key(state_file)
+                    if key is not None:
+                        index[state_file.stem] = key
+                self._index = index
+                self._index_dir = dir_state
+            self._index_checked = now
+            return self._index
+
+    def invalidate(self, state_name: Optional[str] = None):
+        """清除缓存，外部程序修改认证目录后可调用
+
+        Args:
+            state_name: 状态名称，为空时清除全部缓存
+        """
+        with self._lock:
+            if state_name:
+                for state_format in ('json', 'gzip'):
+                    self._states.pop(
+                        str(self.get_state_path(state_name, state_format)), None)
+            else:
+                self._states.clear()
+            self._index_dir = None
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """获取认证状态缓存统计"""
+        with self._lock:
+            return dict(self.stats, size=len(self._states))
 
     def delete_auth_state(self, state_name: str) -> bool:
         """删除认证状态
@@ -165,10 +414,9 @@ class AuthManager:
             bool: 删除是否成功
         """
         try:
-            state_file = self.auth_dir / f"{state_name}.json"
+            state_file = self.get_state_path(state_name)
 
-            if state_file.exists():
-                state_file.unlink()
+            if self._remove_state_files(state_name):
                 logger.info(f"认证状态已删除: {state_file}")
                 return True
             else:
@@ -179,6 +427,39 @@ class AuthManager:
             logger.error(f"删除认证状态失败: {str(e)}")
             return False
 
+    def get_state_metadata(self, state_name: str) -> Optional[Dict[str, Any]]:
+        """读取认证状态的元数据，紧凑格式只读取文件头部
+
+        Args:
+            state_name: 状态名称
+
+        Returns:
+            Optional[Dict[str, Any]]: 元数据副本，状态不存在或无法读取时返回None
+        """
+        state_file = self.get_state_path(state_name)
+        if state_file.suffix != _COMPACT_SUFFIX:
+            data = self.load_auth_state(state_name)
+            return dict(data.get("metadata", {})) if data is not None else None
+
+        try:
+            with open(state_file, 'rb') as f:
+                _, header = _read_compact_header(f)
+            return dict(header.get("metadata", {}))
+        except Exception as e:
+            logger.warning(f"无法读取状态文件头部 {state_file}: {str(e)}")
+            return None
+
+    def _remove_state_files(self, state_name: str) -> bool:
+        """删除两种格式的状态文件，返回是否有文件被删除"""
+        removed = False
+        for state_format in ('json', 'gzip'):
+            state_file = self.get_state_path(state_name, state_format)
+            if state_file.exists():
+                state_file.unlink()
+                removed = True
+        self.invalidate(state_name)
+        return removed
+
     def list_auth_states(self) -> Dict[str, Dict[str, Any]]:
         """列出所有认证状态
 
@@ -188,21 +469,16 @@ class AuthManager:
         states = {}
 
         try:
-            for state_file in self.auth_dir.glob("*.json"):
-                state_name = state_file.stem
-
-                try:
-                    with open(state_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+            for state_name, (_, size) in sorted(self._get_index().items()):
+                state_file = self.get_state_path(state_name)
+                metadata = self.get_state_metadata(state_name)
+                if metadata is None:
+                    logger.warning(f"无法读取状态文件 {state_file}")
+                    continue
 
-                    metadata = data.get("metadata", {})
-                    metadata["file_path"] = str(state_file)
-                    metadata["file_size"] = state_file.stat().st_size
-
-                    states[state_name] = metadata
-
-                except Exception as e:
-                    logger.warning(f"无法读取状态文件 {state_file}: {str(e)}")
+                metadata["file_path"] = str(state_file)
+                metadata["file_size"] = size
+                states[state_name] = metadata
 
         except Exception as e:
             logger.error(f"列出认证状态失败: {str(e)}")
@@ -215,18 +491,14 @@ class AuthManager:
         Args:
             max_age_days: 最大保存天数
         """
-        import time
-
         try:
-            current_time = time.time()
-            cutoff_time = current_time - (max_age_days * 24 * 60 * 60)
+            cutoff_ns = (time.time() - max_age_days * 24 * 60 * 60) * 1e9
 
             deleted_count = 0
-            for state_file in self.auth_dir.glob("*.json"):
-                file_mtime = state_file.stat().st_mtime
-
-                if file_mtime < cutoff_time:
-                    state_file.unlink()
+            for state_name, (mtime_ns, _) in list(self._get_index(force=True).items()):
+                if mtime_ns < cutoff_ns:
+                    state_file = self.get_state_path(state_name)
+                    self._remove_state_files(state_name)
                     deleted_count += 1
                     logger.info(f"已删除过期认证状态: {state_file}")
 
@@ -238,6 +510,157 @@ class AuthManager:
         except Exception as e:
             logger.error(f"清理过期认证状态失败: {str(e)}")
 
+    def get_state_ttl(self, state_name: str, max_age: Optional[float] = None,
+                      cookie_names: Optional[List[str]] = None) -> Optional[float]:
+        """认证状态的剩余有效期，不打开页面
+
+        取保存时间加max_age与持久Cookie过期时间中较早者。未指定cookie_names时
+        优先使用保存时记录在元数据中的最早过期时间，紧凑格式只读取文件头部。
+
+        Args:
+            state_name: 状态名称
+            max_age: 状态有效期（秒），为空时不按保存时间判断
+            cookie_names: 只检查这些Cookie的过期时间，为空时检查所有持久Cookie
+
+        Returns:
+            Optional[float]: 剩余秒数（已过期或不存在时不大于0），没有任何期限时返回None
+        """
+        state_file = self.get_state_path(state_name)
+        key = _file_key(state_file)
+        if key is None:
+            return 0.0
+
+        now = time.time()
+        deadlines = []
+        if max_age is not None:
+            deadlines.append(key[0] / 1e9 + max_age)
+
+        metadata = None if cookie_names else self.get_state_metadata(state_name)
+        if metadata is not None and 'expires_at' in metadata:
+            expires_at = metadata['expires_at']
+        else:
+            state = self.load_auth_state(state_name)
+            if state is None:
+                return 0.0
+            expires_at = _earliest_expiry(state.get('cookies', []), cookie_names)
+        if expires_at is not None:
+            deadlines.append(expires_at)
+
+        return min(deadlines) - now if deadlines else None
+
+    def is_state_fresh(self, state_name: str, max_age: Optional[float] = None,
+                       min_ttl: float = 0,
+                       cookie_names: Optional[List[str]] = None) -> bool:
+        """认证状态是否存在且剩余有效期大于min_ttl
+
+        Args:
+            state_name: 状态名称
+            max_age: 状态有效期（秒），为空时不按保存时间判断
+            min_ttl: 要求的最短剩余有效期（秒）
+            cookie_names: 只检查这些Cookie的过期时间
+        """
+        if not self.get_state_path(state_name).exists():
+            return False
+        ttl = self.get_state_ttl(state_name, max_age, cookie_names)
+        return ttl is None or ttl > min_ttl
+
+    def _login_state_fresh(self, state_name: str, max_age: Optional[float],
+                           min_ttl: float,
+                           cookie_names: Optional[List[str]]) -> bool:
+        """acquire_login使用的有效期判断
+
+        未指定cookie_names时只按保存时间和max_age判断：站点常带有短期的
+        统计类持久Cookie，按最早过期的Cookie判断会导致频繁重新登录。
+        """
+        if cookie_names:
+            return self.is_state_fresh(state_name, max_age, min_ttl, cookie_names)
+        key = _file_key(self.get_state_path(state_name))
+        if key is None:
+            return False
+        return max_age is None or key[0] / 1e9 + max_age - time.time() > min_ttl
+
+    def acquire_login(self, state_name: str, max_age: Optional[float] = None,
+                      timeout: float = 300, refresh_ahead: float = 0,
+                      cookie_names: Optional[List[str]] = None) -> bool:
+        """一次登录，多处复用
+
+        状态的剩余有效期大于refresh_ahead时直接返回False。
+        状态仍然有效但进入提前刷新窗口时，只尝试一次获取锁：获得锁的进程负责重新登录，
+        其他进程不等待，继续使用旧状态。
+        状态不存在或已过期时获取该状态的登录文件锁，其他进程正在登录时阻塞等待，
+        获得锁后状态已被更新则释放锁并返回False。
+        返回True时当前进程持有锁，应执行登录并保存认证状态（保存后自动释放锁），
+        登录失败时调用release_login释放。进程退出时锁也会被释放。
+        剩余有效期按保存时间加max_age计算，指定cookie_names时还考虑这些Cookie的
+        过期时间；不检查其他Cookie。
+
+        Args:
+            state_name: 状态名称
+            max_age: 状态有效期（秒），为空时不按保存时间判断
+            timeout: 等待其他进程登录的最长时间（秒）
+            refresh_ahead: 剩余有效期少于该秒数时提前刷新
+            cookie_names: 会话Cookie名称，只检查这些Cookie的过期时间
+
+        Returns:
+            bool: 当前进程是否需要执行登录
+        """
+        if state_name in self._login_locks:
+            return True
+        if self._login_state_fresh(state_name, max_age, refresh_ahead, cookie_names):
+            return False
+
+        lock_file = open(self.auth_dir / f"{state_name}.lock", 'a+b')
+        waited = False
+        if self._login_state_fresh(state_name, max_age, 0, cookie_names):
+            # 仍然有效，只由一个进程提前刷新
+            if not _try_lock(lock_file):
+                lock_file.close()
+                logger.info(f"其他进程正在刷新认证状态，继续使用当前状态: {state_name}")
+                return False
+        else:
+            deadline = time.monotonic() + timeout
+            while not _try_lock(lock_file):
+                if time.monotonic() >= deadline:
+                    lock_file.close()
+                    raise TimeoutError(
+                        f"等待其他进程登录超时({timeout}秒): {state_name}")
+                if not waited:
+                    logger.info(f"其他进程正在登录，等待认证状态: {state_name}")
+                    waited = True
+                time.sleep(0.2)
+
+        # 等待期间其他进程可能已完成登录，刚登录的状态只要有效即可复用
+        self.invalidate(state_name)
+        if self._login_state_fresh(state_name, max_age,
+                                   0 if waited else refresh_ahead, cookie_names):
+            _unlock(lock_file)
+            lock_file.close()
+            logger.info(f"复用其他进程保存的认证状态: {state_name}")
+            return False
+
+        self._login_locks[state_name] = lock_file
+        logger.info(f"已获取登录锁，由当前进程执行登录: {state_name}")
+        return True
+
+    def release_login(self, state_name: str) -> bool:
+        """释放acquire_login获取的登录锁
+
+        Args:
+            state_name: 状态名称
+
+        Returns:
+            bool: 当前进程是否持有该锁
+        """
+        lock_file = self._login_locks.pop(state_name, None)
+        if lock_file is None:
+            return False
+        try:
+            _unlock(lock_file)
+        finally:
+            lock_file.close()
+        logger.info(f"已释放登录锁: {state_name}")
+        return True
+
     def _get_timestamp(self) -> str:
         """获取当前时间戳"""
         import datetime
@@ -1,11 +1,26 @@
 import json
 import logging
-from typing import Dict, Any, Optional, Union
+import os
+from typing import Dict, Any, List, Tuple, Union
 from urllib.parse import urljoin
 import allure
 
+from .reporting import reporter
+
 logger = logging.getLogger(__name__)
 
+# 标记尚未解析的JSON（解析结果可能为None）
+_UNSET = object()
+
+# 响应体写入文件时，内存中保留的头部字节数
+DEFAULT_HEAD_SIZE = 64 * 1024
+
+# Allure报告中请求/响应体的默认截断长度（字符）
+DEFAULT_LOG_BODY_LIMIT = 10240
+
+# Allure报告记录请求/响应体的方式
+LOG_BODY_MODES = ('truncate', 'sample', 'off')
+
 
 class BrowserHTTPClient:
     """基于浏览器上下文的HTTP客户端类
@@ -21,7 +36,10 @@ class BrowserHTTPClient:
                  headers: Dict[str, str] = None,
                  timeout: int = 30,
                  ignore_https_errors: bool = False,
-                 extra_http_headers: Dict[str, str] = None):
+                 extra_http_headers: Dict[str, str] = None,
+                 request_context=None,
+                 log_body_limit: int = DEFAULT_LOG_BODY_LIMIT,
+                 log_body_mode: str = 'truncate'):
         """初始化浏览器HTTP客户端
 
         Args:
@@ -32,7 +50,13 @@ class BrowserHTTPClient:
             timeout: 默认超时时间(秒)
             ignore_https_errors: 是否忽略HTTPS错误
             extra_http_headers: 额外的HTTP头
+            request_context: 独立的APIRequestContext，提供时不需要浏览器上下文
+            log_body_limit: Allure报告中请求/响应体的最大字符数
+            log_body_mode: truncate（只保留开头）、sample（保留开头和结尾）
+                或off（不记录请求/响应体）
         """
+        if log_body_mode not in LOG_BODY_MODES:
+            raise ValueError(f"不支持的响应体记录方式: {log_body_mode}")
         self.name = name
         self.browser_context = browser_context
         self.base_url = base_url
@@ -40,13 +64,18 @@ class BrowserHTTPClient:
         self.timeout = timeout * 1000  # Playwright使用毫秒
         self.ignore_https_errors = ignore_https_errors
         self.extra_http_headers = extra_http_headers or {}
+        self.log_body_limit = int(log_body_limit)
+        self.log_body_mode = log_body_mode
 
         # 获取API请求上下文
-        self._api_request_context = None
+        self._api_request_context = request_context
         self._init_api_request_context()
 
     def _init_api_request_context(self):
         """初始化API请求上下文"""
+        if self._api_request_context is not None:
+            # 独立的APIRequestContext，不依赖浏览器
+            return
         if self.browser_context:
             # 使用浏览器上下文的request对象，这样可以继承浏览器的会话状态
             self._api_request_context = self.browser_context.request
@@ -59,11 +88,109 @@ class BrowserHTTPClient:
         Args:
             method: HTTP方法
             url: 请求URL
-            **request_kwargs: 请求参数
+            **request_kwargs: 请求参数。save_to指定时响应体写入该文件，
+                内存中只保留前head_size字节
 
         Returns:
             BrowserResponse: 包装的响应对象
         """
+        url, playwright_kwargs = self._prepare_request(
+            method, url, request_kwargs)
+
+        # 记录请求详情
+        self._log_request_to_allure(method, url, playwright_kwargs)
+
+        try:
+            # 发送请求
+            request_func = self._get_request_func(method)
+            response = request_func(url, **playwright_kwargs)
+
+            # 包装响应对象
+            browser_response = BrowserResponse(response)
+            # 304响应没有响应体，保留上次写入的文件
+            if request_kwargs.get('save_to') and response.status != 304:
+                browser_response.save_body(
+                    request_kwargs['save_to'],
+                    request_kwargs.get('head_size', DEFAULT_HEAD_SIZE))
+
+            # 记录响应详情
+            self._log_response_to_allure(browser_response)
+
+            return browser_response
+
+        except Exception as e:
+            self._log_request_error(method, url, e)
+            raise ValueError(f"浏览器HTTP请求失败: {str(e)}") from e
+
+    @classmethod
+    def from_client(cls, client: 'BrowserHTTPClient',
+                    request_context) -> 'BrowserHTTPClient':
+        """复制客户端配置，改用指定的APIRequestContext发送请求"""
+        clone = cls.__new__(cls)
+        clone.__dict__.update(client.__dict__)
+        clone._api_request_context = request_context
+        return clone
+
+    def make_requests(self, requests: List[Tuple[str, str, Dict[str, Any]]],
+                      concurrency: int = 8) -> List[Union['BrowserResponse', Exception]]:
+        """批量发送HTTP请求
+
+        同步API的APIRequestContext一次只能等待一个请求。并发数大于1时，
+        在后台事件循环中创建独立的异步APIRequestContext并发发送，
+        发送前导入浏览器上下文的存储状态，完成后将新增或变化的Cookie写回浏览器上下文。
+        独立APIRequestContext无法写入Cookie，批内新增的Cookie不会写回。
+
+        Args:
+            requests: (HTTP方法, URL, 请求参数)列表
+            concurrency: 最大并发请求数
+
+        Returns:
+            List[Union[BrowserResponse, Exception]]: 与请求顺序一致的响应，
+            请求失败时对应位置为异常对象
+        """
+        if concurrency <= 1 or len(requests) <= 1:
+            results = []
+            for method, url, request_kwargs in requests:
+                try:
+                    results.append(self.make_request(method, url, **request_kwargs))
+                except Exception as e:
+                    results.append(e)
+            return results
+
+        from .async_bridge import async_bridge
+        from .async_backend import run_request_batch
+
+        state_source = self.browser_context or self._api_request_context
+        storage_state = state_source.storage_state()
+        results, cookies = async_bridge.run(run_request_batch(
+            self, requests, concurrency, storage_state))
+
+        changed = [c for c in cookies if c not in storage_state.get('cookies', [])]
+        if changed and self.browser_context:
+            self.browser_context.add_cookies(changed)
+
+        for (method, url, request_kwargs), result in zip(requests, results):
+            url, playwright_kwargs = self._prepare_request(
+                method, url, request_kwargs)
+            self._log_request_to_allure(method, url, playwright_kwargs)
+            if isinstance(result, Exception):
+                self._log_request_error(method, url, result)
+            else:
+                self._log_response_to_allure(result)
+        return results
+
+    def _prepare_request(self, method: str, url: str,
+                         request_kwargs: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """构建完整URL和Playwright请求参数
+
+        Args:
+            method: HTTP方法
+            url: 请求URL
+            request_kwargs: 请求参数
+
+        Returns:
+            Tuple[str, Dict[str, Any]]: 完整URL和Playwright请求参数
+        """
         # 构建完整URL
         if not url.startswith(('http://', 'https://')):
             url = urljoin(self.base_url, url.lstrip('/'))
@@ -108,53 +235,35 @@ class BrowserHTTPClient:
             # Playwright处理文件上传的方式
             playwright_kwargs['multipart'] = request_kwargs['files']
 
-        # 记录请求详情
-        self._log_request_to_allure(method, url, playwright_kwargs)
-
-        try:
-            # 发送请求
-            if method.upper() == 'GET':
-                response = self._api_request_context.get(
-                    url, **playwright_kwargs)
-            elif method.upper() == 'POST':
-                response = self._api_request_context.post(
-                    url, **playwright_kwargs)
-            elif method.upper() == 'PUT':
-                response = self._api_request_context.put(
-                    url, **playwright_kwargs)
-            elif method.upper() == 'DELETE':
-                response = self._api_request_context.delete(
-                    url, **playwright_kwargs)
-            elif method.upper() == 'PATCH':
-                response = self._api_request_context.patch(
-                    url, **playwright_kwargs)
-            elif method.upper() == 'HEAD':
-                response = self._api_request_context.head(
-                    url, **playwright_kwargs)
-            else:
-                raise ValueError(f"不支持的HTTP方法: {method}")
-
-            # 包装响应对象
-            browser_response = BrowserResponse(response)
-
-            # 记录响应详情
-            self._log_response_to_allure(browser_response)
-
-            return browser_response
-
-        except Exception as e:
-            # 记录请求异常
-            error_message = f"请求异常: {str(e)}"
-            allure.attach(
-                error_message,
-                name=f"浏览器HTTP请求失败: {method} {url}",
-                attachment_type=allure.attachment_type.TEXT
-            )
-            raise ValueError(f"浏览器HTTP请求失败: {str(e)}") from e
+        return url, playwright_kwargs
+
+    def _get_request_func(self, method: str):
+        """根据HTTP方法获取APIRequestContext的请求函数"""
+        method = method.upper()
+        if method not in ('GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD'):
+            raise ValueError(f"不支持的HTTP方法: {method}")
+        return getattr(self._api_request_context, method.lower())
+
+    def _log_request_error(self, method: str, url: str, error: Exception) -> None:
+        """记录请求异常"""
+        error_message = f"请求异常: {str(error)}"
+        reporter.attach(
+            error_message,
+            name=f"浏览器HTTP请求失败: {method} {url}",
+            attachment_type=allure.attachment_type.TEXT
+        )
 
     def _log_request_to_allure(self, method: str, url: str, request_kwargs: Dict[str, Any]) -> None:
-        """使用Allure记录请求信息"""
-        request_summary = f"{method} {url}"
+        """使用Allure记录请求信息，请求详情只在报告级别需要时格式化"""
+        reporter.attach(
+            lambda: self._format_request_details(method, url, request_kwargs),
+            name=f"浏览器HTTP请求: {method} {url}",
+            attachment_type=allure.attachment_type.TEXT
+        )
+
+    def _format_request_details(self, method: str, url: str,
+                                request_kwargs: Dict[str, Any]) -> str:
+        """格式化请求详情"""
         request_details = [f"Method: {method}", f"URL: {url}"]
 
         # 添加请求头
@@ -176,16 +285,18 @@ class BrowserHTTPClient:
                 request_details.append(f"  {key}: {value}")
 
         # 添加请求体
-        if "data" in request_kwargs and request_kwargs["data"]:
+        if ("data" in request_kwargs and request_kwargs["data"]
+                and self.log_body_mode != 'off'):
             request_details.append("JSON Body:")
             try:
                 if isinstance(request_kwargs["data"], (dict, list)):
-                    request_details.append(json.dumps(
-                        request_kwargs["data"], indent=2, ensure_ascii=False))
+                    body_text = json.dumps(
+                        request_kwargs["data"], indent=2, ensure_ascii=False)
                 else:
-                    request_details.append(str(request_kwargs["data"]))
+                    body_text = str(request_kwargs["data"])
             except:
-                request_details.append(str(request_kwargs["data"]))
+                body_text = str(request_kwargs["data"])
+            request_details.append(self._limit_body(body_text))
 
         # 添加表单数据
         if "form" in request_kwargs and request_kwargs["form"]:
@@ -193,16 +304,18 @@ class BrowserHTTPClient:
             for key, value in request_kwargs["form"].items():
                 request_details.append(f"  {key}: {value}")
 
-        # 记录到Allure
-        allure.attach(
-            "\n".join(request_details),
-            name=f"浏览器HTTP请求: {request_summary}",
+        return "\n".join(request_details)
+
+    def _log_response_to_allure(self, response: 'BrowserResponse') -> None:
+        """使用Allure记录响应信息，响应详情只在报告级别需要时格式化"""
+        reporter.attach(
+            lambda: self._format_response_details(response),
+            name=f"浏览器HTTP响应: {response.status_code} ({response.elapsed_ms:.2f}ms)",
             attachment_type=allure.attachment_type.TEXT
         )
 
-    def _log_response_to_allure(self, response: 'BrowserResponse') -> None:
-        """使用Allure记录响应信息"""
-        response_summary = f"{response.status_code} ({response.elapsed_ms:.2f}ms)"
+    def _format_response_details(self, response: 'BrowserResponse') -> str:
+        """格式化响应详情"""
         response_details = [
             f"Status: {response.status_code} {response.status_text}",
             f"Response Time: {response.elapsed_ms:.2f}ms"
@@ -214,25 +327,36 @@ class BrowserHTTPClient:
             response_details.append(f"  {key}: {value}")
 
         # 添加响应体
-        response_details.append("Body:")
-        try:
-            body_text = response.text
-            if response.is_json():
-                response_details.append(json.dumps(
-                    response.json(), indent=2, ensure_ascii=False))
-            elif len(body_text) < 10240:  # 限制大小
-                response_details.append(body_text)
-            else:
-                response_details.append(f"<{len(body_text)} 字符>")
-        except Exception as e:
-            response_details.append(f"<解析响应体错误: {str(e)}>")
-
-        # 记录到Allure
-        allure.attach(
-            "\n".join(response_details),
-            name=f"浏览器HTTP响应: {response_summary}",
-            attachment_type=allure.attachment_type.TEXT
-        )
+        if response.body_path:
+            response_details.append(
+                f"Body: <已保存到 {response.body_path}, {response.body_size} 字节>")
+        elif self.log_body_mode != 'off':
+            response_details.append("Body:")
+        if self.log_body_mode != 'off':
+            try:
+                body_text = response.text
+                # 超过上限的JSON不再格式化，直接截断原文
+                if (response.is_json() and not response.body_path
+                        and len(body_text) <= self.log_body_limit):
+                    body_text = json.dumps(
+                        response.json(), indent=2, ensure_ascii=False)
+                response_details.append(self._limit_body(body_text))
+            except Exception as e:
+                response_details.append(f"<解析响应体错误: {str(e)}>")
+
+        return "\n".join(response_details)
+
+    def _limit_body(self, text: str) -> str:
+        """按log_body_limit截断或采样请求/响应体文本"""
+        limit = self.log_body_limit
+        if len(text) <= limit:
+            return text
+        if self.log_body_mode == 'sample':
+            head = limit // 2
+            tail = limit - head
+            return (f"{text[:head]}\n... <省略 {len(text) - limit} 字符> ...\n"
+                    f"{text[len(text) - tail:]}")
+        return f"{text[:limit]}\n... <已截断，共 {len(text)} 字符>"
 
     def close(self) -> None:
         """关闭客户端"""
@@ -243,7 +367,12 @@ class BrowserHTTPClient:
 class BrowserResponse:
     """浏览器响应包装类
 
-    提供与requests.Response兼容的接口
+    提供与requests.Response兼容的接口。响应体只读取和解析一次：
+    文本、JSON、JSON序列化文本和HTML解析树在首次访问时计算并缓存，
+    同一请求的所有捕获和断言共用。
+
+    响应体通过save_body写入文件后，内存中只保留头部窗口：text、regex、
+    xpath和body提取基于头部窗口，json()在首次访问时从文件解析。
     """
 
     def __init__(self, playwright_response):
@@ -253,8 +382,14 @@ class BrowserResponse:
             playwright_response: Playwright的APIResponse对象
         """
         self._response = playwright_response
+        self._headers = None
         self._text = None
-        self._json = None
+        self._json = _UNSET
+        self._json_error = None
+        self._json_text = None
+        self._html_tree = None
+        self.body_path = None
+        self.body_size = None
 
     @property
     def status_code(self) -> int:
@@ -269,7 +404,9 @@ class BrowserResponse:
     @property
     def headers(self) -> Dict[str, str]:
         """获取响应头"""
-        return dict(self._response.headers)
+        if self._headers is None:
+            self._headers = dict(self._response.headers)
+        return self._headers
 
     @property
     def url(self) -> str:
@@ -278,7 +415,7 @@ class BrowserResponse:
 
     @property
     def text(self) -> str:
-        """获取响应文本"""
+        """获取响应文本，响应体已写入文件时为头部窗口"""
         if self._text is None:
             try:
                 self._text = self._response.text()
@@ -287,6 +424,39 @@ class BrowserResponse:
                 self._text = ""
         return self._text
 
+    def save_body(self, path: str, head_size: int = DEFAULT_HEAD_SIZE) -> str:
+        """将响应体写入文件，内存中只保留头部窗口
+
+        Playwright的APIResponse不支持按块读取，响应体写入文件后立即释放
+        APIResponse持有的响应体，后续提取不再持有完整响应体。
+
+        Args:
+            path: 文件路径，父目录不存在时自动创建
+            head_size: 保留在内存中供提取使用的头部字节数
+
+        Returns:
+            str: 文件路径
+        """
+        body = self._response.body()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(body)
+
+        self.body_path = path
+        self.body_size = len(body)
+        self._text = body[:head_size].decode('utf-8', errors='replace')
+        self._json = _UNSET
+        self._json_error = None
+        self._json_text = None
+        self._html_tree = None
+        try:
+            self._response.dispose()
+        except Exception as e:
+            logger.debug(f"释放响应体失败: {str(e)}")
+        return path
+
     @property
     def elapsed_ms(self) -> float:
         """获取响应时间（毫秒）"""
@@ -294,14 +464,36 @@ class BrowserResponse:
         return getattr(self, '_elapsed_ms', 0.0)
 
     def json(self) -> Any:
-        """解析JSON响应"""
-        if self._json is None:
+        """解析JSON响应，解析结果（包括解析失败）只计算一次"""
+        if self._json is _UNSET and self._json_error is None:
             try:
-                self._json = self._response.json()
-            except Exception as e:
-                raise ValueError(f"响应不是有效的JSON格式: {str(e)}")
+                if self.body_path:
+                    with open(self.body_path, 'rb') as f:
+                        self._json = json.load(f)
+                else:
+                    self._json = json.loads(self.text)
+            except ValueError as e:
+                self._json_error = f"响应不是有效的JSON格式: {str(e)}"
+        if self._json_error is not None:
+            raise ValueError(self._json_error)
         return self._json
 
+    @property
+    def json_text(self) -> str:
+        """JSON响应重新序列化后的文本（与pytest-dsl的正则提取保持一致）"""
+        if self._json_text is None:
+            self._json_text = json.dumps(self.json())
+        return self._json_text
+
+    @property
+    def html_tree(self):
+        """响应文本的lxml HTML解析树"""
+        if self._html_tree is None:
+            import lxml.etree as etree
+            self._html_tree = etree.fromstring(
+                self.text.encode(), etree.HTMLParser())
+        return self._html_tree
+
     def is_json(self) -> bool:
         """判断响应是否是JSON格式"""
         content_type = self.headers.get('content-type', '')
@@ -323,12 +515,14 @@ class BrowserHTTPClientManager:
         """初始化客户端管理器"""
         self._clients: Dict[str, BrowserHTTPClient] = {}
 
-    def create_client(self, config: Dict[str, Any], browser_context=None) -> BrowserHTTPClient:
+    def create_client(self, config: Dict[str, Any], browser_context=None,
+                      request_context=None) -> BrowserHTTPClient:
         """从配置创建客户端
 
         Args:
             config: 客户端配置
             browser_context: 浏览器上下文
+            request_context: 独立的APIRequestContext
 
         Returns:
             BrowserHTTPClient实例
@@ -341,13 +535,20 @@ class BrowserHTTPClientManager:
             headers=config.get("headers", {}),
             timeout=config.get("timeout", 30),
             ignore_https_errors=config.get("ignore_https_errors", False),
-            extra_http_headers=config.get("extra_http_headers", {})
+            extra_http_headers=config.get("extra_http_headers", {}),
+            request_context=request_context,
+            log_body_limit=config.get("log_body_limit", DEFAULT_LOG_BODY_LIMIT),
+            log_body_mode=config.get("log_body_mode", "truncate")
         )
         return client
 
     def get_client(self, name: str = "default", browser_context=None, config: Dict[str, Any] = None) -> BrowserHTTPClient:
         """获取或创建客户端
 
+        未提供浏览器上下文时使用独立的APIRequestContext（无浏览器模式），
+        客户端配置中的auth_state指定加载的AuthManager认证状态；
+        两者都没有时记录警告，请求不携带任何登录状态。
+
         Args:
             name: 客户端名称
             browser_context: 浏览器上下文
@@ -356,22 +557,31 @@ class BrowserHTTPClientManager:
         Returns:
             BrowserHTTPClient实例
         """
+        if not config:
+            config = {"name": name}
+
+        request_context = None
+        if not browser_context:
+            from .browser_manager import browser_manager
+            request_context = browser_manager.get_api_request_context(
+                config.get("auth_state"),
+                config.get("ignore_https_errors", False))
+
         # 生成客户端键名，包含浏览器上下文ID以确保唯一性
-        context_id = id(browser_context) if browser_context else "default"
+        context_id = id(browser_context or request_context)
         client_key = f"{name}_{context_id}"
 
         # 如果客户端已存在，直接返回
         if client_key in self._clients:
             return self._clients[client_key]
 
-        # 创建新客户端
-        if not config:
-            config = {"name": name}
+        if not browser_context and not config.get("auth_state"):
+            logger.warning(
+                f"客户端 {name} 没有可用的浏览器上下文，使用无浏览器模式发送请求，"
+                f"不会携带浏览器中的登录状态；需要认证时请指定认证状态")
 
-        if not browser_context:
-            raise ValueError("必须提供浏览器上下文")
-
-        client = self.create_client(config, browser_context)
+        # 创建新客户端
+        client = self.create_client(config, browser_context, request_context)
         self._clients[client_key] = client
         return client
 
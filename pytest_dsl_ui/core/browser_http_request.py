@@ -1,11 +1,12 @@
-import json
 import logging
-import re
 import time
+from functools import partial
 from typing import Dict, List, Any, Tuple, Optional
 import allure
 
 from .browser_http_client import browser_http_client_manager, BrowserResponse
+from .expression_cache import expression_cache
+from .reporting import reporter
 
 logger = logging.getLogger(__name__)
 
@@ -60,7 +61,81 @@ class BrowserHTTPRequest:
         Returns:
             BrowserResponse对象
         """
-        # 获取浏览器HTTP客户端
+        client = self.get_client()
+        method, url, request_kwargs = self.build_request()
+
+        try:
+            # 记录开始时间
+            self._start_time = time.time()
+
+            # 发送请求
+            response = client.make_request(method, url, **request_kwargs)
+
+            # 计算响应时间
+            elapsed_ms = (time.time() - self._start_time) * 1000
+            return self.apply_response(response, elapsed_ms)
+
+        except Exception as e:
+            error_message = f"浏览器HTTP请求执行错误: {str(e)}"
+            reporter.attach(
+                error_message,
+                name=f"浏览器HTTP请求失败: {method} {url}",
+                attachment_type=allure.attachment_type.TEXT
+            )
+            raise ValueError(error_message) from e
+
+    def refetch(self, disable_auth: bool = False,
+                conditional: bool = True) -> Tuple[bool, Dict[str, Any]]:
+        """重新发送请求，用于断言重试
+
+        GET/HEAD请求的上一个响应带有ETag或Last-Modified时发送条件请求，
+        服务器返回304表示资源未变化，保留上一个响应和捕获的变量。
+
+        Args:
+            disable_auth: 是否禁用认证
+            conditional: 是否发送条件请求
+
+        Returns:
+            Tuple[bool, Dict[str, Any]]: 响应是否有变化，以及本次请求的信息
+                （status、elapsed_ms、conditional）
+        """
+        client = self.get_client()
+        method, url, request_kwargs = self.build_request()
+
+        validators = self._conditional_headers(method) if conditional else {}
+        if validators:
+            request_kwargs['headers'] = dict(
+                request_kwargs.get('headers') or {}, **validators)
+
+        start_time = time.time()
+        try:
+            response = client.make_request(method, url, **request_kwargs)
+        except Exception as e:
+            raise ValueError(f"浏览器HTTP请求执行错误: {str(e)}") from e
+        elapsed_ms = (time.time() - start_time) * 1000
+
+        info = {'status': response.status_code, 'elapsed_ms': elapsed_ms,
+                'conditional': bool(validators)}
+        if validators and response.status_code == 304:
+            return False, info
+
+        self.apply_response(response, elapsed_ms)
+        return True, info
+
+    def _conditional_headers(self, method: str) -> Dict[str, str]:
+        """根据上一个响应的校验器构建条件请求头"""
+        if self.response is None or method not in ('GET', 'HEAD'):
+            return {}
+        headers = self.response.headers
+        validators = {}
+        if headers.get('etag'):
+            validators['If-None-Match'] = headers['etag']
+        elif headers.get('last-modified'):
+            validators['If-Modified-Since'] = headers['last-modified']
+        return validators
+
+    def get_client(self):
+        """获取配置对应的浏览器HTTP客户端"""
         client_config = self.config.get('client_config', {})
         client = browser_http_client_manager.get_client(
             name=self.client_name,
@@ -70,14 +145,20 @@ class BrowserHTTPRequest:
 
         if client is None:
             error_message = f"无法获取浏览器HTTP客户端: {self.client_name}"
-            allure.attach(
+            reporter.attach(
                 error_message,
                 name="浏览器HTTP客户端错误",
                 attachment_type=allure.attachment_type.TEXT
             )
             raise ValueError(error_message)
+        return client
+
+    def build_request(self) -> Tuple[str, str, Dict[str, Any]]:
+        """从配置构建请求
 
-        # 提取请求参数
+        Returns:
+            Tuple[str, str, Dict[str, Any]]: HTTP方法、URL和请求参数
+        """
         method = self.config.get('method', 'GET').upper()
         url = self.config.get('url', '')
 
@@ -91,50 +172,47 @@ class BrowserHTTPRequest:
             'data': request_config.get('data'),
             'files': request_config.get('files'),
             'timeout': request_config.get('timeout'),
-            'ignore_https_errors': request_config.get('ignore_https_errors')
+            'ignore_https_errors': request_config.get('ignore_https_errors'),
+            'save_to': request_config.get('save_to'),
+            'head_size': request_config.get('head_size')
         }
 
         # 过滤掉None值
         request_kwargs = {k: v for k,
                           v in request_kwargs.items() if v is not None}
+        return method, url, request_kwargs
 
-        try:
-            # 记录开始时间
-            self._start_time = time.time()
-
-            # 发送请求
-            self.response = client.make_request(method, url, **request_kwargs)
-
-            # 计算响应时间
-            if self._start_time:
-                elapsed_ms = (time.time() - self._start_time) * 1000
-                # 为响应对象添加响应时间属性
-                self.response._elapsed_ms = elapsed_ms
+    def apply_response(self, response: BrowserResponse,
+                       elapsed_ms: Optional[float] = None) -> BrowserResponse:
+        """设置请求的响应并处理捕获
 
-            # 处理捕获
-            try:
-                self.process_captures()
-            except Exception as capture_error:
-                if (not hasattr(self, 'captured_values') or
-                        self.captured_values is None):
-                    self.captured_values = {}
-                logger.warning(f"变量捕获处理失败: {str(capture_error)}")
-                allure.attach(
-                    f"变量捕获处理失败: {str(capture_error)}",
-                    name="变量捕获警告",
-                    attachment_type=allure.attachment_type.TEXT
-                )
+        Args:
+            response: 响应对象
+            elapsed_ms: 响应时间（毫秒），为None时保留响应对象上已有的值
 
-            return self.response
+        Returns:
+            BrowserResponse对象
+        """
+        self.response = response
+        if elapsed_ms is not None:
+            # 为响应对象添加响应时间属性
+            self.response._elapsed_ms = elapsed_ms
 
-        except Exception as e:
-            error_message = f"浏览器HTTP请求执行错误: {str(e)}"
-            allure.attach(
-                error_message,
-                name=f"浏览器HTTP请求失败: {method} {url}",
+        # 处理捕获
+        try:
+            self.process_captures()
+        except Exception as capture_error:
+            if (not hasattr(self, 'captured_values') or
+                    self.captured_values is None):
+                self.captured_values = {}
+            logger.warning(f"变量捕获处理失败: {str(capture_error)}")
+            reporter.attach(
+                f"变量捕获处理失败: {str(capture_error)}",
+                name="变量捕获警告",
                 attachment_type=allure.attachment_type.TEXT
             )
-            raise ValueError(error_message) from e
+
+        return self.response
 
     def process_captures(self) -> Dict[str, Any]:
         """处理响应捕获
@@ -178,7 +256,7 @@ class BrowserHTTPRequest:
                         original_value = captured_value
                         captured_value = len(captured_value)
 
-                        allure.attach(
+                        reporter.attach(
                             f"变量名: {var_name}\n提取器: {extractor_type}\n路径: {extraction_path}\n原始值: {str(original_value)}\n长度: {captured_value}",
                             name=f"捕获长度: {var_name}",
                             attachment_type=allure.attachment_type.TEXT
@@ -189,7 +267,7 @@ class BrowserHTTPRequest:
                             f"类型: {type(original_value).__name__}\n"
                             f"值: {original_value}"
                         )
-                        allure.attach(
+                        reporter.attach(
                             error_msg,
                             name=f"长度计算失败: {extractor_type} {extraction_path}",
                             attachment_type=allure.attachment_type.TEXT
@@ -197,7 +275,7 @@ class BrowserHTTPRequest:
                         raise ValueError(
                             f"断言类型'length'无法应用于值 '{original_value}': {str(e)}")
                 else:
-                    allure.attach(
+                    reporter.attach(
                         f"变量名: {var_name}\n提取器: {extractor_type}\n路径: {extraction_path}\n提取值: {str(captured_value)}",
                         name=f"捕获变量: {var_name}",
                         attachment_type=allure.attachment_type.TEXT
@@ -211,7 +289,7 @@ class BrowserHTTPRequest:
                     f"捕获规格: {capture_spec}\n"
                     f"错误: {type(e).__name__}: {str(e)}"
                 )
-                allure.attach(
+                reporter.attach(
                     error_msg,
                     name=f"变量捕获失败: {var_name}",
                     attachment_type=allure.attachment_type.TEXT
@@ -220,7 +298,8 @@ class BrowserHTTPRequest:
 
         return self.captured_values
 
-    def process_asserts(self, specific_asserts=None, index_mapping=None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    def process_asserts(self, specific_asserts=None, index_mapping=None,
+                        collect_only: bool = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """处理响应断言
 
         复用pytest-dsl的断言逻辑，适配浏览器响应格式
@@ -228,6 +307,8 @@ class BrowserHTTPRequest:
         Args:
             specific_asserts: 指定要处理的断言列表
             index_mapping: 索引映射字典
+            collect_only: 为True时断言失败不抛出异常，只返回结果；
+                默认读取配置中的_collect_failed_assertions_only
 
         Returns:
             断言结果列表和失败需重试的断言列表
@@ -432,13 +513,13 @@ class BrowserHTTPRequest:
             if assertion_type == "length":
                 if extractor_type not in ["response_time", "status"]:
                     try:
-                        allure.attach(
+                        reporter.attach(
                             f"提取器: {extractor_type}\n路径: {extraction_path}\n原始值: {original_actual_value}\n类型: {type(original_actual_value).__name__}",
                             name=f"长度断言原始值: {extractor_type}",
                             attachment_type=allure.attachment_type.TEXT
                         )
                         actual_value = len(actual_value)
-                        allure.attach(
+                        reporter.attach(
                             f"提取器: {extractor_type}\n路径: {extraction_path}\n长度: {actual_value}",
                             name=f"长度断言计算结果: {extractor_type}",
                             attachment_type=allure.attachment_type.TEXT
@@ -449,7 +530,7 @@ class BrowserHTTPRequest:
                             f"类型: {type(original_actual_value).__name__}\n"
                             f"值: {original_actual_value}"
                         )
-                        allure.attach(
+                        reporter.attach(
                             error_msg,
                             name=f"长度计算失败: {extractor_type} {extraction_path}",
                             attachment_type=allure.attachment_type.TEXT
@@ -480,8 +561,8 @@ class BrowserHTTPRequest:
 
                 if result:
                     assertion_result['passed'] = True
-                    allure.attach(
-                        self._format_assertion_details(assertion_result),
+                    reporter.attach(
+                        partial(self._format_assertion_details, assertion_result),
                         name=f"断言成功: {extractor_type}",
                         attachment_type=allure.attachment_type.TEXT
                     )
@@ -489,11 +570,12 @@ class BrowserHTTPRequest:
                     assertion_result['passed'] = False
                     assertion_result['error'] = "断言失败"
 
-                    allure.attach(
+                    reporter.attach(
                         self._format_assertion_details(
                             assertion_result) + "\n\n错误: 断言结果为False",
                         name=f"断言失败: {extractor_type}",
-                        attachment_type=allure.attachment_type.TEXT
+                        attachment_type=allure.attachment_type.TEXT,
+                        failure=True
                     )
 
                     if is_retryable:
@@ -529,7 +611,7 @@ class BrowserHTTPRequest:
                         error_message=str(e)
                     )
 
-                allure.attach(
+                reporter.attach(
                     self._format_assertion_details(
                         assertion_result) + f"\n\n错误: {str(e)}",
                     name=f"断言失败: {extractor_type}",
@@ -545,8 +627,9 @@ class BrowserHTTPRequest:
 
         # 处理断言失败
         if failed_assertions:
-            collect_only = self.config.get(
-                '_collect_failed_assertions_only', False)
+            if collect_only is None:
+                collect_only = self.config.get(
+                    '_collect_failed_assertions_only', False)
 
             if not collect_only:
                 if len(failed_assertions) == 1:
@@ -593,7 +676,7 @@ class BrowserHTTPRequest:
                 raise ValueError(f"不支持的提取器类型: {extractor_type}")
         except Exception as e:
             error_message = f"提取值失败({extractor_type}, {extraction_path}): {type(e).__name__}: {str(e)}"
-            allure.attach(
+            reporter.attach(
                 error_message,
                 name=f"提取错误: {extractor_type}",
                 attachment_type=allure.attachment_type.TEXT
@@ -608,9 +691,8 @@ class BrowserHTTPRequest:
             # 直接使用response.json()，与pytest-dsl保持完全一致
             json_data = self.response.json()
 
-            # 使用jsonpath_ng库进行解析（与pytest-dsl保持一致）
-            import jsonpath_ng.ext as jsonpath
-            jsonpath_expr = jsonpath.parse(path)
+            # 使用jsonpath_ng库进行解析（与pytest-dsl保持一致），编译结果进程内缓存
+            jsonpath_expr = expression_cache.jsonpath(path)
             matches = [match.value for match in jsonpath_expr.find(json_data)]
 
             if not matches:
@@ -626,12 +708,9 @@ class BrowserHTTPRequest:
 
     def _extract_xpath(self, path: str, default_value: Any = None) -> Any:
         """使用XPath从HTML响应提取值"""
-        # 简化实现，实际应该使用lxml解析
         try:
-            import lxml.etree as etree
-            parser = etree.HTMLParser()
-            tree = etree.fromstring(self.response.text.encode(), parser)
-            result = tree.xpath(path)
+            # 解析树在响应对象上缓存，多个表达式共用
+            result = expression_cache.xpath(path)(self.response.html_tree)
 
             if not result:
                 return default_value
@@ -647,19 +726,20 @@ class BrowserHTTPRequest:
     def _extract_regex(self, pattern: str, default_value: Any = None) -> Any:
         """使用正则表达式从响应提取值"""
         try:
-            # 如果响应是JSON格式，先转换为字符串（与pytest-dsl保持一致）
-            if self.response.is_json():
-                text = json.dumps(self.response.json())
+            # 如果响应是JSON格式，先转换为字符串（与pytest-dsl保持一致）；
+            # 响应体已写入文件时只在头部窗口中匹配，不加载完整响应体
+            if self.response.is_json() and not self.response.body_path:
+                text = self.response.json_text
             else:
                 text = self.response.text
 
             # 检查正则表达式是否包含捕获组
-            compiled_pattern = re.compile(pattern)
+            compiled_pattern = expression_cache.regex(pattern)
             has_groups = compiled_pattern.groups > 0
 
             if has_groups:
                 # 如果有捕获组，只返回第一个匹配的捕获组内容
-                first_match = re.search(pattern, text)
+                first_match = compiled_pattern.search(text)
                 if not first_match:
                     return default_value
 
@@ -672,7 +752,7 @@ class BrowserHTTPRequest:
                     return first_match.groups()
             else:
                 # 如果没有捕获组，使用findall获取所有完整匹配
-                matches = re.findall(pattern, text)
+                matches = compiled_pattern.findall(text)
 
                 if not matches:
                     return default_value
@@ -742,18 +822,19 @@ class BrowserHTTPRequest:
                         actual_value = float(clean_actual)
             except (ValueError, TypeError) as e:
                 # 转换失败时记录日志但不抛出异常，保持原值进行比较
-                allure.attach(
+                reporter.attach(
                     f"类型转换失败: {str(e)}\n实际值: {actual_value} ({type(actual_value).__name__})\n预期值: {expected_value} ({type(expected_value).__name__})",
                     name="断言类型转换警告",
                     attachment_type=allure.attachment_type.TEXT
                 )
 
-        # 记录断言参数
-        allure.attach(
-            f"断言类型: {assertion_type}\n"
-            f"比较操作符: {operator}\n"
-            f"实际值: {actual_value} ({type(actual_value).__name__})\n"
-            f"期望值: {expected_value} ({type(expected_value).__name__ if expected_value is not None else 'None'})",
+        # 记录断言参数（实际值可能是完整响应体，只在需要写入报告时格式化）
+        reporter.attach(
+            lambda actual_value=actual_value: (
+                f"断言类型: {assertion_type}\n"
+                f"比较操作符: {operator}\n"
+                f"实际值: {actual_value} ({type(actual_value).__name__})\n"
+                f"期望值: {expected_value} ({type(expected_value).__name__ if expected_value is not None else 'None'})"),
             name="断言参数",
             attachment_type=allure.attachment_type.TEXT
         )
@@ -784,19 +865,21 @@ class BrowserHTTPRequest:
                         actual_value) if actual_value is not None else ""
                 try:
                     pattern = str(expected_value)
-                    match_result = bool(re.search(pattern, actual_value))
+                    match_result = bool(
+                        expression_cache.regex(pattern).search(actual_value))
                     # 记录匹配结果
-                    allure.attach(
-                        f"正则表达式匹配结果: {'成功' if match_result else '失败'}\n"
-                        f"模式: {pattern}\n"
-                        f"目标字符串: {actual_value}",
+                    reporter.attach(
+                        lambda: (
+                            f"正则表达式匹配结果: {'成功' if match_result else '失败'}\n"
+                            f"模式: {pattern}\n"
+                            f"目标字符串: {actual_value}"),
                         name="正则表达式匹配",
                         attachment_type=allure.attachment_type.TEXT
                     )
                     return match_result
                 except Exception as e:
                     # 记录正则表达式匹配错误
-                    allure.attach(
+                    reporter.attach(
                         f"正则表达式匹配失败: {type(e).__name__}: {str(e)}\n"
                         f"模式: {expected_value}\n"
                         f"目标字符串: {actual_value}",
@@ -811,7 +894,7 @@ class BrowserHTTPRequest:
                     return True
                 except Exception as e:
                     # 记录JSON Schema验证错误
-                    allure.attach(
+                    reporter.attach(
                         f"JSON Schema验证失败: {type(e).__name__}: {str(e)}\n"
                         f"Schema: {expected_value}\n"
                         f"实例: {actual_value}",
@@ -917,19 +1000,21 @@ class BrowserHTTPRequest:
                     actual_value) if actual_value is not None else ""
             try:
                 pattern = str(expected_value)
-                match_result = bool(re.search(pattern, actual_value))
+                match_result = bool(
+                    expression_cache.regex(pattern).search(actual_value))
                 # 记录匹配结果
-                allure.attach(
-                    f"正则表达式匹配结果: {'成功' if match_result else '失败'}\n"
-                    f"模式: {pattern}\n"
-                    f"目标字符串: {actual_value}",
+                reporter.attach(
+                    lambda: (
+                        f"正则表达式匹配结果: {'成功' if match_result else '失败'}\n"
+                        f"模式: {pattern}\n"
+                        f"目标字符串: {actual_value}"),
                     name="正则表达式匹配",
                     attachment_type=allure.attachment_type.TEXT
                 )
                 return match_result
             except Exception as e:
                 # 记录正则表达式匹配错误
-                allure.attach(
+                reporter.attach(
                     f"正则表达式匹配失败: {type(e).__name__}: {str(e)}\n"
                     f"模式: {expected_value}\n"
                     f"目标字符串: {actual_value}",
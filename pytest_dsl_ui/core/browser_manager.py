@@ -5,58 +5,59 @@
 """
 
 import logging
+import os
 from typing import Dict, Optional
 from playwright.sync_api import (
     sync_playwright, Browser, BrowserContext, Page, Playwright
 )
+from .api_request_pool import APIRequestContextPool
+from .browser_pool import BrowserPool
+from .context_pool import ContextPool
+from .har_replay import build_record_options, create_replayer
+from .video_recorder import parse_video_size, video_recorder
 
 logger = logging.getLogger(__name__)
 
 
-class BrowserManager:
-    """浏览器管理器
+class BrowserRegistry:
+    """浏览器注册表
 
-    管理Playwright浏览器实例，支持多浏览器类型和多页面。
+    保存浏览器、上下文和页面实例及当前选中的实例，提供ID生成、配置构建和
+    查询接口。同步和异步浏览器管理器都基于它实现各自的启动和关闭操作。
     """
 
     def __init__(self):
-        """初始化浏览器管理器"""
-        self.playwright: Optional[Playwright] = None
+        """初始化浏览器注册表"""
+        self.playwright = None
         self.browsers: Dict[str, Browser] = {}
         self.contexts: Dict[str, BrowserContext] = {}
         self.pages: Dict[str, Page] = {}
         self.current_browser: Optional[str] = None
         self.current_context: Optional[str] = None
         self.current_page: Optional[str] = None
+        # ID序号只增不减，关闭后新建的实例不会与仍存活的实例重名
+        self._id_counters: Dict[str, int] = {}
 
-    def _ensure_playwright(self):
-        """确保Playwright实例已启动"""
-        if self.playwright is None:
-            self.playwright = sync_playwright().start()
+    def _next_id(self, prefix: str) -> str:
+        """生成实例ID：前缀加该前缀下递增的序号"""
+        index = self._id_counters.get(prefix, 0)
+        self._id_counters[prefix] = index + 1
+        return f"{prefix}_{index}"
 
-    def launch_browser(self, browser_type: str = "chromium", **config) -> str:
-        """启动浏览器
-
-        Args:
-            browser_type: 浏览器类型 (chromium, firefox, webkit)
-            **config: 浏览器启动配置
-
-        Returns:
-            str: 浏览器ID
-        """
-        self._ensure_playwright()
-
-        # 获取浏览器类型
+    def _get_browser_launcher(self, browser_type: str):
+        """获取浏览器类型对应的启动器"""
         if browser_type.lower() == "chromium":
-            browser_launcher = self.playwright.chromium
+            return self.playwright.chromium
         elif browser_type.lower() == "firefox":
-            browser_launcher = self.playwright.firefox
+            return self.playwright.firefox
         elif browser_type.lower() == "webkit":
-            browser_launcher = self.playwright.webkit
+            return self.playwright.webkit
         else:
             raise ValueError(f"不支持的浏览器类型: {browser_type}")
 
-        # 处理配置参数
+    @staticmethod
+    def _build_launch_config(config: dict) -> dict:
+        """从关键字配置构建浏览器启动参数"""
         launch_config = {
             "headless": config.get("headless", True),
             "slow_mo": config.get("slow_mo", 0),
@@ -70,39 +71,11 @@ class BrowserManager:
         if "executable_path" in config:
             launch_config["executable_path"] = config["executable_path"]
 
-        # 启动浏览器
-        browser = browser_launcher.launch(**launch_config)
-
-        # 生成浏览器ID
-        browser_id = f"{browser_type}_{len(self.browsers)}"
-        self.browsers[browser_id] = browser
-        self.current_browser = browser_id
-
-        logger.info(f"已启动浏览器: {browser_id}")
-        return browser_id
-
-    def create_context(self, browser_id: Optional[str] = None, **config) -> str:
-        """创建浏览器上下文
-
-        Args:
-            browser_id: 浏览器ID，如果为None则使用当前浏览器
-            **config: 上下文配置，支持storage_state参数加载认证状态
-
-        Returns:
-            str: 上下文ID
-        """
-        if browser_id is None:
-            browser_id = self.current_browser
+        return launch_config
 
-        if browser_id is None:
-            raise ValueError("没有可用的浏览器实例")
-
-        if browser_id not in self.browsers:
-            raise ValueError(f"浏览器 {browser_id} 不存在")
-
-        browser = self.browsers[browser_id]
-
-        # 处理配置参数
+    @staticmethod
+    def _build_context_config(config: dict) -> dict:
+        """从关键字配置构建new_context参数"""
         context_config = {}
 
         # 视口配置
@@ -136,48 +109,25 @@ class BrowserManager:
             context_config["storage_state"] = config["storage_state"]
             logger.info("将使用认证状态创建浏览器上下文")
 
-        context = browser.new_context(**context_config)
-
-        # 生成上下文ID
-        context_id = f"{browser_id}_ctx_{len(self.contexts)}"
-        self.contexts[context_id] = context
-        self.current_context = context_id
-
-        # 标记上下文是否支持HTTPS证书错误忽略
-        if context_config.get('ignore_https_errors', False):
-            setattr(context, '_ignore_https_errors', True)
-
-        logger.info(f"已创建浏览器上下文: {context_id}")
-        return context_id
-
-    def create_page(self, context_id: Optional[str] = None) -> str:
-        """创建页面
-
-        Args:
-            context_id: 上下文ID，如果为None则使用当前上下文
-
-        Returns:
-            str: 页面ID
-        """
-        if context_id is None:
-            context_id = self.current_context
-
-        if context_id is None:
-            raise ValueError("没有可用的浏览器上下文")
-
-        if context_id not in self.contexts:
-            raise ValueError(f"浏览器上下文 {context_id} 不存在")
-
-        context = self.contexts[context_id]
-        page = context.new_page()
-
-        # 生成页面ID
-        page_id = f"{context_id}_page_{len(self.pages)}"
-        self.pages[page_id] = page
-        self.current_page = page_id
-
-        logger.info(f"已创建页面: {page_id}")
-        return page_id
+        # HAR录制配置
+        if config.get("record_har_path"):
+            context_config.update(build_record_options(
+                config["record_har_path"],
+                content=config.get("record_har_content", "embed"),
+                url_filter=config.get("record_har_url_filter"),
+                mode=config.get("record_har_mode", "full"),
+            ))
+            logger.info(f"将录制HAR: {config['record_har_path']}")
+
+        # 视频录制配置，record_video_size可降低分辨率以减少编码开销
+        if config.get("record_video_dir"):
+            context_config["record_video_dir"] = config["record_video_dir"]
+            video_size = parse_video_size(config.get("record_video_size"))
+            if video_size:
+                context_config["record_video_size"] = video_size
+            logger.info(f"将录制视频: {config['record_video_dir']}")
+
+        return context_config
 
     def get_current_page(self) -> Page:
         """获取当前页面实例"""
@@ -230,6 +180,331 @@ class BrowserManager:
         """
         return self.current_page
 
+
+class BrowserManager(BrowserRegistry):
+    """浏览器管理器
+
+    管理Playwright浏览器实例，支持多浏览器类型和多页面。
+    """
+
+    def __init__(self):
+        """初始化浏览器管理器"""
+        super().__init__()
+        self.playwright: Optional[Playwright] = None
+        self.pool: Optional[BrowserPool] = None
+        self.context_pool: Optional[ContextPool] = None
+        self.api_request_pool = APIRequestContextPool()
+        # 开始录制创建的录制上下文：(上下文ID, 视频路径, 原上下文ID, 原页面ID)
+        self._video_session: Optional[tuple] = None
+
+    def enable_pool(self, **options) -> BrowserPool:
+        """启用浏览器池
+
+        启用后，launch_browser会从池中获取浏览器，close_browser只回收上下文
+        并将浏览器归还到池中。
+
+        Args:
+            **options: 浏览器池配置（warm_size, max_size, idle_timeout,
+                      health_check）
+
+        Returns:
+            BrowserPool: 浏览器池实例
+        """
+        if self.pool is None:
+            self.pool = BrowserPool(**options)
+            logger.info("已启用浏览器池")
+        else:
+            self.pool.configure(**options)
+            logger.info("已更新浏览器池配置")
+        return self.pool
+
+    def disable_pool(self):
+        """停用浏览器池并关闭池中的空闲浏览器"""
+        if self.pool is None:
+            return
+
+        pooled_ids = [
+            browser_id for browser_id, browser in self.browsers.items()
+            if self.pool.owns(browser)
+        ]
+        for browser_id in pooled_ids:
+            self.close_browser(browser_id)
+
+        self.pool.shutdown()
+        self.pool = None
+        logger.info("已停用浏览器池")
+
+    def enable_context_recycling(self, **options) -> ContextPool:
+        """启用浏览器上下文复用
+
+        启用后，create_context优先复用已重置的上下文；与浏览器池一起使用时，
+        关闭浏览器会重置其上下文并保留给下一次启动。
+
+        Args:
+            **options: 复用池配置（max_per_key, max_size）
+
+        Returns:
+            ContextPool: 上下文复用池实例
+        """
+        if self.context_pool is None:
+            self.context_pool = ContextPool(**options)
+            logger.info("已启用浏览器上下文复用")
+        else:
+            self.context_pool.configure(**options)
+            logger.info("已更新浏览器上下文复用配置")
+        return self.context_pool
+
+    def disable_context_recycling(self):
+        """停用浏览器上下文复用并关闭所有空闲上下文"""
+        if self.context_pool is None:
+            return
+        self.context_pool.clear()
+        self.context_pool = None
+        logger.info("已停用浏览器上下文复用")
+
+    def _ensure_playwright(self):
+        """确保Playwright实例已启动"""
+        if self.playwright is None:
+            self.playwright = sync_playwright().start()
+
+    def get_api_request_context(self, auth_state: Optional[str] = None,
+                                ignore_https_errors: bool = False):
+        """获取不依赖浏览器的APIRequestContext
+
+        只启动Playwright驱动，不启动浏览器。相同参数返回池中的同一个上下文。
+
+        Args:
+            auth_state: AuthManager中的认证状态名称
+            ignore_https_errors: 是否忽略HTTPS错误
+
+        Returns:
+            APIRequestContext: 请求上下文
+        """
+        self._ensure_playwright()
+        return self.api_request_pool.acquire(
+            self.playwright, auth_state, ignore_https_errors)
+
+    def launch_browser(self, browser_type: str = "chromium", **config) -> str:
+        """启动浏览器
+
+        Args:
+            browser_type: 浏览器类型 (chromium, firefox, webkit)
+            **config: 浏览器启动配置
+
+        Returns:
+            str: 浏览器ID
+        """
+        self._ensure_playwright()
+
+        browser_launcher = self._get_browser_launcher(browser_type)
+        launch_config = self._build_launch_config(config)
+
+        # 启动浏览器（启用浏览器池时优先复用池中实例）
+        if self.pool is not None:
+            pool_key = BrowserPool.make_key(browser_type, launch_config)
+            browser = self.pool.acquire(
+                pool_key, lambda: browser_launcher.launch(**launch_config))
+        else:
+            browser = browser_launcher.launch(**launch_config)
+
+        # 生成浏览器ID
+        browser_id = self._next_id(browser_type)
+        self.browsers[browser_id] = browser
+        self.current_browser = browser_id
+
+        logger.info(f"已启动浏览器: {browser_id}")
+        return browser_id
+
+    def create_context(self, browser_id: Optional[str] = None, **config) -> str:
+        """创建浏览器上下文
+
+        Args:
+            browser_id: 浏览器ID，如果为None则使用当前浏览器
+            **config: 上下文配置，支持storage_state参数加载认证状态，
+                record_har_path参数录制HAR，har_replay参数从HAR回放，
+                record_video_dir参数录制视频（按video_recorder的保留策略处理）
+
+        Returns:
+            str: 上下文ID
+        """
+        if browser_id is None:
+            browser_id = self.current_browser
+
+        if browser_id is None:
+            raise ValueError("没有可用的浏览器实例")
+
+        if browser_id not in self.browsers:
+            raise ValueError(f"浏览器 {browser_id} 不存在")
+
+        browser = self.browsers[browser_id]
+
+        context_config = self._build_context_config(config)
+
+        # 优先复用已重置的上下文（录制HAR和视频的上下文需要真正关闭才会写出文件，不参与复用）
+        recyclable = (self.context_pool is not None
+                      and self.context_pool.is_recyclable(context_config))
+        context = None
+        if recyclable:
+            context = self.context_pool.acquire(browser, context_config)
+        if context is None:
+            context = browser.new_context(**context_config)
+        if recyclable:
+            self.context_pool.track(context, context_config)
+
+        # 视频录制需要在创建页面前开始跟踪
+        if context_config.get('record_video_dir'):
+            video_recorder.track(context)
+
+        # HAR回放
+        replayer = create_replayer(config)
+        if replayer is not None:
+            replayer.attach(context)
+            logger.info(f"已启用HAR回放: {replayer.har_path}")
+
+        # 生成上下文ID
+        context_id = self._next_id(f"{browser_id}_ctx")
+        self.contexts[context_id] = context
+        self.current_context = context_id
+
+        # 标记上下文是否支持HTTPS证书错误忽略
+        if context_config.get('ignore_https_errors', False):
+            setattr(context, '_ignore_https_errors', True)
+
+        # 标记录制HAR的上下文，关闭浏览器前需要先关闭上下文才会写出HAR文件
+        if context_config.get('record_har_path'):
+            setattr(context, '_record_har_path', context_config['record_har_path'])
+
+        logger.info(f"已创建浏览器上下文: {context_id}")
+        return context_id
+
+    def close_context(self, context_id: Optional[str] = None):
+        """关闭浏览器上下文
+
+        启用上下文复用时，上下文会被重置并放回空闲列表，而不是真正关闭。
+
+        Args:
+            context_id: 上下文ID，如果为None则关闭当前上下文
+        """
+        if context_id is None:
+            context_id = self.current_context
+
+        if context_id is None or context_id not in self.contexts:
+            logger.warning("没有可关闭的浏览器上下文")
+            return
+
+        context = self.contexts.pop(context_id)
+        pages_to_remove = [
+            page_id for page_id in self.pages.keys()
+            if page_id.startswith(f"{context_id}_page_")
+        ]
+        for page_id in pages_to_remove:
+            del self.pages[page_id]
+
+        if self.context_pool is not None:
+            self.context_pool.release(context)
+        else:
+            context.close()
+        video_recorder.finalize(context)
+
+        if self.current_context == context_id:
+            self.current_context = None
+            self.current_page = None
+
+        logger.info(f"已关闭浏览器上下文: {context_id}")
+
+    def create_page(self, context_id: Optional[str] = None) -> str:
+        """创建页面
+
+        Args:
+            context_id: 上下文ID，如果为None则使用当前上下文
+
+        Returns:
+            str: 页面ID
+        """
+        if context_id is None:
+            context_id = self.current_context
+
+        if context_id is None:
+            raise ValueError("没有可用的浏览器上下文")
+
+        if context_id not in self.contexts:
+            raise ValueError(f"浏览器上下文 {context_id} 不存在")
+
+        context = self.contexts[context_id]
+        page = context.new_page()
+
+        # 生成页面ID
+        page_id = self._next_id(f"{context_id}_page")
+        self.pages[page_id] = page
+        self.current_page = page_id
+
+        logger.info(f"已创建页面: {page_id}")
+        return page_id
+
+    def start_video_recording(self, path: str, size=None) -> str:
+        """开始录制当前页面
+
+        视频只能在创建上下文时开启，因此用当前上下文的认证状态和视口
+        创建一个录制上下文，打开当前页面地址并切换过去，停止录制时关闭它并切换回原页面。
+        录制上下文是重建的副本：页面内状态不保留，额外请求头、HAR回放路由和
+        网络监听不会复制过去。
+
+        Args:
+            path: 视频保存路径
+            size: 视频尺寸，如"640x360"，为空时由Playwright按视口缩放
+
+        Returns:
+            str: 视频保存路径
+        """
+        if self._video_session is not None:
+            logger.warning("已有录制在进行中")
+            return self._video_session[1]
+
+        context = self.get_current_context()
+        page = self.get_current_page()
+        config = {
+            'record_video_dir': os.path.dirname(os.path.abspath(path)),
+            'record_video_size': size,
+            'storage_state': context.storage_state(),
+            'ignore_https_errors': getattr(context, '_ignore_https_errors', False),
+        }
+        if page.viewport_size:
+            config['viewport'] = page.viewport_size
+
+        previous = (self.current_context, self.current_page)
+        context_id = self.create_context(**config)
+        video_recorder.retain(self.contexts[context_id], path)
+        self.create_page(context_id)
+        if page.url and page.url != 'about:blank':
+            self.get_current_page().goto(page.url)
+
+        self._video_session = (context_id, path) + previous
+        logger.info(f"录制已开始，将保存到: {path}")
+        return path
+
+    def stop_video_recording(self) -> Optional[str]:
+        """停止录制，关闭录制上下文写出视频并切换回原页面
+
+        Returns:
+            Optional[str]: 视频文件路径，如果没有在录制则返回None
+        """
+        if self._video_session is None:
+            logger.warning("没有正在进行的录制")
+            return None
+
+        context_id, path, previous_context, previous_page = self._video_session
+        self._video_session = None
+        self.close_context(context_id)
+        if previous_context in self.contexts and previous_page in self.pages:
+            self.current_context = previous_context
+            self.current_page = previous_page
+
+        if not os.path.exists(path):
+            logger.warning(f"没有生成录制视频: {path}")
+            return None
+        logger.info(f"录制已停止，视频保存在: {path}")
+        return path
+
     def close_browser(self, browser_id: Optional[str] = None):
         """关闭浏览器
 
@@ -245,20 +520,36 @@ class BrowserManager:
 
         if browser_id in self.browsers:
             browser = self.browsers[browser_id]
-            browser.close()
-            del self.browsers[browser_id]
-
-            # 清理相关的上下文和页面
             contexts_to_remove = [
                 ctx_id for ctx_id in self.contexts.keys()
-                if ctx_id.startswith(browser_id)
+                if ctx_id.startswith(f"{browser_id}_ctx_")
             ]
+
+            # 先关闭录制HAR和视频的上下文，确保文件写出
+            self._close_recording_contexts(
+                self.contexts[ctx_id] for ctx_id in contexts_to_remove)
+
+            # 浏览器会被保留在池中时，重置其上下文以便下次复用
+            retained = []
+            if self.context_pool is not None:
+                if self.pool is not None and self.pool.owns(browser):
+                    for ctx_id in contexts_to_remove:
+                        context = self.contexts[ctx_id]
+                        if self.context_pool.release(context, browser):
+                            retained.append(context)
+                else:
+                    self.context_pool.drop_browser(browser)
+
+            self._release_browser(browser, retained)
+            del self.browsers[browser_id]
+
+            # 清理相关的上下文和页面
             for ctx_id in contexts_to_remove:
                 del self.contexts[ctx_id]
 
             pages_to_remove = [
                 page_id for page_id in self.pages.keys()
-                if page_id.startswith(browser_id)
+                if page_id.startswith(f"{browser_id}_ctx_")
             ]
             for page_id in pages_to_remove:
                 del self.pages[page_id]
@@ -271,10 +562,45 @@ class BrowserManager:
 
             logger.info(f"已关闭浏览器: {browser_id}")
 
+    @staticmethod
+    def _close_recording_contexts(contexts):
+        """关闭录制HAR和视频的上下文，Playwright在上下文关闭时写出HAR和视频文件"""
+        for context in contexts:
+            har_path = getattr(context, '_record_har_path', None)
+            recording_video = video_recorder.is_tracked(context)
+            if not har_path and not recording_video:
+                continue
+            try:
+                context.close()
+                if har_path:
+                    logger.info(f"HAR已保存: {har_path}")
+            except Exception as e:
+                logger.warning(f"关闭录制中的上下文失败: {har_path or ''} - {str(e)}")
+            if recording_video:
+                video_recorder.finalize(context)
+
+    def _release_browser(self, browser: Browser, retain_contexts=()):
+        """释放浏览器：池中的浏览器归还到池，其他浏览器直接关闭"""
+        if self.pool is not None:
+            self.pool.release(browser, retain_contexts)
+        else:
+            browser.close()
+
     def close_all(self):
         """关闭所有浏览器实例"""
+        self._video_session = None
+        self._close_recording_contexts(self.contexts.values())
         for browser in self.browsers.values():
-            browser.close()
+            self._release_browser(browser)
+
+        if self.context_pool is not None:
+            self.context_pool.clear()
+
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+        self.api_request_pool.clear()
 
         if self.playwright:
             self.playwright.stop()
@@ -0,0 +1,296 @@
+"""浏览器池
+
+在多个DSL文件之间复用已启动的浏览器实例，避免每次启动浏览器都付出冷启动开销。
+浏览器按 (浏览器类型, 启动参数) 分组缓存，归还时只回收上下文，不关闭浏览器进程。
+
+注意：Playwright同步API不是线程安全的，空闲淘汰在获取/归还时惰性执行，
+不使用后台线程。预热同样无法在后台进行：某个分组第一次获取浏览器时，
+在同一次调用中同步启动预热浏览器，因此第一次获取会更慢；之后获取时
+直接复用空闲浏览器，不再补足预热数量。
+"""
+
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from playwright.sync_api import Browser
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str]
+
+
+class PooledBrowser:
+    """池中的浏览器条目"""
+
+    def __init__(self, browser: Browser, key: PoolKey):
+        self.browser = browser
+        self.key = key
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.use_count = 0
+
+
+class BrowserPool:
+    """浏览器池
+
+    管理按启动参数分组的预启动浏览器，支持预热、最大容量限制、
+    空闲超时淘汰和健康检查。
+    """
+
+    def __init__(self, warm_size: int = 0, max_size: int = 4,
+                 idle_timeout: float = 300.0, health_check: bool = True):
+        """初始化浏览器池
+
+        Args:
+            warm_size: 每个分组第一次获取时额外启动的预热浏览器数量
+            max_size: 池中浏览器总数上限（空闲+使用中）
+            idle_timeout: 空闲超时时间（秒），超时的空闲浏览器会被关闭，0表示不淘汰
+            health_check: 获取和归还时是否检查浏览器健康状态
+        """
+        self.warm_size = 0
+        self.max_size = 1
+        self.idle_timeout = 0.0
+        self.health_check = True
+        self._idle: Dict[PoolKey, List[PooledBrowser]] = {}
+        self._in_use: Dict[int, PooledBrowser] = {}
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'launched': 0,
+            'evicted': 0,
+            'unhealthy': 0,
+            'overflow': 0,
+        }
+        self.configure(warm_size=warm_size, max_size=max_size,
+                       idle_timeout=idle_timeout, health_check=health_check)
+
+    def configure(self, warm_size: Optional[int] = None,
+                  max_size: Optional[int] = None,
+                  idle_timeout: Optional[float] = None,
+                  health_check: Optional[bool] = None):
+        """更新池配置，未指定的参数保持不变"""
+        if warm_size is not None:
+            self.warm_size = max(0, int(warm_size))
+        if max_size is not None:
+            self.max_size = max(1, int(max_size))
+        if idle_timeout is not None:
+            self.idle_timeout = max(0.0, float(idle_timeout))
+        if health_check is not None:
+            self.health_check = bool(health_check)
+        if self.warm_size > self.max_size:
+            logger.warning(
+                f"预热数量 {self.warm_size} 超过池上限 {self.max_size}，已调整")
+            self.warm_size = self.max_size
+
+    @staticmethod
+    def make_key(browser_type: str, launch_config: Dict[str, Any]) -> PoolKey:
+        """生成分组键
+
+        Args:
+            browser_type: 浏览器类型
+            launch_config: 启动参数
+
+        Returns:
+            PoolKey: (浏览器类型, 规范化后的启动参数)
+        """
+        normalized = json.dumps(launch_config, sort_keys=True, default=str)
+        return browser_type.lower(), normalized
+
+    @property
+    def size(self) -> int:
+        """池中浏览器总数（空闲+使用中）"""
+        return self.idle_count + len(self._in_use)
+
+    @property
+    def idle_count(self) -> int:
+        """空闲浏览器数量"""
+        return sum(len(entries) for entries in self._idle.values())
+
+    def owns(self, browser: Browser) -> bool:
+        """浏览器是否由池管理"""
+        return id(browser) in self._in_use
+
+    def acquire(self, key: PoolKey,
+                launcher: Callable[[], Browser]) -> Browser:
+        """从池中获取浏览器
+
+        优先复用同一分组中健康的空闲浏览器；没有可用实例时启动新浏览器，
+        并同步启动预热浏览器补足warm_size。池已满时启动不受池管理的浏览器，
+        归还时直接关闭。
+
+        Args:
+            key: 分组键
+            launcher: 启动新浏览器的回调
+
+        Returns:
+            Browser: 浏览器实例
+        """
+        self.evict_idle()
+
+        idle = self._idle.get(key, [])
+        while idle:
+            entry = idle.pop()
+            if self._is_healthy(entry):
+                self.stats['hits'] += 1
+                entry.use_count += 1
+                self._in_use[id(entry.browser)] = entry
+                logger.info(f"复用池中浏览器 (第{entry.use_count}次使用)")
+                return entry.browser
+            self.stats['unhealthy'] += 1
+            self._discard(entry)
+
+        self.stats['misses'] += 1
+        if self.size >= self.max_size:
+            self._evict_oldest_idle()
+
+        browser = launcher()
+        self.stats['launched'] += 1
+
+        if self.size >= self.max_size:
+            self.stats['overflow'] += 1
+            logger.warning(
+                f"浏览器池已满 ({self.max_size})，本次启动的浏览器不会被复用")
+            return browser
+
+        entry = PooledBrowser(browser, key)
+        entry.use_count = 1
+        self._in_use[id(browser)] = entry
+        self._prewarm(key, launcher)
+        return browser
+
+    def release(self, browser: Browser,
+                retain_contexts: Iterable[Any] = ()):
+        """归还浏览器
+
+        关闭浏览器中的所有上下文后放回空闲列表；不受池管理或
+        不健康的浏览器会被直接关闭。
+
+        Args:
+            browser: 浏览器实例
+            retain_contexts: 需要保留（不关闭）的上下文，用于上下文复用
+        """
+        entry = self._in_use.pop(id(browser), None)
+        if entry is None:
+            self._close_quietly(browser)
+            return
+
+        retained = {id(context) for context in retain_contexts}
+        try:
+            for context in list(browser.contexts):
+                if id(context) not in retained:
+                    context.close()
+        except Exception as e:
+            logger.warning(f"回收浏览器上下文失败，丢弃该浏览器: {str(e)}")
+            self._discard(entry)
+            return
+
+        if not self._is_healthy(entry):
+            self.stats['unhealthy'] += 1
+            self._discard(entry)
+            return
+
+        entry.last_used = time.monotonic()
+        self._idle.setdefault(entry.key, []).append(entry)
+        logger.info("浏览器已归还到池中")
+        self.evict_idle()
+
+    def evict_idle(self) -> int:
+        """关闭空闲超时的浏览器
+
+        Returns:
+            int: 淘汰的浏览器数量
+        """
+        if not self.idle_timeout:
+            return 0
+
+        deadline = time.monotonic() - self.idle_timeout
+        evicted = 0
+        for key in list(self._idle.keys()):
+            keep = []
+            for entry in self._idle[key]:
+                if entry.last_used < deadline:
+                    self._discard(entry)
+                    evicted += 1
+                else:
+                    keep.append(entry)
+            if keep:
+                self._idle[key] = keep
+            else:
+                del self._idle[key]
+
+        if evicted:
+            self.stats['evicted'] += evicted
+            logger.info(f"已淘汰 {evicted} 个空闲超时的浏览器")
+        return evicted
+
+    def shutdown(self):
+        """关闭池中所有浏览器"""
+        for entries in self._idle.values():
+            for entry in entries:
+                self._close_quietly(entry.browser)
+        for entry in self._in_use.values():
+            self._close_quietly(entry.browser)
+        self._idle.clear()
+        self._in_use.clear()
+        logger.info("浏览器池已关闭")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取池统计信息"""
+        return {
+            **self.stats,
+            'size': self.size,
+            'idle': self.idle_count,
+            'in_use': len(self._in_use),
+            'max_size': self.max_size,
+            'warm_size': self.warm_size,
+        }
+
+    def _prewarm(self, key: PoolKey, launcher: Callable[[], Browser]):
+        """为分组补足预热浏览器，在调用线程中同步启动"""
+        idle = self._idle.setdefault(key, [])
+        while len(idle) < self.warm_size and self.size < self.max_size:
+            try:
+                browser = launcher()
+            except Exception as e:
+                logger.warning(f"预热浏览器失败: {str(e)}")
+                break
+            self.stats['launched'] += 1
+            idle.append(PooledBrowser(browser, key))
+        if not idle:
+            del self._idle[key]
+
+    def _evict_oldest_idle(self):
+        """淘汰最久未使用的空闲浏览器，为新分组腾出空间"""
+        oldest = None
+        for entries in self._idle.values():
+            for entry in entries:
+                if oldest is None or entry.last_used < oldest.last_used:
+                    oldest = entry
+        if oldest is None:
+            return
+        self._idle[oldest.key].remove(oldest)
+        if not self._idle[oldest.key]:
+            del self._idle[oldest.key]
+        self.stats['evicted'] += 1
+        self._discard(oldest)
+
+    def _is_healthy(self, entry: PooledBrowser) -> bool:
+        """检查浏览器是否仍可用"""
+        if not self.health_check:
+            return True
+        try:
+            return entry.browser.is_connected()
+        except Exception:
+            return False
+
+    def _discard(self, entry: PooledBrowser):
+        """关闭并丢弃浏览器条目"""
+        self._close_quietly(entry.browser)
+
+    @staticmethod
+    def _close_quietly(browser: Browser):
+        try:
+            browser.close()
+        except Exception as e:
+            logger.debug(f"关闭浏览器时出错: {str(e)}")
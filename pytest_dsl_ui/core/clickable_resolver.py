@@ -0,0 +1,188 @@
+"""智能可点击元素解析
+
+clickable=定位需要比较多个候选元素的可见性和启用状态。逐个调用
+count()/is_visible()/is_enabled()时，每个候选元素都要与浏览器往返多次；
+这里改为每个阶段只调用一次evaluate_all，在页面内一次性取回所有候选元素的状态，
+再在Python端按原有优先级排序：
+
+1. 交互元素（button > a > role=button > role=link > role=menuitem）中可见且启用的
+2. 交互元素中可见的
+3. 精确文本匹配唯一时直接返回
+4. 精确文本匹配多个时依次在span、div、全部匹配中选择可见且启用 > 可见 > 第一个
+5. 模糊文本匹配中可见且启用 > 第一个
+
+返回的仍是 page.locator(...).nth(i) 形式的定位器，可以在后续操作中重新解析。
+
+解析逻辑写成生成器：每次yield (定位器, 元素分组)，由调用方执行evaluate_all
+后把状态列表send回来，最终通过StopIteration返回结果定位器。
+同步和异步定位器共用同一套优先级规则，只是驱动方式不同。
+"""
+
+import logging
+from typing import Any, Generator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 交互元素，按优先级排列
+CLICKABLE_BASES = (
+    "button",
+    "a",
+    "[role='button']",
+    "[role='link']",
+    "[role='menuitem']",
+)
+
+# 精确文本匹配多个元素时的备选元素类型
+FALLBACK_BASES = ("span", "div")
+
+# 在页面内计算元素状态：[可见, 启用, 各分组是否匹配]
+# 可见性与Playwright一致：非空边界框且visibility不是hidden
+ELEMENT_STATE_JS = """
+(elements, bases) => elements.map(el => {
+    const rect = el.getBoundingClientRect();
+    const style = window.getComputedStyle(el);
+    const visible = rect.width > 0 && rect.height > 0
+        && style.visibility !== 'hidden';
+    const disabled = el.disabled === true
+        || !!el.closest('fieldset[disabled]')
+        || !!el.closest('[aria-disabled="true"]');
+    return [visible, !disabled, bases.map(base => el.matches(base))];
+})
+"""
+
+ElementState = Tuple[bool, bool, List[bool]]
+Step = Tuple[Any, Sequence[str]]
+
+
+def has_text_selector(base: str, text: str) -> str:
+    """构造 元素:has-text('文本') 选择器"""
+    return f"{base}:has-text('{text}')"
+
+
+def first_usable(states: Sequence[ElementState],
+                 require_enabled: bool = False) -> Optional[int]:
+    """返回第一个可见（且可选地启用）的元素索引"""
+    for index, (visible, enabled, _) in enumerate(states):
+        if visible and (enabled or not require_enabled):
+            return index
+    return None
+
+
+def split_groups(states: Sequence[ElementState],
+                 group_count: int) -> List[List[ElementState]]:
+    """按分组拆分元素状态，组内保持文档顺序
+
+    联合定位器按文档顺序返回元素，某个分组内的顺序即该分组单独定位时的nth索引。
+    """
+    groups: List[List[ElementState]] = [[] for _ in range(group_count)]
+    for state in states:
+        for group, matched in enumerate(state[2]):
+            if matched:
+                groups[group].append(state)
+    return groups
+
+
+def _union_locator(page, bases: Sequence[str], text: str):
+    locator = page.locator(has_text_selector(bases[0], text))
+    for base in bases[1:]:
+        locator = locator.or_(page.locator(has_text_selector(base, text)))
+    return locator
+
+
+def clickable_steps(page, text: str) -> Generator[Step, List[ElementState], Any]:
+    """智能可点击元素解析步骤
+
+    Args:
+        page: Playwright页面实例（同步或异步）
+        text: 要匹配的文本
+
+    Yields:
+        (定位器, 分组选择器)，调用方需要send回 evaluate_all(ELEMENT_STATE_JS, 分组选择器) 的结果
+
+    Returns:
+        Locator: 最适合点击的元素定位器
+    """
+    states = yield _union_locator(page, CLICKABLE_BASES, text), CLICKABLE_BASES
+    groups = split_groups(states, len(CLICKABLE_BASES))
+    for require_enabled in (True, False):
+        for base, members in zip(CLICKABLE_BASES, groups):
+            index = first_usable(members, require_enabled)
+            if index is not None:
+                logger.debug(f"选择交互元素: {has_text_selector(base, text)} "
+                             f"(索引: {index}, 要求启用: {require_enabled})")
+                return page.locator(has_text_selector(base, text)).nth(index)
+
+    text_locator = page.get_by_text(text, exact=True)
+    states = yield text_locator, ()
+    logger.debug(f"精确文本匹配: '{text}' (数量: {len(states)})")
+
+    if len(states) == 1:
+        return text_locator
+
+    if len(states) > 1:
+        fallback = yield _union_locator(page, FALLBACK_BASES, text), FALLBACK_BASES
+        for base, members in zip(FALLBACK_BASES, split_groups(fallback, len(FALLBACK_BASES))):
+            if not members:
+                continue
+            locator = page.locator(has_text_selector(base, text))
+            index = first_usable(members, True)
+            if index is None:
+                index = first_usable(members)
+            logger.debug(f"选择{base}元素 (索引: {index})")
+            return locator.first if index is None else locator.nth(index)
+
+        index = first_usable(states, True)
+        if index is None:
+            index = first_usable(states)
+        logger.debug(f"选择文本匹配元素 (索引: {index})")
+        return text_locator.first if index is None else text_locator.nth(index)
+
+    fuzzy_locator = page.get_by_text(text)
+    states = yield fuzzy_locator, ()
+    logger.debug(f"模糊文本匹配: '{text}' (数量: {len(states)})")
+    if states:
+        index = first_usable(states, True)
+        return fuzzy_locator.first if index is None else fuzzy_locator.nth(index)
+
+    logger.warning(f"无法找到包含文本 '{text}' 的任何元素")
+    return fuzzy_locator  # 返回空定位器
+
+
+def resolve_clickable(page, text: str):
+    """使用同步API解析可点击元素
+
+    Args:
+        page: Playwright同步页面实例
+        text: 要匹配的文本
+
+    Returns:
+        Locator: 最适合点击的元素定位器
+    """
+    steps = clickable_steps(page, text)
+    try:
+        locator, bases = next(steps)
+        while True:
+            states = locator.evaluate_all(ELEMENT_STATE_JS, list(bases))
+            locator, bases = steps.send(states)
+    except StopIteration as stop:
+        return stop.value
+
+
+async def resolve_clickable_async(page, text: str):
+    """使用异步API解析可点击元素
+
+    Args:
+        page: Playwright异步页面实例
+        text: 要匹配的文本
+
+    Returns:
+        Locator: 最适合点击的元素定位器
+    """
+    steps = clickable_steps(page, text)
+    try:
+        locator, bases = next(steps)
+        while True:
+            states = await locator.evaluate_all(ELEMENT_STATE_JS, list(bases))
+            locator, bases = steps.send(states)
+    except StopIteration as stop:
+        return stop.value
@@ -0,0 +1,388 @@
+"""浏览器上下文复用池
+
+使用过的BrowserContext在重置后放入空闲列表，而不是关闭后重新创建。
+重置会清除cookies、权限、额外请求头、地理位置、路由、访问过的源的存储和所有页面；
+获取时可以低成本地重新应用storage_state（直接写入cookies和localStorage，无需重建上下文）。
+调用过add_init_script、expose_function或expose_binding的上下文无法撤销这些设置，归还时直接关闭。
+"""
+
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+from playwright.sync_api import Browser, BrowserContext, Route
+
+logger = logging.getLogger(__name__)
+
+# 用于在指定源上执行存储清理/写入的占位URL，请求在本地直接响应，不访问网络
+RESET_PATH = "/__pytest_dsl_ui_reset__"
+
+# 不参与分组的上下文配置项
+_KEY_EXCLUDED_OPTIONS = ("storage_state",)
+
+# 关闭时才输出产物的上下文配置项，带这些配置的上下文不能复用
+_NON_RECYCLABLE_OPTIONS = ("record_har_path", "record_video_dir")
+
+# 调用后无法撤销的上下文方法，调用过的上下文不能复用
+_IRREVERSIBLE_METHODS = ("add_init_script", "expose_function", "expose_binding")
+
+_CLEAR_STORAGE_SCRIPT = """async () => {
+    try { localStorage.clear(); } catch (e) {}
+    try { sessionStorage.clear(); } catch (e) {}
+    try {
+        if (indexedDB.databases) {
+            const dbs = await indexedDB.databases();
+            for (const db of dbs) { indexedDB.deleteDatabase(db.name); }
+        }
+    } catch (e) {}
+    try {
+        for (const name of await caches.keys()) { await caches.delete(name); }
+    } catch (e) {}
+}"""
+
+_SET_LOCAL_STORAGE_SCRIPT = """(items) => {
+    for (const item of items) { localStorage.setItem(item.name, item.value); }
+}"""
+
+ContextKey = Tuple[int, str]
+
+
+class PooledContext:
+    """空闲列表中的上下文条目"""
+
+    def __init__(self, context: BrowserContext, browser: Browser,
+                 key: ContextKey, context_config: Dict[str, Any]):
+        self.context = context
+        self.browser = browser
+        self.key = key
+        self.context_config = context_config
+        self.released_at = time.monotonic()
+        self.reuse_count = 0
+
+
+class ContextPool:
+    """浏览器上下文复用池
+
+    按 (浏览器, 上下文配置) 维护有界空闲列表。
+    """
+
+    def __init__(self, max_per_key: int = 2, max_size: int = 8):
+        """初始化上下文复用池
+
+        Args:
+            max_per_key: 每种配置最多保留的空闲上下文数量
+            max_size: 空闲上下文总数上限
+        """
+        self.max_per_key = max(1, int(max_per_key))
+        self.max_size = max(1, int(max_size))
+        self._free: Dict[ContextKey, List[PooledContext]] = {}
+        self._configs: Dict[int, Dict[str, Any]] = {}
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'recycled': 0,
+            'reset_failures': 0,
+            'unrecyclable': 0,
+            'evicted': 0,
+        }
+
+    def configure(self, max_per_key: Optional[int] = None,
+                  max_size: Optional[int] = None):
+        """更新配置，未指定的参数保持不变"""
+        if max_per_key is not None:
+            self.max_per_key = max(1, int(max_per_key))
+        if max_size is not None:
+            self.max_size = max(1, int(max_size))
+        self._trim()
+
+    @staticmethod
+    def is_recyclable(context_config: Dict[str, Any]) -> bool:
+        """上下文配置是否允许复用"""
+        return not any(context_config.get(k) for k in _NON_RECYCLABLE_OPTIONS)
+
+    @staticmethod
+    def make_key(browser: Browser,
+                 context_config: Dict[str, Any]) -> ContextKey:
+        """生成分组键
+
+        Args:
+            browser: 上下文所属浏览器
+            context_config: 传给new_context的配置
+
+        Returns:
+            ContextKey: (浏览器标识, 规范化后的配置)
+        """
+        options = {
+            k: v for k, v in context_config.items()
+            if k not in _KEY_EXCLUDED_OPTIONS
+        }
+        return id(browser), json.dumps(options, sort_keys=True, default=str)
+
+    @property
+    def size(self) -> int:
+        """空闲上下文数量"""
+        return sum(len(entries) for entries in self._free.values())
+
+    def track(self, context: BrowserContext, context_config: Dict[str, Any]):
+        """记录上下文的创建配置，供归还时分组使用
+
+        同时记录页面访问过的源（重置时清理其存储），并标记调用过
+        无法撤销的方法的上下文。
+        """
+        self._configs[id(context)] = context_config
+        state = vars(context)
+        if state.get('_pool_origins') is not None:
+            return
+        state['_pool_origins'] = set()
+        state['_pool_dirty'] = False
+        context.on('page', lambda page: page.on(
+            'framenavigated', lambda frame: _record_origin(context, frame.url)))
+        for name in _IRREVERSIBLE_METHODS:
+            setattr(context, name, _mark_dirty(context, getattr(context, name)))
+
+    def acquire(self, browser: Browser,
+                context_config: Dict[str, Any]) -> Optional[BrowserContext]:
+        """获取可复用的上下文
+
+        Args:
+            browser: 目标浏览器
+            context_config: 上下文配置，包含storage_state时会重新应用
+
+        Returns:
+            Optional[BrowserContext]: 已重置的上下文，没有可用实例时返回None
+        """
+        key = self.make_key(browser, context_config)
+        entries = self._free.get(key, [])
+
+        while entries:
+            entry = entries.pop()
+            if entry.browser is not browser or not browser.is_connected():
+                continue
+            try:
+                storage_state = context_config.get("storage_state")
+                if storage_state:
+                    apply_storage_state(entry.context, storage_state)
+            except Exception as e:
+                logger.warning(f"重新应用认证状态失败，丢弃该上下文: {str(e)}")
+                self._close_quietly(entry.context)
+                continue
+
+            if not entries:
+                del self._free[key]
+            entry.reuse_count += 1
+            self.stats['hits'] += 1
+            self._configs[id(entry.context)] = context_config
+            logger.info(f"复用浏览器上下文 (第{entry.reuse_count}次复用)")
+            return entry.context
+
+        self._free.pop(key, None)
+        self.stats['misses'] += 1
+        return None
+
+    def release(self, context: BrowserContext,
+                browser: Optional[Browser] = None) -> bool:
+        """重置上下文并放回空闲列表
+
+        Args:
+            context: 要归还的上下文
+            browser: 上下文所属浏览器，为None时从上下文获取
+
+        Returns:
+            bool: 是否已放回空闲列表；返回False时上下文已被关闭
+        """
+        context_config = self._configs.pop(id(context), None)
+        browser = browser or context.browser
+        if context_config is None or browser is None:
+            self._close_quietly(context)
+            return False
+
+        if vars(context).get('_pool_dirty'):
+            self.stats['unrecyclable'] += 1
+            logger.info("上下文添加过初始化脚本或暴露函数，无法重置，将直接关闭")
+            self._close_quietly(context)
+            return False
+
+        try:
+            reset_context(context, context_config,
+                          vars(context).get('_pool_origins'))
+        except Exception as e:
+            self.stats['reset_failures'] += 1
+            logger.warning(f"重置浏览器上下文失败，将直接关闭: {str(e)}")
+            self._close_quietly(context)
+            return False
+
+        key = self.make_key(browser, context_config)
+        entry = PooledContext(context, browser, key, context_config)
+        self._free.setdefault(key, []).append(entry)
+        self.stats['recycled'] += 1
+        self._trim()
+        return any(e.context is context for e in self._free.get(key, []))
+
+    def is_free(self, context: BrowserContext) -> bool:
+        """上下文是否在空闲列表中"""
+        return any(
+            entry.context is context
+            for entries in self._free.values() for entry in entries
+        )
+
+    def drop_browser(self, browser: Browser):
+        """移除属于指定浏览器的所有空闲上下文（浏览器即将关闭时调用）"""
+        for key in [k for k in self._free if k[0] == id(browser)]:
+            del self._free[key]
+
+    def clear(self):
+        """关闭并清空所有空闲上下文"""
+        for entries in self._free.values():
+            for entry in entries:
+                self._close_quietly(entry.context)
+        self._free.clear()
+        self._configs.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        return {
+            **self.stats,
+            'free': self.size,
+            'max_per_key': self.max_per_key,
+            'max_size': self.max_size,
+        }
+
+    def _trim(self):
+        """按上限淘汰最早归还的空闲上下文"""
+        for key in list(self._free.keys()):
+            entries = self._free[key]
+            while len(entries) > self.max_per_key:
+                self._evict(entries.pop(0))
+
+        while self.size > self.max_size:
+            oldest_key = min(
+                self._free, key=lambda k: self._free[k][0].released_at)
+            self._evict(self._free[oldest_key].pop(0))
+            if not self._free[oldest_key]:
+                del self._free[oldest_key]
+
+    def _evict(self, entry: PooledContext):
+        self.stats['evicted'] += 1
+        self._close_quietly(entry.context)
+
+    @staticmethod
+    def _close_quietly(context: BrowserContext):
+        try:
+            context.close()
+        except Exception as e:
+            logger.debug(f"关闭浏览器上下文时出错: {str(e)}")
+
+
+def _record_origin(context: BrowserContext, url: str):
+    """记录页面访问过的http(s)源"""
+    parts = urlsplit(url)
+    if parts.scheme in ("http", "https"):
+        vars(context)['_pool_origins'].add(f"{parts.scheme}://{parts.netloc}")
+
+
+def _mark_dirty(context: BrowserContext, method):
+    """包装无法撤销的上下文方法，调用后标记上下文不能复用"""
+    def wrapper(*args, **kwargs):
+        vars(context)['_pool_dirty'] = True
+        return method(*args, **kwargs)
+    return wrapper
+
+
+def _fulfill_blank(route: Route):
+    route.fulfill(status=200, content_type="text/html",
+                  body="<html><head></head><body></body></html>")
+
+
+def _run_on_origins(context: BrowserContext, origins: List[str],
+                    script: str, arg_for_origin=None):
+    """在每个源的占位页面上执行脚本
+
+    占位页面通过路由在本地响应，只需一次轻量导航即可获得该源的存储访问权限。
+    """
+    if not origins:
+        return
+
+    pattern = f"**{RESET_PATH}"
+    context.route(pattern, _fulfill_blank)
+    page = context.new_page()
+    try:
+        for origin in origins:
+            page.goto(origin.rstrip("/") + RESET_PATH)
+            if arg_for_origin is None:
+                page.evaluate(script)
+            else:
+                page.evaluate(script, arg_for_origin(origin))
+    finally:
+        page.close()
+        context.unroute(pattern, _fulfill_blank)
+
+
+def reset_context(context: BrowserContext,
+                  context_config: Optional[Dict[str, Any]] = None,
+                  visited_origins=None):
+    """将上下文重置为接近新建时的状态
+
+    关闭所有页面，清除cookies、权限、额外请求头、地理位置、离线状态、路由
+    以及各个源的localStorage、sessionStorage、IndexedDB和CacheStorage，
+    并恢复创建时的权限和地理位置。
+
+    Args:
+        context: 要重置的上下文
+        context_config: 上下文创建配置
+        visited_origins: 页面访问过的源，与storage_state中的源一起清理存储
+    """
+    context_config = context_config or {}
+
+    # 清理前先记录使用过存储的源（storage_state只包含有localStorage的源）
+    origins = [
+        origin["origin"]
+        for origin in context.storage_state().get("origins", [])
+    ]
+    origins += sorted(set(visited_origins or ()) - set(origins))
+
+    for page in list(context.pages):
+        page.close()
+
+    if not hasattr(context, "unroute_all"):
+        raise RuntimeError("当前Playwright版本不支持unroute_all，无法清除路由")
+    context.unroute_all()
+
+    context.clear_cookies()
+    context.clear_permissions()
+    if context_config.get("permissions"):
+        context.grant_permissions(context_config["permissions"])
+    context.set_extra_http_headers(context_config.get("extra_http_headers") or {})
+    context.set_geolocation(context_config.get("geolocation"))
+    context.set_offline(False)
+
+    _run_on_origins(context, origins, _CLEAR_STORAGE_SCRIPT)
+
+
+def apply_storage_state(context: BrowserContext,
+                        storage_state: Union[str, Dict[str, Any]]):
+    """在现有上下文上应用storage_state
+
+    直接写入cookies和各源的localStorage，效果等同于使用该storage_state
+    新建上下文。
+
+    Args:
+        context: 目标上下文
+        storage_state: 认证状态字典或文件路径
+    """
+    if isinstance(storage_state, str):
+        with open(storage_state, 'r', encoding='utf-8') as f:
+            storage_state = json.load(f)
+
+    cookies = storage_state.get("cookies", [])
+    if cookies:
+        context.add_cookies(cookies)
+
+    local_storage = {
+        origin["origin"]: origin.get("localStorage", [])
+        for origin in storage_state.get("origins", [])
+        if origin.get("localStorage")
+    }
+    _run_on_origins(context, list(local_storage.keys()),
+                    _SET_LOCAL_STORAGE_SCRIPT,
+                    arg_for_origin=lambda origin: local_storage[origin])
@@ -4,13 +4,20 @@
 """
 
 import logging
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Sequence
 from playwright.sync_api import (
     Page,
     Locator,
     TimeoutError as PlaywrightTimeoutError
 )
 
+from .locator_plan import locator_plan_cache
+from .clickable_resolver import resolve_clickable
+from .element_states import (
+    BATCH_STATES_JS, DEFAULT_PROPERTIES, ELEMENT_STATES_JS,
+    build_query, state_spec
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +27,25 @@ class ElementLocator:
     提供统一的元素定位接口，充分利用Playwright的智能等待。
     """
 
+    @classmethod
+    def for_page(cls, page: Page) -> "ElementLocator":
+        """获取页面对应的元素定位器
+
+        定位器实例缓存在页面对象上，同一页面的多次关键字调用共用一个实例，
+        设置的默认超时时间也随之保留。
+
+        Args:
+            page: Playwright页面实例
+
+        Returns:
+            ElementLocator: 元素定位器
+        """
+        locator = getattr(page, '_dsl_element_locator', None)
+        if not isinstance(locator, cls):
+            locator = cls(page)
+            setattr(page, '_dsl_element_locator', locator)
+        return locator
+
     def __init__(self, page: Page):
         """初始化元素定位器
 
@@ -59,189 +85,10 @@ class ElementLocator:
 
         Returns:
             Locator: Playwright定位器对象
-        """
-        # 检查是否是复合定位器（包含&符号）
-        if "&" in selector and not selector.startswith(("http", "ftp")):
-            return self._parse_compound_locator(selector)
-        
-        # 根据选择器类型选择合适的定位方法
-        if selector.startswith("//") or selector.startswith("(//"):
-            # XPath选择器
-            return self.page.locator(f"xpath={selector}")
-        elif selector.startswith("text="):
-            # 文本定位
-            return self._parse_text_locator(selector)
-        elif selector.startswith("role="):
-            # 角色定位
-            return self._parse_role_locator(selector)
-        elif selector.startswith("clickable="):
-            # 智能可点击元素定位
-            text = selector[10:]  # 移除"clickable="前缀
-            return self.locate_clickable_element(text)
-        elif selector.startswith("class="):
-            # CSS类和文本组合定位 class=类名:文本
-            class_part = selector[6:]  # 移除"class="前缀
-            if ":" in class_part:
-                css_class, text = class_part.split(":", 1)
-                return self.locate_by_css_class(
-                    text.strip(), css_class.strip())
-            else:
-                # 只有类名，没有文本
-                return self.page.locator(f".{class_part}")
-        elif "=" in selector and not selector.startswith(("http", "/")):
-            # 检查是否是元素类型定位 (span=, div=, button=等)
-            element_type, text = selector.split("=", 1)
-            allowed_types = [
-                "span", "div", "button", "a", "input", 
-                "p", "h1", "h2", "h3", "h4", "h5", "h6"
-            ]
-            if element_type in allowed_types:
-                return self.locate_by_element_type(text, element_type)
-        
-        # 处理其他标准定位器
-        if selector.startswith("placeholder="):
-            # 占位符定位
-            placeholder = selector[12:]  # 移除"placeholder="前缀
-            return self.page.get_by_placeholder(placeholder)
-        elif selector.startswith("label="):
-            # 标签定位
-            label = selector[6:]  # 移除"label="前缀
-            return self.page.get_by_label(label)
-        elif selector.startswith("title="):
-            # 标题定位
-            title = selector[6:]  # 移除"title="前缀
-            return self.page.get_by_title(title)
-        elif selector.startswith("alt="):
-            # Alt文本定位
-            alt = selector[4:]  # 移除"alt="前缀
-            return self.page.get_by_alt_text(alt)
-        elif selector.startswith("testid="):
-            # 测试ID定位
-            testid = selector[7:]  # 移除"testid="前缀
-            return self.page.get_by_test_id(testid)
-        else:
-            # 默认使用CSS选择器
-            return self.page.locator(selector)
-
-    def _parse_text_locator(self, selector: str) -> Locator:
-        """解析文本定位器，支持精确匹配等选项"""
-        text_part = selector[5:]  # 移除"text="前缀
-
-        if "," in text_part:
-            # 解析带参数的格式：text=Welcome,exact=true
-            parts = text_part.split(",")
-            text = parts[0].strip()
-            kwargs = {}
-
-            for part in parts[1:]:
-                if "=" in part:
-                    key, value = part.split("=", 1)
-                    key = key.strip()
-                    value = value.strip()
-
-                    # 转换布尔值
-                    if value.lower() in ('true', 'false'):
-                        kwargs[key] = value.lower() == 'true'
-                    else:
-                        kwargs[key] = value
-
-            return self.page.get_by_text(text, **kwargs)
-        else:
-            return self.page.get_by_text(text_part)
-
-    def _parse_role_locator(self, selector: str) -> Locator:
-        """解析角色定位器，支持过滤、组合等高级功能"""
-        role_part = selector[5:]  # 移除"role="前缀
-
-        # 支持冒号分隔的简化格式：role=button:百度一下
-        if ":" in role_part and "," not in role_part:
-            role, name = role_part.split(":", 1)
-            return self.page.get_by_role(role.strip(), name=name.strip())
-        elif "," in role_part:
-            # 解析带参数的格式：role=button,name=百度一下
-            parts = role_part.split(",")
-            role = parts[0].strip()
-            kwargs = {}
-
-            for part in parts[1:]:
-                if "=" in part:
-                    key, value = part.split("=", 1)
-                    key = key.strip()
-                    value = value.strip()
-
-                    # 转换布尔值
-                    if value.lower() in ('true', 'false'):
-                        kwargs[key] = value.lower() == 'true'
-                    else:
-                        kwargs[key] = value
-
-            return self.page.get_by_role(role, **kwargs)
-        else:
-            # 简单角色定位
-            return self.page.get_by_role(role_part)
 
-    def _parse_compound_locator(self, selector: str) -> Locator:
-        """解析复合定位器
-        
-        格式示例: "role=cell:外到内&locator=label&first=true"
-        
-        Args:
-            selector: 复合定位器字符串
-            
-        Returns:
-            Locator: 解析后的定位器
+        选择器首次使用时被编译为定位计划并缓存，之后直接按计划调用Playwright方法。
         """
-        # 分解基础定位器和修饰符
-        parts = selector.split("&")
-        base_part = parts[0]
-        modifiers = parts[1:] if len(parts) > 1 else []
-        
-        # 解析基础定位器
-        base_locator = self.locate(base_part)
-        
-        # 应用修饰符
-        current_locator = base_locator
-        
-        for modifier in modifiers:
-            if "=" not in modifier:
-                continue
-                
-            key, value = modifier.split("=", 1)
-            key = key.strip()
-            value = value.strip()
-            
-            if key == "locator":
-                # 子定位器
-                current_locator = current_locator.locator(value)
-            elif key == "has_text":
-                # 文本过滤
-                current_locator = current_locator.filter(has_text=value)
-            elif key == "has_not_text":
-                # 排除文本过滤
-                current_locator = current_locator.filter(has_not_text=value)
-            elif key == "first" and value.lower() == "true":
-                # 第一个元素
-                current_locator = current_locator.first
-            elif key == "last" and value.lower() == "true":
-                # 最后一个元素
-                current_locator = current_locator.last
-            elif key == "nth":
-                # 第N个元素
-                try:
-                    index = int(value)
-                    current_locator = current_locator.nth(index)
-                except ValueError:
-                    logger.warning(f"无效的nth索引: {value}")
-            elif key == "visible" and value.lower() == "true":
-                # 只选择可见元素
-                current_locator = current_locator.filter(visible=True)
-            elif key == "exact":
-                # exact参数已在基础定位器中处理
-                pass
-            else:
-                logger.warning(f"未知的修饰符: {key}={value}")
-        
-        return current_locator
+        return locator_plan_cache.get(selector).apply(self)
 
     def wait_for_element(self, selector: str, state: str = "visible", 
                          timeout: Optional[float] = None) -> bool:
@@ -444,6 +291,54 @@ class ElementLocator:
             texts.append(text or "")
         return texts
 
+    def query_states(self, selectors: Sequence[str],
+                     properties: Sequence[str] = DEFAULT_PROPERTIES,
+                     attributes: Sequence[str] = ()
+                     ) -> Dict[str, Dict[str, Any]]:
+        """批量查询元素状态
+
+        能在页面内执行的选择器合并为一次page.evaluate，其余选择器各使用一次
+        evaluate_all。查询是即时快照，不会等待元素出现。CSS查询与Playwright
+        一样穿透开放的shadow root。
+        匹配多个元素时，除count外的状态以第一个元素为准；元素不存在时
+        visible/enabled/checked为False，text/value/属性值为None。
+
+        Args:
+            selectors: 元素选择器列表
+            properties: 要查询的状态项（count, visible, enabled, checked, text, value）
+            attributes: 要查询的属性名列表
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 选择器 -> 状态字典（属性值在attributes键下）
+        """
+        spec = state_spec(properties, attributes)
+        selectors = list(dict.fromkeys(selectors))
+
+        batched = []
+        for selector in selectors:
+            query = build_query(locator_plan_cache.get(selector))
+            if query is not None:
+                batched.append((selector, query))
+
+        states: Dict[str, Dict[str, Any]] = {}
+        if batched:
+            results = self.page.evaluate(
+                BATCH_STATES_JS,
+                dict(spec, queries=[query for _, query in batched])
+            )
+            for (selector, _), result in zip(batched, results):
+                if result is not None:
+                    states[selector] = result
+
+        for selector in selectors:
+            if selector not in states:
+                states[selector] = self.locate(selector).evaluate_all(
+                    ELEMENT_STATES_JS, spec)
+
+        logger.debug(f"批量查询元素状态: {len(selectors)} 个选择器, "
+                     f"页面内查询 {len(batched)} 个")
+        return {selector: states[selector] for selector in selectors}
+
     def locate_by_visible(self, selector: str) -> Locator:
         """定位可见元素（过滤掉不可见的元素）
 
@@ -637,6 +532,7 @@ class ElementLocator:
         
         当多个元素包含相同文本时，智能选择最合适的可点击元素。
         优先级：可见且启用的交互元素 > 可见的交互元素 > 其他元素
+        每个阶段在页面内一次性获取所有候选元素的状态，避免逐个元素往返查询。
         
         Args:
             text: 要匹配的文本
@@ -646,176 +542,7 @@ class ElementLocator:
             Locator: 最适合点击的元素定位器
         """
         logger.debug(f"智能定位可点击元素: '{text}'")
-        
-        # 首先尝试常见的可点击元素
-        clickable_selectors = [
-            f"button:has-text('{text}')",
-            f"a:has-text('{text}')", 
-            f"[role='button']:has-text('{text}')",
-            f"[role='link']:has-text('{text}')",
-            f"[role='menuitem']:has-text('{text}')"
-        ]
-        
-        # 首先寻找可见且启用的元素
-        for selector in clickable_selectors:
-            locator = self.page.locator(selector)
-            count = locator.count()
-            if count > 0:
-                logger.debug(f"检查选择器: {selector} (数量: {count})")
-                
-                # 优先选择可见且启用的元素
-                for i in range(count):
-                    element = locator.nth(i)
-                    try:
-                        is_visible = element.is_visible()
-                        is_enabled = element.is_enabled()
-                        logger.debug(f"  元素 {i}: 可见={is_visible}, 启用={is_enabled}")
-                        
-                        if is_visible and is_enabled:
-                            logger.debug(f"选择可见且启用的元素: {selector} (索引: {i})")
-                            return element
-                    except Exception as e:
-                        logger.debug(f"  检查元素 {i} 状态失败: {e}")
-                        continue
-        
-        # 如果没找到可见且启用的交互元素，再次查找仅可见的交互元素
-        for selector in clickable_selectors:
-            locator = self.page.locator(selector)
-            count = locator.count()
-            if count > 0:
-                for i in range(count):
-                    element = locator.nth(i)
-                    try:
-                        is_visible = element.is_visible()
-                        if is_visible:
-                            logger.debug(f"选择可见元素: {selector} (索引: {i})")
-                            return element
-                    except Exception as e:
-                        logger.debug(f"  检查元素 {i} 可见性失败: {e}")
-                        continue
-        
-        # 如果没找到明确的可点击元素，尝试span和div
-        text_locator = self.page.get_by_text(text, exact=True)
-        count = text_locator.count()
-        logger.debug(f"精确文本匹配: '{text}' (数量: {count})")
-        
-        if count == 1:
-            return text_locator
-        elif count > 1:
-            # 优先选择可见且启用的span元素
-            span_locator = self.page.locator(f"span:has-text('{text}')")
-            span_count = span_locator.count()
-            if span_count > 0:
-                logger.debug(f"检查span元素: span:has-text('{text}') (数量: {span_count})")
-                
-                # 寻找可见且启用的span
-                for i in range(span_count):
-                    element = span_locator.nth(i)
-                    try:
-                        is_visible = element.is_visible()
-                        is_enabled = element.is_enabled()
-                        if is_visible and is_enabled:
-                            logger.debug(f"选择可见且启用的span元素 (索引: {i})")
-                            return element
-                    except Exception:
-                        continue
-                
-                # 如果没有可见且启用的，选择第一个可见的
-                for i in range(span_count):
-                    element = span_locator.nth(i)
-                    try:
-                        is_visible = element.is_visible()
-                        if is_visible:
-                            logger.debug(f"选择可见的span元素 (索引: {i})")
-                            return element
-                    except Exception:
-                        continue
-                
-                # 最后选择第一个
-                logger.debug("选择第一个span元素")
-                return span_locator.first
-            
-            # 然后选择div元素（类似的逻辑）
-            div_locator = self.page.locator(f"div:has-text('{text}')")
-            div_count = div_locator.count()
-            if div_count > 0:
-                logger.debug(f"检查div元素: div:has-text('{text}') (数量: {div_count})")
-                
-                # 寻找可见且启用的div
-                for i in range(div_count):
-                    element = div_locator.nth(i)
-                    try:
-                        is_visible = element.is_visible()
-                        is_enabled = element.is_enabled()
-                        if is_visible and is_enabled:
-                            logger.debug(f"选择可见且启用的div元素 (索引: {i})")
-                            return element
-                    except Exception:
-                        continue
-                
-                # 如果没有可见且启用的，选择第一个可见的
-                for i in range(div_count):
-                    element = div_locator.nth(i)
-                    try:
-                        is_visible = element.is_visible()
-                        if is_visible:
-                            logger.debug(f"选择可见的div元素 (索引: {i})")
-                            return element
-                    except Exception:
-                        continue
-                
-                # 最后选择第一个
-                logger.debug("选择第一个div元素")
-                return div_locator.first
-            
-            # 最后在所有文本匹配中选择可见且启用的元素
-            for i in range(count):
-                element = text_locator.nth(i)
-                try:
-                    is_visible = element.is_visible()
-                    is_enabled = element.is_enabled()
-                    if is_visible and is_enabled:
-                        logger.debug(f"选择可见且启用的文本匹配元素 (索引: {i})")
-                        return element
-                except Exception:
-                    continue
-            
-            # 选择第一个可见的
-            for i in range(count):
-                element = text_locator.nth(i)
-                try:
-                    is_visible = element.is_visible()
-                    if is_visible:
-                        logger.debug(f"选择可见的文本匹配元素 (索引: {i})")
-                        return element
-                except Exception:
-                    continue
-            
-            # 最后返回第一个匹配的元素
-            logger.debug("使用第一个文本匹配元素")
-            return text_locator.first
-        else:
-            # 如果精确匹配失败，尝试模糊匹配
-            fuzzy_locator = self.page.get_by_text(text)
-            fuzzy_count = fuzzy_locator.count()
-            logger.debug(f"模糊文本匹配: '{text}' (数量: {fuzzy_count})")
-            if fuzzy_count > 0:
-                # 同样优先选择可见且启用的元素
-                for i in range(fuzzy_count):
-                    element = fuzzy_locator.nth(i)
-                    try:
-                        is_visible = element.is_visible()
-                        is_enabled = element.is_enabled()
-                        if is_visible and is_enabled:
-                            logger.debug(f"选择可见且启用的模糊匹配元素 (索引: {i})")
-                            return element
-                    except Exception:
-                        continue
-                
-                return fuzzy_locator.first
-            else:
-                logger.warning(f"无法找到包含文本 '{text}' 的任何元素")
-                return fuzzy_locator  # 返回空定位器
+        return resolve_clickable(self.page, text)
 
     def locate_by_element_type(self, text: str, 
                                element_type: str = "span") -> Locator:
@@ -0,0 +1,175 @@
+"""批量元素状态查询
+
+断言和检查关键字通常需要同一批元素的可见性、启用状态、文本、值等多项状态。
+逐个调用Locator方法时，每个元素的每项状态都要与浏览器往返一次。
+这里将选择器转换为页面内可执行的查询描述，通过一次page.evaluate取回所有结果。
+
+能在页面内直接执行的选择器：CSS选择器、XPath、testid=、元素类型/CSS类+文本
+（:has-text），以及first/last/nth修饰符。其他依赖Playwright选择器引擎的写法
+（text=、role=、label=、clickable=等）回退为对单个定位器调用一次evaluate_all。
+
+与Playwright的CSS引擎一致，页面内的CSS查询会穿透开放的shadow root；
+XPath与Playwright相同，不穿透shadow root。
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+from .locator_plan import LocatorPlan
+
+# 默认查询的状态项
+DEFAULT_PROPERTIES = ("count", "visible", "enabled", "checked", "text", "value")
+
+_HAS_TEXT_PATTERN = re.compile(r"^(.*):has-text\('(.*)'\)$", re.S)
+
+# 计算元素列表的状态，以第一个元素为准
+_STATE_FUNCTION = """
+const elementStates = (elements, spec) => {
+    const el = elements[0] || null;
+    const props = spec.properties;
+    const result = {};
+    if (props.includes('count')) result.count = elements.length;
+    if (props.includes('visible')) {
+        let visible = false;
+        if (el) {
+            const rect = el.getBoundingClientRect();
+            visible = rect.width > 0 && rect.height > 0
+                && window.getComputedStyle(el).visibility !== 'hidden';
+        }
+        result.visible = visible;
+    }
+    if (props.includes('enabled')) {
+        result.enabled = !!el && !(el.disabled === true
+            || !!el.closest('fieldset[disabled]')
+            || !!el.closest('[aria-disabled="true"]'));
+    }
+    if (props.includes('checked')) {
+        let checked = false;
+        if (el) {
+            const type = (el.getAttribute('type') || '').toLowerCase();
+            checked = (el.tagName === 'INPUT' && (type === 'checkbox' || type === 'radio'))
+                ? el.checked : el.getAttribute('aria-checked') === 'true';
+        }
+        result.checked = checked;
+    }
+    if (props.includes('text')) result.text = el ? el.textContent : null;
+    if (props.includes('value')) {
+        result.value = el && ['INPUT', 'TEXTAREA', 'SELECT'].includes(el.tagName)
+            ? el.value : null;
+    }
+    if (spec.attributes.length) {
+        const attributes = {};
+        for (const name of spec.attributes) {
+            attributes[name] = el ? el.getAttribute(name) : null;
+        }
+        result.attributes = attributes;
+    }
+    return result;
+};
+"""
+
+# 对单个定位器调用evaluate_all时使用
+ELEMENT_STATES_JS = "(elements, spec) => {" + _STATE_FUNCTION + """
+    return elementStates(elements, spec);
+}"""
+
+# 一次性在页面内执行多个查询，无法执行的查询返回null
+BATCH_STATES_JS = "(batch) => {" + _STATE_FUNCTION + """
+    const normalize = s => (s || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+    // 页面中存在开放的shadow root时，CSS查询需要逐个节点匹配以穿透shadow root
+    const hasShadow = Array.from(document.querySelectorAll('*')).some(el => el.shadowRoot);
+    const queryDeep = (root, css, out) => {
+        for (const el of root.querySelectorAll('*')) {
+            if (el.matches(css)) out.push(el);
+            if (el.shadowRoot) queryDeep(el.shadowRoot, css, out);
+        }
+        return out;
+    };
+    const find = q => {
+        let elements;
+        if (q.xpath !== null) {
+            const snapshot = document.evaluate(q.xpath, document, null,
+                XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            elements = [];
+            for (let i = 0; i < snapshot.snapshotLength; i++) {
+                elements.push(snapshot.snapshotItem(i));
+            }
+        } else if (hasShadow) {
+            elements = queryDeep(document, q.css, []);
+        } else {
+            elements = Array.from(document.querySelectorAll(q.css));
+        }
+        if (q.hasText !== null) {
+            const text = normalize(q.hasText);
+            elements = elements.filter(el => normalize(el.textContent).includes(text));
+        }
+        if (q.pick !== null) {
+            const index = q.pick < 0 ? elements.length + q.pick : q.pick;
+            elements = elements[index] ? [elements[index]] : [];
+        }
+        return elements;
+    };
+    return batch.queries.map(q => {
+        try {
+            return elementStates(find(q), batch);
+        } catch (e) {
+            // Playwright扩展的CSS语法（如>>、:visible）在页面内无法解析
+            return null;
+        }
+    });
+}"""
+
+
+def build_query(plan: LocatorPlan) -> Optional[Dict[str, Any]]:
+    """将定位计划转换为页面内查询描述
+
+    Args:
+        plan: 定位计划
+
+    Returns:
+        Optional[Dict[str, Any]]: 查询描述，无法在页面内执行时返回None
+    """
+    method, args, kwargs = plan.base
+    if kwargs:
+        return None
+
+    query: Dict[str, Any] = {"css": None, "xpath": None,
+                             "hasText": None, "pick": None}
+    if method == "locator":
+        selector = args[0]
+        if selector.startswith("xpath="):
+            query["xpath"] = selector[6:]
+        else:
+            match = _HAS_TEXT_PATTERN.match(selector)
+            if match:
+                query["css"], query["hasText"] = match.group(1), match.group(2)
+            else:
+                query["css"] = selector
+    elif method == "get_by_test_id":
+        query["css"] = f"[data-testid={json.dumps(args[0], ensure_ascii=False)}]"
+    else:
+        return None
+
+    for index, (modifier, modifier_args, _) in enumerate(plan.modifiers):
+        # 只支持末尾的单个位置修饰符
+        if index != len(plan.modifiers) - 1:
+            return None
+        if modifier == "first":
+            query["pick"] = 0
+        elif modifier == "last":
+            query["pick"] = -1
+        elif modifier == "nth":
+            query["pick"] = modifier_args[0]
+        else:
+            return None
+    return query
+
+
+def state_spec(properties: Sequence[str],
+               attributes: Sequence[str]) -> Dict[str, List[str]]:
+    """构造传给页面脚本的状态项描述"""
+    unknown = set(properties) - set(DEFAULT_PROPERTIES)
+    if unknown:
+        raise ValueError(f"不支持的元素状态: {', '.join(sorted(unknown))}")
+    return {"properties": list(properties), "attributes": list(attributes)}
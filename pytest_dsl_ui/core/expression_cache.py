@@ -0,0 +1,114 @@
+"""提取表达式编译缓存
+
+JSONPath（jsonpath_ng基于ply解析，开销很大）、正则表达式和XPath表达式在
+捕获、断言和断言重试中反复使用。这里按(类型, 表达式)缓存编译结果，
+整个进程共用，供BrowserHTTPRequest和网络监听关键字使用。
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+
+def _compile_jsonpath(expression: str):
+    import jsonpath_ng.ext as jsonpath
+    return jsonpath.parse(expression)
+
+
+def _compile_xpath(expression: str):
+    import lxml.etree as etree
+    return etree.XPath(expression)
+
+
+_COMPILERS: Dict[str, Callable[[str], Any]] = {
+    'jsonpath': _compile_jsonpath,
+    'regex': re.compile,
+    'xpath': _compile_xpath,
+}
+
+
+class ExpressionCache:
+    """编译后的提取表达式LRU缓存"""
+
+    def __init__(self, maxsize: int = 1024):
+        """初始化缓存
+
+        Args:
+            maxsize: 最多缓存的表达式数量（所有类型合计）
+        """
+        self.maxsize = maxsize
+        self._compiled: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = {kind: 0 for kind in _COMPILERS}
+        self.misses = {kind: 0 for kind in _COMPILERS}
+
+    def get(self, kind: str, expression: str) -> Any:
+        """获取编译后的表达式，未缓存时编译并缓存
+
+        编译失败时抛出对应库的异常，失败结果不缓存。
+
+        Args:
+            kind: 表达式类型：jsonpath、regex或xpath
+            expression: 表达式
+
+        Returns:
+            Any: 编译后的表达式对象
+        """
+        key = (kind, expression)
+        with self._lock:
+            compiled = self._compiled.get(key)
+            if compiled is not None:
+                self.hits[kind] += 1
+                self._compiled.move_to_end(key)
+                return compiled
+
+        compiler = _COMPILERS.get(kind)
+        if compiler is None:
+            raise ValueError(f"不支持的表达式类型: {kind}")
+        compiled = compiler(expression)
+
+        with self._lock:
+            self.misses[kind] += 1
+            self._compiled[key] = compiled
+            if len(self._compiled) > self.maxsize:
+                self._compiled.popitem(last=False)
+        return compiled
+
+    def jsonpath(self, expression: str):
+        """获取编译后的JSONPath表达式"""
+        return self.get('jsonpath', expression)
+
+    def regex(self, pattern: str) -> "re.Pattern":
+        """获取编译后的正则表达式"""
+        return self.get('regex', pattern)
+
+    def xpath(self, expression: str):
+        """获取编译后的XPath表达式"""
+        return self.get('xpath', expression)
+
+    def clear(self):
+        """清空缓存和统计"""
+        with self._lock:
+            self._compiled.clear()
+            for kind in _COMPILERS:
+                self.hits[kind] = 0
+                self.misses[kind] = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        with self._lock:
+            return {
+                'size': len(self._compiled),
+                'maxsize': self.maxsize,
+                'hits': sum(self.hits.values()),
+                'misses': sum(self.misses.values()),
+                'by_kind': {
+                    kind: {'hits': self.hits[kind], 'misses': self.misses[kind]}
+                    for kind in _COMPILERS
+                },
+            }
+
+
+# 全局表达式缓存
+expression_cache = ExpressionCache()
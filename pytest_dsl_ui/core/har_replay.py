@@ -0,0 +1,294 @@
+"""HAR录制与回放
+
+录制使用Playwright内置的record_har_path上下文选项，关闭上下文时写出标准HAR文件。
+回放通过context.route拦截请求，从HAR文件中查找匹配的响应直接返回：
+
+- 匹配键规范化：方法大写、主机小写、去掉URL片段、查询参数排序，
+  可以忽略指定的查询参数（如时间戳、缓存破坏参数）和主机
+- 请求体匹配：JSON请求体按键排序、表单请求体按参数排序后比较；
+  请求体不匹配时退化为只按方法和URL匹配
+- 同一匹配键录制了多个响应时按录制顺序依次返回，最后一个响应重复使用
+- 未匹配的请求按fallthrough规则处理：fallback（继续访问真实网络或其他路由）、
+  abort（中止请求）或404（返回404响应）
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+# 未匹配请求的处理方式
+NOT_FOUND_MODES = ('fallback', 'abort', '404')
+
+# 回放时不应原样返回的响应头（响应体已解码）
+_SKIPPED_HEADERS = frozenset([
+    'content-encoding', 'content-length', 'transfer-encoding', 'connection'
+])
+
+MatchKey = Tuple[str, str, Optional[str]]
+
+
+@lru_cache(maxsize=16)
+def _load_har(path: str, mtime: float) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_har(path: str) -> Dict[str, Any]:
+    """读取HAR文件，按(路径, 修改时间)缓存解析结果"""
+    path = os.path.abspath(path)
+    return _load_har(path, os.path.getmtime(path))
+
+
+def normalize_url(url: str, ignore_params: Sequence[str] = (),
+                  ignore_host: bool = False) -> str:
+    """规范化URL作为匹配键
+
+    Args:
+        url: 原始URL
+        ignore_params: 忽略的查询参数名
+        ignore_host: 是否忽略协议和主机
+
+    Returns:
+        str: 规范化后的URL
+    """
+    parts = urlsplit(url)
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k not in ignore_params
+    )
+    scheme, netloc = ('', '') if ignore_host else (
+        parts.scheme.lower(), parts.netloc.lower())
+    return urlunsplit((scheme, netloc, parts.path or '/', urlencode(query), ''))
+
+
+def normalize_body(body: Optional[str], content_type: str = '') -> Optional[str]:
+    """规范化请求体并返回摘要，空请求体返回None"""
+    if not body:
+        return None
+    content_type = (content_type or '').lower()
+    try:
+        if 'json' in content_type or body.lstrip()[:1] in ('{', '['):
+            body = json.dumps(json.loads(body), sort_keys=True,
+                              separators=(',', ':'), ensure_ascii=False)
+        elif 'x-www-form-urlencoded' in content_type:
+            body = urlencode(sorted(parse_qsl(body, keep_blank_values=True)))
+    except ValueError:
+        pass
+    return hashlib.sha1(body.encode('utf-8')).hexdigest()
+
+
+def _header(headers: Union[Dict[str, str], List[Dict[str, str]]],
+            name: str) -> str:
+    if isinstance(headers, dict):
+        for key, value in headers.items():
+            if key.lower() == name:
+                return value
+        return ''
+    for header in headers or []:
+        if header.get('name', '').lower() == name:
+            return header.get('value', '')
+    return ''
+
+
+class HarReplayer:
+    """HAR回放器"""
+
+    def __init__(self, har_path: str, not_found: str = 'fallback',
+                 url_filter: Optional[str] = None,
+                 ignore_params: Union[None, str, Sequence[str]] = None,
+                 ignore_host: bool = False, match_body: bool = True):
+        """初始化回放器
+
+        Args:
+            har_path: HAR文件路径
+            not_found: 未匹配请求的处理方式：fallback、abort或404
+            url_filter: 只拦截匹配的URL（Playwright glob或正则），默认拦截全部
+            ignore_params: 匹配时忽略的查询参数，逗号分隔字符串或列表
+            ignore_host: 匹配时是否忽略协议和主机
+            match_body: 是否按请求体匹配
+        """
+        if not_found not in NOT_FOUND_MODES:
+            raise ValueError(f"不支持的未匹配处理方式: {not_found}")
+        if isinstance(ignore_params, str):
+            ignore_params = [p.strip() for p in ignore_params.split(',')
+                             if p.strip()]
+
+        self.har_path = har_path
+        self.har_dir = os.path.dirname(os.path.abspath(har_path))
+        self.not_found = not_found
+        self.url_filter = url_filter or '**/*'
+        self.ignore_params = frozenset(ignore_params or ())
+        self.ignore_host = ignore_host
+        self.match_body = match_body
+        self.stats = {'hits': 0, 'misses': 0}
+
+        self._entries: Dict[MatchKey, List[Dict[str, Any]]] = {}
+        self._served: Dict[MatchKey, int] = {}
+        for entry in load_har(har_path).get('log', {}).get('entries', []):
+            request = entry.get('request', {})
+            post_data = request.get('postData') or {}
+            for key in self._keys(request.get('method', 'GET'),
+                                  request.get('url', ''),
+                                  post_data.get('text'),
+                                  post_data.get('mimeType', '')):
+                self._entries.setdefault(key, []).append(entry)
+
+        logger.info(f"已加载HAR文件: {har_path} "
+                    f"({len(self._entries)} 个匹配键)")
+
+    def _keys(self, method: str, url: str, body: Optional[str],
+              content_type: str) -> List[MatchKey]:
+        """生成匹配键：带请求体的精确键和只含方法与URL的退化键"""
+        base = (method.upper(),
+                normalize_url(url, self.ignore_params, self.ignore_host))
+        keys = [base + (None,)]
+        body_digest = normalize_body(body, content_type) if self.match_body else None
+        if body_digest is not None:
+            keys.insert(0, base + (body_digest,))
+        return keys
+
+    def lookup(self, method: str, url: str, body: Optional[str] = None,
+               content_type: str = '') -> Optional[Dict[str, Any]]:
+        """查找匹配的HAR条目
+
+        Returns:
+            Optional[Dict[str, Any]]: 匹配的HAR条目，未匹配时返回None
+        """
+        for key in self._keys(method, url, body, content_type):
+            entries = self._entries.get(key)
+            if entries:
+                served = self._served.get(key, 0)
+                self._served[key] = served + 1
+                return entries[min(served, len(entries) - 1)]
+        return None
+
+    def attach(self, context):
+        """在上下文上安装回放路由"""
+        context.route(self.url_filter, self.handle)
+        setattr(context, '_har_replayer', self)
+
+    async def attach_async(self, context):
+        """在异步API的上下文上安装回放路由"""
+        await context.route(self.url_filter, self.handle_async)
+        setattr(context, '_har_replayer', self)
+
+    def resolve(self, request) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """决定如何处理请求
+
+        Returns:
+            Tuple[str, Optional[Dict[str, Any]]]: (fulfill/abort/fallback, fulfill参数)
+        """
+        try:
+            post_data = request.post_data
+        except Exception:
+            # 二进制请求体无法解码为文本，只按方法和URL匹配
+            post_data = None
+        entry = self.lookup(request.method, request.url, post_data,
+                            _header(request.headers, 'content-type'))
+        if entry is not None:
+            self.stats['hits'] += 1
+            return 'fulfill', self._fulfill_options(entry)
+
+        self.stats['misses'] += 1
+        logger.debug(f"HAR未匹配: {request.method} {request.url}")
+        if self.not_found == 'abort':
+            return 'abort', None
+        if self.not_found == '404':
+            return 'fulfill', {'status': 404, 'body': ''}
+        return 'fallback', None
+
+    def handle(self, route, request):
+        """路由处理函数"""
+        action, options = self.resolve(request)
+        if action == 'fulfill':
+            route.fulfill(**options)
+        elif action == 'abort':
+            route.abort()
+        else:
+            route.fallback()
+
+    async def handle_async(self, route, request):
+        """异步API的路由处理函数"""
+        action, options = self.resolve(request)
+        if action == 'fulfill':
+            await route.fulfill(**options)
+        elif action == 'abort':
+            await route.abort()
+        else:
+            await route.fallback()
+
+    def _fulfill_options(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        response = entry.get('response', {})
+        content = response.get('content', {})
+        # 同名响应头合并，Set-Cookie按换行分隔（与Playwright的HAR回放一致）
+        headers: Dict[str, str] = {}
+        names: Dict[str, str] = {}
+        for h in response.get('headers', []):
+            name = h.get('name', '')
+            lower = name.lower()
+            if lower in _SKIPPED_HEADERS or name.startswith(':'):
+                continue
+            if lower in names:
+                separator = '\n' if lower == 'set-cookie' else ', '
+                headers[names[lower]] += separator + h['value']
+            else:
+                names[lower] = name
+                headers[name] = h['value']
+
+        if content.get('_file'):
+            with open(os.path.join(self.har_dir, content['_file']), 'rb') as f:
+                body = f.read()
+        elif content.get('encoding') == 'base64':
+            body = base64.b64decode(content.get('text', ''))
+        else:
+            body = content.get('text', '').encode('utf-8')
+
+        return {'status': response.get('status', 200),
+                'headers': headers, 'body': body}
+
+
+def create_replayer(config: Dict[str, Any]) -> Optional[HarReplayer]:
+    """根据上下文配置创建回放器，未配置har_replay时返回None"""
+    if not config.get('har_replay'):
+        return None
+    return HarReplayer(
+        config['har_replay'],
+        not_found=config.get('har_not_found', 'fallback'),
+        url_filter=config.get('har_url_filter'),
+        ignore_params=config.get('har_ignore_params'),
+        ignore_host=config.get('har_ignore_host', False),
+    )
+
+
+def build_record_options(record_har_path: str,
+                         content: str = 'embed',
+                         url_filter: Optional[str] = None,
+                         mode: str = 'full') -> Dict[str, Any]:
+    """构建new_context的HAR录制参数
+
+    Args:
+        record_har_path: HAR文件保存路径，关闭上下文时写出
+        content: 响应体保存方式：embed（内嵌）、attach（单独文件）或omit
+        url_filter: 只录制匹配的URL
+        mode: full或minimal（只保留回放需要的字段）
+
+    Returns:
+        Dict[str, Any]: new_context参数
+    """
+    directory = os.path.dirname(os.path.abspath(record_har_path))
+    os.makedirs(directory, exist_ok=True)
+    options = {
+        'record_har_path': record_har_path,
+        'record_har_content': content,
+        'record_har_mode': mode,
+    }
+    if url_filter:
+        options['record_har_url_filter'] = url_filter
+    return options
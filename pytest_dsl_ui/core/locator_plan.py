@@ -0,0 +1,266 @@
+"""定位器编译缓存
+
+将ElementLocator支持的选择器语法一次性编译为不可变的定位计划，
+并按选择器字符串缓存在LRU中。应用计划时只需按步骤调用Page/Locator方法，
+不再重复执行前缀判断、字符串切分和复合定位器解析。
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 支持 "元素类型=文本" 简写的元素类型
+ELEMENT_TYPES = frozenset([
+    "span", "div", "button", "a", "input",
+    "p", "h1", "h2", "h3", "h4", "h5", "h6"
+])
+
+# 简单前缀定位器: 前缀 -> Page方法
+_PREFIX_METHODS = (
+    ("placeholder=", "get_by_placeholder"),
+    ("label=", "get_by_label"),
+    ("title=", "get_by_title"),
+    ("alt=", "get_by_alt_text"),
+    ("testid=", "get_by_test_id"),
+)
+
+# 需要在运行时查询元素状态、无法静态编译的基础定位器
+CLICKABLE = "clickable"
+
+Step = Tuple[str, Tuple[Any, ...], Tuple[Tuple[str, Any], ...]]
+
+
+class LocatorPlan:
+    """编译后的定位计划
+
+    base为基础定位步骤，modifiers为依次应用在Locator上的修饰步骤。
+    每个步骤是 (方法名, 位置参数, 关键字参数) 三元组；修饰步骤的方法名为
+    "first"/"last"时表示属性访问。
+    """
+
+    __slots__ = ("selector", "base", "modifiers")
+
+    def __init__(self, selector: str, base: Step,
+                 modifiers: Tuple[Step, ...] = ()):
+        object.__setattr__(self, "selector", selector)
+        object.__setattr__(self, "base", base)
+        object.__setattr__(self, "modifiers", modifiers)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("LocatorPlan是不可变对象")
+
+    def __repr__(self) -> str:
+        return f"LocatorPlan({self.selector!r}, base={self.base}, modifiers={self.modifiers})"
+
+    @property
+    def is_clickable(self) -> bool:
+        """基础定位器是否是clickable=智能定位"""
+        return self.base[0] == CLICKABLE
+
+    def apply(self, element_locator) -> Any:
+        """在元素定位器的当前页面上应用计划
+
+        Args:
+            element_locator: ElementLocator实例（提供page和clickable定位）
+
+        Returns:
+            Locator: Playwright定位器对象
+        """
+        method, args, kwargs = self.base
+        if method == CLICKABLE:
+            locator = element_locator.locate_clickable_element(*args)
+        else:
+            locator = getattr(element_locator.page, method)(*args, **dict(kwargs))
+        return self.apply_modifiers(locator)
+
+    def apply_modifiers(self, locator) -> Any:
+        """在基础定位器上依次应用修饰步骤
+
+        Args:
+            locator: 基础定位器
+
+        Returns:
+            Locator: 应用修饰后的定位器
+        """
+        for method, args, kwargs in self.modifiers:
+            if method in ("first", "last"):
+                locator = getattr(locator, method)
+            else:
+                locator = getattr(locator, method)(*args, **dict(kwargs))
+        return locator
+
+
+def _step(method: str, *args, **kwargs) -> Step:
+    return method, args, tuple(sorted(kwargs.items()))
+
+
+def _parse_options(parts) -> Dict[str, Any]:
+    """解析 key=value 形式的参数列表，true/false转换为布尔值"""
+    kwargs = {}
+    for part in parts:
+        if "=" in part:
+            key, value = part.split("=", 1)
+            key = key.strip()
+            value = value.strip()
+            if value.lower() in ('true', 'false'):
+                kwargs[key] = value.lower() == 'true'
+            else:
+                kwargs[key] = value
+    return kwargs
+
+
+def _compile_text(text_part: str) -> Step:
+    """text=文本 或 text=文本,exact=true"""
+    if "," in text_part:
+        parts = text_part.split(",")
+        return _step("get_by_text", parts[0].strip(), **_parse_options(parts[1:]))
+    return _step("get_by_text", text_part)
+
+
+def _compile_role(role_part: str) -> Step:
+    """role=button 或 role=button:名称 或 role=button,name=名称"""
+    if ":" in role_part and "," not in role_part:
+        role, name = role_part.split(":", 1)
+        return _step("get_by_role", role.strip(), name=name.strip())
+    elif "," in role_part:
+        parts = role_part.split(",")
+        return _step("get_by_role", parts[0].strip(), **_parse_options(parts[1:]))
+    return _step("get_by_role", role_part)
+
+
+def _compile_simple(selector: str) -> Tuple[Step, Tuple[Step, ...]]:
+    """编译不含&的选择器，返回基础步骤和附加修饰步骤"""
+    if selector.startswith("//") or selector.startswith("(//"):
+        return _step("locator", f"xpath={selector}"), ()
+    elif selector.startswith("text="):
+        return _compile_text(selector[5:]), ()
+    elif selector.startswith("role="):
+        return _compile_role(selector[5:]), ()
+    elif selector.startswith("clickable="):
+        return _step(CLICKABLE, selector[10:]), ()
+    elif selector.startswith("class="):
+        class_part = selector[6:]
+        if ":" in class_part:
+            css_class, text = class_part.split(":", 1)
+            return (_step("locator", f".{css_class.strip()}:has-text('{text.strip()}')"),
+                    (_step("first"),))
+        return _step("locator", f".{class_part}"), ()
+    elif "=" in selector and not selector.startswith(("http", "/")):
+        element_type, text = selector.split("=", 1)
+        if element_type in ELEMENT_TYPES:
+            return (_step("locator", f"{element_type}:has-text('{text}')"),
+                    (_step("first"),))
+
+    for prefix, method in _PREFIX_METHODS:
+        if selector.startswith(prefix):
+            return _step(method, selector[len(prefix):]), ()
+
+    return _step("locator", selector), ()
+
+
+def _compile_modifier(modifier: str) -> Optional[Step]:
+    """编译复合定位器中的单个修饰符"""
+    if "=" not in modifier:
+        return None
+
+    key, value = modifier.split("=", 1)
+    key = key.strip()
+    value = value.strip()
+
+    if key == "locator":
+        return _step("locator", value)
+    elif key == "has_text":
+        return _step("filter", has_text=value)
+    elif key == "has_not_text":
+        return _step("filter", has_not_text=value)
+    elif key == "first":
+        return _step("first") if value.lower() == "true" else None
+    elif key == "last":
+        return _step("last") if value.lower() == "true" else None
+    elif key == "nth":
+        try:
+            return _step("nth", int(value))
+        except ValueError:
+            logger.warning(f"无效的nth索引: {value}")
+            return None
+    elif key == "visible":
+        return _step("filter", visible=True) if value.lower() == "true" else None
+    elif key == "exact":
+        # exact参数已在基础定位器中处理
+        return None
+
+    logger.warning(f"未知的修饰符: {key}={value}")
+    return None
+
+
+def compile_selector(selector: str) -> LocatorPlan:
+    """将选择器编译为定位计划
+
+    支持的语法与ElementLocator.locate一致，复合定位器格式为
+    "基础定位器&修饰符=值&..."，例如 "role=cell:外到内&locator=label&first=true"。
+
+    Args:
+        selector: 元素选择器
+
+    Returns:
+        LocatorPlan: 定位计划
+    """
+    if "&" in selector and not selector.startswith(("http", "ftp")):
+        parts = selector.split("&")
+        base, modifiers = _compile_simple(parts[0])
+        compiled = [m for m in (_compile_modifier(p) for p in parts[1:]) if m]
+        return LocatorPlan(selector, base, modifiers + tuple(compiled))
+
+    base, modifiers = _compile_simple(selector)
+    return LocatorPlan(selector, base, modifiers)
+
+
+class LocatorPlanCache:
+    """定位计划LRU缓存"""
+
+    def __init__(self, maxsize: int = 2048):
+        """初始化缓存
+
+        Args:
+            maxsize: 最多缓存的选择器数量
+        """
+        self.maxsize = maxsize
+        self._plans: "OrderedDict[str, LocatorPlan]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, selector: str) -> LocatorPlan:
+        """获取选择器的定位计划，未缓存时编译并缓存"""
+        plan = self._plans.get(selector)
+        if plan is not None:
+            self.hits += 1
+            self._plans.move_to_end(selector)
+            return plan
+
+        self.misses += 1
+        plan = compile_selector(selector)
+        self._plans[selector] = plan
+        if len(self._plans) > self.maxsize:
+            self._plans.popitem(last=False)
+        return plan
+
+    def clear(self):
+        """清空缓存和统计"""
+        self._plans.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取缓存统计信息"""
+        return {
+            'size': len(self._plans),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+# 全局定位计划缓存
+locator_plan_cache = LocatorPlanCache()
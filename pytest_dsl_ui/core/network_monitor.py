@@ -0,0 +1,583 @@
+"""网络监控器
+
+监听页面的请求和响应并按捕获策略记录：
+
+- 环形缓冲区：只保留最近的N条请求/响应记录，超出的记录被淘汰
+- URL和Content-Type过滤：只记录关心的请求，例如排除图片和JS包
+- 响应体读取模式：默认在事件处理中立即读取；可选懒加载，只记录元数据，
+  关键字需要响应内容时才读取（页面跳转后响应体可能已无法读取）。
+  超过大小上限的响应体不读取，读取失败的原因记录在body_error中
+- 溢出到磁盘：被淘汰的记录可以追加写入gzip压缩的JSONL文件
+- 二级索引：按主机、路径首段、请求方法和状态码索引记录，组合条件和时间窗口
+  查询只需扫描最小的索引桶，不再随记录数线性变慢
+"""
+
+import gzip
+import json
+import logging
+import re
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional, Pattern, Sequence, Union
+from urllib.parse import urlsplit
+
+from .expression_cache import expression_cache
+
+logger = logging.getLogger(__name__)
+
+# 响应体捕获模式
+BODY_LAZY = 'lazy'
+BODY_EAGER = 'eager'
+BODY_NONE = 'none'
+BODY_MODES = (BODY_LAZY, BODY_EAGER, BODY_NONE)
+
+
+def _as_list(value: Union[None, str, Sequence[str]]) -> List[str]:
+    """将逗号分隔的字符串或列表转换为列表"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(',') if item.strip()]
+    return [str(item) for item in value]
+
+
+class CapturePolicy:
+    """网络捕获策略"""
+
+    def __init__(self, capacity: int = 1000,
+                 url_include: Union[None, str, Sequence[str]] = None,
+                 url_exclude: Union[None, str, Sequence[str]] = None,
+                 content_types: Union[None, str, Sequence[str]] = None,
+                 exclude_content_types: Union[None, str, Sequence[str]] = None,
+                 max_body_size: int = 1024 * 1024,
+                 body_mode: str = BODY_EAGER,
+                 spill_path: Optional[str] = None):
+        """初始化捕获策略
+
+        Args:
+            capacity: 请求和响应各自保留的最大记录数
+            url_include: 只记录匹配任一正则的URL
+            url_exclude: 不记录匹配任一正则的URL
+            content_types: 只记录Content-Type包含任一片段的响应
+            exclude_content_types: 不记录Content-Type包含任一片段的响应
+            max_body_size: 响应体大小上限（字节），超过时不读取响应体
+            body_mode: 响应体捕获模式，eager（立即读取，默认）、lazy（按需读取）或none
+            spill_path: 被淘汰记录的溢出文件路径（.jsonl.gz），为None时直接丢弃
+        """
+        if body_mode not in BODY_MODES:
+            raise ValueError(f"不支持的响应体捕获模式: {body_mode}")
+        if int(capacity) <= 0:
+            raise ValueError("缓冲区容量必须大于0")
+
+        self.capacity = int(capacity)
+        self.url_include = [compile_pattern(p) for p in _as_list(url_include)]
+        self.url_exclude = [compile_pattern(p) for p in _as_list(url_exclude)]
+        self.content_types = [t.lower() for t in _as_list(content_types)]
+        self.exclude_content_types = [
+            t.lower() for t in _as_list(exclude_content_types)]
+        self.max_body_size = int(max_body_size)
+        self.body_mode = body_mode
+        self.spill_path = spill_path
+
+    def url_allowed(self, url: str) -> bool:
+        """URL是否需要记录"""
+        if self.url_include and not any(p.search(url) for p in self.url_include):
+            return False
+        return not any(p.search(url) for p in self.url_exclude)
+
+    def content_type_allowed(self, content_type: str) -> bool:
+        """Content-Type是否需要记录"""
+        content_type = (content_type or '').lower()
+        if self.content_types and not any(
+                t in content_type for t in self.content_types):
+            return False
+        return not any(t in content_type for t in self.exclude_content_types)
+
+    def describe(self) -> Dict[str, Any]:
+        """获取策略描述"""
+        return {
+            'capacity': self.capacity,
+            'url_include': [p.pattern for p in self.url_include],
+            'url_exclude': [p.pattern for p in self.url_exclude],
+            'content_types': self.content_types,
+            'exclude_content_types': self.exclude_content_types,
+            'max_body_size': self.max_body_size,
+            'body_mode': self.body_mode,
+            'spill_path': self.spill_path,
+        }
+
+
+def compile_pattern(pattern: str) -> Pattern:
+    """编译URL正则表达式，使用进程内的表达式缓存"""
+    return expression_cache.regex(pattern)
+
+
+def _host_of(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def _path_prefix_of(path: str) -> str:
+    """路径首段，例如 /api/v1/users -> /api"""
+    if not path.startswith('/'):
+        path = '/' + path
+    end = path.find('/', 1)
+    return path if end == -1 else path[:end]
+
+
+# 索引名称 -> 从记录数据中提取索引键的函数
+INDEX_KEYS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    'host': lambda data: _host_of(data['url']),
+    'path_prefix': lambda data: _path_prefix_of(urlsplit(data['url']).path),
+    'method': lambda data: (data.get('method') or '').upper() or None,
+    'status': lambda data: data.get('status'),
+}
+
+
+class IndexedBuffer:
+    """带二级索引的环形缓冲区
+
+    记录按到达顺序分配递增序号。索引桶中保存序号，淘汰总是发生在最旧的记录上，
+    因此被淘汰记录的序号一定在各索引桶的队首。时间戳与记录并列保存，
+    时间窗口通过二分查找转换为序号区间。
+    """
+
+    def __init__(self, capacity: int,
+                 data_of: Callable[[Any], Dict[str, Any]] = lambda item: item):
+        """初始化缓冲区
+
+        Args:
+            capacity: 最大记录数
+            data_of: 从记录中取出数据字典的函数
+        """
+        self.capacity = capacity
+        self._data_of = data_of
+        self._items: List[Any] = []
+        self._timestamps: List[float] = []
+        self._head = 0      # _items中第一个有效记录的位置
+        self._base = 0      # _items[0]对应的序号
+        self._indexes: Dict[str, Dict[Any, deque]] = {
+            name: {} for name in INDEX_KEYS}
+        self._keys: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._items) - self._head
+
+    def __iter__(self) -> Iterator[Any]:
+        for position in range(self._head, len(self._items)):
+            yield self._items[position]
+
+    def clear(self):
+        """清空记录和索引"""
+        self._base += len(self._items)
+        self._items = []
+        self._timestamps = []
+        self._keys = []
+        self._head = 0
+        for index in self._indexes.values():
+            index.clear()
+
+    def resize(self, capacity: int) -> List[Any]:
+        """调整容量，返回被淘汰的记录"""
+        self.capacity = capacity
+        evicted = []
+        while len(self) > capacity:
+            evicted.append(self._evict())
+        return evicted
+
+    def append(self, item: Any) -> Optional[Any]:
+        """追加记录，时间戳取自记录数据的timestamp字段
+
+        Returns:
+            Optional[Any]: 缓冲区已满时被淘汰的最旧记录
+        """
+        evicted = self._evict() if len(self) >= self.capacity else None
+
+        seq = self._base + len(self._items)
+        data = self._data_of(item)
+        timestamp = data.get('timestamp') or time.time()
+        keys = {}
+        for name, key_of in INDEX_KEYS.items():
+            try:
+                key = key_of(data)
+            except Exception:
+                key = None
+            if key is not None:
+                keys[name] = key
+                self._indexes[name].setdefault(key, deque()).append(seq)
+
+        self._items.append(item)
+        self._timestamps.append(timestamp)
+        self._keys.append(keys)
+        return evicted
+
+    def query(self, filters: Optional[Dict[str, Any]] = None,
+              since: Optional[float] = None, until: Optional[float] = None,
+              predicate: Optional[Callable[[Dict[str, Any]], bool]] = None
+              ) -> List[Any]:
+        """按索引条件、时间窗口和附加条件查询记录
+
+        Args:
+            filters: 索引条件，键为INDEX_KEYS中的索引名称。path_prefix
+                可以是任意路径前缀，包含完整首段时先按首段索引再做前缀匹配
+            since: 起始时间戳（包含）
+            until: 结束时间戳（包含）
+            predicate: 附加条件，参数为记录数据
+
+        Returns:
+            List[Any]: 按到达顺序排列的匹配记录
+        """
+        filters = {k: v for k, v in (filters or {}).items() if v is not None}
+        path_prefix = filters.pop('path_prefix', None)
+        if path_prefix is not None:
+            if not path_prefix.startswith('/'):
+                path_prefix = '/' + path_prefix
+            # 只有包含完整首段时才能使用索引，例如 /api/ 或 /api/v1
+            if path_prefix.find('/', 1) != -1:
+                filters['path_prefix'] = _path_prefix_of(path_prefix)
+        if 'method' in filters:
+            filters['method'] = str(filters['method']).upper()
+        if 'host' in filters:
+            filters['host'] = str(filters['host']).lower()
+        if 'status' in filters:
+            filters['status'] = int(filters['status'])
+
+        lo = self._head
+        hi = len(self._items)
+        if since is not None:
+            lo = bisect_left(self._timestamps, since, lo, hi)
+        if until is not None:
+            hi = bisect_right(self._timestamps, until, lo, hi)
+
+        if filters:
+            buckets = []
+            for name, value in filters.items():
+                bucket = self._indexes[name].get(value)
+                if not bucket:
+                    return []
+                buckets.append(bucket)
+            # 桶内序号递增，从尾部向前扫描到时间窗口起点即可停止
+            positions = []
+            for seq in reversed(min(buckets, key=len)):
+                position = seq - self._base
+                if position < lo:
+                    break
+                if position < hi:
+                    positions.append(position)
+            positions.reverse()
+        else:
+            positions = range(lo, hi)
+
+        results = []
+        for position in positions:
+            keys = self._keys[position]
+            if any(keys.get(name) != value for name, value in filters.items()):
+                continue
+            item = self._items[position]
+            data = self._data_of(item)
+            if path_prefix is not None and not urlsplit(
+                    data['url']).path.startswith(path_prefix):
+                continue
+            if predicate is not None and not predicate(data):
+                continue
+            results.append(item)
+        return results
+
+    def _evict(self) -> Any:
+        position = self._head
+        for name, key in self._keys[position].items():
+            bucket = self._indexes[name][key]
+            bucket.popleft()
+            if not bucket:
+                del self._indexes[name][key]
+
+        item = self._items[position]
+        self._items[position] = None
+        self._keys[position] = None
+        self._head += 1
+
+        # 已淘汰的部分超过一半时压缩列表
+        if self._head > 1024 and self._head * 2 > len(self._items):
+            self._items = self._items[self._head:]
+            self._timestamps = self._timestamps[self._head:]
+            self._keys = self._keys[self._head:]
+            self._base += self._head
+            self._head = 0
+        return item
+
+
+class _ResponseRecord:
+    """响应记录，持有Playwright响应对象用于懒加载响应体"""
+
+    __slots__ = ('data', 'response', 'body_loaded')
+
+    def __init__(self, data: Dict[str, Any], response):
+        self.data = data
+        self.response = response
+        self.body_loaded = False
+
+
+class NetworkMonitor:
+    """网络监控器
+
+    用于监听和记录网络请求和响应
+    """
+
+    def __init__(self, page, policy: Optional[CapturePolicy] = None):
+        self.page = page
+        self.policy = policy or CapturePolicy()
+        self._requests = IndexedBuffer(self.policy.capacity)
+        self._responses = IndexedBuffer(
+            self.policy.capacity, lambda record: record.data)
+        self.is_monitoring = False
+        self.dropped = 0
+        self.spilled = 0
+        self._spill_file = None
+        self._request_handler = None
+        self._response_handler = None
+
+    def configure(self, policy: CapturePolicy):
+        """更新捕获策略，已有记录按新容量截断"""
+        self.policy = policy
+        for kind, buffer in (('request', self._requests),
+                             ('response', self._responses)):
+            for evicted in buffer.resize(policy.capacity):
+                self._dropped(kind, evicted)
+        self._close_spill()
+
+    def start_monitoring(self):
+        """开始监听网络请求"""
+        if self.is_monitoring:
+            return
+
+        self._requests.clear()
+        self._responses.clear()
+        self.dropped = 0
+        self.spilled = 0
+
+        def on_request(request):
+            if not self.policy.url_allowed(request.url):
+                return
+            request_data = {
+                'url': request.url,
+                'method': request.method,
+                'headers': dict(request.headers),
+                'post_data': request.post_data,
+                'timestamp': self._get_timestamp()
+            }
+            self._append(self._requests, request_data, 'request')
+            logger.debug(f"捕获请求: {request.method} {request.url}")
+
+        def on_response(response):
+            if not self.policy.url_allowed(response.url):
+                return
+            headers = dict(response.headers)
+            if not self.policy.content_type_allowed(
+                    headers.get('content-type', '')):
+                return
+
+            response_data = {
+                'url': response.url,
+                'method': self._request_method(response),
+                'status': response.status,
+                'status_text': response.status_text,
+                'headers': headers,
+                'timestamp': self._get_timestamp()
+            }
+            record = _ResponseRecord(response_data, response)
+            if self.policy.body_mode == BODY_EAGER:
+                self._load_body(record)
+            self._append(self._responses, record, 'response')
+            logger.debug(f"捕获响应: {response.status} {response.url}")
+
+        self._request_handler = on_request
+        self._response_handler = on_response
+
+        self.page.on('request', self._request_handler)
+        self.page.on('response', self._response_handler)
+        self.is_monitoring = True
+        logger.info("网络监听已开始")
+
+    def stop_monitoring(self):
+        """停止监听网络请求"""
+        if not self.is_monitoring:
+            return
+
+        if self._request_handler:
+            self.page.remove_listener('request', self._request_handler)
+        if self._response_handler:
+            self.page.remove_listener('response', self._response_handler)
+
+        self._close_spill()
+        self.is_monitoring = False
+        logger.info("网络监听已停止")
+
+    @property
+    def requests(self) -> List[Dict[str, Any]]:
+        """已捕获的请求"""
+        return list(self._requests)
+
+    @property
+    def responses(self) -> List[Dict[str, Any]]:
+        """已捕获的响应元数据（不读取响应体）"""
+        return [record.data for record in self._responses]
+
+    def get_requests(
+        self, url_pattern: Optional[str] = None,
+        method: Optional[str] = None, host: Optional[str] = None,
+        path_prefix: Optional[str] = None,
+        since: Optional[float] = None, until: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """获取捕获的请求
+
+        Args:
+            url_pattern: URL匹配模式（正则表达式）
+            method: 请求方法
+            host: 主机（含端口）
+            path_prefix: 路径前缀
+            since: 起始时间戳
+            until: 结束时间戳
+
+        Returns:
+            List[Dict[str, Any]]: 匹配的请求列表
+        """
+        return self._requests.query(
+            {'method': method, 'host': host, 'path_prefix': path_prefix},
+            since, until, self._url_predicate(url_pattern))
+
+    def get_responses(
+        self, url_pattern: Optional[str] = None, include_body: bool = True,
+        method: Optional[str] = None, status: Optional[int] = None,
+        host: Optional[str] = None, path_prefix: Optional[str] = None,
+        since: Optional[float] = None, until: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """获取捕获的响应
+
+        Args:
+            url_pattern: URL匹配模式（正则表达式）
+            include_body: 是否读取响应体（text/json），懒加载模式下此时才读取
+            method: 请求方法
+            status: 状态码
+            host: 主机（含端口）
+            path_prefix: 路径前缀
+            since: 起始时间戳
+            until: 结束时间戳
+
+        Returns:
+            List[Dict[str, Any]]: 匹配的响应列表
+        """
+        records = self._responses.query(
+            {'method': method, 'status': status, 'host': host,
+             'path_prefix': path_prefix},
+            since, until, self._url_predicate(url_pattern))
+
+        if include_body and self.policy.body_mode != BODY_NONE:
+            for record in records:
+                self._load_body(record)
+        return [dict(record.data) for record in records]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取捕获统计信息"""
+        return {
+            'requests': len(self._requests),
+            'responses': len(self._responses),
+            'dropped': self.dropped,
+            'spilled': self.spilled,
+            'policy': self.policy.describe(),
+        }
+
+    def _load_body(self, record: _ResponseRecord):
+        """读取响应体，超过大小上限或读取失败时记录原因"""
+        if record.body_loaded:
+            return
+        record.body_loaded = True
+        data = record.data
+        data['text'] = None
+        data['json'] = None
+
+        max_size = self.policy.max_body_size
+        content_length = data['headers'].get('content-length')
+        if content_length and content_length.isdigit() and int(content_length) > max_size:
+            data['body_skipped'] = f'响应体超过{max_size}字节'
+            return
+
+        try:
+            body = record.response.body()
+            if len(body) > max_size:
+                data['body_skipped'] = f'响应体超过{max_size}字节'
+                return
+            content_type = data['headers'].get('content-type', '')
+            charset = re.search(r'charset=([\w-]+)', content_type)
+            data['text'] = body.decode(charset.group(1) if charset else 'utf-8')
+            if 'application/json' in content_type:
+                data['json'] = json.loads(data['text'])
+        except Exception as e:
+            data['body_error'] = str(e)
+            logger.debug(f"无法获取响应内容: {str(e)}")
+        finally:
+            # 响应体已读取或确定不读取，释放响应对象
+            record.response = None
+
+    def _append(self, buffer: IndexedBuffer, item, kind: str):
+        """追加记录，缓冲区已满时淘汰最旧的记录"""
+        evicted = buffer.append(item)
+        if evicted is not None:
+            self._dropped(kind, evicted)
+
+    def _dropped(self, kind: str, evicted):
+        self.dropped += 1
+        if self.policy.spill_path:
+            if isinstance(evicted, _ResponseRecord):
+                evicted = evicted.data
+            self._spill(kind, evicted)
+
+    @staticmethod
+    def _url_predicate(url_pattern: Optional[str]):
+        if not url_pattern:
+            return None
+        pattern = compile_pattern(url_pattern)
+        return lambda data: pattern.search(data['url']) is not None
+
+    @staticmethod
+    def _request_method(response) -> Optional[str]:
+        try:
+            return response.request.method
+        except Exception:
+            return None
+
+    def _spill(self, kind: str, data: Dict[str, Any]):
+        """将被淘汰的记录追加写入溢出文件"""
+        try:
+            if self._spill_file is None:
+                self._spill_file = gzip.open(
+                    self.policy.spill_path, 'at', encoding='utf-8')
+            self._spill_file.write(json.dumps(
+                dict(data, kind=kind), ensure_ascii=False, default=str) + '\n')
+            self.spilled += 1
+        except Exception as e:
+            logger.warning(f"写入网络记录溢出文件失败: {str(e)}")
+
+    def _close_spill(self):
+        if self._spill_file is not None:
+            try:
+                self._spill_file.close()
+            except Exception:
+                pass
+            self._spill_file = None
+
+    def _get_timestamp(self):
+        """获取当前时间戳"""
+        return time.time()
+
+
+def read_spill_file(path: str) -> List[Dict[str, Any]]:
+    """读取溢出文件中的记录
+
+    Args:
+        path: 溢出文件路径
+
+    Returns:
+        List[Dict[str, Any]]: 记录列表，kind字段为request或response
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -9,6 +9,8 @@ from pathlib import Path
 from typing import Optional, Dict, Any, Union
 from playwright.sync_api import Page
 
+from .artifacts import artifact_writer
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,7 +29,6 @@ class PageContext:
         self.page = page
         self.screenshots_dir = Path("screenshots")
         self.videos_dir = Path("videos")
-        self.recording_path: Optional[str] = None
 
         # 确保目录存在
         self.screenshots_dir.mkdir(exist_ok=True)
@@ -96,56 +97,85 @@ class PageContext:
         """
         return self.page.url
 
-    def screenshot(self, path: Optional[str] = None, 
-                  element_selector: Optional[str] = None,
-                  full_page: bool = False) -> str:
+    def capture(self, element_selector: Optional[str] = None,
+                full_page: bool = False,
+                image_format: Optional[str] = None) -> bytes:
+        """截图到内存，不写入文件
+
+        Args:
+            element_selector: 要截图的元素选择器
+            full_page: 是否截取整页
+            image_format: 截图格式，None时使用artifact_writer的默认格式
+
+        Returns:
+            bytes: 浏览器输出的截图字节（webp格式时为PNG，由写入线程转换）
+        """
+        options = artifact_writer.screenshot_options(image_format)
+        if element_selector:
+            # 截取指定元素
+            from .element_locator import ElementLocator
+            locator = ElementLocator.for_page(self.page)
+            element = locator.locate(element_selector)
+            return element.screenshot(**options)
+        # 截取整个页面
+        return self.page.screenshot(full_page=full_page, **options)
+
+    def screenshot(self, path: Optional[str] = None,
+                   element_selector: Optional[str] = None,
+                   full_page: bool = False, wait: bool = False,
+                   name: str = "页面截图",
+                   allow_buffer: bool = True) -> Optional[str]:
         """截图
 
+        截图字节交给artifact_writer在后台写入文件并附加到报告。
+        指定path时总是写入该路径；未指定时生成文件名，与上一帧相同或
+        放入环形缓冲时不再写入（allow_buffer为False时按指定路径处理）。
+
         Args:
-            path: 截图保存路径
+            path: 截图保存路径，扩展名为png/jpg/webp时使用对应格式
             element_selector: 要截图的元素选择器
             full_page: 是否截取整页
+            wait: 是否等待这一帧写入完成后再返回
+            name: Allure附件名称
+            allow_buffer: 未指定path时是否允许去重和环形缓冲
 
         Returns:
-            str: 截图文件路径
+            Optional[str]: 截图文件路径，帧暂存在环形缓冲中时为None
         """
+        auto_named = path is None and allow_buffer
         if path is None:
             # 生成默认文件名
             import datetime
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            path = str(self.screenshots_dir / f"screenshot_{timestamp}.png")
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            filename = f"screenshot_{timestamp}.{artifact_writer.extension}"
+            path = str(self.screenshots_dir / filename)
         else:
             # 确保路径是绝对路径
             if not os.path.isabs(path):
                 path = str(self.screenshots_dir / path)
 
-        # 确保目录存在
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-
-        if element_selector:
-            # 截取指定元素
-            from .element_locator import ElementLocator
-            locator = ElementLocator(self.page)
-            element = locator.locate(element_selector)
-            element.screenshot(path=path)
-        else:
-            # 截取整个页面
-            self.page.screenshot(path=path, full_page=full_page)
-
+        image_format = artifact_writer.format_for(path)
+        data = self.capture(element_selector, full_page, image_format)
+        path = artifact_writer.submit(data, path, name, image_format,
+                                      auto_named=auto_named)
+        if wait and path:
+            artifact_writer.wait_for(path)
         return path
 
-    def start_video_recording(self, path: Optional[str] = None) -> str:
+    def start_video_recording(self, path: Optional[str] = None,
+                              size: Optional[str] = None) -> str:
         """开始录制视频
 
+        录制状态由browser_manager保存，录制期间当前页面切换为录制上下文中的页面。
+
         Args:
             path: 录制文件保存路径
+            size: 视频尺寸，如"640x360"
 
         Returns:
             str: 录制文件路径
         """
-        if self.recording_path:
-            logger.warning("已有录制在进行中")
-            return self.recording_path
+        from .browser_manager import browser_manager
 
         if path is None:
             # 生成默认文件名
@@ -160,9 +190,7 @@ class PageContext:
         # 确保目录存在
         os.makedirs(os.path.dirname(path), exist_ok=True)
 
-        self.recording_path = path
-        logger.info(f"录制已开始，将保存到: {path}")
-        return path
+        return browser_manager.start_video_recording(path, size)
 
     def stop_recording(self) -> Optional[str]:
         """停止录制视频
@@ -170,14 +198,9 @@ class PageContext:
         Returns:
             Optional[str]: 视频文件路径，如果没有在录制则返回None
         """
-        if self.recording_path:
-            path = self.recording_path
-            self.recording_path = None
-            logger.info(f"录制已停止，视频保存在: {path}")
-            return path
-        else:
-            logger.warning("没有正在进行的录制")
-            return None
+        from .browser_manager import browser_manager
+
+        return browser_manager.stop_video_recording()
 
     def wait_for_load_state(self, state: str = "load", 
                            timeout: Optional[float] = None):
@@ -0,0 +1,206 @@
+"""关键字耗时分析
+
+为每个UI关键字记录一次执行的：
+
+- 墙钟耗时
+- Playwright驱动往返次数（同步API的每次阻塞调用）
+- 等待时间（阻塞在驱动调用上的时间）与活跃时间（其余的Python端时间）
+- 涉及的定位器或URL
+
+记录按行写入JSONL或CSV文件（按扩展名区分），由
+``python -m pytest_dsl_ui profile`` 汇总为各关键字的p50/p95/p99和最慢步骤。
+通过环境变量PYTEST_DSL_UI_PROFILE或[配置性能分析]关键字指定输出文件，
+路径中的{pid}替换为进程号，并行执行时每个工作进程写入独立的文件。
+"""
+
+import csv
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_FIELDS = ['ts', 'keyword', 'wall_ms', 'driver_calls', 'wait_ms',
+                  'active_ms', 'target', 'status', 'error', 'test', 'pid']
+
+# 按顺序查找关键字参数中的操作目标
+_TARGET_KEYS = ('selector', 'element_selector', 'url', 'pattern', 'source',
+                'client', 'path')
+
+
+class _Record:
+    """一次关键字执行的计数"""
+
+    __slots__ = ('driver_calls', 'wait')
+
+    def __init__(self):
+        self.driver_calls = 0
+        self.wait = 0.0
+
+
+class KeywordProfiler:
+    """关键字耗时分析器"""
+
+    def __init__(self):
+        self.output_path: Optional[str] = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._file = None
+        self._csv_writer = None
+        self._original_sync = None
+        path = os.environ.get('PYTEST_DSL_UI_PROFILE')
+        if path:
+            self.enable(path)
+
+    @property
+    def enabled(self) -> bool:
+        return self.output_path is not None
+
+    def enable(self, output_path: str):
+        """开始记录到指定文件（追加写入）"""
+        self.disable()
+        output_path = output_path.replace('{pid}', str(os.getpid()))
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(output_path, 'a', encoding='utf-8', newline='')
+        if output_path.lower().endswith('.csv'):
+            self._csv_writer = csv.DictWriter(self._file, PROFILE_FIELDS)
+            if self._file.tell() == 0:
+                self._csv_writer.writeheader()
+        self.output_path = output_path
+        self._patch_driver()
+        logger.info(f"关键字耗时分析已启用: {output_path}")
+
+    def disable(self):
+        """停止记录并关闭文件"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            self._file = None
+            self._csv_writer = None
+            self.output_path = None
+
+    def _stack(self) -> List[_Record]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _patch_driver(self):
+        """统计Playwright同步API的阻塞调用，只安装一次"""
+        if self._original_sync is not None:
+            return
+        try:
+            from playwright._impl._sync_base import SyncBase
+        except ImportError:
+            return
+
+        original = SyncBase._sync
+        profiler = self
+
+        @functools.wraps(original)
+        def _sync(base, coro):
+            stack = profiler._stack()
+            if not stack:
+                return original(base, coro)
+            start = time.perf_counter()
+            try:
+                return original(base, coro)
+            finally:
+                elapsed = time.perf_counter() - start
+                # 嵌套关键字的耗时计入每一层
+                for record in stack:
+                    record.driver_calls += 1
+                    record.wait += elapsed
+
+        SyncBase._sync = _sync
+        self._original_sync = original
+
+    def wrap(self, keyword: str, func: Callable) -> Callable:
+        """包装关键字函数，未启用时直接调用"""
+        @functools.wraps(func)
+        def profiled(**kwargs):
+            if not self.enabled:
+                return func(**kwargs)
+            return self._run(keyword, func, kwargs)
+        profiled.__profiled__ = True
+        return profiled
+
+    def _run(self, keyword: str, func: Callable, kwargs: Dict[str, Any]):
+        record = _Record()
+        stack = self._stack()
+        stack.append(record)
+        ts = time.time()
+        start = time.perf_counter()
+        error = None
+        try:
+            return func(**kwargs)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            wall = time.perf_counter() - start
+            stack.pop()
+            self._write({
+                'ts': round(ts, 3),
+                'keyword': keyword,
+                'wall_ms': round(wall * 1000, 2),
+                'driver_calls': record.driver_calls,
+                'wait_ms': round(record.wait * 1000, 2),
+                'active_ms': round(max(wall - record.wait, 0) * 1000, 2),
+                'target': _find_target(kwargs),
+                'status': 'failed' if error is not None else 'passed',
+                'error': type(error).__name__ if error is not None else '',
+                'test': os.environ.get('PYTEST_CURRENT_TEST', ''),
+                'pid': os.getpid(),
+            })
+
+    def _write(self, row: Dict[str, Any]):
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                if self._csv_writer is not None:
+                    self._csv_writer.writerow(row)
+                else:
+                    self._file.write(json.dumps(row, ensure_ascii=False) + '\n')
+                self._file.flush()
+            except Exception as e:
+                logger.warning(f"写入关键字耗时记录失败: {str(e)}")
+
+    def instrument(self, manager, module_prefix: str = 'pytest_dsl_ui.') -> int:
+        """包装关键字管理器中由本包注册的关键字
+
+        Args:
+            manager: pytest-dsl的关键字管理器
+            module_prefix: 只包装函数所在模块以此开头的关键字
+
+        Returns:
+            int: 新包装的关键字数量
+        """
+        count = 0
+        for name, info in manager._keywords.items():
+            func = info.get('func')
+            if (func is None or getattr(func, '__profiled__', False)
+                    or not getattr(func, '__module__', '').startswith(module_prefix)):
+                continue
+            info['func'] = self.wrap(name, func)
+            count += 1
+        return count
+
+
+def _find_target(kwargs: Dict[str, Any]) -> str:
+    for key in _TARGET_KEYS:
+        value = kwargs.get(key)
+        if value:
+            return str(value)[:200]
+    return ''
+
+
+# 全局关键字耗时分析器
+keyword_profiler = KeywordProfiler()
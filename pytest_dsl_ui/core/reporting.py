@@ -0,0 +1,178 @@
+"""Allure报告门面
+
+关键字和HTTP客户端通过reporter写入Allure步骤和附件，报告级别：
+
+- full：立即写入所有附件（默认）
+- sampled：按采样率写入成功路径的附件，同一个最外层步骤内的附件一起采样或丢弃
+- failures-only：成功路径的附件先缓存，步骤失败时才格式化并写入
+- off：不写入附件
+
+失败路径（在except块中调用attach或指定failure=True）的附件在off以外的级别
+都立即写入，并先写入之前缓存的附件。
+附件内容可以是返回内容的函数，只在确定写入时才调用，成功路径不再付出格式化开销。
+级别通过环境变量PYTEST_DSL_UI_REPORT_LEVEL、PYTEST_DSL_UI_REPORT_SAMPLE_RATE
+或reporter.configure设置。
+"""
+
+import logging
+import os
+import random
+import sys
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, List, Optional, Union
+
+import allure
+
+logger = logging.getLogger(__name__)
+
+REPORT_LEVELS = ('off', 'failures-only', 'sampled', 'full')
+
+# failures-only级别下每个线程最多缓存的附件数量
+DEFAULT_BUFFER_SIZE = 200
+
+
+class _ThreadState(threading.local):
+    """每个线程的步骤深度、采样结果和附件缓存"""
+
+    def __init__(self):
+        self.depth = 0
+        self.sampled = True
+        self.buffer = deque(maxlen=DEFAULT_BUFFER_SIZE)
+
+
+class Reporter:
+    """Allure报告门面"""
+
+    def __init__(self, level: Optional[str] = None,
+                 sample_rate: Optional[float] = None):
+        """初始化报告门面
+
+        Args:
+            level: 报告级别，None时读取环境变量，默认full
+            sample_rate: sampled级别的采样率（0-1），None时读取环境变量，默认0.1
+        """
+        self.level = 'full'
+        self.sample_rate = 0.1
+        self._state = _ThreadState()
+        self._failure_hooks: List[Callable[[], None]] = []
+        self.configure(
+            level or os.environ.get('PYTEST_DSL_UI_REPORT_LEVEL', 'full'),
+            sample_rate if sample_rate is not None
+            else os.environ.get('PYTEST_DSL_UI_REPORT_SAMPLE_RATE', 0.1))
+
+    def configure(self, level: Optional[str] = None,
+                  sample_rate: Optional[float] = None):
+        """设置报告级别和采样率"""
+        if level is not None:
+            if level not in REPORT_LEVELS:
+                raise ValueError(
+                    f"不支持的报告级别: {level}，可选: {', '.join(REPORT_LEVELS)}")
+            self.level = level
+        if sample_rate is not None:
+            sample_rate = float(sample_rate)
+            if not 0 <= sample_rate <= 1:
+                raise ValueError(f"采样率必须在0到1之间: {sample_rate}")
+            self.sample_rate = sample_rate
+        self._state.buffer.clear()
+
+    @contextmanager
+    def step(self, title: str):
+        """Allure步骤
+
+        failures-only级别下步骤因异常退出时，先写入缓存的附件再结束步骤；
+        最外层步骤结束时清空缓存。sampled级别在最外层步骤开始时决定是否采样。
+        """
+        state = self._state
+        outermost = state.depth == 0
+        if outermost:
+            state.sampled = random.random() < self.sample_rate
+        state.depth += 1
+        try:
+            with allure.step(title):
+                try:
+                    yield
+                except BaseException:
+                    self.flush()
+                    self._run_failure_hooks()
+                    raise
+        finally:
+            state.depth -= 1
+            if outermost:
+                state.buffer.clear()
+
+    def attach(self, body: Union[str, bytes, Callable[[], Any]],
+               name: Optional[str] = None, attachment_type=None,
+               extension: Optional[str] = None, failure: bool = False):
+        """按报告级别写入或缓存附件
+
+        Args:
+            body: 附件内容，或返回附件内容的函数
+            name: 附件名称
+            attachment_type: allure.attachment_type
+            extension: 文件扩展名
+            failure: 是否是失败路径的附件，在except块中调用时自动视为失败路径
+        """
+        level = self.level
+        if level == 'off':
+            return
+        if level == 'full' or failure or sys.exc_info()[1] is not None:
+            # 失败路径：先补上失败前缓存的附件
+            self.flush()
+            self._write(body, name, attachment_type, extension)
+        elif level == 'sampled':
+            state = self._state
+            sampled = (state.sampled if state.depth
+                       else random.random() < self.sample_rate)
+            if sampled:
+                self._write(body, name, attachment_type, extension)
+        else:
+            self._state.buffer.append((body, name, attachment_type, extension))
+
+    def attach_file(self, path: str, name: Optional[str] = None,
+                    attachment_type=None, extension: Optional[str] = None):
+        """按报告级别附加文件，只在确定写入时读取文件"""
+        def read():
+            with open(path, 'rb') as f:
+                return f.read()
+        self.attach(read, name=name, attachment_type=attachment_type,
+                    extension=extension)
+
+    def add_failure_hook(self, hook: Callable[[], None]):
+        """注册步骤失败时调用的函数，例如写入缓冲的截图"""
+        if hook not in self._failure_hooks:
+            self._failure_hooks.append(hook)
+
+    def _run_failure_hooks(self):
+        if self.level == 'off':
+            return
+        for hook in self._failure_hooks:
+            try:
+                hook()
+            except Exception as e:
+                logger.warning(f"执行步骤失败回调出错: {str(e)}")
+
+    def flush(self):
+        """写入当前线程缓存的附件"""
+        buffer = self._state.buffer
+        while buffer:
+            self._write(*buffer.popleft())
+
+    def discard(self):
+        """丢弃当前线程缓存的附件"""
+        self._state.buffer.clear()
+
+    def _write(self, body, name, attachment_type, extension):
+        try:
+            if callable(body):
+                body = body()
+            allure.attach(body, name=name, attachment_type=attachment_type,
+                          extension=extension)
+        except Exception as e:
+            # 报告失败不影响测试结果
+            logger.warning(f"写入Allure附件失败({name}): {str(e)}")
+
+
+# 全局报告门面
+reporter = Reporter()
@@ -0,0 +1,270 @@
+"""请求配置模板和引用文件缓存
+
+数据驱动的用例会成千上万次引用同一个请求体/请求头文件和同一段请求配置。
+这里缓存：
+
+- 引用文件：按(路径, 修改时间, 编码, 类型)缓存解析后的JSON/YAML结构，
+  文件修改后自动重新加载
+- 模板：占位符位置只扫描一次（预编译），每次请求只做变量替换
+- YAML请求配置：按替换变量后的文本缓存解析结果
+
+引用文件（非模板）的解析结果在请求间共享，调用方不应修改；
+请求配置的解析结果每次返回深拷贝。
+"""
+
+import copy
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Tuple, Union
+
+import yaml
+
+# pytest-dsl不可用时的简单占位符语法
+_SIMPLE_PLACEHOLDER = re.compile(r'\$\{([^}]+)\}')
+
+
+def detect_file_type(file_path: str, file_type: str = 'auto') -> str:
+    """根据扩展名确定文件类型：json、yaml或text"""
+    if file_type != 'auto':
+        return file_type
+    file_ext = os.path.splitext(file_path)[1].lower()
+    if file_ext in ['.json']:
+        return 'json'
+    elif file_ext in ['.yaml', '.yml']:
+        return 'yaml'
+    return 'text'
+
+
+def parse_content(content: str, file_type: str, file_path: str) -> Any:
+    """按文件类型解析文本内容"""
+    if file_type == 'json':
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"无效的JSON文件 {file_path}: {str(e)}")
+    elif file_type == 'yaml':
+        try:
+            return yaml.safe_load(content)
+        except yaml.YAMLError as e:
+            raise ValueError(f"无效的YAML文件 {file_path}: {str(e)}")
+    return content
+
+
+def _find_placeholders(text: str) -> List[Tuple[int, int, str]]:
+    """扫描${...}占位符，返回(开始, 结束, 引用表达式)列表"""
+    try:
+        from pytest_dsl.core.variable_utils import VariableReplacer
+        return VariableReplacer()._find_placeholders(text)
+    except ImportError:
+        return [(m.start(), m.end(), m.group(1))
+                for m in _SIMPLE_PLACEHOLDER.finditer(text)]
+
+
+class CompiledTemplate:
+    """预编译的文本模板
+
+    占位符位置在编译时确定，渲染时只对占位符求值并拼接，
+    结果与VariableReplacer.replace_in_string一致。
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        # 字面量为str，占位符为(引用表达式, 原文)
+        self._parts: List[Union[str, Tuple[str, str]]] = []
+        position = 0
+        for start, end, var_ref in (_find_placeholders(text) if '${' in text else []):
+            if start > position:
+                self._parts.append(text[position:start])
+            self._parts.append((var_ref, text[start:end]))
+            position = end
+        if position < len(text):
+            self._parts.append(text[position:])
+
+    @property
+    def is_static(self) -> bool:
+        """模板是否不含占位符"""
+        return all(isinstance(part, str) for part in self._parts)
+
+    def render(self, test_context=None) -> Any:
+        """替换变量
+
+        整个模板只是一个占位符时返回变量的原始值，否则返回字符串。
+
+        Raises:
+            KeyError: 变量不存在
+        """
+        if self.is_static:
+            return self.text
+
+        try:
+            from pytest_dsl.core.variable_utils import VariableReplacer
+        except ImportError:
+            # 简单的变量替换，未定义的变量保留原文
+            variables = getattr(test_context, '_vars', {}) if test_context else {}
+            return "".join(
+                part if isinstance(part, str)
+                else str(variables[part[0]]) if part[0] in variables else part[1]
+                for part in self._parts)
+
+        replacer = VariableReplacer(test_context=test_context)
+        if len(self._parts) == 1:
+            return replacer.replace_in_string(self._parts[0][1])
+
+        rendered = []
+        for part in self._parts:
+            if isinstance(part, str):
+                rendered.append(part)
+            else:
+                value = replacer.replace_in_string(part[1])
+                rendered.append('null' if value is None else str(value))
+        return "".join(rendered)
+
+
+class _LRU:
+    """带命中统计的LRU字典"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any:
+        value = self._items.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._items.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        return {'size': len(self._items), 'hits': self.hits, 'misses': self.misses}
+
+
+class TemplateCache:
+    """请求配置模板和引用文件缓存"""
+
+    def __init__(self, maxsize: int = 256):
+        """初始化缓存
+
+        Args:
+            maxsize: 引用文件、模板和解析后的配置各自最多缓存的数量
+        """
+        self._files = _LRU(maxsize)
+        self._templates = _LRU(maxsize)
+        self._configs = _LRU(maxsize)
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def compile(self, text: str) -> CompiledTemplate:
+        """获取预编译的模板"""
+        with self._lock:
+            template = self._templates.get(text)
+            if template is None:
+                template = CompiledTemplate(text)
+                self._templates.put(text, template)
+            return template
+
+    def load_file(self, file_path: str, is_template: bool = False,
+                  file_type: str = 'auto', encoding: str = 'utf-8',
+                  test_context=None) -> Any:
+        """加载引用文件
+
+        非模板文件返回缓存的解析结果；模板文件缓存预编译模板，
+        每次替换变量后解析（占位符可能位于JSON/YAML字符串之外）。
+        不含占位符的模板按普通文件处理。
+
+        Args:
+            file_path: 文件路径
+            is_template: 是否替换文件中的变量
+            file_type: json、yaml、text或auto（按扩展名判断）
+            encoding: 文件编码
+            test_context: 替换变量使用的测试上下文
+
+        Returns:
+            Any: 解析后的文件内容
+        """
+        try:
+            mtime = os.stat(file_path).st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"找不到引用的文件: {file_path}")
+        file_type = detect_file_type(file_path, file_type)
+        key = (os.path.abspath(file_path), encoding, file_type, is_template)
+
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is not None and entry[0] != mtime:
+                self.reloads += 1
+                entry = None
+
+        if entry is None:
+            with open(file_path, 'r', encoding=encoding) as f:
+                content = f.read()
+            template = CompiledTemplate(content) if is_template else None
+            if template is None or template.is_static:
+                entry = (mtime, parse_content(content, file_type, file_path), None)
+            else:
+                entry = (mtime, None, template)
+            with self._lock:
+                self._files.put(key, entry)
+
+        _, parsed, template = entry
+        if template is None:
+            return parsed
+        return parse_content(template.render(test_context), file_type, file_path)
+
+    def parse_config(self, text: str, test_context=None) -> Any:
+        """替换变量并解析YAML请求配置，返回解析结果的深拷贝
+
+        Raises:
+            yaml.YAMLError: 配置不是有效的YAML
+        """
+        rendered = self.compile(text).render(test_context)
+        if not isinstance(rendered, str):
+            return rendered
+        if not rendered:
+            return {}
+
+        with self._lock:
+            parsed = self._configs.get(rendered)
+        if parsed is None:
+            parsed = (yaml.safe_load(rendered),)
+            with self._lock:
+                self._configs.put(rendered, parsed)
+        return copy.deepcopy(parsed[0])
+
+    def clear(self):
+        """清空缓存和统计"""
+        with self._lock:
+            self._files.clear()
+            self._templates.clear()
+            self._configs.clear()
+            self.reloads = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        with self._lock:
+            return {
+                'files': dict(self._files.get_stats(), reloads=self.reloads),
+                'templates': self._templates.get_stats(),
+                'configs': self._configs.get_stats(),
+            }
+
+
+# 全局模板和文件缓存
+template_cache = TemplateCache()
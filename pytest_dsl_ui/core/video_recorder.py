@@ -0,0 +1,280 @@
+"""视频录制管理
+
+带record_video_dir创建的上下文由VideoRecorder跟踪其页面的视频，
+Playwright在上下文关闭时写出视频文件，之后按保留策略处理：
+
+- on-failure：只保留录制期间有用例失败的上下文的视频，其余删除（默认）
+- always：保留所有视频
+
+步骤失败由reporter的失败回调通知。在pytest中运行时，步骤失败先按当前用例
+（PYTEST_CURRENT_TEST）记为待定，由pytest_plugin在用例结束时按实际结果确认：
+被DSL捕获、用例最终通过的步骤失败不会保留视频；用例结束前关闭的上下文的视频
+总是暂时保留，用例通过后再删除，因此UI步骤之外的失败同样会保留视频。
+不在pytest中运行时，任何步骤失败都会保留视频。
+保留的视频可以在后台线程中用ffmpeg转码（例如转为体积更小的mp4），
+不占用测试执行时间；没有安装ffmpeg时跳过转码。
+通过环境变量PYTEST_DSL_UI_VIDEO_RETENTION、PYTEST_DSL_UI_VIDEO_TRANSCODE
+或video_recorder.configure设置。
+"""
+
+import atexit
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .reporting import reporter
+
+logger = logging.getLogger(__name__)
+
+VIDEO_RETENTIONS = ('on-failure', 'always')
+
+
+def parse_video_size(value) -> Optional[Dict[str, int]]:
+    """解析视频尺寸，支持"640x360"或{"width": 640, "height": 360}"""
+    if not value:
+        return None
+    if isinstance(value, dict):
+        return {'width': int(value['width']), 'height': int(value['height'])}
+    try:
+        width, height = str(value).lower().replace('*', 'x').split('x')
+        return {'width': int(width), 'height': int(height)}
+    except ValueError:
+        raise ValueError(f"视频尺寸格式应为 宽x高: {value}")
+
+
+def current_test_id() -> Optional[str]:
+    """当前pytest用例的nodeid，不在pytest中运行时为None"""
+    current = os.environ.get('PYTEST_CURRENT_TEST')
+    return current.rsplit(' ', 1)[0] if current else None
+
+
+class _Recording:
+    """一个录制视频的上下文"""
+
+    __slots__ = ('videos', 'failed', 'pending', 'keep', 'target_path')
+
+    def __init__(self):
+        self.videos: List[Any] = []
+        self.failed = False
+        # 有步骤失败、但尚未结束的用例
+        self.pending: Set[str] = set()
+        self.keep = False
+        self.target_path: Optional[str] = None
+
+
+class VideoRecorder:
+    """视频录制管理器"""
+
+    def __init__(self, retention: Optional[str] = None,
+                 transcode: Optional[str] = None):
+        """初始化视频录制管理器
+
+        Args:
+            retention: 保留策略（on-failure或always），None时读取环境变量，默认on-failure
+            transcode: 转码目标扩展名（如mp4），None时读取环境变量，默认不转码
+        """
+        self.retention = 'on-failure'
+        self.transcode: Optional[str] = None
+        self._recordings: Dict[int, _Recording] = {}
+        # 等待用例结果再决定是否删除的视频：(视频路径, 尚未结束的用例)
+        self._deferred: List[Tuple[List[str], Set[str]]] = []
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Tuple[str, str]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {'recorded': 0, 'kept': 0, 'deleted': 0,
+                      'transcoded': 0, 'transcode_failed': 0}
+        self.configure(
+            retention or os.environ.get('PYTEST_DSL_UI_VIDEO_RETENTION', 'on-failure'),
+            transcode if transcode is not None
+            else os.environ.get('PYTEST_DSL_UI_VIDEO_TRANSCODE', ''))
+        reporter.add_failure_hook(self.mark_failed)
+
+    def configure(self, retention: Optional[str] = None,
+                  transcode: Optional[str] = None):
+        """设置保留策略和转码格式，transcode为空字符串时关闭转码"""
+        if retention is not None:
+            if retention not in VIDEO_RETENTIONS:
+                raise ValueError(f"不支持的视频保留策略: {retention}，"
+                                 f"可选: {', '.join(VIDEO_RETENTIONS)}")
+            self.retention = retention
+        if transcode is not None:
+            self.transcode = transcode.lstrip('.').lower() or None
+
+    def track(self, context):
+        """跟踪带record_video_dir创建的上下文，需要在创建页面前调用"""
+        recording = _Recording()
+        with self._lock:
+            self._recordings[id(context)] = recording
+        context.on('page', lambda page: recording.videos.append(page.video))
+
+    def retain(self, context, target_path: Optional[str] = None):
+        """无论测试结果都保留上下文的视频，并移动到target_path（不转码）"""
+        with self._lock:
+            recording = self._recordings.get(id(context))
+        if recording is None:
+            raise ValueError("上下文没有在录制视频")
+        recording.keep = True
+        recording.target_path = target_path
+
+    def is_tracked(self, context) -> bool:
+        return id(context) in self._recordings
+
+    def mark_failed(self):
+        """步骤失败时标记所有录制中的上下文
+
+        在pytest中运行时只记为当前用例待定，由test_finished按用例结果确认。
+        """
+        test_id = current_test_id()
+        with self._lock:
+            for recording in self._recordings.values():
+                if test_id is None:
+                    recording.failed = True
+                else:
+                    recording.pending.add(test_id)
+
+    def test_finished(self, test_id: str, failed: bool):
+        """用例结束时确认其步骤失败，由pytest_plugin调用
+
+        Args:
+            test_id: 用例nodeid
+            failed: 用例是否失败
+        """
+        with self._lock:
+            for recording in self._recordings.values():
+                recording.pending.discard(test_id)
+                if failed:
+                    recording.failed = True
+
+            resolved = []
+            for entry in list(self._deferred):
+                paths, pending = entry
+                if test_id not in pending:
+                    continue
+                pending.discard(test_id)
+                if failed or not pending:
+                    self._deferred.remove(entry)
+                    resolved.append(paths)
+
+        for paths in resolved:
+            if failed:
+                self._keep(paths)
+            else:
+                self._delete(paths)
+
+    def finalize(self, context) -> List[str]:
+        """上下文关闭后按保留策略处理视频
+
+        Args:
+            context: 已关闭的浏览器上下文
+
+        Returns:
+            List[str]: 保留的视频路径（转码在后台进行，路径为转码前的文件）；
+                等待用例结果时为空列表
+        """
+        with self._lock:
+            recording = self._recordings.pop(id(context), None)
+        if recording is None:
+            return []
+
+        paths = []
+        for video in recording.videos:
+            if video is None:
+                continue
+            try:
+                path = video.path()
+            except Exception as e:
+                logger.warning(f"获取视频路径失败: {str(e)}")
+                continue
+            if os.path.exists(path):
+                paths.append(path)
+        self.stats['recorded'] += len(paths)
+        if not paths:
+            return []
+
+        if recording.keep:
+            if recording.target_path:
+                os.makedirs(os.path.dirname(recording.target_path) or '.',
+                            exist_ok=True)
+                shutil.move(paths[0], recording.target_path)
+                paths[0] = recording.target_path
+            self.stats['kept'] += len(paths)
+            logger.info(f"已保留录制视频: {', '.join(paths)}")
+            return paths
+
+        if recording.failed or self.retention == 'always':
+            return self._keep(paths)
+
+        pending = set(recording.pending)
+        test_id = current_test_id()
+        if test_id is not None:
+            pending.add(test_id)
+        if pending:
+            # 用例还未结束，失败可能来自UI步骤之外（如断言关键字），
+            # 等用例结果确认后再决定是否删除
+            with self._lock:
+                self._deferred.append((paths, pending))
+            return []
+
+        self._delete(paths)
+        return []
+
+    def _keep(self, paths: List[str]) -> List[str]:
+        self.stats['kept'] += len(paths)
+        for path in paths:
+            if self.transcode and not path.endswith(f".{self.transcode}"):
+                self._enqueue(path)
+        logger.info(f"已保留录制视频: {', '.join(paths)}")
+        return paths
+
+    def _delete(self, paths: List[str]):
+        for path in paths:
+            try:
+                os.remove(path)
+                self.stats['deleted'] += 1
+            except OSError as e:
+                logger.warning(f"删除录制视频失败({path}): {str(e)}")
+
+    def _enqueue(self, path: str):
+        if shutil.which('ffmpeg') is None:
+            logger.warning("未找到ffmpeg，跳过视频转码")
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='video-transcoder',
+                                            daemon=True)
+            self._thread.start()
+        self._queue.put((path, f"{os.path.splitext(path)[0]}.{self.transcode}"))
+
+    def _run(self):
+        while True:
+            source, target = self._queue.get()
+            try:
+                subprocess.run(['ffmpeg', '-y', '-loglevel', 'error', '-i', source, target],
+                               check=True, stdin=subprocess.DEVNULL,
+                               capture_output=True)
+                os.remove(source)
+                self.stats['transcoded'] += 1
+                logger.info(f"视频已转码: {target}")
+            except Exception as e:
+                self.stats['transcode_failed'] += 1
+                logger.warning(f"视频转码失败({source}): {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def wait(self):
+        """等待转码队列处理完毕"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取视频录制统计"""
+        return dict(self.stats, recording=len(self._recordings),
+                    deferred=len(self._deferred), pending=self._queue.qsize())
+
+
+# 全局视频录制管理器
+video_recorder = VideoRecorder()
+atexit.register(video_recorder.wait)
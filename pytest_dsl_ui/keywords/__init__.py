@@ -16,6 +16,14 @@ from . import network_keywords
 from . import auth_keywords
 from . import download_keywords
 from . import browser_http_keywords
+from . import report_keywords
+from . import profile_keywords
+
+# 为已注册的UI关键字安装耗时分析包装（未启用时直接调用原函数）
+from pytest_dsl.core.keyword_manager import keyword_manager as _keyword_manager
+from ..core.profiler import keyword_profiler as _keyword_profiler
+
+_keyword_profiler.instrument(_keyword_manager)
 
 __all__ = [
     'browser_keywords',
@@ -29,5 +37,7 @@ __all__ = [
     'network_keywords',
     'auth_keywords',
     'download_keywords',
-    'browser_http_keywords'
+    'browser_http_keywords',
+    'report_keywords',
+    'profile_keywords'
 ]
@@ -4,12 +4,16 @@
 使用Playwright的expect API实现更可靠的断言。
 """
 
+import json
 import logging
+import time
 import allure
 
 from pytest_dsl.core.keyword_manager import keyword_manager
 from ..core.browser_manager import browser_manager
 from ..core.element_locator import ElementLocator
+from ..core.element_states import DEFAULT_PROPERTIES
+from ..core.reporting import reporter
 
 # 导入Playwright的expect API
 try:
@@ -23,7 +27,7 @@ logger = logging.getLogger(__name__)
 def _get_current_locator() -> ElementLocator:
     """获取当前页面的元素定位器"""
     page = browser_manager.get_current_page()
-    return ElementLocator(page)
+    return ElementLocator.for_page(page)
 
 
 @keyword_manager.register('断言元素可见', [
@@ -49,7 +53,7 @@ def assert_element_visible(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"断言元素可见: {selector}"):
+    with reporter.step(f"断言元素可见: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -57,7 +61,7 @@ def assert_element_visible(**kwargs):
             # 使用Playwright的expect API进行断言
             expect(element).to_be_visible(timeout=int(timeout * 1000))
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout}秒\n"
                 f"断言结果: 通过",
@@ -72,7 +76,7 @@ def assert_element_visible(**kwargs):
 
         except Exception as e:
             logger.error(f"元素可见断言失败: {selector} - {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout}秒\n"
                 f"断言结果: 失败\n"
@@ -107,14 +111,14 @@ def assert_element_hidden(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"断言元素隐藏: {selector}"):
+    with reporter.step(f"断言元素隐藏: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
 
             expect(element).to_be_hidden(timeout=int(timeout * 1000))
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout}秒\n"
                 f"断言结果: 通过",
@@ -137,7 +141,7 @@ def assert_element_hidden(**kwargs):
 
         except Exception as e:
             logger.error(f"元素隐藏断言失败: {selector} - {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout}秒\n"
                 f"断言结果: 失败\n"
@@ -172,14 +176,14 @@ def assert_element_exists(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"断言元素存在: {selector}"):
+    with reporter.step(f"断言元素存在: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
 
             expect(element).to_be_attached(timeout=int(timeout * 1000))
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout}秒\n"
                 f"断言结果: 通过",
@@ -202,7 +206,7 @@ def assert_element_exists(**kwargs):
 
         except Exception as e:
             logger.error(f"元素存在断言失败: {selector} - {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout}秒\n"
                 f"断言结果: 失败\n"
@@ -237,14 +241,14 @@ def assert_element_enabled(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"断言元素启用: {selector}"):
+    with reporter.step(f"断言元素启用: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
 
             expect(element).to_be_enabled(timeout=int(timeout * 1000))
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout}秒\n"
                 f"断言结果: 通过",
@@ -267,7 +271,7 @@ def assert_element_enabled(**kwargs):
 
         except Exception as e:
             logger.error(f"元素启用断言失败: {selector} - {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout}秒\n"
                 f"断言结果: 失败\n"
@@ -302,14 +306,14 @@ def assert_element_disabled(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"断言元素禁用: {selector}"):
+    with reporter.step(f"断言元素禁用: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
 
             expect(element).to_be_disabled(timeout=int(timeout * 1000))
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout}秒\n"
                 f"断言结果: 通过",
@@ -332,7 +336,7 @@ def assert_element_disabled(**kwargs):
 
         except Exception as e:
             logger.error(f"元素禁用断言失败: {selector} - {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout}秒\n"
                 f"断言结果: 失败\n"
@@ -382,7 +386,7 @@ def assert_text_content(**kwargs):
     )
     message = message or default_message
 
-    with allure.step(f"断言文本内容: {selector} -> {expected_text}"):
+    with reporter.step(f"断言文本内容: {selector} -> {expected_text}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -397,7 +401,7 @@ def assert_text_content(**kwargs):
                     expected_text, timeout=int(timeout * 1000)
                 )
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"期望文本: {expected_text}\n"
                 f"匹配方式: {match_type}\n"
@@ -424,7 +428,7 @@ def assert_text_content(**kwargs):
 
         except Exception as e:
             logger.error(f"文本内容断言失败: {selector} -> {expected_text} - {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"期望文本: {expected_text}\n"
                 f"匹配方式: {match_type}\n"
@@ -466,7 +470,7 @@ def assert_input_value(**kwargs):
     if expected_value is None:
         raise ValueError("期望值参数不能为空")
 
-    with allure.step(f"断言输入值: {selector} -> {expected_value}"):
+    with reporter.step(f"断言输入值: {selector} -> {expected_value}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -475,7 +479,7 @@ def assert_input_value(**kwargs):
                 expected_value, timeout=int(timeout * 1000)
             )
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"期望值: {expected_value}\n"
                 f"超时时间: {timeout}秒\n"
@@ -500,7 +504,7 @@ def assert_input_value(**kwargs):
 
         except Exception as e:
             logger.error(f"输入值断言失败: {selector} -> {expected_value} - {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"期望值: {expected_value}\n"
                 f"超时时间: {timeout}秒\n"
@@ -547,7 +551,7 @@ def assert_attribute_value(**kwargs):
     if not attribute_name:
         raise ValueError("属性名参数不能为空")
 
-    with allure.step(
+    with reporter.step(
         f"断言属性值: {selector}.{attribute_name} -> {expected_value}"
     ):
         try:
@@ -558,7 +562,7 @@ def assert_attribute_value(**kwargs):
                 attribute_name, expected_value, timeout=int(timeout * 1000)
             )
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"属性名: {attribute_name}\n"
                 f"期望值: {expected_value}\n"
@@ -590,7 +594,7 @@ def assert_attribute_value(**kwargs):
                 f"{selector}.{attribute_name} -> {expected_value} - {str(e)}"
             )
             logger.error(f"属性值断言失败: {error_msg}")
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"属性名: {attribute_name}\n"
                 f"期望值: {expected_value}\n"
@@ -637,7 +641,7 @@ def assert_element_count(**kwargs):
     except (ValueError, TypeError):
         raise ValueError("期望数量必须是数字")
 
-    with allure.step(f"断言元素数量: {selector} -> {expected_count}"):
+    with reporter.step(f"断言元素数量: {selector} -> {expected_count}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -646,7 +650,7 @@ def assert_element_count(**kwargs):
                 expected_count, timeout=int(timeout * 1000)
             )
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"期望数量: {expected_count}\n"
                 f"超时时间: {timeout}秒\n"
@@ -673,7 +677,7 @@ def assert_element_count(**kwargs):
             logger.error(
                 f"元素数量断言失败: {selector} -> {expected_count} - {str(e)}"
             )
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"期望数量: {expected_count}\n"
                 f"超时时间: {timeout}秒\n"
@@ -718,7 +722,7 @@ def assert_page_title(**kwargs):
     )
     message = message or default_message
 
-    with allure.step(f"断言页面标题: {expected_title}"):
+    with reporter.step(f"断言页面标题: {expected_title}"):
         try:
             page = browser_manager.get_current_page()
 
@@ -735,7 +739,7 @@ def assert_page_title(**kwargs):
                     expected_title, timeout=int(timeout * 1000)
                 )
 
-            allure.attach(
+            reporter.attach(
                 f"期望标题: {expected_title}\n"
                 f"匹配方式: {match_type}\n"
                 f"超时时间: {timeout}秒\n"
@@ -760,7 +764,7 @@ def assert_page_title(**kwargs):
 
         except Exception as e:
             logger.error(f"页面标题断言失败: {expected_title} - {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"期望标题: {expected_title}\n"
                 f"匹配方式: {match_type}\n"
                 f"超时时间: {timeout}秒\n"
@@ -805,7 +809,7 @@ def assert_page_url(**kwargs):
     )
     message = message or default_message
 
-    with allure.step(f"断言页面URL: {expected_url}"):
+    with reporter.step(f"断言页面URL: {expected_url}"):
         try:
             page = browser_manager.get_current_page()
 
@@ -822,7 +826,7 @@ def assert_page_url(**kwargs):
                     expected_url, timeout=int(timeout * 1000)
                 )
 
-            allure.attach(
+            reporter.attach(
                 f"期望URL: {expected_url}\n"
                 f"匹配方式: {match_type}\n"
                 f"超时时间: {timeout}秒\n"
@@ -847,7 +851,7 @@ def assert_page_url(**kwargs):
 
         except Exception as e:
             logger.error(f"页面URL断言失败: {expected_url} - {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"期望URL: {expected_url}\n"
                 f"匹配方式: {match_type}\n"
                 f"超时时间: {timeout}秒\n"
@@ -884,7 +888,7 @@ def check_element_visible(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"检查元素是否可见: {selector}"):
+    with reporter.step(f"检查元素是否可见: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -905,7 +909,7 @@ def check_element_visible(**kwargs):
             else:
                 result = False
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout}秒\n"
                 f"检查结果: {'可见' if result else '不可见'}",
@@ -930,7 +934,7 @@ def check_element_visible(**kwargs):
             except Exception:
                 result = False
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout}秒\n"
                 f"检查结果: {'可见' if result else '异常 - 不可见'}\n"
@@ -971,7 +975,7 @@ def check_element_exists(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"检查元素是否存在: {selector}"):
+    with reporter.step(f"检查元素是否存在: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -980,7 +984,7 @@ def check_element_exists(**kwargs):
             count = element.count()
             result = count > 0
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout}秒\n"
                 f"元素数量: {count}\n"
@@ -1004,7 +1008,7 @@ def check_element_exists(**kwargs):
 
         except Exception as e:
             logger.error(f"元素存在性检查异常: {selector} - {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout}秒\n"
                 f"检查结果: 异常 - {str(e)}",
@@ -1044,7 +1048,7 @@ def check_element_enabled(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"检查元素是否启用: {selector}"):
+    with reporter.step(f"检查元素是否启用: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -1052,7 +1056,7 @@ def check_element_enabled(**kwargs):
             # 使用is_enabled()方法检查
             result = element.is_enabled()
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout}秒\n"
                 f"检查结果: {'启用' if result else '禁用'}",
@@ -1075,7 +1079,7 @@ def check_element_enabled(**kwargs):
 
         except Exception as e:
             logger.error(f"元素启用状态检查异常: {selector} - {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout}秒\n"
                 f"检查结果: 异常 - {str(e)}",
@@ -1120,7 +1124,7 @@ def check_text_contains(**kwargs):
     if expected_text is None:
         raise ValueError("期望文本参数不能为空")
 
-    with allure.step(f"检查文本是否包含: {selector} -> {expected_text}"):
+    with reporter.step(f"检查文本是否包含: {selector} -> {expected_text}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -1129,7 +1133,7 @@ def check_text_contains(**kwargs):
             actual_text = element.text_content()
             result = expected_text in (actual_text or "")
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"期望文本: {expected_text}\n"
                 f"实际文本: {actual_text}\n"
@@ -1159,7 +1163,7 @@ def check_text_contains(**kwargs):
 
         except Exception as e:
             logger.error(f"文本包含检查异常: {selector} -> {expected_text} - {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"期望文本: {expected_text}\n"
                 f"超时时间: {timeout}秒\n"
@@ -1206,13 +1210,13 @@ def check_url_contains(**kwargs):
     if url_fragment is None:
         raise ValueError("URL片段参数不能为空")
 
-    with allure.step(f"检查页面URL是否包含: {url_fragment}"):
+    with reporter.step(f"检查页面URL是否包含: {url_fragment}"):
         try:
             page = browser_manager.get_current_page()
             current_url = page.url
             result = url_fragment in current_url
 
-            allure.attach(
+            reporter.attach(
                 f"期望URL片段: {url_fragment}\n"
                 f"当前URL: {current_url}\n"
                 f"超时时间: {timeout}秒\n"
@@ -1243,7 +1247,7 @@ def check_url_contains(**kwargs):
 
         except Exception as e:
             logger.error(f"URL包含检查异常: {url_fragment} - {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"期望URL片段: {url_fragment}\n"
                 f"超时时间: {timeout}秒\n"
                 f"检查结果: 异常 - {str(e)}",
@@ -1288,13 +1292,13 @@ def check_title_contains(**kwargs):
     if title_fragment is None:
         raise ValueError("标题片段参数不能为空")
 
-    with allure.step(f"检查页面标题是否包含: {title_fragment}"):
+    with reporter.step(f"检查页面标题是否包含: {title_fragment}"):
         try:
             page = browser_manager.get_current_page()
             current_title = page.title()
             result = title_fragment in current_title
 
-            allure.attach(
+            reporter.attach(
                 f"期望标题片段: {title_fragment}\n"
                 f"当前标题: {current_title}\n"
                 f"超时时间: {timeout}秒\n"
@@ -1325,7 +1329,7 @@ def check_title_contains(**kwargs):
 
         except Exception as e:
             logger.error(f"标题包含检查异常: {title_fragment} - {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"期望标题片段: {title_fragment}\n"
                 f"超时时间: {timeout}秒\n"
                 f"检查结果: 异常 - {str(e)}",
@@ -1377,7 +1381,7 @@ def check_attribute_value(**kwargs):
     if not attribute_name:
         raise ValueError("属性名参数不能为空")
 
-    with allure.step(
+    with reporter.step(
         f"检查元素属性值: {selector}.{attribute_name} -> {expected_value}"
     ):
         try:
@@ -1390,7 +1394,7 @@ def check_attribute_value(**kwargs):
                       if actual_value is not None
                       else expected_value is None)
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"属性名: {attribute_name}\n"
                 f"期望值: {expected_value}\n"
@@ -1428,7 +1432,7 @@ def check_attribute_value(**kwargs):
                 f"{selector}.{attribute_name} -> {expected_value} - {str(e)}"
             )
             logger.error(f"属性值检查异常: {error_msg}")
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"属性名: {attribute_name}\n"
                 f"期望值: {expected_value}\n"
@@ -1456,6 +1460,128 @@ def check_attribute_value(**kwargs):
             }
 
 
+# 多条件检查中可以批量查询的元素条件类型 -> 需要的状态项
+_ELEMENT_CONDITIONS = {
+    'element_visible': 'visible',
+    'element_exists': 'count',
+    'element_enabled': 'enabled',
+    'text_contains': 'text',
+    'attribute_value': None,
+}
+
+
+def _check_element_condition(condition: dict, state: dict) -> dict:
+    """根据批量查询到的元素状态计算单个条件的结果"""
+    condition_type = condition.get('type')
+
+    if condition_type == 'element_visible':
+        result = state['visible']
+        return {"result": result, "captures": {"is_visible": result}}
+    elif condition_type == 'element_exists':
+        result = state['count'] > 0
+        return {"result": result,
+                "captures": {"exists": result, "count": state['count']}}
+    elif condition_type == 'element_enabled':
+        result = state['enabled']
+        return {"result": result, "captures": {"is_enabled": result}}
+    elif condition_type == 'text_contains':
+        expected_text = condition.get('expected_text')
+        actual_text = state['text']
+        result = str(expected_text) in (actual_text or "")
+        return {"result": result, "captures": {
+            "contains_text": result,
+            "actual_text": actual_text,
+            "expected_text": expected_text
+        }}
+    else:  # attribute_value
+        attribute_name = condition.get('attribute_name')
+        expected_value = condition.get('expected_value')
+        actual_value = state['attributes'][attribute_name]
+        result = (str(actual_value) == str(expected_value)
+                  if actual_value is not None
+                  else expected_value is None)
+        return {"result": result, "captures": {
+            "attribute_matches": result,
+            "actual_value": actual_value,
+            "expected_value": expected_value
+        }}
+
+
+def _validate_element_condition(condition: dict):
+    """检查元素条件的必填参数"""
+    if not condition.get('selector'):
+        raise ValueError("定位器参数不能为空")
+    if (condition['type'] == 'text_contains'
+            and condition.get('expected_text') is None):
+        raise ValueError("期望文本参数不能为空")
+    if (condition['type'] == 'attribute_value'
+            and not condition.get('attribute_name')):
+        raise ValueError("属性名参数不能为空")
+
+
+def _query_condition_states(conditions: list) -> dict:
+    """一次性查询给定元素条件涉及的元素状态"""
+    selectors = []
+    properties = set()
+    attributes = []
+    for condition in conditions:
+        selectors.append(condition['selector'])
+        if condition['type'] == 'attribute_value':
+            attributes.append(condition['attribute_name'])
+        else:
+            properties.add(_ELEMENT_CONDITIONS[condition['type']])
+
+    locator = _get_current_locator()
+    return locator.query_states(
+        selectors, sorted(properties), list(dict.fromkeys(attributes)))
+
+
+def _poll_element_conditions(conditions: dict, logic: str) -> dict:
+    """轮询元素条件直到满足或超时
+
+    每轮通过一次批量查询获取所有未满足条件的元素状态。每个条件在自己的
+    超时时间（timeout，默认3秒）内重试；OR逻辑下任一条件满足即停止。
+
+    Args:
+        conditions: 条件序号 -> 条件
+        logic: 逻辑关系，'AND'或'OR'
+
+    Returns:
+        dict: 条件序号 -> 检查结果，查询异常时为异常对象
+    """
+    outcomes = {}
+    if not conditions:
+        return outcomes
+
+    start = time.monotonic()
+    deadlines = {i: start + float(condition.get('timeout', 3.0))
+                 for i, condition in conditions.items()}
+    pending = list(conditions)
+    while True:
+        try:
+            states = _query_condition_states(
+                [conditions[i] for i in pending])
+            for i in pending:
+                outcomes[i] = _check_element_condition(
+                    conditions[i], states[conditions[i]['selector']])
+        except Exception as e:
+            logger.warning(f"批量查询元素状态异常: {str(e)}")
+            for i in pending:
+                outcomes[i] = e
+
+        now = time.monotonic()
+        passed = [i for i, outcome in outcomes.items()
+                  if isinstance(outcome, dict) and outcome['result']]
+        if logic == 'OR' and passed:
+            break
+        pending = [i for i in pending
+                   if i not in passed and now < deadlines[i]]
+        if not pending:
+            break
+        time.sleep(0.1)
+    return outcomes
+
+
 @keyword_manager.register('多条件检查', [
     {'name': '检查条件列表', 'mapping': 'conditions', 'description': '包含多个检查条件的列表'},
     {'name': '逻辑关系', 'mapping': 'logic', 'description': 'AND或OR逻辑关系'},
@@ -1463,6 +1589,10 @@ def check_attribute_value(**kwargs):
 def check_multiple_conditions(**kwargs):
     """执行多个条件检查并根据逻辑关系返回结果
 
+    元素类条件（element_visible、element_exists、element_enabled、
+    text_contains、attribute_value）的元素状态通过批量查询获取，
+    未满足的条件在各自的超时时间（timeout，默认3秒）内轮询重试。
+
     Args:
         conditions: 检查条件列表，每个条件包含type和参数
         logic: 逻辑关系，'AND'或'OR'
@@ -1477,7 +1607,7 @@ def check_multiple_conditions(**kwargs):
              "expected_text": "欢迎"}
         ]
     """
-    conditions = kwargs.get('conditions', [], category='UI/元素')
+    conditions = kwargs.get('conditions', [])
     logic = kwargs.get('logic', 'AND').upper()
 
     if not conditions:
@@ -1485,27 +1615,33 @@ def check_multiple_conditions(**kwargs):
     if logic not in ['AND', 'OR']:
         raise ValueError("逻辑关系必须是AND或OR")
 
-    with allure.step(f"多条件检查 ({logic})"):
+    with reporter.step(f"多条件检查 ({logic})"):
         results = []
         details = []
 
+        element_conditions = {}
+        for i, condition in enumerate(conditions):
+            if condition.get('type') not in _ELEMENT_CONDITIONS:
+                continue
+            try:
+                _validate_element_condition(condition)
+            except ValueError:
+                continue
+            element_conditions[i] = condition
+        element_results = _poll_element_conditions(element_conditions, logic)
+
         for i, condition in enumerate(conditions):
             condition_type = condition.get('type')
             try:
-                if condition_type == 'element_visible':
-                    result = check_element_visible(**condition)
-                elif condition_type == 'element_exists':
-                    result = check_element_exists(**condition)
-                elif condition_type == 'element_enabled':
-                    result = check_element_enabled(**condition)
-                elif condition_type == 'text_contains':
-                    result = check_text_contains(**condition)
+                if condition_type in _ELEMENT_CONDITIONS:
+                    _validate_element_condition(condition)
+                    result = element_results[i]
+                    if isinstance(result, Exception):
+                        raise result
                 elif condition_type == 'url_contains':
                     result = check_url_contains(**condition)
                 elif condition_type == 'title_contains':
                     result = check_title_contains(**condition)
-                elif condition_type == 'attribute_value':
-                    result = check_attribute_value(**condition)
                 else:
                     raise ValueError(f"不支持的检查类型: {condition_type}")
 
@@ -1535,7 +1671,7 @@ def check_multiple_conditions(**kwargs):
         passed_count = sum(results)
         total_count = len(results)
 
-        allure.attach(
+        reporter.attach(
             f"逻辑关系: {logic}\n"
             f"总条件数: {total_count}\n"
             f"通过条件数: {passed_count}\n"
@@ -1568,6 +1704,209 @@ def check_multiple_conditions(**kwargs):
         }
 
 
+# 批量断言支持的期望项 -> 需要的状态项
+_BULK_EXPECTATIONS = {
+    'visible': 'visible',
+    'enabled': 'enabled',
+    'checked': 'checked',
+    'exists': 'count',
+    'count': 'count',
+    'text': 'text',
+    'text_contains': 'text',
+    'value': 'value',
+}
+
+
+def _parse_bool(value) -> bool:
+    """解析布尔期望值，字符串"false"、"0"等解析为False"""
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in ('true', '1', 'yes'):
+            return True
+        if text in ('false', '0', 'no', ''):
+            return False
+        raise ValueError(f"无法解析的布尔值: {value}")
+    return bool(value)
+
+
+def _bulk_assertion_failures(assertions: list, states: dict) -> list:
+    """返回未满足的期望列表"""
+    failures = []
+    for assertion in assertions:
+        selector = assertion['selector']
+        state = states[selector]
+        for key, expected in assertion.items():
+            if key == 'selector':
+                continue
+            if key == 'attributes':
+                for name, expected_value in expected.items():
+                    actual_value = state['attributes'][name]
+                    if str(actual_value) != str(expected_value):
+                        failures.append(
+                            f"{selector} 属性{name}: 期望 {expected_value}, "
+                            f"实际 {actual_value}")
+                continue
+
+            if key == 'exists':
+                actual = state['count'] > 0
+                ok = actual == _parse_bool(expected)
+            elif key == 'count':
+                actual = state['count']
+                ok = actual == int(expected)
+            elif key == 'text_contains':
+                actual = state['text']
+                ok = str(expected) in (actual or "")
+            elif key in ('text', 'value'):
+                actual = state[key]
+                ok = actual is not None and actual.strip() == str(expected).strip()
+            else:
+                actual = state[key]
+                ok = actual == _parse_bool(expected)
+            if not ok:
+                failures.append(f"{selector} {key}: 期望 {expected}, 实际 {actual}")
+    return failures
+
+
+@keyword_manager.register('批量断言元素状态', [
+    {'name': '断言列表', 'mapping': 'assertions',
+     'description': '断言列表，每项包含selector和期望状态（visible/enabled/checked/'
+                    'exists/count/text/text_contains/value/attributes）'},
+    {'name': '超时时间', 'mapping': 'timeout', 'description': '超时时间（秒）', 'default': 5},
+    {'name': '消息', 'mapping': 'message', 'description': '断言失败时的错误消息'},
+], category='UI/断言')
+def assert_elements_state(**kwargs):
+    """批量断言多个元素的状态
+
+    每轮通过一次批量查询获取所有元素状态，全部满足时通过；
+    否则在超时时间内重试，超时后列出所有未满足的期望。
+
+    Args:
+        assertions: 断言列表
+        timeout: 超时时间（秒）
+        message: 自定义错误消息
+
+    Returns:
+        dict: 操作结果
+
+    示例:
+        assertions = [
+            {"selector": "#username", "visible": True, "value": "admin"},
+            {"selector": "#submit", "enabled": False},
+            {"selector": ".error", "count": 0},
+            {"selector": "#agree", "checked": True,
+             "attributes": {"name": "agree"}}
+        ]
+    """
+    assertions = kwargs.get('assertions') or []
+    timeout = float(kwargs.get('timeout', 5))
+    message = kwargs.get('message', '批量元素状态断言失败')
+
+    if not assertions:
+        raise ValueError("断言列表不能为空")
+
+    properties = set()
+    attributes = []
+    for assertion in assertions:
+        if not assertion.get('selector'):
+            raise ValueError("断言项缺少selector")
+        for key in assertion:
+            if key == 'attributes':
+                attributes.extend(assertion[key])
+            elif key in _BULK_EXPECTATIONS:
+                if key in ('visible', 'enabled', 'checked', 'exists'):
+                    _parse_bool(assertion[key])
+                properties.add(_BULK_EXPECTATIONS[key])
+            elif key != 'selector':
+                raise ValueError(f"不支持的断言项: {key}")
+
+    selectors = [assertion['selector'] for assertion in assertions]
+
+    with reporter.step(f"批量断言元素状态: {len(assertions)} 项"):
+        locator = _get_current_locator()
+        deadline = time.monotonic() + timeout
+        rounds = 0
+        while True:
+            rounds += 1
+            states = locator.query_states(
+                selectors, sorted(properties), list(dict.fromkeys(attributes)))
+            failures = _bulk_assertion_failures(assertions, states)
+            if not failures or time.monotonic() >= deadline:
+                break
+            time.sleep(0.1)
+
+        reporter.attach(
+            f"断言项数: {len(assertions)}\n"
+            f"查询轮数: {rounds}\n"
+            f"超时时间: {timeout}秒\n"
+            f"断言结果: {'通过' if not failures else '失败'}\n"
+            + "".join(f"  {failure}\n" for failure in failures),
+            name="批量元素状态断言",
+            attachment_type=allure.attachment_type.TEXT
+        )
+
+        if failures:
+            logger.error(f"批量元素状态断言失败: {len(failures)} 项不满足")
+            raise AssertionError(f"{message}:\n" + "\n".join(failures))
+
+        logger.info(f"批量元素状态断言通过: {len(assertions)} 项")
+        return {
+            "result": True,
+            "captures": {},
+            "session_state": {},
+            "metadata": {
+                "assertions_count": len(assertions),
+                "rounds": rounds,
+                "assertion": "elements_state",
+                "operation": "assert_elements_state"
+            }
+        }
+
+
+@keyword_manager.register('批量获取元素状态', [
+    {'name': '定位器列表', 'mapping': 'selectors', 'description': '元素定位器列表'},
+    {'name': '状态项', 'mapping': 'properties',
+     'description': '要查询的状态项（count/visible/enabled/checked/text/value），默认全部'},
+    {'name': '属性列表', 'mapping': 'attributes', 'description': '要查询的属性名列表'},
+], category='UI/断言')
+def get_elements_state(**kwargs):
+    """批量获取多个元素的状态
+
+    Args:
+        selectors: 元素定位器列表
+        properties: 要查询的状态项
+        attributes: 要查询的属性名列表
+
+    Returns:
+        dict: 操作结果，result为 定位器 -> 状态字典
+    """
+    selectors = kwargs.get('selectors') or []
+    properties = kwargs.get('properties') or DEFAULT_PROPERTIES
+    attributes = kwargs.get('attributes') or []
+
+    if not selectors:
+        raise ValueError("定位器列表不能为空")
+
+    with reporter.step(f"批量获取元素状态: {len(selectors)} 个元素"):
+        locator = _get_current_locator()
+        states = locator.query_states(selectors, properties, attributes)
+
+        reporter.attach(
+            lambda: json.dumps(states, ensure_ascii=False, indent=2),
+            name="元素状态",
+            attachment_type=allure.attachment_type.JSON
+        )
+
+        return {
+            "result": states,
+            "captures": {"element_states": states},
+            "session_state": {},
+            "metadata": {
+                "selectors_count": len(selectors),
+                "operation": "get_elements_state"
+            }
+        }
+
+
 @keyword_manager.register('断言复选框状态', [
     {'name': '定位器', 'mapping': 'selector', 'description': '复选框定位器'},
     {'name': '期望状态', 'mapping': 'expected_checked', 'description': '期望的选中状态（True/False）'},
@@ -1597,7 +1936,7 @@ def assert_checkbox_state(**kwargs):
     if expected_checked is None:
         raise ValueError("期望状态参数不能为空")
 
-    with allure.step(f"断言复选框状态: {selector} -> {expected_checked}"):
+    with reporter.step(f"断言复选框状态: {selector} -> {expected_checked}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -1607,7 +1946,7 @@ def assert_checkbox_state(**kwargs):
             else:
                 expect(element).not_to_be_checked(timeout=int(timeout * 1000))
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"期望状态: {'选中' if expected_checked else '未选中'}\n"
                 f"超时时间: {timeout}秒\n"
@@ -1632,7 +1971,7 @@ def assert_checkbox_state(**kwargs):
 
         except Exception as e:
             logger.error(f"复选框状态断言失败: {selector} -> {expected_checked} - {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"期望状态: {'选中' if expected_checked else '未选中'}\n"
                 f"超时时间: {timeout}秒\n"
@@ -11,10 +11,20 @@ import allure
 from pytest_dsl.core.keyword_manager import keyword_manager
 from ..core.browser_manager import browser_manager
 from ..core.auth_manager import auth_manager
+from ..core.reporting import reporter
 
 logger = logging.getLogger(__name__)
 
 
+def _split_names(value):
+    """逗号分隔的名称或列表转换为列表"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        return [name.strip() for name in value.split(',') if name.strip()]
+    return list(value)
+
+
 @keyword_manager.register('加载认证状态', [
     {'name': '状态名称', 'mapping': 'state_name', 'description': '要加载的认证状态名称'},
     {'name': '创建新上下文', 'mapping': 'new_context',
@@ -22,16 +32,25 @@ logger = logging.getLogger(__name__)
     {'name': '创建新页面', 'mapping': 'create_new_page',
      'description': '是否创建新页面（仅在创建新上下文时有效）', 'default': False},
     {'name': '验证登录', 'mapping': 'verify_login',
-     'description': '是否验证登录状态', 'default': True},
+     'description': '是否验证登录状态（检查Cookie过期时间，不打开页面）', 'default': True},
+    {'name': '验证接口', 'mapping': 'probe_url',
+     'description': '验证登录时额外请求的接口URL，返回非2xx状态码视为登录失效'},
+    {'name': 'Cookie名称', 'mapping': 'cookie_names',
+     'description': '验证时只检查这些Cookie的过期时间，多个用逗号分隔'},
 ], category='UI/认证', tags=['加载', '状态'])
 def load_auth_state(**kwargs):
     """加载保存的认证状态
 
+    验证登录时不驱动页面：先检查保存的持久Cookie是否已过期，
+    指定验证接口时再通过新上下文的request发送一次请求。
+
     Args:
         state_name: 认证状态名称
         new_context: 是否创建新的浏览器上下文
         create_new_page: 是否创建新页面（仅在创建新上下文时有效）
         verify_login: 是否验证登录状态
+        probe_url: 验证接口URL
+        cookie_names: 只检查这些Cookie的过期时间
 
     Returns:
         dict: 操作结果
@@ -40,12 +59,14 @@ def load_auth_state(**kwargs):
     new_context = kwargs.get('new_context', True)
     create_new_page = kwargs.get('create_new_page', False)
     verify_login = kwargs.get('verify_login', True)
+    probe_url = kwargs.get('probe_url')
+    cookie_names = _split_names(kwargs.get('cookie_names'))
     context = kwargs.get('context')
 
     if not state_name:
         raise ValueError("状态名称参数不能为空")
 
-    with allure.step(f"加载认证状态: {state_name}"):
+    with reporter.step(f"加载认证状态: {state_name}"):
         try:
             # 检查认证状态是否存在
             if not auth_manager.has_auth_state(state_name):
@@ -66,6 +87,16 @@ def load_auth_state(**kwargs):
             if 'origins' not in storage_state:
                 storage_state['origins'] = []
 
+            # 根据保存的Cookie过期时间验证，不需要打开页面
+            ttl = None
+            if verify_login:
+                ttl = auth_manager.get_state_ttl(state_name, cookie_names=cookie_names)
+                if ttl is not None and ttl <= 0:
+                    # 未指定Cookie名称时过期的可能是与登录无关的Cookie
+                    if cookie_names:
+                        raise ValueError(f"认证状态已过期: {state_name}")
+                    logger.warning(f"认证状态中有已过期的Cookie: {state_name}")
+
             # 获取当前浏览器ID
             current_browser_id = browser_manager.current_browser
             if not current_browser_id:
@@ -120,26 +151,18 @@ def load_auth_state(**kwargs):
                     context.set('current_context_id', context_id)
                     context.set('current_page_id', page_id)
 
-                # 可选：验证登录状态
-                if verify_login:
+                # 可选：通过一次接口请求验证登录状态
+                if verify_login and probe_url:
+                    response = browser_manager.get_context(context_id).request.get(
+                        probe_url, max_redirects=0)
                     try:
-                        page = browser_manager.get_current_page()
-                        # 等待页面加载完成
-                        page.wait_for_load_state(
-                            'domcontentloaded', timeout=10000)
-
-                        # 检查是否有有效的认证状态（通过检查cookies）
-                        current_cookies = page.context.cookies()
-                        if not current_cookies:
-                            logger.warning(
-                                f"加载认证状态后未发现任何cookies: {state_name}")
-                        else:
-                            logger.info(
-                                f"认证状态验证成功，发现 {len(current_cookies)} 个cookies")
-
-                    except Exception as verify_error:
-                        logger.warning(f"验证登录状态时出现警告: {str(verify_error)}")
-                        # 验证失败不应该阻止整个流程
+                        if not response.ok:
+                            raise ValueError(
+                                f"认证状态已失效: {state_name} "
+                                f"(验证接口 {probe_url} 返回 {response.status})")
+                    finally:
+                        response.dispose()
+                    logger.info(f"验证接口确认登录有效: {probe_url}")
 
                 logger.info(f"已创建新上下文并加载认证状态: {state_name} (页面策略: {'新建' if create_new_page else '智能复用'})")
             else:
@@ -161,7 +184,7 @@ def load_auth_state(**kwargs):
                         "loaded_at": "刚刚"
                     }
 
-            allure.attach(
+            reporter.attach(
                 f"状态名称: {state_name}\n"
                 f"用户名: {metadata.get('username', '未知')}\n"
                 f"保存时间: {metadata.get('saved_at', '未知')}\n"
@@ -170,7 +193,8 @@ def load_auth_state(**kwargs):
                 f"Origins数量: {len(storage_state.get('origins', []))}\n"
                 f"创建新上下文: {new_context}\n"
                 f"页面管理策略: {'强制创建新页面' if create_new_page else '智能复用现有页面'}\n"
-                f"验证登录: {verify_login}",
+                f"验证登录: {verify_login}\n"
+                f"剩余有效期: {'不限' if ttl is None else f'{ttl:.0f}秒'}",
                 name="认证状态加载信息",
                 attachment_type=allure.attachment_type.TEXT
             )
@@ -201,7 +225,7 @@ def load_auth_state(**kwargs):
 
         except Exception as e:
             logger.error(f"加载认证状态失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}\n"
                 f"状态名称: {state_name}",
                 name="认证状态加载失败",
@@ -216,6 +240,8 @@ def load_auth_state(**kwargs):
     {'name': '描述', 'mapping': 'description', 'description': '状态描述（元数据）'},
     {'name': '包含IndexedDB', 'mapping': 'include_indexed_db',
      'description': '是否包含IndexedDB数据', 'default': True},
+    {'name': '存储格式', 'mapping': 'state_format',
+     'description': 'json（缩进JSON）、gzip或zstd（压缩的紧凑格式），默认使用PYTEST_DSL_UI_AUTH_FORMAT或json'},
 ], category='UI/认证', tags=['保存', '状态'])
 def save_auth_state(**kwargs):
     """保存当前的认证状态
@@ -225,6 +251,7 @@ def save_auth_state(**kwargs):
         username: 用户名
         description: 状态描述
         include_indexed_db: 是否包含IndexedDB数据
+        state_format: 存储格式
 
     Returns:
         dict: 操作结果
@@ -233,11 +260,12 @@ def save_auth_state(**kwargs):
     username = kwargs.get('username')
     description = kwargs.get('description')
     include_indexed_db = kwargs.get('include_indexed_db', True)
+    state_format = kwargs.get('state_format')
 
     if not state_name:
         raise ValueError("状态名称参数不能为空")
 
-    with allure.step(f"保存认证状态: {state_name}"):
+    with reporter.step(f"保存认证状态: {state_name}"):
         try:
             page = browser_manager.get_current_page()
             browser_context = page.context
@@ -271,7 +299,8 @@ def save_auth_state(**kwargs):
                 # 尝试使用IndexedDB支持（如果可用）
                 state_path = auth_manager.save_auth_state(
                     browser_context, state_name, metadata,
-                    include_indexed_db=include_indexed_db
+                    include_indexed_db=include_indexed_db,
+                    state_format=state_format
                 )
             except TypeError:
                 # 如果auth_manager不支持include_indexed_db参数，使用原有方式
@@ -282,11 +311,11 @@ def save_auth_state(**kwargs):
 
             # 验证保存的状态
             if auth_manager.has_auth_state(state_name):
-                # 获取保存后的状态信息进行验证
-                saved_state = auth_manager.load_auth_state(state_name)
-                if saved_state:
-                    cookies_count = len(saved_state.get('cookies', []))
-                    origins_count = len(saved_state.get('origins', []))
+                # 读取保存后的元数据进行验证，紧凑格式不需要解压整个状态
+                saved_metadata = auth_manager.get_state_metadata(state_name)
+                if saved_metadata is not None:
+                    cookies_count = saved_metadata.get('cookies_count', 0)
+                    origins_count = saved_metadata.get('origins_count', 0)
                     logger.info(
                         f"认证状态保存验证成功: cookies={cookies_count}, "
                         f"origins={origins_count}")
@@ -301,7 +330,7 @@ def save_auth_state(**kwargs):
             else:
                 logger.warning("保存后认证状态验证失败")
 
-            allure.attach(
+            reporter.attach(
                 f"状态名称: {state_name}\n"
                 f"用户名: {username or '未提供'}\n"
                 f"描述: {description or '无'}\n"
@@ -339,7 +368,7 @@ def save_auth_state(**kwargs):
 
         except Exception as e:
             logger.error(f"保存认证状态失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}\n"
                 f"状态名称: {state_name}\n"
                 f"当前URL: {page.url if 'page' in locals() else '未知'}",
@@ -366,18 +395,16 @@ def check_auth_state(**kwargs):
     if not state_name:
         raise ValueError("状态名称参数不能为空")
 
-    with allure.step(f"检查认证状态: {state_name}"):
+    with reporter.step(f"检查认证状态: {state_name}"):
         try:
             exists = auth_manager.has_auth_state(state_name)
 
             # 如果存在，获取更多信息
             metadata = {}
             if exists:
-                storage_state = auth_manager.load_auth_state(state_name)
-                if storage_state:
-                    metadata = storage_state.get("metadata", {})
+                metadata = auth_manager.get_state_metadata(state_name) or {}
 
-            allure.attach(
+            reporter.attach(
                 f"状态名称: {state_name}\n"
                 f"存在状态: {exists}\n"
                 f"用户名: {metadata.get('username', '未知')}\n"
@@ -394,7 +421,7 @@ def check_auth_state(**kwargs):
 
         except Exception as e:
             logger.error(f"检查认证状态失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="认证状态检查失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -402,6 +429,82 @@ def check_auth_state(**kwargs):
             raise
 
 
+@keyword_manager.register('获取登录锁', [
+    {'name': '状态名称', 'mapping': 'state_name', 'description': '认证状态名称'},
+    {'name': '有效期', 'mapping': 'max_age',
+     'description': '认证状态有效期（秒），超过后重新登录；为空时只要存在即可复用'},
+    {'name': '超时时间', 'mapping': 'timeout',
+     'description': '等待其他进程登录的最长时间（秒）', 'default': 300},
+    {'name': '提前刷新', 'mapping': 'refresh_ahead',
+     'description': '剩余有效期少于该秒数时由一个进程提前重新登录，其他进程继续使用旧状态',
+     'default': 0},
+    {'name': 'Cookie名称', 'mapping': 'cookie_names',
+     'description': '只按这些Cookie的过期时间判断有效期，多个用逗号分隔'},
+], category='UI/认证', tags=['登录', '锁', '并行'])
+def acquire_login_lock(**kwargs):
+    """一次登录，多处复用
+
+    并行执行时第一个需要认证状态的工作进程获得登录锁并返回True，由它执行登录；
+    其他进程阻塞等待，登录进程保存认证状态后返回False，直接加载该状态。
+    保存认证状态时自动释放锁，登录失败时使用[释放登录锁]。
+    有效期按保存时间和有效期计算；指定Cookie名称时还考虑这些会话Cookie的
+    过期时间，其他Cookie（如短期的统计Cookie）不影响判断。
+
+    Args:
+        state_name: 认证状态名称
+        max_age: 认证状态有效期（秒）
+        timeout: 等待其他进程登录的最长时间（秒）
+        refresh_ahead: 提前刷新的秒数
+        cookie_names: 只检查这些Cookie的过期时间
+
+    Returns:
+        bool: 当前进程是否需要执行登录
+    """
+    state_name = kwargs.get('state_name')
+    max_age = kwargs.get('max_age')
+    timeout = float(kwargs.get('timeout', 300))
+    refresh_ahead = float(kwargs.get('refresh_ahead') or 0)
+    cookie_names = _split_names(kwargs.get('cookie_names'))
+
+    if not state_name:
+        raise ValueError("状态名称参数不能为空")
+
+    with reporter.step(f"获取登录锁: {state_name}"):
+        need_login = auth_manager.acquire_login(
+            state_name, float(max_age) if max_age else None, timeout,
+            refresh_ahead, cookie_names)
+
+        reporter.attach(
+            f"状态名称: {state_name}\n"
+            f"有效期: {max_age or '不限'}\n"
+            f"需要登录: {need_login}",
+            name="登录锁信息",
+            attachment_type=allure.attachment_type.TEXT
+        )
+        return need_login
+
+
+@keyword_manager.register('释放登录锁', [
+    {'name': '状态名称', 'mapping': 'state_name', 'description': '认证状态名称'},
+], category='UI/认证', tags=['登录', '锁', '并行'])
+def release_login_lock(**kwargs):
+    """释放[获取登录锁]获取的锁，登录失败时使用
+
+    Args:
+        state_name: 认证状态名称
+
+    Returns:
+        bool: 当前进程是否持有该锁
+    """
+    state_name = kwargs.get('state_name')
+
+    if not state_name:
+        raise ValueError("状态名称参数不能为空")
+
+    with reporter.step(f"释放登录锁: {state_name}"):
+        return auth_manager.release_login(state_name)
+
+
 @keyword_manager.register('删除认证状态', [
     {'name': '状态名称', 'mapping': 'state_name', 'description': '要删除的认证状态名称'},
 ], category='UI/认证', tags=['删除', '状态'])
@@ -419,11 +522,11 @@ def delete_auth_state(**kwargs):
     if not state_name:
         raise ValueError("状态名称参数不能为空")
 
-    with allure.step(f"删除认证状态: {state_name}"):
+    with reporter.step(f"删除认证状态: {state_name}"):
         try:
             success = auth_manager.delete_auth_state(state_name)
 
-            allure.attach(
+            reporter.attach(
                 f"状态名称: {state_name}\n"
                 f"删除结果: {'成功' if success else '失败（状态不存在）'}",
                 name="认证状态删除信息",
@@ -449,7 +552,7 @@ def delete_auth_state(**kwargs):
 
         except Exception as e:
             logger.error(f"删除认证状态失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="认证状态删除失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -472,7 +575,7 @@ def list_auth_states(**kwargs):
     variable = kwargs.get('variable')
     context = kwargs.get('context')
 
-    with allure.step("列出认证状态"):
+    with reporter.step("列出认证状态"):
         try:
             states = auth_manager.list_auth_states()
 
@@ -490,7 +593,7 @@ def list_auth_states(**kwargs):
                     f"({metadata.get('saved_at', '未知时间')})"
                 )
 
-            allure.attach(
+            reporter.attach(
                 f"认证状态数量: {len(states)}\n"
                 f"状态列表:\n" + (
                     "\n".join(states_info) if states_info else "无认证状态"
@@ -515,7 +618,7 @@ def list_auth_states(**kwargs):
 
         except Exception as e:
             logger.error(f"列出认证状态失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="列出认证状态失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -540,7 +643,7 @@ def clear_auth_state(**kwargs):
     if not state_name:
         raise ValueError("状态名称参数不能为空")
 
-    with allure.step(f"清除认证状态: {state_name}"):
+    with reporter.step(f"清除认证状态: {state_name}"):
         try:
             # 检查状态是否存在
             exists = auth_manager.has_auth_state(state_name)
@@ -551,7 +654,7 @@ def clear_auth_state(**kwargs):
             # 删除认证状态
             success = auth_manager.delete_auth_state(state_name)
 
-            allure.attach(
+            reporter.attach(
                 f"状态名称: {state_name}\n"
                 f"原始存在状态: {exists}\n"
                 f"清除结果: {'成功' if success else '失败（状态不存在）'}",
@@ -583,7 +686,7 @@ def clear_auth_state(**kwargs):
 
         except Exception as e:
             logger.error(f"清除认证状态失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="认证状态清除失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -609,7 +712,7 @@ def clear_all_auth_states(**kwargs):
     if not confirm_clear:
         raise ValueError("请设置 '确认清除: True' 来确认清除所有认证状态")
 
-    with allure.step("清除所有认证状态"):
+    with reporter.step("清除所有认证状态"):
         try:
             # 先获取所有状态
             states = auth_manager.list_auth_states()
@@ -618,7 +721,7 @@ def clear_all_auth_states(**kwargs):
             if states_count == 0:
                 logger.info("没有认证状态需要清除")
 
-                allure.attach(
+                reporter.attach(
                     "没有认证状态需要清除",
                     name="认证状态清除信息",
                     attachment_type=allure.attachment_type.TEXT
@@ -668,7 +771,7 @@ def clear_all_auth_states(**kwargs):
             if failed_states:
                 result_info.append(f"失败的状态: {', '.join(failed_states)}")
 
-            allure.attach(
+            reporter.attach(
                 "\n".join(result_info),
                 name="所有认证状态清除结果",
                 attachment_type=allure.attachment_type.TEXT
@@ -698,7 +801,7 @@ def clear_all_auth_states(**kwargs):
 
         except Exception as e:
             logger.error(f"清除所有认证状态失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="清除所有认证状态失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -5,11 +5,10 @@
 """
 
 import allure
+import copy
 import re
 import yaml
 import json
-import os
-import time
 import logging
 from typing import Dict, Any, Union
 
@@ -42,7 +41,11 @@ except ImportError:
         def get(self, key):
             return self._vars.get(key)
 
+from ..core.assertion_retry import AssertionRetryScheduler
 from ..core.browser_http_request import BrowserHTTPRequest
+from ..core.expression_cache import expression_cache
+from ..core.template_cache import template_cache
+from ..core.reporting import reporter
 
 # 配置日志
 logger = logging.getLogger(__name__)
@@ -98,46 +101,13 @@ def _process_file_reference(reference: Union[str, Dict[str, Any]],
 def _load_file_content(file_path: str, is_template: bool = False,
                        file_type: str = 'auto', encoding: str = 'utf-8',
                        test_context: TestContext = None) -> Any:
-    """加载文件内容"""
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"找不到引用的文件: {file_path}")
+    """加载文件内容
 
-    with open(file_path, 'r', encoding=encoding) as f:
-        content = f.read()
-
-    if is_template:
-        # 简单的变量替换实现
-        try:
-            from pytest_dsl.core.variable_utils import VariableReplacer
-            replacer = VariableReplacer(test_context=test_context)
-            content = replacer.replace_in_string(content)
-        except ImportError:
-            # 如果没有VariableReplacer，进行简单的字符串替换
-            if test_context:
-                for key, value in test_context._vars.items():
-                    content = content.replace(f"${{{key}}}", str(value))
-
-    if file_type == 'auto':
-        file_ext = os.path.splitext(file_path)[1].lower()
-        if file_ext in ['.json']:
-            file_type = 'json'
-        elif file_ext in ['.yaml', '.yml']:
-            file_type = 'yaml'
-        else:
-            file_type = 'text'
-
-    if file_type == 'json':
-        try:
-            return json.loads(content)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"无效的JSON文件 {file_path}: {str(e)}")
-    elif file_type == 'yaml':
-        try:
-            return yaml.safe_load(content)
-        except yaml.YAMLError as e:
-            raise ValueError(f"无效的YAML文件 {file_path}: {str(e)}")
-    else:
-        return content
+    解析结果按(路径, 修改时间, 编码, 类型)缓存，模板文件预编译，
+    每次请求只替换变量。
+    """
+    return template_cache.load_file(file_path, is_template, file_type,
+                                    encoding, test_context)
 
 
 def _process_request_config(config: Dict[str, Any], test_context: TestContext = None) -> Dict[str, Any]:
@@ -160,15 +130,30 @@ def _process_request_config(config: Dict[str, Any], test_context: TestContext =
     return config
 
 
-def _normalize_retry_config(config, assert_retry_count=None, assert_retry_interval=None):
-    """标准化断言重试配置（复用pytest-dsl逻辑）"""
+_RETRY_SCHEDULE_KEYS = ('backoff', 'multiplier', 'max_interval', 'deadline',
+                        'conditional')
+
+
+def _normalize_retry_config(config, assert_retry_count=None, assert_retry_interval=None,
+                            assert_retry_backoff=None, assert_retry_deadline=None):
+    """标准化断言重试配置（复用pytest-dsl逻辑）
+
+    除pytest-dsl的重试次数、间隔和断言选择外，还包含重试调度配置：
+    backoff（fixed/exponential/jitter）、multiplier、max_interval、
+    deadline（总期限，秒）和conditional（是否发送条件请求）。
+    """
     standard_retry_config = {
         'enabled': False,
         'count': 3,
         'interval': 1.0,
         'all': False,
         'indices': [],
-        'specific': {}
+        'specific': {},
+        'backoff': 'fixed',
+        'multiplier': 2.0,
+        'max_interval': 30.0,
+        'deadline': None,
+        'conditional': True
     }
 
     if assert_retry_count and int(assert_retry_count) > 0:
@@ -197,6 +182,9 @@ def _normalize_retry_config(config, assert_retry_count=None, assert_retry_interv
                 if isinstance(key, int):
                     specific_config[key] = value
             standard_retry_config['specific'] = specific_config
+        for key in _RETRY_SCHEDULE_KEYS:
+            if key in retry_assertions:
+                standard_retry_config[key] = retry_assertions[key]
 
     elif 'retry' in config and config['retry']:
         retry_config = config['retry']
@@ -206,10 +194,64 @@ def _normalize_retry_config(config, assert_retry_count=None, assert_retry_interv
             standard_retry_config['all'] = True
             if 'interval' in retry_config:
                 standard_retry_config['interval'] = retry_config['interval']
+            for key in _RETRY_SCHEDULE_KEYS:
+                if key in retry_config:
+                    standard_retry_config[key] = retry_config[key]
+
+    if assert_retry_backoff:
+        standard_retry_config['backoff'] = assert_retry_backoff
+    if assert_retry_deadline:
+        standard_retry_config['deadline'] = float(assert_retry_deadline)
 
     return standard_retry_config
 
 
+def _get_template(template_name: str) -> Dict[str, Any]:
+    """获取YAML变量文件中定义的请求模板"""
+    browser_http_templates = yaml_vars.get_variable("browser_http_templates") or {}
+    template = browser_http_templates.get(template_name)
+    if not template:
+        raise ValueError(f"未找到名为 '{template_name}' 的浏览器HTTP请求模板")
+    return template
+
+
+def _parse_config(context, config: Any) -> Any:
+    """替换变量并解析YAML配置，非字符串配置原样返回
+
+    配置文本预编译，替换变量后的解析结果缓存，返回深拷贝。
+    """
+    if not isinstance(config, str):
+        return config
+    try:
+        return template_cache.parse_config(config, context)
+    except yaml.YAMLError as e:
+        raise ValueError(f"无效的YAML配置: {str(e)}")
+
+
+def _load_request_config(context, config: Any,
+                         template_name: str = None) -> Dict[str, Any]:
+    """加载单个请求配置，指定模板时与模板深度合并"""
+    config = _parse_config(context, config)
+    if template_name:
+        config = _deep_merge(copy.deepcopy(_get_template(template_name)),
+                             config or {})
+    return config
+
+
+def _request_target(client_name: str, auth_state: str = None):
+    """确定请求使用的浏览器上下文和客户端配置
+
+    指定认证状态或没有打开的浏览器时使用独立的APIRequestContext（无浏览器模式），
+    返回的浏览器上下文为None，认证状态写入客户端配置的auth_state。
+    """
+    browser_http_clients_config = yaml_vars.get_variable("browser_http_clients") or {}
+    client_config = dict(browser_http_clients_config.get(client_name, {}))
+    if auth_state:
+        client_config['auth_state'] = auth_state
+        return None, client_config
+    return browser_manager.get_current_context(), client_config
+
+
 @keyword_manager.register('浏览器HTTP请求', [
     {'name': '客户端', 'mapping': 'client',
      'description': '客户端名称，对应YAML变量文件中的客户端配置',
@@ -227,7 +269,13 @@ def _normalize_retry_config(config, assert_retry_count=None, assert_retry_interv
     {'name': '断言重试次数', 'mapping': 'assert_retry_count',
      'description': '断言失败时的重试次数', 'default': 0},
     {'name': '断言重试间隔', 'mapping': 'assert_retry_interval',
-     'description': '断言重试间隔时间（秒）', 'default': 1}
+     'description': '断言重试间隔时间（秒），指数退避时为首次间隔', 'default': 1},
+    {'name': '断言重试策略', 'mapping': 'assert_retry_backoff',
+     'description': '重试等待策略：fixed（固定间隔）、exponential（指数退避）或jitter（带抖动的指数退避）'},
+    {'name': '断言重试期限', 'mapping': 'assert_retry_deadline',
+     'description': '断言重试的总期限（秒），到期后不再重试'},
+    {'name': '认证状态', 'mapping': 'auth_state',
+     'description': '不使用浏览器，以AuthManager保存的认证状态发送请求；未打开浏览器时自动使用无浏览器模式'}
 ], category='UI/接口测试', tags=['接口', '请求'])
 def browser_http_request(context, **kwargs):
     """执行基于浏览器的HTTP请求
@@ -245,6 +293,9 @@ def browser_http_request(context, **kwargs):
         template: 模板名称
         assert_retry_count: 断言失败时的重试次数
         assert_retry_interval: 断言重试间隔时间（秒）
+        assert_retry_backoff: 断言重试等待策略
+        assert_retry_deadline: 断言重试总期限（秒）
+        auth_state: 无浏览器模式使用的认证状态名称
 
     Returns:
         捕获的变量字典或响应对象
@@ -258,12 +309,12 @@ def browser_http_request(context, **kwargs):
     assert_retry_count = kwargs.get('assert_retry_count')
     assert_retry_interval = kwargs.get('assert_retry_interval')
 
-    # 获取当前浏览器上下文
-    browser_context = browser_manager.get_current_context()
-    if not browser_context:
-        raise ValueError("需要先创建浏览器上下文才能使用浏览器HTTP请求")
+    # 获取当前浏览器上下文，没有时使用无浏览器模式
+    browser_context, client_config = _request_target(
+        client_name, kwargs.get('auth_state'))
 
-    print(f"🌐 浏览器HTTP请求 - 客户端: {client_name}")
+    print(f"🌐 浏览器HTTP请求 - 客户端: {client_name}"
+          f"{'' if browser_context else ' (无浏览器模式)'}")
 
     # 检查浏览器HTTP客户端配置
     browser_http_clients_config = yaml_vars.get_variable("browser_http_clients")
@@ -271,7 +322,6 @@ def browser_http_request(context, **kwargs):
         print(f"✓ 找到browser_http_clients配置，包含 {len(browser_http_clients_config)} 个客户端")
         if client_name in browser_http_clients_config:
             print(f"✓ 找到浏览器HTTP客户端 '{client_name}' 的配置")
-            client_config = browser_http_clients_config[client_name]
             print(f"  - base_url: {client_config.get('base_url', 'N/A')}")
             print(f"  - timeout: {client_config.get('timeout', 'N/A')}")
         else:
@@ -280,68 +330,23 @@ def browser_http_request(context, **kwargs):
     else:
         print("⚠️ 未找到browser_http_clients配置，使用默认配置")
 
-    with allure.step(f"发送浏览器HTTP请求 (客户端: {client_name}"
-                     f"{', 会话: ' + session_name if session_name else ''})"):
-        # 处理模板
-        if template_name:
-            browser_http_templates = yaml_vars.get_variable("browser_http_templates") or {}
-            template = browser_http_templates.get(template_name)
-
-            if not template:
-                raise ValueError(f"未找到名为 '{template_name}' 的浏览器HTTP请求模板")
-
-            if isinstance(config, str):
-                try:
-                    from pytest_dsl.core.variable_utils import VariableReplacer
-                    replacer = VariableReplacer(test_context=context)
-                    config = replacer.replace_in_string(config)
-                except ImportError:
-                    # 简单的变量替换
-                    if hasattr(context, '_vars'):
-                        for key, value in context._vars.items():
-                            config = config.replace(f"${{{key}}}", str(value))
-
-                try:
-                    user_config = yaml.safe_load(config) if config else {}
-                    merged_config = _deep_merge(template.copy(), user_config)
-                    config = merged_config
-                except yaml.YAMLError as e:
-                    raise ValueError(f"无效的YAML配置: {str(e)}")
-        else:
-            if isinstance(config, str):
-                try:
-                    from pytest_dsl.core.variable_utils import VariableReplacer
-                    replacer = VariableReplacer(test_context=context)
-                    config = replacer.replace_in_string(config)
-                except ImportError:
-                    # 简单的变量替换
-                    if hasattr(context, '_vars'):
-                        for key, value in context._vars.items():
-                            config = config.replace(f"${{{key}}}", str(value))
-
-        # 解析YAML配置
-        if isinstance(config, str):
-            try:
-                config = yaml.safe_load(config)
-            except yaml.YAMLError as e:
-                raise ValueError(f"无效的YAML配置: {str(e)}")
+    with reporter.step(f"发送浏览器HTTP请求 (客户端: {client_name}"
+                       f"{', 会话: ' + session_name if session_name else ''})"):
+        config = _load_request_config(context, config, template_name)
 
         # 统一处理重试配置
-        retry_config = _normalize_retry_config(config, assert_retry_count, assert_retry_interval)
+        retry_config = _normalize_retry_config(
+            config, assert_retry_count, assert_retry_interval,
+            kwargs.get('assert_retry_backoff'), kwargs.get('assert_retry_deadline'))
 
         # 为了兼容性，将标准化后的重试配置写回到配置中
         if retry_config['enabled']:
             config['retry_assertions'] = {
-                'count': retry_config['count'],
-                'interval': retry_config['interval'],
-                'all': retry_config['all'],
-                'indices': retry_config['indices'],
-                'specific': retry_config['specific']
+                key: value for key, value in retry_config.items()
+                if key != 'enabled'
             }
 
         # 获取客户端配置
-        browser_http_clients_config = yaml_vars.get_variable("browser_http_clients") or {}
-        client_config = browser_http_clients_config.get(client_name, {})
         config['client_config'] = client_config
 
         config = _process_request_config(config, test_context=context)
@@ -354,7 +359,7 @@ def browser_http_request(context, **kwargs):
         response = browser_http_req.execute(disable_auth=disable_auth)
 
         # 统一处理断言逻辑
-        with allure.step("执行断言验证"):
+        with reporter.step("执行断言验证"):
             if retry_config['enabled']:
                 _process_assertions_with_unified_retry(
                     browser_http_req, retry_config, disable_auth)
@@ -433,196 +438,110 @@ def _deep_merge(dict1, dict2):
 
 
 def _process_assertions_with_unified_retry(browser_http_req, retry_config, disable_auth=False):
-    """使用统一的重试配置处理断言"""
-    # 初始尝试执行所有断言
-    try:
-        results, failed_retryable_assertions = browser_http_req.process_asserts()
-        return results
-    except AssertionError as e:
-        # 记录初始断言失败的详细错误信息
-        allure.attach(
-            str(e),
-            name="断言验证失败详情",
-            attachment_type=allure.attachment_type.TEXT
-        )
+    """使用统一的重试配置处理断言
 
-        # 收集失败的断言
-        original_config = (browser_http_req.config.copy()
-                           if isinstance(browser_http_req.config, dict) else {})
+    由AssertionRetryScheduler按退避策略和总期限重新请求，
+    每次只重新评估仍失败的断言。
+    """
+    return AssertionRetryScheduler(
+        browser_http_req, retry_config, disable_auth).run()
 
-        temp_config = original_config.copy()
-        temp_config['_collect_failed_assertions_only'] = True
 
-        try:
-            browser_http_req.config = temp_config
-            if not browser_http_req.response:
-                browser_http_req.execute(disable_auth=disable_auth)
-
-            _, failed_retryable_assertions = browser_http_req.process_asserts()
-        except Exception as collect_err:
-            allure.attach(
-                f"收集失败断言时出错: {type(collect_err).__name__}: {str(collect_err)}",
-                name="断言收集错误",
-                attachment_type=allure.attachment_type.TEXT
-            )
-            failed_retryable_assertions = []
-        finally:
-            browser_http_req.config = original_config
-
-        if not failed_retryable_assertions:
-            raise
-
-        # 过滤需要重试的断言
-        retryable_assertions = []
-        for failed_assertion in failed_retryable_assertions:
-            assertion_idx = failed_assertion['index']
-            should_retry = False
-            specific_retry_count = retry_config['count']
-            specific_retry_interval = retry_config['interval']
-
-            if str(assertion_idx) in retry_config['specific']:
-                should_retry = True
-                spec_config = retry_config['specific'][str(assertion_idx)]
-                if isinstance(spec_config, dict):
-                    if 'count' in spec_config:
-                        specific_retry_count = spec_config['count']
-                    if 'interval' in spec_config:
-                        specific_retry_interval = spec_config['interval']
-            elif assertion_idx in retry_config['indices']:
-                should_retry = True
-            elif retry_config['all']:
-                should_retry = True
-
-            if should_retry:
-                failed_assertion['retry_count'] = specific_retry_count
-                failed_assertion['retry_interval'] = specific_retry_interval
-                retryable_assertions.append(failed_assertion)
-
-        if not retryable_assertions:
-            raise
-
-        retry_info = "\n".join([
-            f"{i+1}. {a['type']} " +
-            (f"[{a['path']}]" if a['path'] else "") +
-            f": 重试 {a['retry_count']} 次，间隔 {a['retry_interval']} 秒"
-            for i, a in enumerate(retryable_assertions)
-        ])
-
-        allure.attach(
-            f"找到 {len(retryable_assertions)} 个可重试的断言:\n\n{retry_info}",
-            name="重试断言列表",
-            attachment_type=allure.attachment_type.TEXT
-        )
+@keyword_manager.register('批量浏览器HTTP请求', [
+    {'name': '客户端', 'mapping': 'client',
+     'description': '客户端名称，对应YAML变量文件中的客户端配置',
+     'default': 'default'},
+    {'name': '配置', 'mapping': 'config',
+     'description': '请求配置列表（YAML），每项与浏览器HTTP请求的配置相同'},
+    {'name': '模板', 'mapping': 'template',
+     'description': '每项请求共用的YAML请求模板'},
+    {'name': '并发数', 'mapping': 'concurrency',
+     'description': '最大并发请求数，为1时依次发送', 'default': 8},
+    {'name': '保存响应', 'mapping': 'save_response',
+     'description': '将所有响应按顺序保存到指定变量名中'},
+    {'name': '认证状态', 'mapping': 'auth_state',
+     'description': '不使用浏览器，以AuthManager保存的认证状态发送请求；未打开浏览器时自动使用无浏览器模式'},
+], category='UI/接口测试', tags=['接口', '请求', '批量'])
+def batch_browser_http_request(context, **kwargs):
+    """以有限并发批量执行基于浏览器的HTTP请求
+
+    所有请求共享浏览器上下文（无浏览器模式下为独立APIRequestContext）的Cookie，
+    每项请求独立处理捕获和断言，
+    捕获的变量按请求顺序写入上下文。所有请求完成后汇总报告失败的请求和断言。
+    批量请求不支持断言重试。
 
-        # 开始重试循环
-        max_retry_count = retry_config['count']
-        for retryable_assertion in retryable_assertions:
-            max_retry_count = max(max_retry_count,
-                                  retryable_assertion.get('retry_count', 3))
-
-        # 进行断言重试
-        for attempt in range(1, max_retry_count + 1):
-            with allure.step(f"断言重试 (尝试 {attempt}/{max_retry_count})"):
-                retry_interval = retry_config['interval']
-                for assertion in retryable_assertions:
-                    retry_interval = max(retry_interval,
-                                         assertion.get('retry_interval', 1.0))
-
-                allure.attach(
-                    f"重试 {len(retryable_assertions)} 个断言\n"
-                    f"等待间隔: {retry_interval}秒",
-                    name="断言重试信息",
-                    attachment_type=allure.attachment_type.TEXT
-                )
-
-                time.sleep(retry_interval)
-
-                # 重新发送请求
-                try:
-                    browser_http_req.execute(disable_auth=disable_auth)
-                except Exception as exec_error:
-                    allure.attach(
-                        f"重试执行请求失败: {type(exec_error).__name__}: {str(exec_error)}",
-                        name=f"重试请求执行失败 #{attempt}",
-                        attachment_type=allure.attachment_type.TEXT
-                    )
-                    continue
+    Args:
+        context: 测试上下文
+        client: 客户端名称
+        config: 请求配置列表，也可以是包含requests列表的配置
+        template: 模板名称
+        concurrency: 最大并发请求数
+        save_response: 保存响应列表的变量名
+        auth_state: 无浏览器模式使用的认证状态名称
+
+    Returns:
+        list: 每项请求捕获的变量字典
+    """
+    client_name = kwargs.get('client', 'default')
+    template_name = kwargs.get('template')
+    concurrency = int(kwargs.get('concurrency', 8))
+    save_response = kwargs.get('save_response')
 
-                # 过滤出仍在重试范围内的断言
-                still_retryable_assertions = []
-                for assertion in retryable_assertions:
-                    assertion_retry_count = assertion.get('retry_count', 3)
-                    if attempt < assertion_retry_count:
-                        still_retryable_assertions.append(assertion)
+    browser_context, client_config = _request_target(
+        client_name, kwargs.get('auth_state'))
 
-                if not still_retryable_assertions:
-                    break
+    items = _parse_config(context, kwargs.get('config', '[]')) or []
+    if isinstance(items, dict):
+        items = items.get('requests', [])
+    if not isinstance(items, list):
+        raise ValueError("批量请求配置必须是请求配置列表")
 
-                # 只重试那些仍在重试范围内的断言
-                try:
-                    retry_assertion_indexes = [
-                        a['index'] for a in still_retryable_assertions]
-                    retry_assertions = [
-                        browser_http_req.config.get('asserts', [])[idx]
-                        for idx in retry_assertion_indexes]
-
-                    index_mapping = {
-                        new_idx: orig_idx for new_idx, orig_idx in
-                        enumerate(retry_assertion_indexes)}
-
-                    results, new_failed_assertions = browser_http_req.process_asserts(
-                        specific_asserts=retry_assertions,
-                        index_mapping=index_mapping)
-
-                    if not new_failed_assertions:
-                        try:
-                            results, _ = browser_http_req.process_asserts()
-                            allure.attach(
-                                "所有断言重试后验证通过",
-                                name="重试成功",
-                                attachment_type=allure.attachment_type.TEXT
-                            )
-                            return results
-                        except AssertionError as final_err:
-                            allure.attach(
-                                f"重试后的完整断言验证仍有失败: {str(final_err)}",
-                                name="完整断言仍失败",
-                                attachment_type=allure.attachment_type.TEXT
-                            )
-                            continue
-
-                    retryable_assertions = new_failed_assertions
-
-                except AssertionError as retry_err:
-                    allure.attach(
-                        f"第 {attempt} 次重试断言失败: {str(retry_err)}",
-                        name=f"重试断言失败 #{attempt}",
-                        attachment_type=allure.attachment_type.TEXT
-                    )
+    requests = []
+    for item in items:
+        if template_name:
+            item = _deep_merge(copy.deepcopy(_get_template(template_name)), item)
+        item['client_config'] = client_config
+        item = _process_request_config(item, test_context=context)
+        requests.append(BrowserHTTPRequest(item, client_name, browser_context))
+
+    with reporter.step(f"批量发送浏览器HTTP请求 (客户端: {client_name}, "
+                       f"数量: {len(requests)}, 并发: {concurrency})"):
+        if not requests:
+            return []
+
+        client = requests[0].get_client()
+        responses = client.make_requests(
+            [request.build_request() for request in requests], concurrency)
+
+        failures = []
+        results = []
+        for index, (request, response) in enumerate(zip(requests, responses), 1):
+            method, url, _ = request.build_request()
+            with reporter.step(f"请求 #{index}: {method} {url}"):
+                if isinstance(response, Exception):
+                    failures.append(f"请求 #{index} {method} {url}: {str(response)}")
+                    results.append({})
                     continue
 
-        # 重试次数用完，执行一次完整的断言以获取最终结果和错误
-        allure.attach(
-            "所有重试次数已用完，执行最终断言验证",
-            name="重试完成",
-            attachment_type=allure.attachment_type.TEXT
-        )
+                request.apply_response(response)
+                try:
+                    request.process_asserts()
+                except AssertionError as e:
+                    failures.append(f"请求 #{index} {method} {url}:\n{str(e)}")
 
-        try:
-            browser_http_req.execute(disable_auth=disable_auth)
-            results, _ = browser_http_req.process_asserts()
-            return results
-        except AssertionError as final_err:
-            enhanced_error = (
-                f"断言验证失败 (已重试 {max_retry_count} 次):\n\n"
-                f"{str(final_err)}"
-            )
-            allure.attach(
-                enhanced_error,
-                name="重试后仍失败的断言",
-                attachment_type=allure.attachment_type.TEXT
-            )
-            raise AssertionError(enhanced_error) from final_err
+                for var_name, value in request.captured_values.items():
+                    context.set(var_name, value)
+                results.append(request.captured_values)
+
+        if save_response:
+            context.set(save_response, responses)
+
+        if failures:
+            raise AssertionError(
+                f"批量请求失败 ({len(failures)}/{len(requests)}):\n\n"
+                + "\n\n".join(failures))
+
+        return results
 
 
 # 额外的便利关键字
@@ -662,7 +581,7 @@ def set_browser_http_client(context, **kwargs):
         except json.JSONDecodeError:
             raise ValueError("无效的JSON格式headers")
 
-    with allure.step(f"设置浏览器HTTP客户端: {client_name}"):
+    with reporter.step(f"设置浏览器HTTP客户端: {client_name}"):
         # 构建客户端配置
         client_config = {
             'base_url': base_url,
@@ -675,7 +594,7 @@ def set_browser_http_client(context, **kwargs):
         browser_http_clients[client_name] = client_config
         context.set('browser_http_clients', browser_http_clients)
 
-        allure.attach(
+        reporter.attach(
             f"客户端名称: {client_name}\n"
             f"基础URL: {base_url}\n"
             f"默认头: {json.dumps(headers, indent=2, ensure_ascii=False)}\n"
@@ -685,4 +604,56 @@ def set_browser_http_client(context, **kwargs):
         )
 
         # 直接返回成功状态
-        return True
\ No newline at end of file
+        return True
+
+
+@keyword_manager.register('获取表达式缓存统计', [
+    {'name': '清空', 'mapping': 'clear',
+     'description': '获取统计后清空缓存和计数', 'default': False},
+], category='UI/接口测试', tags=['性能', '缓存'])
+def get_expression_cache_stats(context, **kwargs):
+    """获取JSONPath/正则/XPath表达式编译缓存的统计信息
+
+    Args:
+        context: 测试上下文
+        clear: 获取统计后是否清空缓存
+
+    Returns:
+        dict: 缓存大小和按表达式类型的命中/未命中次数
+    """
+    stats = expression_cache.get_stats()
+    if kwargs.get('clear', False):
+        expression_cache.clear()
+
+    reporter.attach(
+        json.dumps(stats, indent=2, ensure_ascii=False),
+        name="表达式缓存统计",
+        attachment_type=allure.attachment_type.JSON
+    )
+    return stats
+
+
+@keyword_manager.register('获取模板缓存统计', [
+    {'name': '清空', 'mapping': 'clear',
+     'description': '获取统计后清空缓存和计数', 'default': False},
+], category='UI/接口测试', tags=['性能', '缓存'])
+def get_template_cache_stats(context, **kwargs):
+    """获取请求配置模板和引用文件缓存的统计信息
+
+    Args:
+        context: 测试上下文
+        clear: 获取统计后是否清空缓存
+
+    Returns:
+        dict: 引用文件、预编译模板和请求配置的缓存大小及命中/未命中次数
+    """
+    stats = template_cache.get_stats()
+    if kwargs.get('clear', False):
+        template_cache.clear()
+
+    reporter.attach(
+        json.dumps(stats, indent=2, ensure_ascii=False),
+        name="模板缓存统计",
+        attachment_type=allure.attachment_type.JSON
+    )
+    return stats
@@ -11,6 +11,7 @@ import urllib.parse
 
 from pytest_dsl.core.keyword_manager import keyword_manager
 from ..core.browser_manager import browser_manager
+from ..core.reporting import reporter
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +29,19 @@ logger = logging.getLogger(__name__)
     {'name': '视口高度', 'mapping': 'height', 'description': '浏览器视口高度'},
     {'name': '忽略证书错误', 'mapping': 'ignore_https_errors',
      'description': '是否忽略HTTPS证书错误', 'default': True},
+    {'name': 'HAR录制', 'mapping': 'record_har_path',
+     'description': '录制网络流量的HAR文件路径，关闭浏览器时写出'},
+    {'name': 'HAR回放', 'mapping': 'har_replay',
+     'description': '从HAR文件回放匹配的请求'},
+    {'name': 'HAR未匹配处理', 'mapping': 'har_not_found',
+     'description': '回放时未匹配请求的处理：fallback（访问真实网络）、abort或404',
+     'default': 'fallback'},
+    {'name': 'HAR忽略参数', 'mapping': 'har_ignore_params',
+     'description': '回放匹配时忽略的查询参数，多个用逗号分隔'},
+    {'name': '视频目录', 'mapping': 'record_video_dir',
+     'description': '录制视频的目录，默认只保留失败用例的视频，见[配置视频录制]'},
+    {'name': '视频尺寸', 'mapping': 'record_video_size',
+     'description': '录制视频的尺寸，如640x360，降低尺寸可减少编码开销'},
 ], category='UI/浏览器', tags=['启动', '配置'])
 def launch_browser(**kwargs):
     """启动浏览器
@@ -40,6 +54,12 @@ def launch_browser(**kwargs):
         width: 视口宽度
         height: 视口高度
         ignore_https_errors: 是否忽略HTTPS证书错误
+        record_har_path: HAR录制文件路径
+        har_replay: HAR回放文件路径
+        har_not_found: 回放时未匹配请求的处理方式
+        har_ignore_params: 回放匹配时忽略的查询参数
+        record_video_dir: 视频录制目录
+        record_video_size: 视频尺寸
 
     Returns:
         dict: 包含浏览器ID和相关信息的字典
@@ -53,7 +73,7 @@ def launch_browser(**kwargs):
     ignore_https_errors = kwargs.get('ignore_https_errors', True)
     context = kwargs.get('context')
 
-    with allure.step(f"启动浏览器: {browser_type}"):
+    with reporter.step(f"启动浏览器: {browser_type}"):
         try:
             # 解析配置
             if isinstance(config_str, str):
@@ -91,6 +111,13 @@ def launch_browser(**kwargs):
             if ignore_https_errors:
                 context_config['ignore_https_errors'] = True
 
+            # HAR录制、回放和视频录制配置
+            for key in ('record_har_path', 'har_replay',
+                        'har_not_found', 'har_ignore_params',
+                        'record_video_dir', 'record_video_size'):
+                if kwargs.get(key):
+                    context_config[key] = kwargs[key]
+
             context_id = browser_manager.create_context(
                 browser_id, **context_config)
 
@@ -109,7 +136,7 @@ def launch_browser(**kwargs):
                 context.set('current_context_id', context_id)
                 context.set('current_page_id', page_id)
 
-            allure.attach(
+            reporter.attach(
                 f"浏览器类型: {browser_type}\n"
                 f"浏览器ID: {browser_id}\n"
                 f"上下文ID: {context_id}\n"
@@ -137,7 +164,7 @@ def launch_browser(**kwargs):
 
         except Exception as e:
             logger.error(f"启动浏览器失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="浏览器启动失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -161,7 +188,7 @@ def close_browser(**kwargs):
     browser_id = kwargs.get('browser_id')
     context = kwargs.get('context')
 
-    with allure.step("关闭浏览器"):
+    with reporter.step("关闭浏览器"):
         try:
             # 如果没有指定浏览器ID，从上下文获取
             if not browser_id and context:
@@ -175,7 +202,7 @@ def close_browser(**kwargs):
                 context.set('current_context_id', None)
                 context.set('current_page_id', None)
 
-            allure.attach(
+            reporter.attach(
                 f"已关闭浏览器: {browser_id or '当前浏览器'}",
                 name="浏览器关闭信息",
                 attachment_type=allure.attachment_type.TEXT
@@ -188,7 +215,7 @@ def close_browser(**kwargs):
 
         except Exception as e:
             logger.error(f"关闭浏览器失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="浏览器关闭失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -196,6 +223,182 @@ def close_browser(**kwargs):
             raise
 
 
+@keyword_manager.register('关闭上下文', [
+    {'name': '上下文ID', 'mapping': 'context_id',
+        'description': '要关闭的浏览器上下文ID，如果不指定则关闭当前上下文'},
+], category='UI/浏览器', tags=['关闭'])
+def close_context(**kwargs):
+    """关闭浏览器上下文
+
+    启用上下文复用时，上下文被重置并放回空闲列表，供之后的[加载认证状态]等复用。
+
+    Args:
+        context_id: 上下文ID
+
+    Returns:
+        bool: 操作结果
+    """
+    context_id = kwargs.get('context_id')
+    context = kwargs.get('context')
+
+    with reporter.step("关闭浏览器上下文"):
+        try:
+            closing_current = (context_id is None
+                               or context_id == browser_manager.current_context)
+            browser_manager.close_context(context_id)
+
+            if context and closing_current:
+                context.set('current_context_id', None)
+                context.set('current_page_id', None)
+
+            logger.info(f"浏览器上下文关闭成功: {context_id or '当前上下文'}")
+            return True
+
+        except Exception as e:
+            logger.error(f"关闭浏览器上下文失败: {str(e)}")
+            reporter.attach(
+                f"错误信息: {str(e)}",
+                name="上下文关闭失败",
+                attachment_type=allure.attachment_type.TEXT
+            )
+            raise
+
+
+@keyword_manager.register('配置浏览器池', [
+    {'name': '启用', 'mapping': 'enabled',
+     'description': '是否启用浏览器池', 'default': True},
+    {'name': '预热数量', 'mapping': 'warm_size',
+     'description': '每种启动配置第一次启动浏览器时额外启动的预热浏览器数量（同步启动）',
+     'default': 0},
+    {'name': '最大数量', 'mapping': 'max_size',
+     'description': '池中浏览器总数上限', 'default': 4},
+    {'name': '空闲超时', 'mapping': 'idle_timeout',
+     'description': '空闲浏览器的最长保留时间（秒），0表示不淘汰', 'default': 300},
+    {'name': '健康检查', 'mapping': 'health_check',
+     'description': '复用前是否检查浏览器连接状态', 'default': True},
+], category='UI/浏览器', tags=['配置', '性能'])
+def configure_browser_pool(**kwargs):
+    """配置浏览器池
+
+    启用后，启动浏览器会复用池中已启动的浏览器，关闭浏览器只回收上下文，
+    从而避免每个DSL文件都付出浏览器冷启动开销。预热浏览器在第一次启动浏览器时
+    同步启动（Playwright同步API不能在后台线程中使用），这次启动会相应变慢。
+
+    Args:
+        enabled: 是否启用
+        warm_size: 预热数量
+        max_size: 最大数量
+        idle_timeout: 空闲超时
+        health_check: 健康检查
+
+    Returns:
+        dict: 浏览器池统计信息
+    """
+    enabled = kwargs.get('enabled', True)
+    warm_size = int(kwargs.get('warm_size', 0))
+    max_size = int(kwargs.get('max_size', 4))
+    idle_timeout = float(kwargs.get('idle_timeout', 300))
+    health_check = kwargs.get('health_check', True)
+
+    with reporter.step(f"配置浏览器池: {'启用' if enabled else '停用'}"):
+        try:
+            if not enabled:
+                browser_manager.disable_pool()
+                logger.info("浏览器池已停用")
+                return {}
+
+            pool = browser_manager.enable_pool(
+                warm_size=warm_size,
+                max_size=max_size,
+                idle_timeout=idle_timeout,
+                health_check=health_check
+            )
+            stats = pool.get_stats()
+
+            reporter.attach(
+                f"预热数量: {pool.warm_size}\n"
+                f"最大数量: {pool.max_size}\n"
+                f"空闲超时: {pool.idle_timeout}秒\n"
+                f"健康检查: {pool.health_check}\n"
+                f"当前浏览器数: {stats['size']} (空闲: {stats['idle']})",
+                name="浏览器池配置",
+                attachment_type=allure.attachment_type.TEXT
+            )
+
+            logger.info(f"浏览器池配置成功: {stats}")
+            return stats
+
+        except Exception as e:
+            logger.error(f"配置浏览器池失败: {str(e)}")
+            reporter.attach(
+                f"错误信息: {str(e)}",
+                name="浏览器池配置失败",
+                attachment_type=allure.attachment_type.TEXT
+            )
+            raise
+
+
+@keyword_manager.register('配置上下文复用', [
+    {'name': '启用', 'mapping': 'enabled',
+     'description': '是否启用浏览器上下文复用', 'default': True},
+    {'name': '每组上限', 'mapping': 'max_per_key',
+     'description': '每种上下文配置最多保留的空闲上下文数量', 'default': 2},
+    {'name': '总上限', 'mapping': 'max_size',
+     'description': '空闲上下文总数上限', 'default': 8},
+], category='UI/浏览器', tags=['配置', '性能'])
+def configure_context_recycling(**kwargs):
+    """配置浏览器上下文复用
+
+    启用后，新建上下文（包括加载认证状态）会优先复用已重置的上下文。
+    上下文只在[关闭上下文]时，或启用浏览器池后[关闭浏览器]时归还；
+    只启用本功能而不关闭上下文不会有任何复用。
+    重置会清除cookies、权限、请求头、地理位置、路由、存储和页面，认证状态通过
+    直接写入cookies和localStorage重新应用。添加过初始化脚本的上下文不复用。
+
+    Args:
+        enabled: 是否启用
+        max_per_key: 每组上限
+        max_size: 总上限
+
+    Returns:
+        dict: 上下文复用统计信息
+    """
+    enabled = kwargs.get('enabled', True)
+    max_per_key = int(kwargs.get('max_per_key', 2))
+    max_size = int(kwargs.get('max_size', 8))
+
+    with reporter.step(f"配置上下文复用: {'启用' if enabled else '停用'}"):
+        try:
+            if not enabled:
+                browser_manager.disable_context_recycling()
+                logger.info("浏览器上下文复用已停用")
+                return {}
+
+            context_pool = browser_manager.enable_context_recycling(
+                max_per_key=max_per_key, max_size=max_size)
+            stats = context_pool.get_stats()
+
+            reporter.attach(
+                f"每组上限: {context_pool.max_per_key}\n"
+                f"总上限: {context_pool.max_size}\n"
+                f"当前空闲上下文: {stats['free']}",
+                name="上下文复用配置",
+                attachment_type=allure.attachment_type.TEXT
+            )
+
+            logger.info(f"浏览器上下文复用配置成功: {stats}")
+            return stats
+
+        except Exception as e:
+            logger.error(f"配置上下文复用失败: {str(e)}")
+            reporter.attach(
+                f"错误信息: {str(e)}",
+                name="上下文复用配置失败",
+                attachment_type=allure.attachment_type.TEXT
+            )
+            raise
+
+
 @keyword_manager.register('新建页面', [
     {'name': '上下文ID', 'mapping': 'context_id',
         'description': '浏览器上下文ID，如果不指定则使用当前上下文'},
@@ -212,7 +415,7 @@ def new_page(**kwargs):
     context_id = kwargs.get('context_id')
     test_context = kwargs.get('context')
 
-    with allure.step("新建页面"):
+    with reporter.step("新建页面"):
         try:
             # 如果没有指定上下文ID，从测试上下文获取
             if not context_id and test_context:
@@ -224,7 +427,7 @@ def new_page(**kwargs):
             if test_context:
                 test_context.set('current_page_id', page_id)
 
-            allure.attach(
+            reporter.attach(
                 f"新页面ID: {page_id}\n上下文ID: {context_id}",
                 name="新建页面信息",
                 attachment_type=allure.attachment_type.TEXT
@@ -241,7 +444,7 @@ def new_page(**kwargs):
 
         except Exception as e:
             logger.error(f"新建页面失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="新建页面失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -264,7 +467,7 @@ def switch_page(**kwargs):
     page_id = kwargs.get('page_id')
     context = kwargs.get('context')
 
-    with allure.step(f"切换页面: {page_id}"):
+    with reporter.step(f"切换页面: {page_id}"):
         try:
             # 切换内部焦点
             browser_manager.switch_page(page_id)
@@ -277,7 +480,7 @@ def switch_page(**kwargs):
             if context:
                 context.set('current_page_id', page_id)
 
-            allure.attach(
+            reporter.attach(
                 f"已切换到页面: {page_id}",
                 name="页面切换信息",
                 attachment_type=allure.attachment_type.TEXT
@@ -300,7 +503,7 @@ def switch_page(**kwargs):
 
         except Exception as e:
             logger.error(f"切换页面失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="页面切换失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -322,15 +525,15 @@ def set_default_timeout(**kwargs):
     """
     timeout = float(kwargs.get('timeout', 30))
 
-    with allure.step(f"设置等待超时: {timeout}秒"):
+    with reporter.step(f"设置等待超时: {timeout}秒"):
         try:
             # 获取当前页面并设置超时
             page = browser_manager.get_current_page()
             from ..core.element_locator import ElementLocator
-            locator = ElementLocator(page)
+            locator = ElementLocator.for_page(page)
             locator.set_default_timeout(timeout)
 
-            allure.attach(
+            reporter.attach(
                 f"默认超时时间已设置为: {timeout}秒",
                 name="超时设置信息",
                 attachment_type=allure.attachment_type.TEXT
@@ -351,7 +554,7 @@ def set_default_timeout(**kwargs):
 
         except Exception as e:
             logger.error(f"设置超时时间失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="超时设置失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -375,7 +578,7 @@ def get_page_list(**kwargs):
     variable = kwargs.get('variable')
     context = kwargs.get('context')
 
-    with allure.step("获取页面列表"):
+    with reporter.step("获取页面列表"):
         try:
             # 获取所有页面ID
             page_ids = list(browser_manager.pages.keys())
@@ -408,7 +611,7 @@ def get_page_list(**kwargs):
             if variable and context:
                 context.set(variable, result)
 
-            allure.attach(
+            reporter.attach(
                 f"总页面数: {len(page_ids)}\n"
                 f"当前页面: {current_page_id}\n"
                 f"页面列表: {', '.join(page_ids)}",
@@ -434,7 +637,7 @@ def get_page_list(**kwargs):
 
         except Exception as e:
             logger.error(f"获取页面列表失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="获取页面列表失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -460,7 +663,7 @@ def wait_for_new_page(**kwargs):
     variable = kwargs.get('variable')
     context = kwargs.get('context')
 
-    with allure.step("等待新页面"):
+    with reporter.step("等待新页面"):
         try:
             # 记录当前页面数量
             initial_page_count = len(browser_manager.pages)
@@ -496,7 +699,7 @@ def wait_for_new_page(**kwargs):
             if variable and context:
                 context.set(variable, page_id)
 
-            allure.attach(
+            reporter.attach(
                 f"新页面ID: {page_id}\n"
                 f"页面URL: {new_page.url}\n"
                 f"超时时间: {timeout}秒",
@@ -525,7 +728,7 @@ def wait_for_new_page(**kwargs):
 
         except Exception as e:
             logger.error(f"等待新页面失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="等待新页面失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -548,7 +751,7 @@ def switch_to_latest_page(**kwargs):
     variable = kwargs.get('variable')
     context = kwargs.get('context')
 
-    with allure.step("切换到最新页面"):
+    with reporter.step("切换到最新页面"):
         try:
             if not browser_manager.pages:
                 raise ValueError("没有可用的页面")
@@ -579,7 +782,7 @@ def switch_to_latest_page(**kwargs):
             page_url = page.url
             page_title = page.title()
 
-            allure.attach(
+            reporter.attach(
                 f"最新页面ID: {latest_page_id}\n"
                 f"页面URL: {page_url}\n"
                 f"页面标题: {page_title}",
@@ -608,7 +811,7 @@ def switch_to_latest_page(**kwargs):
 
         except Exception as e:
             logger.error(f"切换到最新页面失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="切换到最新页面失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -640,7 +843,7 @@ def find_page_by_title(**kwargs):
     if not title:
         raise ValueError("标题参数不能为空")
 
-    with allure.step(f"根据标题查找页面: {title}"):
+    with reporter.step(f"根据标题查找页面: {title}"):
         try:
             # 获取所有页面
             page_ids = list(browser_manager.pages.keys())
@@ -730,7 +933,7 @@ def find_page_by_title(**kwargs):
             if variable and context and result:
                 context.set(variable, result)
 
-            allure.attach(
+            reporter.attach(
                 f"查找标题: {title}\n"
                 f"编码后: {search_title_encoded}\n"
                 f"匹配模式: {'精确匹配' if exact_match else '部分匹配'}\n"
@@ -766,7 +969,7 @@ def find_page_by_title(**kwargs):
 
         except Exception as e:
             logger.error(f"根据标题查找页面失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="根据标题查找页面失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -798,7 +1001,7 @@ def find_page_by_url(**kwargs):
     if not url:
         raise ValueError("URL参数不能为空")
 
-    with allure.step(f"根据URL查找页面: {url}"):
+    with reporter.step(f"根据URL查找页面: {url}"):
         try:
             # 获取所有页面
             page_ids = list(browser_manager.pages.keys())
@@ -838,7 +1041,7 @@ def find_page_by_url(**kwargs):
             if variable and context and result:
                 context.set(variable, result)
 
-            allure.attach(
+            reporter.attach(
                 f"查找URL: {url}\n"
                 f"匹配模式: {'精确匹配' if exact_match else '部分匹配'}\n"
                 f"找到页面数: {len(found_pages)}\n"
@@ -872,7 +1075,7 @@ def find_page_by_url(**kwargs):
 
         except Exception as e:
             logger.error(f"根据URL查找页面失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="根据URL查找页面失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -18,6 +18,7 @@ except ImportError as e:
 from pytest_dsl.core.keyword_manager import keyword_manager
 from ..core.browser_manager import browser_manager
 from ..core.page_context import PageContext
+from ..core.reporting import reporter
 
 logger = logging.getLogger(__name__)
 
@@ -71,7 +72,7 @@ def recognize_text_captcha(**kwargs):
     if not image_source:
         raise ValueError("图片源不能为空")
 
-    with allure.step("识别文字验证码"):
+    with reporter.step("识别文字验证码"):
         try:
             # 获取图片数据
             image_data = _get_image_data(image_source, source_type, context)
@@ -88,13 +89,13 @@ def recognize_text_captcha(**kwargs):
                 context.set(variable, result)
 
             # 记录日志和报告
-            allure.attach(
+            reporter.attach(
                 image_data,
                 name="验证码图片",
                 attachment_type=allure.attachment_type.PNG
             )
 
-            allure.attach(
+            reporter.attach(
                 f"图片源: {image_source}\n"
                 f"源类型: {source_type}\n"
                 f"识别结果: {result}\n"
@@ -111,7 +112,7 @@ def recognize_text_captcha(**kwargs):
 
         except Exception as e:
             logger.error(f"文字验证码识别失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}\n"
                 f"图片源: {image_source}",
                 name="验证码识别失败",
@@ -151,10 +152,8 @@ def _get_image_data(image_source: str, source_type: str, context) -> bytes:
         # 元素截图
         page = browser_manager.get_current_page()
         page_context = PageContext(page)
-        screenshot_path = page_context.screenshot(
-            element_selector=image_source)
-        with open(screenshot_path, 'rb') as f:
-            return f.read()
+        return page_context.capture(element_selector=image_source,
+                                    image_format='png')
 
     elif source_type == 'base64':
         # base64数据
@@ -8,14 +8,17 @@ import allure
 
 from pytest_dsl.core.keyword_manager import keyword_manager
 from ..core.browser_manager import browser_manager
+from ..core.artifacts import artifact_writer
 from ..core.page_context import PageContext
+from ..core.reporting import reporter
+from ..core.video_recorder import video_recorder
 
 logger = logging.getLogger(__name__)
 
 
 @keyword_manager.register('截图', [
     {'name': '文件名', 'mapping': 'filename', 
-     'description': '截图文件名，如果不指定则自动生成'},
+     'description': '截图文件名，如果不指定则自动生成；自动命名的截图与上一帧相同时不再保存'},
     {'name': '元素定位器', 'mapping': 'element_selector', 
      'description': '如果指定则只截取该元素'},
     {'name': '全页面', 'mapping': 'full_page', 
@@ -41,16 +44,19 @@ def take_screenshot(**kwargs):
     variable = kwargs.get('variable')
     context = kwargs.get('context')
 
-    with allure.step("页面截图"):
+    with reporter.step("页面截图"):
         try:
             page = browser_manager.get_current_page()
             page_context = PageContext(page)
 
-            # 执行截图
+            # 执行截图，文件写入和报告附件由artifact_writer在后台处理；
+            # 需要保存路径时不参与环形缓冲，并在返回前等待文件写入完成
             screenshot_path = page_context.screenshot(
                 path=filename,
                 element_selector=element_selector,
-                full_page=full_page
+                full_page=full_page,
+                wait=bool(variable),
+                allow_buffer=not variable
             )
 
             # 保存到变量
@@ -59,15 +65,7 @@ def take_screenshot(**kwargs):
                 context.set(variable, screenshot_path)
                 captures[variable] = screenshot_path
 
-            # 添加到Allure报告
-            with open(screenshot_path, 'rb') as f:
-                allure.attach(
-                    f.read(),
-                    name="页面截图",
-                    attachment_type=allure.attachment_type.PNG
-                )
-
-            allure.attach(
+            reporter.attach(
                 f"截图文件: {screenshot_path}\n"
                 f"元素定位器: {element_selector or '整个页面'}\n"
                 f"全页面: {full_page}\n"
@@ -76,7 +74,10 @@ def take_screenshot(**kwargs):
                 attachment_type=allure.attachment_type.TEXT
             )
 
-            logger.info(f"截图成功: {screenshot_path}")
+            if screenshot_path:
+                logger.info(f"截图成功: {screenshot_path}")
+            else:
+                logger.info("截图已放入环形缓冲，步骤失败时写入")
 
             # 保存到变量
             if variable and context:
@@ -87,7 +88,7 @@ def take_screenshot(**kwargs):
 
         except Exception as e:
             logger.error(f"截图失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="截图失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -95,15 +96,63 @@ def take_screenshot(**kwargs):
             raise
 
 
+@keyword_manager.register('配置截图', [
+    {'name': '格式', 'mapping': 'image_format',
+     'description': '截图格式：png、jpeg或webp'},
+    {'name': '质量', 'mapping': 'quality',
+     'description': 'jpeg/webp的质量（0-100）'},
+    {'name': '缓冲帧数', 'mapping': 'ring_size',
+     'description': '大于0时未指定文件名和变量名的截图只在内存中保留最近N帧，步骤失败时才写入；0表示立即写入'},
+], category='UI/截图')
+def configure_screenshots(**kwargs):
+    """配置截图格式、质量和失败时才写入的环形缓冲
+
+    Args:
+        image_format: 截图格式
+        quality: 质量
+        ring_size: 缓冲帧数
+
+    Returns:
+        dict: 当前配置和写入统计
+    """
+    quality = kwargs.get('quality')
+    ring_size = kwargs.get('ring_size')
+
+    with reporter.step("配置截图"):
+        artifact_writer.configure(
+            image_format=kwargs.get('image_format'),
+            quality=int(quality) if quality not in (None, '') else None,
+            ring_size=int(ring_size) if ring_size not in (None, '') else None)
+
+        settings = {
+            'image_format': artifact_writer.image_format,
+            'quality': artifact_writer.quality,
+            'ring_size': artifact_writer.ring_size,
+            'stats': artifact_writer.get_stats(),
+        }
+        logger.info(f"截图配置: {settings}")
+        return settings
+
+
 @keyword_manager.register('开始录制', [
-    {'name': '文件名', 'mapping': 'filename', 'description': '录制文件名，如果不指定则自动生成'},
+    {'name': '文件名', 'mapping': 'filename',
+     'description': '录制文件名，如果不指定则自动生成。录制在重新打开当前URL的新上下文中进行，'
+                    '页面内状态、额外请求头、HAR回放和网络监听不会带过去'},
+    {'name': '视频尺寸', 'mapping': 'size', 'description': '视频尺寸，如640x360，不指定时按视口缩放'},
     {'name': '变量名', 'mapping': 'variable', 'description': '保存录制路径的变量名'},
 ], category='UI/视频录制')
 def start_recording(**kwargs):
     """开始录制视频
 
+    Playwright只能在创建上下文时开启录制，因此录制在一个新建的录制上下文中进行：
+    复制当前上下文的cookies和localStorage、视口和证书设置后重新打开当前URL。
+    页面内的状态（表单输入、滚动位置、内存中的数据）不会保留，打开页面的副作用会重复；
+    额外请求头、HAR回放路由和网络监听不会带到录制上下文中。
+    停止录制后切换回原页面，原页面不受影响。
+
     Args:
         filename: 文件名
+        size: 视频尺寸
         variable: 变量名
 
     Returns:
@@ -113,13 +162,14 @@ def start_recording(**kwargs):
     variable = kwargs.get('variable')
     context = kwargs.get('context')
 
-    with allure.step("开始录制"):
+    with reporter.step("开始录制"):
         try:
             page = browser_manager.get_current_page()
             page_context = PageContext(page)
 
             # 开始录制
-            recording_path = page_context.start_recording(filename)
+            recording_path = page_context.start_video_recording(
+                filename, kwargs.get('size'))
 
             # 保存到变量
             captures = {}
@@ -127,7 +177,7 @@ def start_recording(**kwargs):
                 context.set(variable, recording_path)
                 captures[variable] = recording_path
 
-            allure.attach(
+            reporter.attach(
                 f"录制文件: {recording_path}\n"
                 f"保存变量: {variable or '无'}",
                 name="录制开始信息",
@@ -145,7 +195,7 @@ def start_recording(**kwargs):
 
         except Exception as e:
             logger.error(f"开始录制失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="开始录制失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -168,7 +218,7 @@ def stop_recording(**kwargs):
     variable = kwargs.get('variable')
     context = kwargs.get('context')
 
-    with allure.step("停止录制"):
+    with reporter.step("停止录制"):
         try:
             page = browser_manager.get_current_page()
             page_context = PageContext(page)
@@ -184,17 +234,13 @@ def stop_recording(**kwargs):
 
             if recording_path:
                 # 添加到Allure报告
-                try:
-                    with open(recording_path, 'rb') as f:
-                        allure.attach(
-                            f.read(),
-                            name="录制视频",
-                            attachment_type=allure.attachment_type.WEBM
-                        )
-                except Exception as e:
-                    logger.warning(f"无法添加录制视频到报告: {str(e)}")
-
-                allure.attach(
+                reporter.attach_file(
+                    recording_path,
+                    name="录制视频",
+                    attachment_type=allure.attachment_type.WEBM
+                )
+
+                reporter.attach(
                     f"录制文件: {recording_path}\n"
                     f"保存变量: {variable or '无'}",
                     name="录制停止信息",
@@ -214,7 +260,7 @@ def stop_recording(**kwargs):
 
         except Exception as e:
             logger.error(f"停止录制失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="停止录制失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -222,6 +268,35 @@ def stop_recording(**kwargs):
             raise
 
 
+@keyword_manager.register('配置视频录制', [
+    {'name': '保留策略', 'mapping': 'retention',
+     'description': 'on-failure只保留失败用例期间录制的视频（pytest中以用例结果为准），always保留全部'},
+    {'name': '转码格式', 'mapping': 'transcode',
+     'description': '保留的视频在后台用ffmpeg转码为该格式（如mp4），空字符串关闭转码'},
+], category='UI/视频录制')
+def configure_video_recording(**kwargs):
+    """配置[启动浏览器]视频目录录制的视频的保留策略和转码
+
+    Args:
+        retention: 保留策略
+        transcode: 转码格式
+
+    Returns:
+        dict: 当前配置和录制统计
+    """
+    with reporter.step("配置视频录制"):
+        video_recorder.configure(retention=kwargs.get('retention'),
+                                 transcode=kwargs.get('transcode'))
+
+        settings = {
+            'retention': video_recorder.retention,
+            'transcode': video_recorder.transcode,
+            'stats': video_recorder.get_stats(),
+        }
+        logger.info(f"视频录制配置: {settings}")
+        return settings
+
+
 @keyword_manager.register('设置视口大小', [
     {'name': '宽度', 'mapping': 'width', 'description': '视口宽度'},
     {'name': '高度', 'mapping': 'height', 'description': '视口高度'},
@@ -242,14 +317,14 @@ def set_viewport_size(**kwargs):
     if not width or not height:
         raise ValueError("宽度和高度参数不能为空")
 
-    with allure.step(f"设置视口大小: {width}x{height}"):
+    with reporter.step(f"设置视口大小: {width}x{height}"):
         try:
             page = browser_manager.get_current_page()
             page_context = PageContext(page)
 
             page_context.set_viewport_size(int(width), int(height))
 
-            allure.attach(
+            reporter.attach(
                 f"视口宽度: {width}\n"
                 f"视口高度: {height}",
                 name="视口大小设置",
@@ -263,7 +338,7 @@ def set_viewport_size(**kwargs):
 
         except Exception as e:
             logger.error(f"设置视口大小失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="设置视口大小失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -286,7 +361,7 @@ def get_viewport_size(**kwargs):
     variable = kwargs.get('variable')
     context = kwargs.get('context')
 
-    with allure.step("获取视口大小"):
+    with reporter.step("获取视口大小"):
         try:
             page = browser_manager.get_current_page()
             page_context = PageContext(page)
@@ -299,7 +374,7 @@ def get_viewport_size(**kwargs):
                 context.set(variable, viewport_size)
                 captures[variable] = viewport_size
 
-            allure.attach(
+            reporter.attach(
                 f"视口宽度: {viewport_size['width']}\n"
                 f"视口高度: {viewport_size['height']}\n"
                 f"保存变量: {variable or '无'}",
@@ -318,7 +393,7 @@ def get_viewport_size(**kwargs):
 
         except Exception as e:
             logger.error(f"获取视口大小失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="获取视口大小失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -347,7 +422,7 @@ def execute_javascript(**kwargs):
     if not script:
         raise ValueError("脚本参数不能为空")
 
-    with allure.step("执行JavaScript"):
+    with reporter.step("执行JavaScript"):
         try:
             page = browser_manager.get_current_page()
             page_context = PageContext(page)
@@ -358,7 +433,7 @@ def execute_javascript(**kwargs):
             if variable and context:
                 context.set(variable, result)
 
-            allure.attach(
+            reporter.attach(
                 f"JavaScript代码:\n{script}\n\n"
                 f"执行结果: {result}\n"
                 f"保存变量: {variable or '无'}",
@@ -373,7 +448,7 @@ def execute_javascript(**kwargs):
 
         except Exception as e:
             logger.error(f"JavaScript执行失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="JavaScript执行失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -9,6 +9,7 @@ import allure
 import pyperclip
 
 from pytest_dsl.core.keyword_manager import keyword_manager
+from ..core.reporting import reporter
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +30,7 @@ def get_clipboard_text(**kwargs):
     variable = kwargs.get('variable')
     context = kwargs.get('context')
 
-    with allure.step("获取剪贴板文本"):
+    with reporter.step("获取剪贴板文本"):
         try:
             # 获取剪贴板文本
             clipboard_text = pyperclip.paste()
@@ -39,7 +40,7 @@ def get_clipboard_text(**kwargs):
                 context.set(variable, clipboard_text)
 
             # 记录日志和报告
-            allure.attach(
+            reporter.attach(
                 f"剪贴板文本: {clipboard_text}\n"
                 f"文本长度: {len(clipboard_text)}\n"
                 f"保存变量: {variable or '无'}",
@@ -54,7 +55,7 @@ def get_clipboard_text(**kwargs):
 
         except Exception as e:
             logger.error(f"获取剪贴板文本失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="获取剪贴板文本失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -79,13 +80,13 @@ def set_clipboard_text(**kwargs):
     if text is None:
         text = ''
 
-    with allure.step("设置剪贴板文本"):
+    with reporter.step("设置剪贴板文本"):
         try:
             # 设置剪贴板文本
             pyperclip.copy(text)
 
             # 记录日志和报告
-            allure.attach(
+            reporter.attach(
                 f"设置文本: {text}\n"
                 f"文本长度: {len(text)}",
                 name="剪贴板设置信息",
@@ -99,7 +100,7 @@ def set_clipboard_text(**kwargs):
 
         except Exception as e:
             logger.error(f"设置剪贴板文本失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="设置剪贴板文本失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -134,7 +135,7 @@ def compare_clipboard_text(**kwargs):
     if expected_text is None:
         raise ValueError("期望文本参数不能为空")
 
-    with allure.step("比较剪贴板文本"):
+    with reporter.step("比较剪贴板文本"):
         try:
             # 获取剪贴板文本
             clipboard_text = pyperclip.paste()
@@ -160,7 +161,7 @@ def compare_clipboard_text(**kwargs):
                 raise ValueError(f"不支持的匹配方式: {match_type}")
 
             # 记录日志和报告
-            allure.attach(
+            reporter.attach(
                 f"剪贴板文本: {clipboard_text}\n"
                 f"期望文本: {expected_text}\n"
                 f"匹配方式: {match_type}\n"
@@ -181,7 +182,7 @@ def compare_clipboard_text(**kwargs):
 
         except Exception as e:
             logger.error(f"剪贴板文本比较失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="剪贴板文本比较失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -225,7 +226,7 @@ def assert_clipboard_text(**kwargs):
     )
     message = message or default_message
 
-    with allure.step("断言剪贴板文本"):
+    with reporter.step("断言剪贴板文本"):
         try:
             # 使用比较函数
             result = compare_clipboard_text(
@@ -240,7 +241,7 @@ def assert_clipboard_text(**kwargs):
                 clipboard_text = pyperclip.paste()
                 error_msg = f"{message}。实际文本: '{clipboard_text}'"
                 
-                allure.attach(
+                reporter.attach(
                     error_msg,
                     name="剪贴板文本断言失败",
                     attachment_type=allure.attachment_type.TEXT
@@ -255,7 +256,7 @@ def assert_clipboard_text(**kwargs):
             raise
         except Exception as e:
             logger.error(f"剪贴板文本断言失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="剪贴板文本断言失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -14,6 +14,7 @@ from typing import Optional, Dict, Any, List
 from pytest_dsl.core.keyword_manager import keyword_manager
 from ..core.browser_manager import browser_manager
 from ..utils.helpers import generate_timestamp_filename, safe_filename
+from ..core.reporting import reporter
 
 logger = logging.getLogger(__name__)
 
@@ -49,7 +50,7 @@ def wait_for_download(**kwargs):
     if not trigger_selector:
         raise ValueError("触发元素定位器不能为空")
 
-    with allure.step(f"等待下载: {trigger_selector}"):
+    with reporter.step(f"等待下载: {trigger_selector}"):
         try:
             page = browser_manager.get_current_page()
             
@@ -104,7 +105,7 @@ def wait_for_download(**kwargs):
                 context.set(variable, download_path)
                 captures[variable] = download_path
 
-            allure.attach(
+            reporter.attach(
                 f"触发元素: {trigger_selector}\n"
                 f"下载文件: {download_path}\n"
                 f"文件大小: {file_size} 字节\n"
@@ -125,7 +126,7 @@ def wait_for_download(**kwargs):
 
         except Exception as e:
             logger.error(f"文件下载失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="文件下载失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -157,7 +158,7 @@ def monitor_downloads(**kwargs):
     variable = kwargs.get('variable')
     context = kwargs.get('context')
 
-    with allure.step(f"监听下载 {listen_duration} 秒"):
+    with reporter.step(f"监听下载 {listen_duration} 秒"):
         try:
             page = browser_manager.get_current_page()
             downloaded_files = []
@@ -213,7 +214,7 @@ def monitor_downloads(**kwargs):
                 context.set(variable, downloaded_files)
                 captures[variable] = downloaded_files
 
-            allure.attach(
+            reporter.attach(
                 f"监听时间: {listen_duration} 秒\n"
                 f"保存目录: {downloads_dir}\n"
                 f"下载文件数: {len(downloaded_files)}\n"
@@ -240,7 +241,7 @@ def monitor_downloads(**kwargs):
 
         except Exception as e:
             logger.error(f"下载监听失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="下载监听失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -278,7 +279,7 @@ def verify_downloaded_file(**kwargs):
     if not file_path:
         raise ValueError("文件路径不能为空")
 
-    with allure.step(f"验证下载文件: {file_path}"):
+    with reporter.step(f"验证下载文件: {file_path}"):
         try:
             file_path = Path(file_path)
             
@@ -322,7 +323,7 @@ def verify_downloaded_file(**kwargs):
                 "valid": True
             }
 
-            allure.attach(
+            reporter.attach(
                 f"文件路径: {file_path}\n"
                 f"文件大小: {file_size} 字节\n"
                 f"文件扩展名: {file_extension}\n"
@@ -347,7 +348,7 @@ def verify_downloaded_file(**kwargs):
 
         except Exception as e:
             logger.error(f"文件验证失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="文件验证失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -378,7 +379,7 @@ def cleanup_downloads(**kwargs):
     file_pattern = kwargs.get('file_pattern', '*')
     keep_days = kwargs.get('keep_days', 0)
 
-    with allure.step(f"清理下载文件: {download_directory}"):
+    with reporter.step(f"清理下载文件: {download_directory}"):
         try:
             downloads_dir = Path(download_directory)
             
@@ -429,7 +430,7 @@ def cleanup_downloads(**kwargs):
                 "keep_days": keep_days
             }
 
-            allure.attach(
+            reporter.attach(
                 f"下载目录: {downloads_dir}\n"
                 f"文件模式: {file_pattern}\n"
                 f"保留天数: {keep_days}\n"
@@ -455,7 +456,7 @@ def cleanup_downloads(**kwargs):
 
         except Exception as e:
             logger.error(f"清理下载文件失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="清理下载文件失败",
                 attachment_type=allure.attachment_type.TEXT
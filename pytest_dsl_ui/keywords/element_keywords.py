@@ -11,6 +11,7 @@ import allure
 from pytest_dsl.core.keyword_manager import keyword_manager
 from ..core.browser_manager import browser_manager
 from ..core.element_locator import ElementLocator
+from ..core.reporting import reporter
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +19,7 @@ logger = logging.getLogger(__name__)
 def _get_current_locator() -> ElementLocator:
     """获取当前页面的元素定位器"""
     page = browser_manager.get_current_page()
-    return ElementLocator(page)
+    return ElementLocator.for_page(page)
 
 
 @keyword_manager.register('点击元素', [
@@ -55,7 +56,7 @@ def click_element(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"点击元素: {selector}"):
+    with reporter.step(f"点击元素: {selector}"):
         try:
             locator = _get_current_locator()
 
@@ -73,7 +74,7 @@ def click_element(**kwargs):
             timeout_ms = int(timeout * 1000) if timeout else 30000
             element.click(force=force, timeout=timeout_ms)
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"强制点击: {force}\n"
                 f"索引: {index if index is not None else '无'}\n"
@@ -100,7 +101,7 @@ def click_element(**kwargs):
                 error_msg += "\n可能原因: 页面结构发生变化，元素已被移除"
             
             logger.error(error_msg)
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {error_msg}",
                 name="元素点击失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -130,7 +131,7 @@ def double_click_element(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"双击元素: {selector}"):
+    with reporter.step(f"双击元素: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -138,7 +139,7 @@ def double_click_element(**kwargs):
             timeout_ms = int(timeout * 1000) if timeout else 30000
             element.dblclick(timeout=timeout_ms)
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout or '默认'}秒",
                 name="元素双击信息",
@@ -152,7 +153,7 @@ def double_click_element(**kwargs):
 
         except Exception as e:
             logger.error(f"元素双击失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="元素双击失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -182,7 +183,7 @@ def right_click_element(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"右键点击元素: {selector}"):
+    with reporter.step(f"右键点击元素: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -190,7 +191,7 @@ def right_click_element(**kwargs):
             timeout_ms = int(timeout * 1000) if timeout else 30000
             element.click(button="right", timeout=timeout_ms)
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout or '默认'}秒",
                 name="元素右键点击信息",
@@ -204,7 +205,7 @@ def right_click_element(**kwargs):
 
         except Exception as e:
             logger.error(f"元素右键点击失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="元素右键点击失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -241,7 +242,7 @@ def input_text(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"输入文本: {selector} -> {text}"):
+    with reporter.step(f"输入文本: {selector} -> {text}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -256,7 +257,7 @@ def input_text(**kwargs):
                 element.click(timeout=timeout_ms)
                 element.type(text, delay=50, timeout=timeout_ms)
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"输入文本: {text}\n"
                 f"清空输入框: {clear}\n"
@@ -272,7 +273,7 @@ def input_text(**kwargs):
 
         except Exception as e:
             logger.error(f"文本输入失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="文本输入失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -302,7 +303,7 @@ def clear_text(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"清空文本: {selector}"):
+    with reporter.step(f"清空文本: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -310,7 +311,7 @@ def clear_text(**kwargs):
             timeout_ms = int(timeout * 1000) if timeout else 30000
             element.clear(timeout=timeout_ms)
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout or '默认'}秒",
                 name="文本清空信息",
@@ -324,7 +325,7 @@ def clear_text(**kwargs):
 
         except Exception as e:
             logger.error(f"文本清空失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="文本清空失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -354,7 +355,7 @@ def check_checkbox(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"勾选复选框: {selector}"):
+    with reporter.step(f"勾选复选框: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -362,7 +363,7 @@ def check_checkbox(**kwargs):
             timeout_ms = int(timeout * 1000) if timeout else 30000
             element.check(timeout=timeout_ms)
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout or '默认'}秒",
                 name="复选框勾选信息",
@@ -375,7 +376,7 @@ def check_checkbox(**kwargs):
             return True
         except Exception as e:
             logger.error(f"复选框勾选失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="复选框勾选失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -405,7 +406,7 @@ def uncheck_checkbox(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"取消勾选复选框: {selector}"):
+    with reporter.step(f"取消勾选复选框: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -413,7 +414,7 @@ def uncheck_checkbox(**kwargs):
             timeout_ms = int(timeout * 1000) if timeout else 30000
             element.uncheck(timeout=timeout_ms)
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout or '默认'}秒",
                 name="复选框取消勾选信息",
@@ -427,7 +428,7 @@ def uncheck_checkbox(**kwargs):
 
         except Exception as e:
             logger.error(f"复选框取消勾选失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="复选框取消勾选失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -461,7 +462,7 @@ def set_checkbox(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"设置复选框状态: {selector} -> {checked}"):
+    with reporter.step(f"设置复选框状态: {selector} -> {checked}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -469,7 +470,7 @@ def set_checkbox(**kwargs):
             timeout_ms = int(timeout * 1000) if timeout else 30000
             element.set_checked(checked, timeout=timeout_ms)
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"选中状态: {checked}\n"
                 f"超时时间: {timeout or '默认'}秒",
@@ -484,7 +485,7 @@ def set_checkbox(**kwargs):
 
         except Exception as e:
             logger.error(f"复选框状态设置失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="复选框状态设置失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -514,7 +515,7 @@ def select_radio(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"选择单选框: {selector}"):
+    with reporter.step(f"选择单选框: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -522,7 +523,7 @@ def select_radio(**kwargs):
             timeout_ms = int(timeout * 1000) if timeout else 30000
             element.check(timeout=timeout_ms)
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout or '默认'}秒",
                 name="单选框选择信息",
@@ -536,7 +537,7 @@ def select_radio(**kwargs):
 
         except Exception as e:
             logger.error(f"单选框选择失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="单选框选择失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -585,7 +586,7 @@ def select_option(**kwargs):
     if not any([value, label, index is not None]):
         raise ValueError("必须提供选项值、标签或索引中的一个")
 
-    with allure.step(f"选择下拉选项: {selector}"):
+    with reporter.step(f"选择下拉选项: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -621,7 +622,7 @@ def select_option(**kwargs):
             if index is not None:
                 selection_info.append(f"选项索引: {index}")
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"{'; '.join(selection_info)}\n"
                 f"多选: {multiple}\n"
@@ -637,7 +638,7 @@ def select_option(**kwargs):
 
         except Exception as e:
             logger.error(f"下拉选项选择失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="下拉选项选择失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -674,7 +675,7 @@ def type_text(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"逐字符输入: {selector} -> {text}"):
+    with reporter.step(f"逐字符输入: {selector} -> {text}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -682,7 +683,7 @@ def type_text(**kwargs):
             timeout_ms = int(timeout * 1000) if timeout else 30000
             element.press_sequentially(text, delay=delay, timeout=timeout_ms)
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"输入文本: {text}\n"
                 f"字符延迟: {delay}毫秒\n"
@@ -698,7 +699,7 @@ def type_text(**kwargs):
 
         except Exception as e:
             logger.error(f"逐字符输入失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="逐字符输入失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -734,7 +735,7 @@ def press_key(**kwargs):
     if not key:
         raise ValueError("按键参数不能为空")
 
-    with allure.step(f"按键操作: {selector} -> {key}"):
+    with reporter.step(f"按键操作: {selector} -> {key}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -742,7 +743,7 @@ def press_key(**kwargs):
             timeout_ms = int(timeout * 1000) if timeout else 30000
             element.press(key, timeout=timeout_ms)
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"按键: {key}\n"
                 f"超时时间: {timeout or '默认'}秒",
@@ -757,7 +758,7 @@ def press_key(**kwargs):
 
         except Exception as e:
             logger.error(f"按键操作失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="按键操作失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -787,7 +788,7 @@ def hover_element(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"悬停元素: {selector}"):
+    with reporter.step(f"悬停元素: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -795,7 +796,7 @@ def hover_element(**kwargs):
             timeout_ms = int(timeout * 1000) if timeout else 30000
             element.hover(timeout=timeout_ms)
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout or '默认'}秒",
                 name="元素悬停信息",
@@ -809,7 +810,7 @@ def hover_element(**kwargs):
 
         except Exception as e:
             logger.error(f"元素悬停失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="元素悬停失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -845,7 +846,7 @@ def drag_element(**kwargs):
     if not target_selector:
         raise ValueError("目标定位器参数不能为空")
 
-    with allure.step(f"拖拽元素: {source_selector} -> {target_selector}"):
+    with reporter.step(f"拖拽元素: {source_selector} -> {target_selector}"):
         try:
             locator = _get_current_locator()
             source_element = locator.locate(source_selector)
@@ -854,7 +855,7 @@ def drag_element(**kwargs):
             timeout_ms = int(timeout * 1000) if timeout else 30000
             source_element.drag_to(target_element, timeout=timeout_ms)
 
-            allure.attach(
+            reporter.attach(
                 f"源定位器: {source_selector}\n"
                 f"目标定位器: {target_selector}\n"
                 f"超时时间: {timeout or '默认'}秒",
@@ -869,7 +870,7 @@ def drag_element(**kwargs):
 
         except Exception as e:
             logger.error(f"元素拖拽失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="元素拖拽失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -899,7 +900,7 @@ def focus_element(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"聚焦元素: {selector}"):
+    with reporter.step(f"聚焦元素: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -907,7 +908,7 @@ def focus_element(**kwargs):
             timeout_ms = int(timeout * 1000) if timeout else 30000
             element.focus(timeout=timeout_ms)
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout or '默认'}秒",
                 name="元素聚焦信息",
@@ -921,7 +922,7 @@ def focus_element(**kwargs):
 
         except Exception as e:
             logger.error(f"元素聚焦失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="元素聚焦失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -968,7 +969,7 @@ def scroll_into_view(**kwargs):
     scroll_step = kwargs.get('scroll_step', 10)
     max_attempts = kwargs.get('max_attempts', 20)
 
-    with allure.step(f"滚动元素到视野: {selector}"):
+    with reporter.step(f"滚动元素到视野: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -997,7 +998,7 @@ def scroll_into_view(**kwargs):
                 # 直接滚动到元素
                 element.scroll_into_view_if_needed(timeout=timeout_ms)
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"超时时间: {timeout or '默认'}秒",
                 name="元素滚动信息",
@@ -1011,7 +1012,7 @@ def scroll_into_view(**kwargs):
 
         except Exception as e:
             logger.error(f"元素滚动失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="元素滚动失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -1056,7 +1057,7 @@ def upload_files(**kwargs):
     else:
         paths = file_paths
 
-    with allure.step(f"上传文件: {selector} -> {paths}"):
+    with reporter.step(f"上传文件: {selector} -> {paths}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -1064,7 +1065,7 @@ def upload_files(**kwargs):
             timeout_ms = int(timeout * 1000) if timeout else 30000
             element.set_input_files(paths, timeout=timeout_ms)
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"文件路径: {', '.join(paths)}\n"
                 f"超时时间: {timeout or '默认'}秒",
@@ -1079,7 +1080,7 @@ def upload_files(**kwargs):
 
         except Exception as e:
             logger.error(f"文件上传失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="文件上传失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -1115,7 +1116,7 @@ def check_navigation_empty(**kwargs):
     if content_type not in ['auto', 'menu', 'page_tree']:
         raise ValueError("内容类型必须是 'auto', 'menu' 或 'page_tree'")
 
-    with allure.step(f"检查导航栏是否为空: {selector}"):
+    with reporter.step(f"检查导航栏是否为空: {selector}"):
         try:
             # 调试日志：函数开始执行
             logger.debug(f"[导航栏检查] 开始执行函数，参数: selector={selector}, content_type={content_type}, timeout={timeout}")
@@ -1196,7 +1197,7 @@ def check_navigation_empty(**kwargs):
             output_info += f"使用的容器选择器: {'.ix-menu-inline' if content_type == 'menu' else '主容器'}\n"
             output_info += f"使用的项选择器: {'.ix-menu-item[aria-label]' if content_type == 'menu' else '.plugin_pagetree_children_span a'}\n"
 
-            allure.attach(
+            reporter.attach(
                 output_info,
                 name=f"{content_name}空检查结果",
                 attachment_type=allure.attachment_type.TEXT
@@ -1209,7 +1210,7 @@ def check_navigation_empty(**kwargs):
 
         except Exception as e:
             logger.error(f"导航栏检查失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="导航栏检查失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -1245,7 +1246,7 @@ def output_navigation_content(**kwargs):
     if content_type not in ['auto', 'menu', 'page_tree']:
         raise ValueError("内容类型必须是 'auto', 'menu' 或 'page_tree'")
 
-    with allure.step(f"输出导航栏内容: {selector}"):
+    with reporter.step(f"输出导航栏内容: {selector}"):
         try:
             # 调试日志：函数开始执行
             logger.debug(f"[导航栏内容输出] 开始执行函数，参数: selector={selector}, content_type={content_type}, timeout={timeout}")
@@ -1345,7 +1346,7 @@ def output_navigation_content(**kwargs):
             output_info += f"选择的属性/内容: {attr_name}\n"
             output_info += f"检测到的选择器: {'.ix-menu-item[aria-label]' if content_type == 'menu' else '.plugin_pagetree_children_span a'}\n"
 
-            allure.attach(
+            reporter.attach(
                 output_info,
                 name=f"{content_name}内容输出结果",
                 attachment_type=allure.attachment_type.TEXT
@@ -1358,7 +1359,7 @@ def output_navigation_content(**kwargs):
 
         except Exception as e:
             logger.error(f"导航栏内容输出失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="导航栏内容输出失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -9,6 +9,7 @@ import allure
 from pytest_dsl.core.keyword_manager import keyword_manager
 from ..core.browser_manager import browser_manager
 from ..core.element_locator import ElementLocator
+from ..core.reporting import reporter
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +17,7 @@ logger = logging.getLogger(__name__)
 def _get_current_locator() -> ElementLocator:
     """获取当前页面的元素定位器"""
     page = browser_manager.get_current_page()
-    return ElementLocator(page)
+    return ElementLocator.for_page(page)
 
 
 @keyword_manager.register('选择选项', [
@@ -51,7 +52,7 @@ def select_option(**kwargs):
     if not any([value, label, index is not None], category='UI/元素'):
         raise ValueError("必须指定值、标签或索引中的一个")
 
-    with allure.step(f"选择选项: {selector}"):
+    with reporter.step(f"选择选项: {selector}"):
         try:
             locator = _get_current_locator()
             element = locator.locate(selector)
@@ -73,7 +74,7 @@ def select_option(**kwargs):
                 else f"索引: {index}"
             )
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"选择: {selection_info}\n"
                 f"超时时间: {timeout or '默认'}秒",
@@ -99,7 +100,7 @@ def select_option(**kwargs):
 
         except Exception as e:
             logger.error(f"选项选择失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="选项选择失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -132,7 +133,7 @@ def upload_file(**kwargs):
     if not file_path:
         raise ValueError("文件路径参数不能为空")
 
-    with allure.step(f"上传文件: {selector} -> {file_path}"):
+    with reporter.step(f"上传文件: {selector} -> {file_path}"):
         try:
             import os
             if not os.path.exists(file_path):
@@ -147,7 +148,7 @@ def upload_file(**kwargs):
                 file_path, timeout=timeout_ms
             )
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"文件路径: {file_path}\n"
                 f"超时时间: {timeout or '默认'}秒",
@@ -171,7 +172,7 @@ def upload_file(**kwargs):
 
         except Exception as e:
             logger.error(f"文件上传失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="文件上传失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -207,12 +208,12 @@ def wait_for_element(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"等待元素{state}: {selector}"):
+    with reporter.step(f"等待元素{state}: {selector}"):
         try:
             locator = _get_current_locator()
             result = locator.wait_for_element(selector, state, timeout)
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"等待状态: {state}\n"
                 f"超时时间: {timeout or '默认'}秒\n"
@@ -239,7 +240,7 @@ def wait_for_element(**kwargs):
 
         except Exception as e:
             logger.error(f"元素等待失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="元素等待失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -271,12 +272,12 @@ def wait_for_text(**kwargs):
     if not text:
         raise ValueError("文本参数不能为空")
 
-    with allure.step(f"等待文本出现: {text}"):
+    with reporter.step(f"等待文本出现: {text}"):
         try:
             locator = _get_current_locator()
             result = locator.wait_for_text(text, timeout)
 
-            allure.attach(
+            reporter.attach(
                 f"等待文本: {text}\n"
                 f"超时时间: {timeout or '默认'}秒\n"
                 f"等待结果: {'成功' if result else '超时'}\n"
@@ -302,7 +303,7 @@ def wait_for_text(**kwargs):
 
         except Exception as e:
             logger.error(f"文本等待失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="文本等待失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -331,7 +332,7 @@ def get_element_text(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"获取元素文本: {selector}"):
+    with reporter.step(f"获取元素文本: {selector}"):
         try:
             locator = _get_current_locator()
             text = locator.get_element_text(selector)
@@ -342,7 +343,7 @@ def get_element_text(**kwargs):
                 context.set(variable, text)
                 captures[variable] = text
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"文本内容: {text}\n"
                 f"保存变量: {variable or '无'}",
@@ -361,7 +362,7 @@ def get_element_text(**kwargs):
 
         except Exception as e:
             logger.error(f"获取元素文本失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="获取元素文本失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -399,7 +400,7 @@ def get_element_attribute(**kwargs):
     if not attribute:
         raise ValueError("属性参数不能为空")
 
-    with allure.step(f"获取元素属性: {selector}.{attribute}"):
+    with reporter.step(f"获取元素属性: {selector}.{attribute}"):
         try:
             locator = _get_current_locator()
             attribute_value = locator.get_element_attribute(
@@ -447,7 +448,7 @@ def get_element_attribute(**kwargs):
                 context.set(variable, attribute_value)
                 captures[variable] = attribute_value
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"属性名: {attribute}\n"
                 f"原始属性值: {locator.get_element_attribute(selector, attribute)}\n"
@@ -470,7 +471,7 @@ def get_element_attribute(**kwargs):
 
         except Exception as e:
             logger.error(f"获取元素属性失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="获取元素属性失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -495,12 +496,12 @@ def check_element_checked(**kwargs):
     if not selector:
         raise ValueError("定位器参数不能为空")
 
-    with allure.step(f"检查元素是否选中: {selector}"):
+    with reporter.step(f"检查元素是否选中: {selector}"):
         try:
             locator = _get_current_locator()
             is_checked = locator.is_element_checked(selector)
 
-            allure.attach(
+            reporter.attach(
                 f"定位器: {selector}\n"
                 f"选中状态: {is_checked}",
                 name="元素选中状态检查",
@@ -522,7 +523,7 @@ def check_element_checked(**kwargs):
 
         except Exception as e:
             logger.error(f"检查元素选中状态失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="元素选中状态检查失败",
                 attachment_type=allure.attachment_type.TEXT
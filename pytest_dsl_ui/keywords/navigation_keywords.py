@@ -9,6 +9,7 @@ import allure
 from pytest_dsl.core.keyword_manager import keyword_manager
 from ..core.browser_manager import browser_manager
 from ..core.page_context import PageContext
+from ..core.reporting import reporter
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +42,7 @@ def open_page(**kwargs):
     if not url:
         raise ValueError("URL参数不能为空")
 
-    with allure.step(f"打开页面: {url}"):
+    with reporter.step(f"打开页面: {url}"):
         try:
             # 如果需要忽略HTTPS证书错误，且当前上下文不支持，需要创建新上下文
             if ignore_https_errors and url.startswith('https://'):
@@ -66,7 +67,7 @@ def open_page(**kwargs):
 
             page_context.navigate(url, wait_until, timeout)
 
-            allure.attach(
+            reporter.attach(
                 f"URL: {url}\n"
                 f"等待条件: {wait_until}\n"
                 f"超时时间: {timeout or '默认'}秒\n"
@@ -82,7 +83,7 @@ def open_page(**kwargs):
 
         except Exception as e:
             logger.error(f"打开页面失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="页面导航失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -108,14 +109,14 @@ def refresh_page(**kwargs):
     wait_until = kwargs.get('wait_until', 'load')
     timeout = kwargs.get('timeout')
 
-    with allure.step("刷新页面"):
+    with reporter.step("刷新页面"):
         try:
             page = browser_manager.get_current_page()
             page_context = PageContext(page)
 
             page_context.reload(wait_until, timeout)
 
-            allure.attach(
+            reporter.attach(
                 f"等待条件: {wait_until}\n"
                 f"超时时间: {timeout or '默认'}秒",
                 name="页面刷新信息",
@@ -129,7 +130,7 @@ def refresh_page(**kwargs):
 
         except Exception as e:
             logger.error(f"刷新页面失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="页面刷新失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -155,14 +156,14 @@ def go_back(**kwargs):
     wait_until = kwargs.get('wait_until', 'load')
     timeout = kwargs.get('timeout')
 
-    with allure.step("浏览器后退"):
+    with reporter.step("浏览器后退"):
         try:
             page = browser_manager.get_current_page()
             page_context = PageContext(page)
 
             page_context.go_back(wait_until, timeout)
 
-            allure.attach(
+            reporter.attach(
                 f"等待条件: {wait_until}\n"
                 f"超时时间: {timeout or '默认'}秒",
                 name="浏览器后退信息",
@@ -176,7 +177,7 @@ def go_back(**kwargs):
 
         except Exception as e:
             logger.error(f"浏览器后退失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="浏览器后退失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -202,14 +203,14 @@ def go_forward(**kwargs):
     wait_until = kwargs.get('wait_until', 'load')
     timeout = kwargs.get('timeout')
 
-    with allure.step("浏览器前进"):
+    with reporter.step("浏览器前进"):
         try:
             page = browser_manager.get_current_page()
             page_context = PageContext(page)
 
             page_context.go_forward(wait_until, timeout)
 
-            allure.attach(
+            reporter.attach(
                 f"等待条件: {wait_until}\n"
                 f"超时时间: {timeout or '默认'}秒",
                 name="浏览器前进信息",
@@ -223,7 +224,7 @@ def go_forward(**kwargs):
 
         except Exception as e:
             logger.error(f"浏览器前进失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="浏览器前进失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -238,14 +239,14 @@ def get_page_title(**kwargs):
     Returns:
         dict: 包含页面标题的字典
     """
-    with allure.step("获取页面标题"):
+    with reporter.step("获取页面标题"):
         try:
             page = browser_manager.get_current_page()
             page_context = PageContext(page)
 
             title = page_context.get_title()
 
-            allure.attach(
+            reporter.attach(
                 f"页面标题: {title}",
                 name="页面标题信息",
                 attachment_type=allure.attachment_type.TEXT
@@ -258,7 +259,7 @@ def get_page_title(**kwargs):
 
         except Exception as e:
             logger.error(f"获取页面标题失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="获取页面标题失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -273,14 +274,14 @@ def get_current_url(**kwargs):
     Returns:
         dict: 包含当前URL的字典
     """
-    with allure.step("获取当前地址"):
+    with reporter.step("获取当前地址"):
         try:
             page = browser_manager.get_current_page()
             page_context = PageContext(page)
 
             url = page_context.get_url()
 
-            allure.attach(
+            reporter.attach(
                 f"当前URL: {url}",
                 name="当前地址信息",
                 attachment_type=allure.attachment_type.TEXT
@@ -293,7 +294,7 @@ def get_current_url(**kwargs):
 
         except Exception as e:
             logger.error(f"获取当前地址失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="获取当前地址失败",
                 attachment_type=allure.attachment_type.TEXT
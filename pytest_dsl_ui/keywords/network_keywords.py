@@ -5,145 +5,106 @@
 """
 
 import logging
-import re
 import time
 import allure
-from typing import Optional, Dict, Any, List
+from typing import Dict
 
 from pytest_dsl.core.keyword_manager import keyword_manager
 from ..core.browser_manager import browser_manager
+from ..core.network_monitor import (
+    NetworkMonitor, CapturePolicy, compile_pattern
+)
+from ..core.reporting import reporter
 
 logger = logging.getLogger(__name__)
 
 
-class NetworkMonitor:
-    """网络监控器
-
-    用于监听和记录网络请求和响应
-    """
-
-    def __init__(self, page):
-        self.page = page
-        self.requests: List[Dict[str, Any]] = []
-        self.responses: List[Dict[str, Any]] = []
-        self.is_monitoring = False
-        self._request_handler = None
-        self._response_handler = None
-
-    def start_monitoring(self):
-        """开始监听网络请求"""
-        if self.is_monitoring:
-            return
-
-        self.requests.clear()
-        self.responses.clear()
-
-        def on_request(request):
-            request_data = {
-                'url': request.url,
-                'method': request.method,
-                'headers': dict(request.headers),
-                'post_data': request.post_data,
-                'timestamp': self._get_timestamp()
-            }
-            self.requests.append(request_data)
-            logger.debug(f"捕获请求: {request.method} {request.url}")
-
-        def on_response(response):
-            response_data = {
-                'url': response.url,
-                'status': response.status,
-                'status_text': response.status_text,
-                'headers': dict(response.headers),
-                'timestamp': self._get_timestamp()
-            }
-            # 尝试获取响应内容
-            try:
-                content_type = response.headers.get('content-type', '')
-                if 'application/json' in content_type:
-                    response_data['json'] = response.json()
-                response_data['text'] = response.text()
-            except Exception as e:
-                logger.debug(f"无法获取响应内容: {str(e)}")
-                response_data['text'] = None
-                response_data['json'] = None
-
-            self.responses.append(response_data)
-            logger.debug(f"捕获响应: {response.status} {response.url}")
-
-        self._request_handler = on_request
-        self._response_handler = on_response
-
-        self.page.on('request', self._request_handler)
-        self.page.on('response', self._response_handler)
-        self.is_monitoring = True
-        logger.info("网络监听已开始")
-
-    def stop_monitoring(self):
-        """停止监听网络请求"""
-        if not self.is_monitoring:
-            return
-
-        if self._request_handler:
-            self.page.remove_listener('request', self._request_handler)
-        if self._response_handler:
-            self.page.remove_listener('response', self._response_handler)
-
-        self.is_monitoring = False
-        logger.info("网络监听已停止")
-
-    def get_requests(
-        self, url_pattern: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """获取捕获的请求
-
-        Args:
-            url_pattern: URL匹配模式（正则表达式）
-
-        Returns:
-            List[Dict[str, Any]]: 匹配的请求列表
-        """
-        if not url_pattern:
-            return self.requests.copy()
-
-        pattern = re.compile(url_pattern)
-        return [req for req in self.requests if pattern.search(req['url'], category='UI/网络')]
-
-    def get_responses(
-        self, url_pattern: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """获取捕获的响应
-
-        Args:
-            url_pattern: URL匹配模式（正则表达式）
-
-        Returns:
-            List[Dict[str, Any]]: 匹配的响应列表
-        """
-        if not url_pattern:
-            return self.responses.copy()
-
-        pattern = re.compile(url_pattern)
-        return [resp for resp in self.responses if pattern.search(resp['url'], category='UI/网络')]
-
-    def _get_timestamp(self):
-        """获取当前时间戳"""
-        return time.time()
-
-
 # 全局网络监控器实例
 _network_monitors: Dict[str, NetworkMonitor] = {}
 
+# 新建监控器使用的捕获策略
+_capture_policy = CapturePolicy()
+
 
 def _get_network_monitor() -> NetworkMonitor:
     """获取当前页面的网络监控器"""
     page = browser_manager.get_current_page()
     page_id = id(page)
 
-    if page_id not in _network_monitors:
-        _network_monitors[page_id] = NetworkMonitor(page)
+    monitor = _network_monitors.get(page_id)
+    if monitor is None or monitor.page is not page:
+        monitor = NetworkMonitor(page, _capture_policy)
+        _network_monitors[page_id] = monitor
+
+    return monitor
+
+
+def _query_filters(kwargs: dict) -> dict:
+    """从关键字参数中提取网络记录查询条件"""
+    filters = {
+        'method': kwargs.get('method'),
+        'host': kwargs.get('host'),
+        'path_prefix': kwargs.get('path_prefix'),
+    }
+    within_seconds = kwargs.get('within_seconds')
+    if within_seconds is not None:
+        filters['since'] = time.time() - float(within_seconds)
+    return filters
+
+
+@keyword_manager.register('配置网络监听', [
+    {'name': '缓冲区容量', 'mapping': 'capacity',
+     'description': '请求和响应各自保留的最大记录数', 'default': 1000},
+    {'name': '包含URL', 'mapping': 'url_include',
+     'description': '只记录匹配的URL（正则表达式，多个用逗号分隔）'},
+    {'name': '排除URL', 'mapping': 'url_exclude',
+     'description': '不记录匹配的URL（正则表达式，多个用逗号分隔）'},
+    {'name': '包含类型', 'mapping': 'content_types',
+     'description': '只记录Content-Type包含这些片段的响应（多个用逗号分隔）'},
+    {'name': '排除类型', 'mapping': 'exclude_content_types',
+     'description': '不记录Content-Type包含这些片段的响应，如image,javascript'},
+    {'name': '最大响应体', 'mapping': 'max_body_size',
+     'description': '响应体大小上限（字节），超过时不读取', 'default': 1048576},
+    {'name': '响应体捕获', 'mapping': 'body_mode',
+     'description': 'eager（立即读取）、lazy（获取响应时读取，页面跳转后可能读取失败）或none',
+     'default': 'eager'},
+    {'name': '溢出文件', 'mapping': 'spill_path',
+     'description': '被淘汰记录写入的gzip压缩JSONL文件路径'},
+], category='UI/网络')
+def configure_network_monitoring(**kwargs):
+    """配置网络监听的捕获策略
 
-    return _network_monitors[page_id]
+    配置对当前页面的监控器和之后新建的监控器生效。
+
+    Returns:
+        dict: 捕获策略
+    """
+    global _capture_policy
+
+    with reporter.step("配置网络监听"):
+        policy = CapturePolicy(
+            capacity=int(kwargs.get('capacity', 1000)),
+            url_include=kwargs.get('url_include'),
+            url_exclude=kwargs.get('url_exclude'),
+            content_types=kwargs.get('content_types'),
+            exclude_content_types=kwargs.get('exclude_content_types'),
+            max_body_size=int(kwargs.get('max_body_size', 1048576)),
+            body_mode=str(kwargs.get('body_mode', 'eager')).lower(),
+            spill_path=kwargs.get('spill_path'),
+        )
+        _capture_policy = policy
+
+        if browser_manager.current_page:
+            _get_network_monitor().configure(policy)
+
+        description = policy.describe()
+        reporter.attach(
+            "\n".join(f"{key}: {value}" for key, value in description.items()),
+            name="网络监听配置",
+            attachment_type=allure.attachment_type.TEXT
+        )
+        logger.info(f"网络监听配置已更新: {description}")
+        return description
 
 
 @keyword_manager.register('开始网络监听', [
@@ -162,7 +123,7 @@ def start_network_monitoring(**kwargs):
     variable = kwargs.get('variable')
     context = kwargs.get('context')
 
-    with allure.step("开始网络监听"):
+    with reporter.step("开始网络监听"):
         try:
             monitor = _get_network_monitor()
             monitor.start_monitoring()
@@ -173,7 +134,7 @@ def start_network_monitoring(**kwargs):
                 context.set(variable, True)
                 captures[variable] = True
 
-            allure.attach(
+            reporter.attach(
                 f"网络监听已开始\n"
                 f"保存变量: {variable or '无'}",
                 name="网络监听信息",
@@ -191,7 +152,7 @@ def start_network_monitoring(**kwargs):
 
         except Exception as e:
             logger.error(f"开始网络监听失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="网络监听失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -206,12 +167,12 @@ def stop_network_monitoring(**kwargs):
     Returns:
         dict: 操作结果
     """
-    with allure.step("停止网络监听"):
+    with reporter.step("停止网络监听"):
         try:
             monitor = _get_network_monitor()
             monitor.stop_monitoring()
 
-            allure.attach(
+            reporter.attach(
                 "网络监听已停止",
                 name="网络监听信息",
                 attachment_type=allure.attachment_type.TEXT
@@ -224,7 +185,7 @@ def stop_network_monitoring(**kwargs):
 
         except Exception as e:
             logger.error(f"停止网络监听失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="停止网络监听失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -235,27 +196,39 @@ def stop_network_monitoring(**kwargs):
 @keyword_manager.register('获取网络请求', [
     {'name': 'URL模式', 'mapping': 'url_pattern',
      'description': '匹配URL的正则表达式模式'},
+    {'name': '请求方法', 'mapping': 'method', 'description': '请求方法，如GET、POST'},
+    {'name': '主机', 'mapping': 'host', 'description': '请求主机（含端口）'},
+    {'name': '路径前缀', 'mapping': 'path_prefix', 'description': 'URL路径前缀，如/api/'},
+    {'name': '最近秒数', 'mapping': 'within_seconds',
+     'description': '只返回最近N秒内捕获的记录'},
     {'name': '变量名', 'mapping': 'variable',
      'description': '保存请求列表的变量名'},
 ], category='UI/网络')
 def get_network_requests(**kwargs):
     """获取捕获的网络请求
 
+    多个过滤条件同时生效，请求方法、主机和路径前缀通过索引查询。
+
     Args:
         url_pattern: URL匹配模式（正则表达式）
+        method: 请求方法
+        host: 请求主机
+        path_prefix: URL路径前缀
+        within_seconds: 只返回最近N秒内的记录
         variable: 变量名
 
     Returns:
         dict: 包含请求列表的字典
     """
     url_pattern = kwargs.get('url_pattern')
+    filters = _query_filters(kwargs)
     variable = kwargs.get('variable')
     context = kwargs.get('context')
 
-    with allure.step("获取网络请求"):
+    with reporter.step("获取网络请求"):
         try:
             monitor = _get_network_monitor()
-            requests = monitor.get_requests(url_pattern)
+            requests = monitor.get_requests(url_pattern, **filters)
 
             # 保存到变量
             captures = {}
@@ -266,7 +239,7 @@ def get_network_requests(**kwargs):
             # 输出数量信息到日志
             logger.info(f"获取到 {len(requests)} 个网络请求")
 
-            allure.attach(
+            reporter.attach(
                 f"URL模式: {url_pattern or '全部'}\n"
                 f"请求数量: {len(requests)}\n"
                 f"保存变量: {variable or '无'}\n"
@@ -286,7 +259,7 @@ def get_network_requests(**kwargs):
                         f"  时间戳: {req['timestamp']}"
                     )
 
-                allure.attach(
+                reporter.attach(
                     "\n\n".join(request_details),
                     name="请求详情",
                     attachment_type=allure.attachment_type.TEXT
@@ -303,7 +276,7 @@ def get_network_requests(**kwargs):
 
         except Exception as e:
             logger.error(f"获取网络请求失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="获取网络请求失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -314,27 +287,48 @@ def get_network_requests(**kwargs):
 @keyword_manager.register('获取网络响应', [
     {'name': 'URL模式', 'mapping': 'url_pattern',
      'description': '匹配URL的正则表达式模式'},
+    {'name': '包含响应体', 'mapping': 'include_body',
+     'description': '是否读取响应内容（text/json）', 'default': True},
+    {'name': '状态码', 'mapping': 'status_code', 'description': 'HTTP状态码'},
+    {'name': '请求方法', 'mapping': 'method', 'description': '请求方法，如GET、POST'},
+    {'name': '主机', 'mapping': 'host', 'description': '请求主机（含端口）'},
+    {'name': '路径前缀', 'mapping': 'path_prefix', 'description': 'URL路径前缀，如/api/'},
+    {'name': '最近秒数', 'mapping': 'within_seconds',
+     'description': '只返回最近N秒内捕获的记录'},
     {'name': '变量名', 'mapping': 'variable',
      'description': '保存响应列表的变量名'},
 ], category='UI/网络')
 def get_network_responses(**kwargs):
     """获取捕获的网络响应
 
+    多个过滤条件同时生效，请求方法、状态码、主机和路径前缀通过索引查询。
+
     Args:
         url_pattern: URL匹配模式（正则表达式）
+        include_body: 是否读取响应内容
+        status_code: HTTP状态码
+        method: 请求方法
+        host: 请求主机
+        path_prefix: URL路径前缀
+        within_seconds: 只返回最近N秒内的记录
         variable: 变量名
 
     Returns:
         dict: 包含响应列表的字典
     """
     url_pattern = kwargs.get('url_pattern')
+    filters = _query_filters(kwargs)
+    if kwargs.get('status_code') is not None:
+        filters['status'] = int(kwargs['status_code'])
+    include_body = kwargs.get('include_body', True)
     variable = kwargs.get('variable')
     context = kwargs.get('context')
 
-    with allure.step("获取网络响应"):
+    with reporter.step("获取网络响应"):
         try:
             monitor = _get_network_monitor()
-            responses = monitor.get_responses(url_pattern)
+            responses = monitor.get_responses(
+                url_pattern, include_body, **filters)
 
             # 保存到变量
             captures = {}
@@ -345,7 +339,7 @@ def get_network_responses(**kwargs):
             # 输出数量信息到日志
             logger.info(f"获取到 {len(responses)} 个网络响应")
 
-            allure.attach(
+            reporter.attach(
                 f"URL模式: {url_pattern or '全部'}\n"
                 f"响应数量: {len(responses)}\n"
                 f"保存变量: {variable or '无'}\n"
@@ -365,7 +359,7 @@ def get_network_responses(**kwargs):
                         f"  时间戳: {resp['timestamp']}"
                     )
 
-                allure.attach(
+                reporter.attach(
                     "\n\n".join(response_details),
                     name="响应详情",
                     attachment_type=allure.attachment_type.TEXT
@@ -382,7 +376,7 @@ def get_network_responses(**kwargs):
 
         except Exception as e:
             logger.error(f"获取网络响应失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}",
                 name="获取网络响应失败",
                 attachment_type=allure.attachment_type.TEXT
@@ -416,14 +410,15 @@ def wait_for_network_request(**kwargs):
     if not url_pattern:
         raise ValueError("URL模式参数不能为空")
 
-    with allure.step(f"等待网络请求: {url_pattern}"):
+    with reporter.step(f"等待网络请求: {url_pattern}"):
         try:
             page = browser_manager.get_current_page()
 
             # 使用Playwright的expect_request方法
             timeout_ms = int(timeout * 1000)
+            pattern = compile_pattern(url_pattern)
             with page.expect_request(
-                lambda req: re.search(url_pattern, req.url),
+                lambda req: pattern.search(req.url),
                 timeout=timeout_ms
             ) as request_info:
                 # 等待请求
@@ -446,7 +441,7 @@ def wait_for_network_request(**kwargs):
                 context.set(variable, request_data)
                 captures[variable] = request_data
 
-            allure.attach(
+            reporter.attach(
                 f"URL模式: {url_pattern}\n"
                 f"匹配URL: {request.url}\n"
                 f"请求方法: {request.method}\n"
@@ -467,7 +462,7 @@ def wait_for_network_request(**kwargs):
 
         except Exception as e:
             logger.error(f"等待网络请求失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}\n"
                 f"URL模式: {url_pattern}",
                 name="等待网络请求失败",
@@ -505,13 +500,15 @@ def wait_for_network_response(**kwargs):
     if not url_pattern:
         raise ValueError("URL模式参数不能为空")
 
-    with allure.step(f"等待网络响应: {url_pattern}"):
+    with reporter.step(f"等待网络响应: {url_pattern}"):
         try:
             page = browser_manager.get_current_page()
 
             # 构建匹配条件
+            pattern = compile_pattern(url_pattern)
+
             def match_response(response):
-                url_match = re.search(url_pattern, response.url)
+                url_match = pattern.search(response.url)
                 if not url_match:
                     return False
 
@@ -556,7 +553,7 @@ def wait_for_network_response(**kwargs):
                 context.set(variable, response_data)
                 captures[variable] = response_data
 
-            allure.attach(
+            reporter.attach(
                 f"URL模式: {url_pattern}\n"
                 f"匹配URL: {response.url}\n"
                 f"响应状态: {response.status} {response.status_text}\n"
@@ -578,7 +575,7 @@ def wait_for_network_response(**kwargs):
 
         except Exception as e:
             logger.error(f"等待网络响应失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}\n"
                 f"URL模式: {url_pattern}\n"
                 f"期望状态码: {status_code or '任意'}",
@@ -613,7 +610,7 @@ def wait_for_url_change(**kwargs):
     if not url_pattern:
         raise ValueError("URL模式参数不能为空")
 
-    with allure.step(f"等待URL变化: {url_pattern}"):
+    with reporter.step(f"等待URL变化: {url_pattern}"):
         try:
             page = browser_manager.get_current_page()
             current_url = page.url
@@ -630,7 +627,7 @@ def wait_for_url_change(**kwargs):
                 context.set(variable, new_url)
                 captures[variable] = new_url
 
-            allure.attach(
+            reporter.attach(
                 f"URL模式: {url_pattern}\n"
                 f"原始URL: {current_url}\n"
                 f"新URL: {new_url}\n"
@@ -651,7 +648,7 @@ def wait_for_url_change(**kwargs):
 
         except Exception as e:
             logger.error(f"等待URL变化失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"错误信息: {str(e)}\n"
                 f"URL模式: {url_pattern}",
                 name="等待URL变化失败",
@@ -700,7 +697,7 @@ def assert_response_content(**kwargs):
     if not isinstance(response_data, dict):
         raise ValueError("响应数据必须是字典格式")
 
-    with allure.step(f"断言响应内容: {assertion_type}"):
+    with reporter.step(f"断言响应内容: {assertion_type}"):
         try:
             result = False
             actual_value = None
@@ -744,7 +741,7 @@ def assert_response_content(**kwargs):
                 )
                 raise AssertionError(error_msg)
 
-            allure.attach(
+            reporter.attach(
                 f"断言类型: {assertion_type}\n"
                 f"期望值: {expected_value}\n"
                 f"实际值: {actual_value}\n"
@@ -761,7 +758,7 @@ def assert_response_content(**kwargs):
 
         except Exception as e:
             logger.error(f"响应内容断言失败: {str(e)}")
-            allure.attach(
+            reporter.attach(
                 f"断言类型: {assertion_type}\n"
                 f"期望值: {expected_value}\n"
                 f"实际值: {actual_value}\n"
@@ -0,0 +1,39 @@
+"""性能分析关键字
+
+提供关键字耗时分析的开关，与浏览器无关。
+"""
+
+import logging
+
+from pytest_dsl.core.keyword_manager import keyword_manager
+from ..core.profiler import keyword_profiler
+
+logger = logging.getLogger(__name__)
+
+
+@keyword_manager.register('配置性能分析', [
+    {'name': '输出文件', 'mapping': 'output',
+     'description': '关键字耗时记录文件（.jsonl或.csv），{pid}替换为进程号，为空时停止记录',
+     'default': 'profile/keywords-{pid}.jsonl'},
+], category='UI/性能', tags=['配置', '性能'])
+def configure_profiling(**kwargs):
+    """配置关键字耗时分析
+
+    启用后每个UI关键字执行一次写入一行记录：耗时、驱动往返次数、
+    等待/活跃时间和涉及的定位器或URL。
+    使用 python -m pytest_dsl_ui profile <文件> 汇总。
+
+    Args:
+        output: 输出文件
+
+    Returns:
+        str: 实际的输出文件路径，停止记录时为空字符串
+    """
+    output = kwargs.get('output')
+    if not output:
+        keyword_profiler.disable()
+        logger.info("关键字耗时分析已停止")
+        return ''
+
+    keyword_profiler.enable(output)
+    return keyword_profiler.output_path
@@ -0,0 +1,39 @@
+"""报告配置关键字
+
+提供Allure报告级别等全局报告设置，与浏览器无关。
+"""
+
+import logging
+
+from pytest_dsl.core.keyword_manager import keyword_manager
+from ..core.reporting import reporter
+
+logger = logging.getLogger(__name__)
+
+
+@keyword_manager.register('配置报告级别', [
+    {'name': '级别', 'mapping': 'level',
+     'description': '报告级别：full, sampled, failures-only, off', 'default': 'full'},
+    {'name': '采样率', 'mapping': 'sample_rate',
+     'description': 'sampled级别下写入成功步骤附件的比例（0-1）', 'default': 0.1},
+], category='UI/报告', tags=['配置', '报告'])
+def configure_report_level(**kwargs):
+    """配置Allure报告级别
+
+    failures-only级别下成功步骤的附件不格式化也不写入，步骤失败时才写入；
+    sampled级别按采样率写入成功步骤的附件；off不写入附件。
+    失败路径的附件在off以外的级别都会写入。
+
+    Args:
+        level: 报告级别
+        sample_rate: 采样率
+
+    Returns:
+        dict: 当前报告级别和采样率
+    """
+    level = kwargs.get('level', 'full')
+    sample_rate = float(kwargs.get('sample_rate', 0.1))
+
+    reporter.configure(level=level, sample_rate=sample_rate)
+    logger.info(f"报告级别已设置为: {level} (采样率: {sample_rate})")
+    return {'level': reporter.level, 'sample_rate': reporter.sample_rate}
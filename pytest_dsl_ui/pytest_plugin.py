@@ -0,0 +1,23 @@
+"""pytest插件
+
+通过pytest11入口点自动加载，把用例的最终结果通知视频录制管理器，
+使"只保留失败用例的视频"以用例结果为准，而不是以是否有步骤抛出过异常为准。
+用例结束时还会丢弃截图环形缓冲，使缓冲的帧和截图去重只在同一用例内生效。
+"""
+
+from .core.artifacts import artifact_writer
+from .core.video_recorder import video_recorder
+
+# 本次运行中已失败的用例（任一阶段失败）
+_failed_tests = set()
+
+
+def pytest_runtest_logreport(report):
+    """在用例teardown报告后按用例结果确认视频的保留，并丢弃截图环形缓冲"""
+    if report.failed:
+        _failed_tests.add(report.nodeid)
+    if report.when == 'teardown':
+        failed = report.nodeid in _failed_tests
+        _failed_tests.discard(report.nodeid)
+        video_recorder.test_finished(report.nodeid, failed)
+        artifact_writer.discard_ring()
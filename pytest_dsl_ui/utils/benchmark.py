@@ -0,0 +1,359 @@
+"""核心关键字性能基准
+
+在本地启动一个夹具Web应用（大表格、多字段表单、大量XHR的单页应用和JSON接口），
+通过关键字管理器执行核心关键字并计时：
+
+- click_clickable：[点击元素] 使用 clickable= 定位大表格中的按钮
+- assert_visible / assert_text：[断言元素可见]、[断言文本内容]
+- form_fill：[输入文本] 依次填写多字段表单
+- network_monitor_load：[开始网络监听] 后加载发出大量XHR的页面
+- http_batch / http_sequential：[批量浏览器HTTP请求] 并发与顺序发送
+- auth_save / auth_load：[保存认证状态]、[加载认证状态]
+
+结果保存为JSON，可与另一个版本的结果对比，找出p50变慢超过阈值的用例。
+"""
+
+import json
+import platform
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# 夹具应用的默认规模
+DEFAULT_SCALE = {'rows': 2000, 'fields': 200, 'xhr': 300, 'batch': 100}
+
+
+def _table_page(rows: int) -> str:
+    body = "".join(
+        f'<tr id="row-{i}"><td class="id">{i}</td><td class="name">用户{i}</td>'
+        f'<td><button onclick="document.getElementById(\'status\').textContent='
+        f'\'已编辑{i}\'">编辑第{i}行</button></td></tr>'
+        for i in range(rows))
+    return (f'<html><head><title>大表格</title></head><body>'
+            f'<div id="status">就绪</div><table id="users">{body}</table></body></html>')
+
+
+def _form_page(fields: int) -> str:
+    inputs = "".join(
+        f'<label for="field-{i}">字段{i}</label>'
+        f'<input id="field-{i}" name="field-{i}" type="text"><br>'
+        for i in range(fields))
+    return (f'<html><head><title>表单</title></head><body><form id="form">{inputs}'
+            f'<button type="button" onclick="document.getElementById(\'result\')'
+            f'.textContent=\'已提交\'">提交</button></form>'
+            f'<div id="result"></div></body></html>')
+
+
+def _spa_page(xhr: int) -> str:
+    return f'''<html><head><title>单页应用</title></head><body>
+<div id="progress">0</div><div id="done"></div>
+<script>
+let finished = 0;
+for (let i = 0; i < {xhr}; i++) {{
+  fetch('/api/items/' + i).then(r => r.json()).then(() => {{
+    finished++;
+    document.getElementById('progress').textContent = finished;
+    if (finished === {xhr}) document.getElementById('done').textContent = '完成';
+  }});
+}}
+</script></body></html>'''
+
+
+def _login_page() -> str:
+    return '''<html><head><title>登录</title></head><body>
+<div id="user">admin</div>
+<script>localStorage.setItem('token', 'bench-token');</script>
+</body></html>'''
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    """夹具应用请求处理"""
+
+    scale: Dict[str, int] = DEFAULT_SCALE
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, body: str, content_type: str = 'text/html; charset=utf-8',
+              headers: Optional[Dict[str, str]] = None):
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: int(v[0]) for k, v in parse_qs(url.query).items()
+                 if v and v[0].isdigit()}
+        scale = dict(self.scale, **query)
+
+        if url.path == '/table':
+            self._send(_table_page(scale['rows']))
+        elif url.path == '/form':
+            self._send(_form_page(scale['fields']))
+        elif url.path == '/spa':
+            self._send(_spa_page(scale['xhr']))
+        elif url.path == '/login':
+            self._send(_login_page(),
+                       headers={'Set-Cookie': 'session=bench-session; Path=/'})
+        elif url.path.startswith('/api/items/'):
+            item_id = url.path.rsplit('/', 1)[-1]
+            self._send(json.dumps({'id': item_id, 'name': f'item-{item_id}',
+                                   'tags': ['a', 'b', 'c']}),
+                       content_type='application/json')
+        else:
+            self.send_error(404)
+
+
+class FixtureApp:
+    """在后台线程中运行的本地夹具Web应用"""
+
+    def __init__(self, scale: Optional[Dict[str, int]] = None):
+        handler = type('FixtureHandler', (_FixtureHandler,),
+                       {'scale': dict(DEFAULT_SCALE, **(scale or {}))})
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever,
+                                        daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> 'FixtureApp':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def summarize_timings(timings: List[float]) -> Dict[str, float]:
+    """计算一组耗时（毫秒）的统计值"""
+    ordered = sorted(timings)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        'runs': len(ordered),
+        'min_ms': round(ordered[0], 2),
+        'mean_ms': round(statistics.mean(ordered), 2),
+        'p50_ms': round(statistics.median(ordered), 2),
+        'p95_ms': round(ordered[p95_index], 2),
+        'max_ms': round(ordered[-1], 2),
+    }
+
+
+class BenchmarkRunner:
+    """通过关键字管理器执行基准用例"""
+
+    def __init__(self, base_url: str, iterations: int = 5,
+                 scale: Optional[Dict[str, int]] = None):
+        from pytest_dsl.core.context import TestContext
+        from pytest_dsl.core.keyword_manager import keyword_manager
+        import pytest_dsl_ui  # noqa: F401  注册UI关键字
+
+        self.base_url = base_url
+        self.iterations = iterations
+        self.scale = dict(DEFAULT_SCALE, **(scale or {}))
+        self.keyword_manager = keyword_manager
+        self.context = TestContext()
+
+    def run_keyword(self, name: str, **params) -> Any:
+        return self.keyword_manager.execute(name, context=self.context, **params)
+
+    def time_case(self, setup: Optional[Callable[[], None]],
+                  action: Callable[[], None]) -> Dict[str, float]:
+        """执行iterations次，每次先执行setup（不计时）再计时action"""
+        timings = []
+        for _ in range(self.iterations):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            action()
+            timings.append((time.perf_counter() - start) * 1000)
+        return summarize_timings(timings)
+
+    def _open(self, path: str):
+        return lambda: self.run_keyword('打开页面', url=self.base_url + path)
+
+    def cases(self) -> Dict[str, Callable[[], Dict[str, float]]]:
+        rows, fields = self.scale['rows'], self.scale['fields']
+        last = rows - 1
+        batch_config = "\n".join(
+            f"- method: GET\n  url: {self.base_url}/api/items/{i}\n"
+            f"  asserts:\n    - [\"status\", \"eq\", 200]"
+            for i in range(self.scale['batch']))
+
+        def fill_form():
+            for i in range(fields):
+                self.run_keyword('输入文本', selector=f'#field-{i}', text=f'值{i}')
+
+        def network_load():
+            self.run_keyword('开始网络监听')
+            self.run_keyword('打开页面', url=f"{self.base_url}/spa")
+            self.run_keyword('断言文本内容', selector='#done',
+                             expected_text='完成', timeout=30)
+            self.run_keyword('停止网络监听')
+
+        return {
+            'click_clickable': lambda: self.time_case(
+                self._open('/table'),
+                lambda: self.run_keyword('点击元素',
+                                         selector=f'clickable=编辑第{last}行')),
+            'assert_visible': lambda: self.time_case(
+                self._open('/table'),
+                lambda: self.run_keyword('断言元素可见', selector=f'#row-{last}')),
+            'assert_text': lambda: self.time_case(
+                self._open('/table'),
+                lambda: self.run_keyword('断言文本内容',
+                                         selector=f'#row-{last} td.name',
+                                         expected_text=f'用户{last}')),
+            'form_fill': lambda: self.time_case(self._open('/form'), fill_form),
+            'network_monitor_load': lambda: self.time_case(None, network_load),
+            'http_batch': lambda: self.time_case(
+                None, lambda: self.run_keyword('批量浏览器HTTP请求',
+                                               config=batch_config, concurrency=8)),
+            'http_sequential': lambda: self.time_case(
+                None, lambda: self.run_keyword('批量浏览器HTTP请求',
+                                               config=batch_config, concurrency=1)),
+            'auth_save': lambda: self.time_case(
+                self._open('/login'),
+                lambda: self.run_keyword('保存认证状态', state_name='bench')),
+            'auth_load': lambda: self.time_case(
+                None, lambda: self.run_keyword('加载认证状态', state_name='bench',
+                                               create_new_page=True,
+                                               verify_login=False)),
+        }
+
+
+def run_benchmarks(iterations: int = 5, cases: Optional[List[str]] = None,
+                   scale: Optional[Dict[str, int]] = None,
+                   headless: bool = True) -> Dict[str, Any]:
+    """启动夹具应用和浏览器，执行基准用例
+
+    Args:
+        iterations: 每个用例的执行次数
+        cases: 只执行的用例名称，None表示全部
+        scale: 夹具应用规模（rows、fields、xhr、batch）
+        headless: 是否使用无头模式
+
+    Returns:
+        Dict[str, Any]: 基准结果
+    """
+    from ..core.auth_manager import auth_manager
+    from ..core.browser_manager import browser_manager
+
+    results: Dict[str, Any] = {}
+    original_auth_dir = auth_manager.auth_dir
+    with FixtureApp(scale) as app, tempfile.TemporaryDirectory() as auth_dir:
+        # 认证状态写入临时目录，不影响项目中保存的状态
+        auth_manager.auth_dir = type(original_auth_dir)(auth_dir)
+        try:
+            runner = BenchmarkRunner(app.base_url, iterations, scale)
+            selected = runner.cases()
+            if cases:
+                unknown = set(cases) - set(selected)
+                if unknown:
+                    raise ValueError(f"未知的基准用例: {', '.join(sorted(unknown))}")
+                selected = {name: selected[name] for name in cases}
+
+            runner.run_keyword('启动浏览器', headless=headless)
+            for name, case in selected.items():
+                try:
+                    results[name] = case()
+                except Exception as e:
+                    results[name] = {'error': f"{type(e).__name__}: {str(e)}"}
+        finally:
+            browser_manager.close_all()
+            auth_manager.auth_dir = original_auth_dir
+
+    return {
+        'version': _package_version(),
+        'python': platform.python_version(),
+        'playwright': _playwright_version(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'iterations': iterations,
+        'scale': dict(DEFAULT_SCALE, **(scale or {})),
+        'results': results,
+    }
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = 0.1) -> List[Dict[str, Any]]:
+    """对比两次基准结果的p50
+
+    Args:
+        current: 本次结果
+        baseline: 基线结果
+        threshold: p50变慢超过该比例视为回归
+
+    Returns:
+        List[Dict[str, Any]]: 两次都成功的用例的对比，regression标记是否回归
+    """
+    comparison = []
+    for name, stats in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base or 'p50_ms' not in base or 'p50_ms' not in stats:
+            continue
+        change = ((stats['p50_ms'] - base['p50_ms']) / base['p50_ms']
+                  if base['p50_ms'] else 0.0)
+        comparison.append({
+            'case': name,
+            'baseline_p50_ms': base['p50_ms'],
+            'p50_ms': stats['p50_ms'],
+            'change': round(change, 3),
+            'regression': change > threshold,
+        })
+    return comparison
+
+
+def format_results(results: Dict[str, Any],
+                   comparison: Optional[List[Dict[str, Any]]] = None) -> str:
+    """格式化基准结果"""
+    lines = [
+        f"版本: {results['version']}  Python: {results['python']}  "
+        f"Playwright: {results['playwright']}  每个用例执行: {results['iterations']}次",
+        f"{'用例':<22} {'p50(ms)':>9} {'p95(ms)':>9} {'min(ms)':>9} {'max(ms)':>9}",
+    ]
+    for name, stats in results['results'].items():
+        if 'error' in stats:
+            lines.append(f"{name:<22} 失败: {stats['error']}")
+            continue
+        lines.append(f"{name:<22} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} "
+                     f"{stats['min_ms']:>9.1f} {stats['max_ms']:>9.1f}")
+
+    if comparison:
+        lines.append("")
+        lines.append(f"{'用例':<22} {'基线p50':>9} {'p50':>9} {'变化':>8}")
+        for c in comparison:
+            flag = "  回归" if c['regression'] else ""
+            lines.append(f"{c['case']:<22} {c['baseline_p50_ms']:>9.1f} "
+                         f"{c['p50_ms']:>9.1f} {c['change']:>+8.1%}{flag}")
+    return "\n".join(lines)
+
+
+def _package_version() -> str:
+    try:
+        from importlib.metadata import version
+        return version('pytest-dsl-ui')
+    except Exception:
+        from .. import __version__
+        return __version__
+
+
+def _playwright_version() -> str:
+    try:
+        from importlib.metadata import version
+        return version('playwright')
+    except Exception:
+        return 'unknown'
@@ -0,0 +1,333 @@
+"""DSL并行执行器
+
+将DSL文件分片到多个工作进程中执行。每个工作进程都是独立启动的Python解释器，
+拥有独立的browser_manager、auth_manager、网络监听器和HTTP客户端等全局状态；
+进程内启用浏览器池，使同一工作进程执行的所有DSL文件共用一个常驻浏览器。
+
+每个工作进程通过pytest执行分到的DSL文件，并将Allure结果写入各自的目录，
+全部完成后合并到目标Allure结果目录，同时输出各工作进程的利用率报告。
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DSL_EXTENSIONS = ('.dsl', '.auto')
+
+# 工作进程编号环境变量，DSL或关键字中可据此区分工作进程
+WORKER_ID_ENV = "PYTEST_DSL_UI_WORKER_ID"
+
+# pytest退出码：5表示没有收集到测试
+_PYTEST_NO_TESTS_COLLECTED = 5
+
+
+def _is_hook_file(path: Path) -> bool:
+    """是否是目录级setup/teardown文件"""
+    try:
+        from pytest_dsl.core.hook_files import is_hook_file
+        return is_hook_file(path)
+    except ImportError:
+        return path.stem in ('setup', 'teardown')
+
+
+def discover_dsl_files(paths: Sequence[str]) -> List[str]:
+    """查找DSL用例文件
+
+    Args:
+        paths: DSL文件或目录列表
+
+    Returns:
+        List[str]: 排序后的DSL文件路径列表（不包含目录级setup/teardown文件）
+    """
+    files = []
+    for path in paths:
+        path_obj = Path(path)
+        if path_obj.is_file():
+            files.append(str(path_obj))
+        elif path_obj.is_dir():
+            for file_path in sorted(path_obj.rglob('*')):
+                if (file_path.suffix in DSL_EXTENSIONS
+                        and file_path.is_file()
+                        and not _is_hook_file(file_path)):
+                    files.append(str(file_path))
+        else:
+            raise FileNotFoundError(f"路径不存在: {path}")
+    return files
+
+
+def shard_files(files: Sequence[str], workers: int,
+                weights: Optional[Dict[str, float]] = None
+                ) -> List[List[str]]:
+    """将文件分片到多个工作进程
+
+    使用最长处理时间优先的贪心策略：按权重从大到小依次分配给当前负载最小的
+    工作进程。权重默认使用文件大小近似执行耗时。
+
+    Args:
+        files: DSL文件列表
+        workers: 工作进程数量
+        weights: 文件权重（如历史执行耗时），缺失的文件使用文件大小
+
+    Returns:
+        List[List[str]]: 每个工作进程分到的文件列表，空分片会被丢弃
+    """
+    workers = max(1, min(int(workers), len(files) or 1))
+    weights = weights or {}
+
+    def weight_of(file_path: str) -> float:
+        if file_path in weights:
+            return float(weights[file_path])
+        try:
+            return float(os.path.getsize(file_path))
+        except OSError:
+            return 0.0
+
+    shards: List[List[str]] = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    for file_path in sorted(files, key=weight_of, reverse=True):
+        index = loads.index(min(loads))
+        shards[index].append(file_path)
+        loads[index] += weight_of(file_path)
+
+    return [sorted(shard) for shard in shards if shard]
+
+
+def merge_allure_results(source_dirs: Sequence[str], target_dir: str) -> int:
+    """合并多个Allure结果目录
+
+    Allure结果文件以UUID命名，可以直接合并到同一目录。
+
+    Args:
+        source_dirs: 各工作进程的结果目录
+        target_dir: 目标结果目录
+
+    Returns:
+        int: 合并的文件数量
+    """
+    target = Path(target_dir)
+    target.mkdir(parents=True, exist_ok=True)
+
+    merged = 0
+    for source_dir in source_dirs:
+        source = Path(source_dir)
+        if not source.is_dir():
+            continue
+        for file_path in source.iterdir():
+            if file_path.is_file():
+                shutil.copy2(file_path, target / file_path.name)
+                merged += 1
+    return merged
+
+
+class _WorkerReportPlugin:
+    """在工作进程中收集用例耗时的pytest插件"""
+
+    def __init__(self):
+        self.tests = 0
+        self.passed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.busy_s = 0.0
+
+    def pytest_runtest_logreport(self, report):
+        self.busy_s += report.duration
+        if report.when == 'call':
+            self.tests += 1
+            if report.passed:
+                self.passed += 1
+            elif report.failed:
+                self.failed += 1
+            else:
+                self.skipped += 1
+        elif report.when == 'setup' and not report.passed:
+            # setup阶段失败或跳过时不会有call阶段报告
+            self.tests += 1
+            if report.failed:
+                self.failed += 1
+            else:
+                self.skipped += 1
+        elif report.when == 'teardown' and report.failed:
+            self.failed += 1
+
+
+def _worker_main(worker_id: int, files: List[str], alluredir: Optional[str],
+                 pytest_args: List[str], pool_options: Optional[Dict[str, Any]],
+                 result_queue):
+    """工作进程入口"""
+    os.environ[WORKER_ID_ENV] = str(worker_id)
+    started_at = time.monotonic()
+    stats: Dict[str, Any] = {
+        'worker_id': worker_id,
+        'pid': os.getpid(),
+        'files': len(files),
+        'exit_code': 1,
+    }
+
+    plugin = _WorkerReportPlugin()
+    try:
+        import pytest
+        from ..core.browser_manager import browser_manager
+
+        if pool_options is not None:
+            browser_manager.enable_pool(**pool_options)
+
+        args = list(files) + list(pytest_args)
+        if alluredir:
+            args.append(f"--alluredir={alluredir}")
+
+        try:
+            stats['exit_code'] = int(pytest.main(args, plugins=[plugin]))
+        finally:
+            browser_manager.close_all()
+    except Exception as e:
+        stats['error'] = str(e)
+
+    stats.update({
+        'tests': plugin.tests,
+        'passed': plugin.passed,
+        'failed': plugin.failed,
+        'skipped': plugin.skipped,
+        'busy_s': plugin.busy_s,
+        'elapsed_s': time.monotonic() - started_at,
+    })
+    result_queue.put(stats)
+
+
+def run_parallel(paths: Sequence[str], workers: Optional[int] = None,
+                 alluredir: Optional[str] = None,
+                 pytest_args: Optional[Sequence[str]] = None,
+                 pool_options: Optional[Dict[str, Any]] = None,
+                 weights: Optional[Dict[str, float]] = None
+                 ) -> Dict[str, Any]:
+    """并行执行DSL文件
+
+    Args:
+        paths: DSL文件或目录列表
+        workers: 工作进程数量，默认为CPU核数
+        alluredir: 合并后的Allure结果目录，为None时不生成Allure结果
+        pytest_args: 传给每个工作进程中pytest的额外参数
+        pool_options: 工作进程内浏览器池配置，为None时不启用浏览器池
+        weights: 分片使用的文件权重
+
+    Returns:
+        Dict[str, Any]: 执行报告，包含退出码和各工作进程的统计信息
+    """
+    files = discover_dsl_files(paths)
+    if not files:
+        raise ValueError(f"没有找到DSL文件: {', '.join(paths)}")
+
+    workers = workers or os.cpu_count() or 1
+    shards = shard_files(files, workers, weights)
+
+    worker_dirs: List[Optional[str]] = []
+    if alluredir:
+        base = Path(alluredir).parent / f".{Path(alluredir).name}-workers"
+        worker_dirs = [str(base / f"worker-{i}") for i in range(len(shards))]
+    else:
+        worker_dirs = [None] * len(shards)
+
+    ctx = multiprocessing.get_context('spawn')
+    result_queue = ctx.Queue()
+    processes = []
+    started_at = time.monotonic()
+
+    for worker_id, shard in enumerate(shards):
+        process = ctx.Process(
+            target=_worker_main,
+            args=(worker_id, shard, worker_dirs[worker_id],
+                  list(pytest_args or []), pool_options, result_queue),
+            name=f"pytest-dsl-ui-worker-{worker_id}"
+        )
+        process.start()
+        processes.append(process)
+        logger.info(f"工作进程 {worker_id} 已启动，分配 {len(shard)} 个文件")
+
+    results: Dict[int, Dict[str, Any]] = {}
+    while len(results) < len(processes):
+        try:
+            stats = result_queue.get(timeout=1)
+            results[stats['worker_id']] = stats
+        except queue.Empty:
+            # 进程异常退出时不会上报结果
+            if not any(p.is_alive() for p in processes) and result_queue.empty():
+                break
+
+    for process in processes:
+        process.join()
+
+    wall_s = time.monotonic() - started_at
+
+    worker_reports = []
+    for worker_id, process in enumerate(processes):
+        stats = results.get(worker_id, {
+            'worker_id': worker_id,
+            'files': len(shards[worker_id]),
+            'exit_code': process.exitcode or 1,
+            'error': '工作进程异常退出',
+            'tests': 0, 'passed': 0, 'failed': 0, 'skipped': 0,
+            'busy_s': 0.0, 'elapsed_s': wall_s,
+        })
+        stats['utilization'] = stats['busy_s'] / wall_s if wall_s else 0.0
+        worker_reports.append(stats)
+
+    merged = 0
+    if alluredir:
+        merged = merge_allure_results(
+            [d for d in worker_dirs if d], alluredir)
+        shutil.rmtree(Path(worker_dirs[0]).parent, ignore_errors=True)
+
+    ok_codes = (0, _PYTEST_NO_TESTS_COLLECTED)
+    exit_code = 0 if all(
+        r['exit_code'] in ok_codes for r in worker_reports) else 1
+
+    busy_total = sum(r['busy_s'] for r in worker_reports)
+    return {
+        'exit_code': exit_code,
+        'files': len(files),
+        'workers': worker_reports,
+        'wall_s': wall_s,
+        'utilization': busy_total / (wall_s * len(worker_reports))
+        if wall_s and worker_reports else 0.0,
+        'allure_files_merged': merged,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """格式化并行执行报告
+
+    Args:
+        report: run_parallel返回的报告
+
+    Returns:
+        str: 可读的报告文本
+    """
+    lines = [
+        f"文件数: {report['files']}  工作进程数: {len(report['workers'])}  "
+        f"总耗时: {report['wall_s']:.1f}s  "
+        f"平均利用率: {report['utilization']:.0%}",
+        f"{'进程':>4} {'文件':>5} {'用例':>5} {'通过':>5} {'失败':>5} "
+        f"{'忙碌(s)':>9} {'耗时(s)':>9} {'利用率':>7}",
+    ]
+    for r in report['workers']:
+        lines.append(
+            f"{r['worker_id']:>4} {r['files']:>5} {r['tests']:>5} "
+            f"{r['passed']:>5} {r['failed']:>5} {r['busy_s']:>9.1f} "
+            f"{r['elapsed_s']:>9.1f} {r['utilization']:>7.0%}"
+        )
+        if r.get('error'):
+            lines.append(f"     错误: {r['error']}")
+    return "\n".join(lines)
+
+
+def save_report(report: Dict[str, Any], path: str):
+    """将执行报告保存为JSON文件"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,149 @@
+"""关键字耗时报告
+
+读取KeywordProfiler写出的JSONL/CSV记录，按关键字汇总调用次数、
+总耗时、p50/p95/p99、平均驱动往返次数和等待时间占比，并列出最慢的步骤。
+"""
+
+import csv
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence
+
+_NUMERIC_FIELDS = ('wall_ms', 'wait_ms', 'active_ms', 'driver_calls')
+
+SORT_KEYS = ('total', 'p95', 'p99', 'count')
+
+
+def _record_files(paths: Sequence[str]) -> List[Path]:
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob('*')
+                                if p.suffix.lower() in ('.jsonl', '.csv')))
+        elif path.exists():
+            files.append(path)
+        else:
+            raise FileNotFoundError(f"找不到耗时记录文件: {path}")
+    return files
+
+
+def load_records(paths: Sequence[str]) -> List[Dict[str, Any]]:
+    """读取耗时记录
+
+    Args:
+        paths: JSONL/CSV文件或包含这些文件的目录
+
+    Returns:
+        List[Dict[str, Any]]: 耗时记录
+    """
+    records = []
+    for path in _record_files(paths):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            if path.suffix.lower() == '.csv':
+                rows: Iterable[Dict[str, Any]] = csv.DictReader(f)
+            else:
+                rows = (json.loads(line) for line in f if line.strip())
+            for row in rows:
+                for field in _NUMERIC_FIELDS:
+                    row[field] = float(row.get(field) or 0)
+                records.append(row)
+    return records
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """线性插值百分位数，values需已排序"""
+    if not values:
+        return 0.0
+    rank = (len(values) - 1) * p / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def summarize(records: Sequence[Dict[str, Any]],
+              sort: str = 'total') -> List[Dict[str, Any]]:
+    """按关键字汇总耗时
+
+    Args:
+        records: 耗时记录
+        sort: 排序依据：total、p95、p99或count（均为降序）
+
+    Returns:
+        List[Dict[str, Any]]: 每个关键字的汇总
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"不支持的排序方式: {sort}")
+
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        groups.setdefault(record['keyword'], []).append(record)
+
+    summary = []
+    for keyword, rows in groups.items():
+        walls = sorted(r['wall_ms'] for r in rows)
+        total = sum(walls)
+        wait = sum(r['wait_ms'] for r in rows)
+        summary.append({
+            'keyword': keyword,
+            'count': len(rows),
+            'failed': sum(1 for r in rows if r.get('status') == 'failed'),
+            'total_ms': round(total, 2),
+            'p50_ms': round(percentile(walls, 50), 2),
+            'p95_ms': round(percentile(walls, 95), 2),
+            'p99_ms': round(percentile(walls, 99), 2),
+            'max_ms': walls[-1],
+            'driver_calls': round(sum(r['driver_calls'] for r in rows) / len(rows), 1),
+            'wait_ratio': round(wait / total, 3) if total else 0.0,
+        })
+
+    sort_field = {'total': 'total_ms', 'p95': 'p95_ms', 'p99': 'p99_ms',
+                  'count': 'count'}[sort]
+    summary.sort(key=lambda s: s[sort_field], reverse=True)
+    return summary
+
+
+def slowest(records: Sequence[Dict[str, Any]], top: int = 20) -> List[Dict[str, Any]]:
+    """耗时最长的步骤"""
+    return sorted(records, key=lambda r: r['wall_ms'], reverse=True)[:top]
+
+
+def build_report(records: Sequence[Dict[str, Any]], top: int = 20,
+                 sort: str = 'total') -> Dict[str, Any]:
+    """生成耗时报告"""
+    return {
+        'records': len(records),
+        'total_ms': round(sum(r['wall_ms'] for r in records), 2),
+        'keywords': summarize(records, sort),
+        'slowest': slowest(records, top),
+    }
+
+
+def format_report(report: Dict[str, Any], top: int = 20) -> str:
+    """格式化耗时报告
+
+    Args:
+        report: build_report返回的报告
+        top: 最多显示的关键字数量
+
+    Returns:
+        str: 可读的报告文本
+    """
+    lines = [
+        f"记录数: {report['records']}  关键字总耗时: {report['total_ms'] / 1000:.1f}s",
+        f"{'关键字':<16} {'次数':>6} {'失败':>5} {'总耗时(s)':>10} {'p50(ms)':>9} "
+        f"{'p95(ms)':>9} {'p99(ms)':>9} {'往返':>6} {'等待占比':>8}",
+    ]
+    for s in report['keywords'][:top]:
+        lines.append(
+            f"{s['keyword']:<16} {s['count']:>6} {s['failed']:>5} "
+            f"{s['total_ms'] / 1000:>10.1f} {s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} "
+            f"{s['p99_ms']:>9.1f} {s['driver_calls']:>6.1f} {s['wait_ratio']:>8.0%}"
+        )
+
+    lines.append("")
+    lines.append("最慢的步骤:")
+    for r in report['slowest']:
+        target = f" [{r['target']}]" if r.get('target') else ""
+        test = f"  ({r['test']})" if r.get('test') else ""
+        lines.append(f"  {r['wall_ms']:>9.1f}ms  {r['keyword']}{target}{test}")
+    return "\n".join(lines)
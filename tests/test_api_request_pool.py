@@ -0,0 +1,98 @@
+"""测试独立APIRequestContext池
+
+使用模拟的Playwright实例和临时认证目录，不需要浏览器。
+"""
+
+import json
+import os
+from unittest.mock import Mock
+
+import pytest
+
+from pytest_dsl_ui.core import auth_manager as auth_module
+from pytest_dsl_ui.core.api_request_pool import APIRequestContextPool
+from pytest_dsl_ui.core.browser_http_client import BrowserHTTPClientManager
+from pytest_dsl_ui.core.browser_manager import browser_manager
+
+
+@pytest.fixture
+def auth_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(auth_module.auth_manager, 'auth_dir', tmp_path)
+    return tmp_path
+
+
+def write_state(auth_dir, name, value, mtime):
+    path = auth_dir / f"{name}.json"
+    path.write_text(json.dumps({
+        'cookies': [{'name': 'sid', 'value': value}],
+        'origins': [],
+        'metadata': {'username': 'admin'},
+        'saved_at': '2024-01-01T00:00:00',
+    }), encoding='utf-8')
+    os.utime(path, (mtime, mtime))
+
+
+class TestAPIRequestContextPool:
+    """独立APIRequestContext池测试类"""
+
+    def test_reuse_and_refresh(self, auth_dir):
+        """相同参数复用上下文，认证文件更新后重建"""
+        write_state(auth_dir, 'admin', '1', 1000)
+        playwright = Mock()
+        playwright.request.new_context.side_effect = lambda **kw: Mock()
+        pool = APIRequestContextPool()
+
+        first = pool.acquire(playwright, 'admin')
+        assert pool.acquire(playwright, 'admin') is first
+        assert pool.acquire(playwright) is not first
+        kwargs = playwright.request.new_context.call_args_list[0][1]
+        assert kwargs['storage_state'] == {
+            'cookies': [{'name': 'sid', 'value': '1'}], 'origins': []}
+
+        write_state(auth_dir, 'admin', '2', 2000)
+        refreshed = pool.acquire(playwright, 'admin')
+        assert refreshed is not first
+        first.dispose.assert_called_once()
+        assert pool.get_stats() == {
+            'created': 3, 'reused': 1, 'refreshed': 1, 'size': 2}
+
+        pool.clear()
+        refreshed.dispose.assert_called_once()
+
+    def test_missing_state(self, auth_dir):
+        with pytest.raises(ValueError):
+            APIRequestContextPool().acquire(Mock(), 'nobody')
+
+    def test_headless_client(self, monkeypatch):
+        """没有浏览器上下文时客户端使用池中的APIRequestContext"""
+        request_context = Mock()
+        request_context.get.return_value = Mock(status=200, headers={})
+        get_context = Mock(return_value=request_context)
+        monkeypatch.setattr(browser_manager, 'get_api_request_context',
+                            get_context)
+        manager = BrowserHTTPClientManager()
+
+        client = manager.get_client(
+            'api', config={'auth_state': 'admin', 'base_url': 'https://a.test/'})
+
+        assert manager.get_client('api', config={'auth_state': 'admin'}) is client
+        get_context.assert_called_with('admin', False)
+        monkeypatch.setattr(client, '_log_response_to_allure', Mock())
+        client.make_request('GET', 'users')
+        request_context.get.assert_called_once()
+        assert request_context.get.call_args[0][0] == 'https://a.test/users'
+
+    def test_headless_client_without_auth_state_warns(self, monkeypatch, caplog):
+        """既没有浏览器上下文也没有认证状态时记录警告"""
+        monkeypatch.setattr(browser_manager, 'get_api_request_context',
+                            Mock(return_value=Mock()))
+        manager = BrowserHTTPClientManager()
+
+        with caplog.at_level('WARNING'):
+            manager.get_client('api', config={'name': 'api'})
+        assert '无浏览器模式' in caplog.text
+
+        caplog.clear()
+        with caplog.at_level('WARNING'):
+            manager.get_client('other', config={'auth_state': 'admin'})
+        assert caplog.text == ''
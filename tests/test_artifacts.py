@@ -0,0 +1,107 @@
+"""测试截图写入管道"""
+
+import io
+from unittest.mock import Mock, patch
+
+import pytest
+from PIL import Image
+
+from pytest_dsl_ui.core.artifacts import ArtifactWriter
+from pytest_dsl_ui.core.reporting import reporter
+
+
+def png(color):
+    output = io.BytesIO()
+    Image.new('RGB', (32, 32), color).save(output, format='PNG')
+    return output.getvalue()
+
+
+@pytest.fixture
+def attach():
+    with patch('allure.attach') as attach:
+        yield attach
+
+
+class TestArtifactWriter:
+    """截图写入管道测试类"""
+
+    def test_background_write_and_dedup(self, tmp_path, attach):
+        writer = ArtifactWriter(image_format='png', ring_size=0)
+        first = writer.submit(png('red'), str(tmp_path / 'a.png'), auto_named=True)
+        same = writer.submit(png('red'), str(tmp_path / 'b.png'), auto_named=True)
+        writer.submit(png('blue'), str(tmp_path / 'c.png'), auto_named=True)
+        writer.wait()
+
+        assert same == first
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['a.png', 'c.png']
+        assert attach.call_count == 2
+        assert writer.get_stats()['deduplicated'] == 1
+
+    def test_explicit_path_always_written(self, tmp_path, attach):
+        """指定路径的帧不去重、不缓冲，wait_for返回时文件已存在"""
+        writer = ArtifactWriter(image_format='png', ring_size=5)
+        for name in ('a.png', 'b.png'):
+            path = str(tmp_path / name)
+            assert writer.submit(png('red'), path) == path
+            writer.wait_for(path)
+            assert (tmp_path / name).exists()
+        assert writer.get_stats()['deduplicated'] == 0
+        assert writer.get_stats()['ring'] == 0
+
+    def test_webp_encoding(self, tmp_path, attach):
+        writer = ArtifactWriter(image_format='webp', quality=50, ring_size=0)
+        path = writer.submit(png('green'), str(tmp_path / 'a.webp'))
+        writer.wait_for(path)
+        assert Image.open(path).format == 'WEBP'
+        assert attach.call_args[0][0][:4] == b'RIFF'
+        assert writer.screenshot_options('jpeg') == {'type': 'jpeg', 'quality': 50}
+        assert writer.format_for('x.JPG') == 'jpeg'
+        with pytest.raises(ValueError):
+            writer.configure(image_format='gif')
+
+    def test_ring_flushed_on_failure(self, tmp_path, attach):
+        writer = ArtifactWriter(image_format='png', ring_size=2)
+        for i, color in enumerate(['red', 'green', 'blue']):
+            assert writer.submit(png(color), str(tmp_path / f'{i}.png'),
+                                 auto_named=True) is None
+        writer.wait()
+        assert not list(tmp_path.iterdir()) and attach.call_count == 0
+
+        with pytest.raises(AssertionError):
+            with reporter.step('失败步骤'):
+                raise AssertionError('boom')
+        writer.wait()
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['1.png', '2.png']
+        assert attach.call_count == 2
+        assert writer.get_stats()['ring'] == 0
+
+    def test_screenshot_keyword_waits_only_for_variable(self):
+        """截图关键字只在需要保存路径时等待写入完成"""
+        from pytest_dsl_ui.keywords import capture_keywords
+
+        with patch.object(capture_keywords, 'browser_manager'), \
+                patch.object(capture_keywords, 'PageContext') as page_context:
+            screenshot = page_context.return_value.screenshot
+            capture_keywords.take_screenshot(filename='a.png')
+            assert screenshot.call_args[1]['wait'] is False
+            capture_keywords.take_screenshot(variable='shot', context=None)
+            assert screenshot.call_args[1]['wait'] is True
+
+    def test_ring_and_dedup_reset_between_tests(self, tmp_path, attach):
+        """用例结束后缓冲的帧被丢弃，下一个用例的相同帧不会被去重"""
+        from pytest_dsl_ui import pytest_plugin
+
+        writer = ArtifactWriter(image_format='png', ring_size=2)
+        writer.submit(png('red'), str(tmp_path / 'a.png'), auto_named=True)
+        with patch.object(pytest_plugin, 'artifact_writer', writer), \
+                patch.object(pytest_plugin, 'video_recorder'):
+            pytest_plugin.pytest_runtest_logreport(
+                Mock(nodeid='t.py::test_a', when='teardown', failed=False))
+        assert writer.get_stats()['ring'] == 0
+
+        writer.configure(ring_size=0)
+        path = str(tmp_path / 'b.png')
+        assert writer.submit(png('red'), path, auto_named=True) == path
+        writer.wait()
+        assert [p.name for p in tmp_path.iterdir()] == ['b.png']
+        assert writer.get_stats()['deduplicated'] == 0
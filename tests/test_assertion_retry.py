@@ -0,0 +1,111 @@
+"""测试断言重试调度器
+
+使用模拟客户端按顺序返回响应，验证退避、条件请求和只重新评估失败断言。
+"""
+
+import json
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from pytest_dsl_ui.core.assertion_retry import AssertionRetryScheduler, RetryPolicy
+from pytest_dsl_ui.core.browser_http_client import BrowserResponse
+from pytest_dsl_ui.core.browser_http_request import BrowserHTTPRequest
+from pytest_dsl_ui.keywords.browser_http_keywords import _normalize_retry_config
+
+
+def make_response(body, status=200, etag=None):
+    playwright_response = Mock(status=status, status_text='OK', url='/jobs/1')
+    playwright_response.headers = {'content-type': 'application/json'}
+    if etag:
+        playwright_response.headers['etag'] = etag
+    playwright_response.text.return_value = json.dumps(body)
+    return BrowserResponse(playwright_response)
+
+
+def make_request(config, responses):
+    """创建已执行过首次请求的BrowserHTTPRequest，后续请求依次返回responses"""
+    request = BrowserHTTPRequest(dict(config, method='GET', url='/jobs/1'))
+    client = Mock()
+    client.make_request.side_effect = responses[1:]
+    request.get_client = lambda: client
+    request.apply_response(responses[0], 1.0)
+    return request, client
+
+
+class TestRetryPolicy:
+    """重试等待策略测试类"""
+
+    def test_backoff(self):
+        policy = RetryPolicy(interval=1, backoff='exponential', max_interval=5)
+        assert [policy.delay(n) for n in range(1, 6)] == [1, 2, 4, 5, 5]
+        jitter = RetryPolicy(interval=1, backoff='jitter')
+        assert all(1 <= jitter.delay(3) <= 4 for _ in range(20))
+
+    def test_deadline(self):
+        policy = RetryPolicy(interval=10, deadline=0.5)
+        delays = policy.delays(time.monotonic())
+        assert next(delays) <= 0.5
+        assert list(RetryPolicy(deadline=1).delays(time.monotonic() - 2)) == []
+
+
+class TestAssertionRetryScheduler:
+    """断言重试调度器测试类"""
+
+    def test_polling_until_done(self):
+        """只重新评估失败的断言，全部通过后更新捕获值"""
+        config = {
+            'captures': {'job_status': ['jsonpath', '$.status']},
+            'asserts': [['status', 'eq', 200],
+                        ['jsonpath', '$.status', 'eq', 'done']],
+        }
+        request, client = make_request(config, [
+            make_response({'status': 'running'}),
+            make_response({'status': 'running'}),
+            make_response({'status': 'done'}),
+        ])
+        retry = _normalize_retry_config(
+            {'retry_assertions': {'indices': [1], 'count': 5, 'interval': 0.01,
+                                  'backoff': 'exponential'}})
+
+        scheduler = AssertionRetryScheduler(request, retry)
+        results = scheduler.run()
+
+        assert [r['passed'] for r in results] == [True, True]
+        assert [a['failed'] for a in scheduler.attempts] == [[1], []]
+        assert request.captured_values['job_status'] == 'done'
+        # 响应没有ETag，不发送条件请求
+        assert 'headers' not in client.make_request.call_args[1]
+
+    def test_not_modified_keeps_response(self):
+        """304响应不更新响应和捕获值，重试次数用完后报告失败"""
+        config = {
+            'captures': {'job_status': ['jsonpath', '$.status']},
+            'asserts': [['jsonpath', '$.status', 'eq', 'done']],
+        }
+        first = make_response({'status': 'running'}, etag='"v1"')
+        request, client = make_request(config, [
+            first, make_response({}, status=304), make_response({}, status=304)])
+        retry = _normalize_retry_config(
+            {'retry_assertions': {'all': True, 'count': 2, 'interval': 0.01}})
+
+        scheduler = AssertionRetryScheduler(request, retry)
+        with pytest.raises(AssertionError, match='已重试 2 次'):
+            scheduler.run()
+
+        assert [a['not_modified'] for a in scheduler.attempts] == [True, True]
+        assert client.make_request.call_args[1]['headers'] == {'If-None-Match': '"v1"'}
+        assert request.response is first
+        assert request.captured_values['job_status'] == 'running'
+
+    def test_non_retryable_failure(self):
+        """不可重试的断言失败时不重新请求"""
+        request, client = make_request(
+            {'asserts': [['status', 'eq', 201]]}, [make_response({})])
+        retry = _normalize_retry_config(
+            {'retry_assertions': {'indices': [5], 'count': 3}})
+
+        with pytest.raises(AssertionError, match='不可重试'):
+            AssertionRetryScheduler(request, retry).run()
+        client.make_request.assert_not_called()
@@ -0,0 +1,175 @@
+"""测试异步后端和事件循环桥接器
+
+使用模拟的APIRequestContext验证异步HTTP客户端，不需要真实浏览器。
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock
+
+from pytest_dsl_ui.core.async_bridge import AsyncLoopBridge
+import pytest
+
+from pytest_dsl_ui.core.async_backend import (
+    AsyncBrowserHTTPClient, AsyncBrowserManager, AsyncElementLocator,
+    AsyncPageContext)
+
+
+class TestAsyncLoopBridge:
+    """事件循环桥接器测试类"""
+
+    def setup_method(self):
+        self.bridge = AsyncLoopBridge(name="test-async-bridge")
+
+    def teardown_method(self):
+        self.bridge.shutdown()
+
+    def test_run_returns_result(self):
+        async def add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+
+        assert self.bridge.run(add(1, 2)) == 3
+
+    def test_gather_overlaps_and_keeps_order(self):
+        """多个协程并发执行，结果按提交顺序返回"""
+        async def delayed(value):
+            await asyncio.sleep(0.2)
+            return value
+
+        start = time.monotonic()
+        results = self.bridge.gather(*(delayed(i) for i in range(5)))
+        assert results == [0, 1, 2, 3, 4]
+        assert time.monotonic() - start < 0.8
+
+    def test_submit_returns_future(self):
+        async def value():
+            return "done"
+
+        future = self.bridge.submit(value())
+        assert future.result(timeout=5) == "done"
+
+
+class TestAsyncPageObjects:
+    """异步定位器、页面上下文和管理器测试类"""
+
+    def test_no_inherited_sync_methods(self):
+        """不暴露直接调用同步API的方法"""
+        for name in ('capture', 'start_video_recording', 'stop_recording'):
+            assert not hasattr(AsyncPageContext, name)
+        for name in ('resolve_strict_mode_conflict', 'locate_first'):
+            assert not hasattr(AsyncElementLocator, name)
+        for name in ('enable_pool', 'enable_context_recycling',
+                     'start_video_recording', 'get_api_request_context'):
+            assert not hasattr(AsyncBrowserManager, name)
+
+    def test_wait_for_text_awaits(self):
+        page = Mock()
+        page.get_by_text.return_value.wait_for = AsyncMock()
+        locator = AsyncElementLocator(page)
+        assert asyncio.run(locator.wait_for_text("完成", timeout=1)) is True
+        page.get_by_text.return_value.wait_for.assert_awaited_once_with(
+            state="visible", timeout=1000)
+        with pytest.raises(ValueError):
+            locator.locate("clickable=提交")
+
+    def test_query_states_awaits(self):
+        page = Mock()
+        page.evaluate = AsyncMock(return_value=[{"count": 1, "visible": True}])
+        states = asyncio.run(AsyncElementLocator(page).query_states(["#a"]))
+        assert states == {"#a": {"count": 1, "visible": True}}
+
+
+class TestAsyncBrowserHTTPClient:
+    """异步HTTP客户端测试类"""
+
+    def make_context(self):
+        response = Mock()
+        response.status = 200
+        response.status_text = "OK"
+        response.headers = {"content-type": "application/json"}
+        response.url = "https://example.com/api/items"
+        response.body = AsyncMock(return_value=b'{"items": [1, 2]}')
+
+        context = Mock()
+        context.request.get = AsyncMock(return_value=response)
+        return context
+
+    def test_make_request_buffers_body(self):
+        context = self.make_context()
+        client = AsyncBrowserHTTPClient(
+            browser_context=context, base_url="https://example.com/")
+
+        response = asyncio.run(client.make_request(
+            "GET", "/api/items", params={"page": 1}))
+
+        url, kwargs = context.request.get.call_args
+        assert url == ("https://example.com/api/items",)
+        assert kwargs["params"] == {"page": 1}
+        assert response.status_code == 200
+        assert response.json() == {"items": [1, 2]}
+        assert response.text == '{"items": [1, 2]}'
+        assert response.elapsed_ms >= 0
+
+    def test_make_requests_bounded_and_ordered(self):
+        """批量请求不超过并发上限，结果按请求顺序返回，失败请求返回异常"""
+        in_flight = {"now": 0, "max": 0}
+
+        async def get(url, **kwargs):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.01 * (10 - int(url.rsplit("/", 1)[1])))
+            in_flight["now"] -= 1
+            if url.endswith("/3"):
+                raise RuntimeError("connection reset")
+            response = Mock(status=200, status_text="OK", url=url,
+                            headers={"content-type": "text/plain"})
+            response.body = AsyncMock(return_value=url.encode())
+            return response
+
+        context = Mock()
+        context.request.get = get
+        client = AsyncBrowserHTTPClient(
+            browser_context=context, base_url="https://example.com/")
+
+        results = asyncio.run(client.make_requests(
+            [("GET", f"/items/{i}", {}) for i in range(8)], concurrency=3))
+
+        assert in_flight["max"] == 3
+        assert isinstance(results[3], ValueError)
+        assert [r.text for i, r in enumerate(results) if i != 3] == [
+            f"https://example.com/items/{i}" for i in range(8) if i != 3]
+
+
+class TestBrowserHTTPClientBatch:
+    """同步客户端批量请求测试类"""
+
+    def test_make_requests_merges_cookies(self, monkeypatch):
+        """并发批量请求在后台执行，新增的Cookie写回浏览器上下文"""
+        from pytest_dsl_ui.core import async_backend
+        from pytest_dsl_ui.core.browser_http_client import (
+            BrowserHTTPClient, BrowserResponse
+        )
+
+        session = {"name": "sid", "value": "1", "domain": "example.com"}
+        token = {"name": "token", "value": "abc", "domain": "example.com"}
+        context = Mock()
+        context.storage_state.return_value = {"cookies": [session], "origins": []}
+        response = BrowserResponse(Mock(status=200, headers={}))
+
+        async def run_batch(client, requests, concurrency, storage_state):
+            assert storage_state["cookies"] == [session]
+            return [response] * len(requests), [session, token]
+
+        monkeypatch.setattr(async_backend, "run_request_batch", run_batch)
+        monkeypatch.setattr(BrowserHTTPClient, "_log_response_to_allure",
+                            lambda self, response: None)
+        client = BrowserHTTPClient(browser_context=context)
+
+        results = client.make_requests(
+            [("POST", "https://example.com/seed", {"json": {}})] * 2,
+            concurrency=4)
+
+        assert results == [response, response]
+        context.add_cookies.assert_called_once_with([token])
+        context.request.post.assert_not_called()
@@ -0,0 +1,167 @@
+"""测试认证状态缓存和登录锁
+
+使用临时认证目录和子进程，不需要浏览器。
+"""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from pytest_dsl_ui.core.auth_manager import AuthManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    with patch.object(AuthManager, '_ensure_gitignore'):
+        yield AuthManager(str(tmp_path), watch_interval=0)
+
+
+def write_state(manager, name, value, mtime=None):
+    path = manager.get_state_path(name)
+    path.write_text(json.dumps({'cookies': [{'name': 'sid', 'value': value}],
+                                'origins': [], 'metadata': {'username': value}}),
+                    encoding='utf-8')
+    if mtime:
+        os.utime(path, (mtime, mtime))
+
+
+class TestAuthStateCache:
+    """认证状态缓存测试类"""
+
+    def test_load_cached_until_changed(self, manager):
+        write_state(manager, 'admin', '1', 1000)
+        first = manager.load_auth_state('admin')
+        assert manager.load_auth_state('admin') is first
+        assert manager.get_cache_stats() == {'hits': 1, 'misses': 1, 'size': 1}
+
+        write_state(manager, 'admin', '2', 2000)
+        assert manager.load_auth_state('admin')['cookies'][0]['value'] == '2'
+        assert manager.load_auth_state('missing') is None
+
+    def test_index_and_save(self, manager):
+        assert not manager.has_auth_state('admin')
+        write_state(manager, 'admin', '1')
+        write_state(manager, 'user', '2', time.time() - 40 * 86400)
+        assert manager.has_auth_state('admin')
+        assert manager.list_auth_states()['user']['username'] == '2'
+
+        manager.cleanup_expired_states(30)
+        assert sorted(manager.list_auth_states()) == ['admin']
+
+        context = Mock()
+        context.storage_state.return_value = {'cookies': [], 'origins': []}
+        manager.save_auth_state(context, 'admin', {'username': 'new'})
+        assert manager.load_auth_state('admin')['metadata']['username'] == 'new'
+        assert not list(manager.auth_dir.glob('*.tmp'))
+
+        manager.delete_auth_state('admin')
+        assert not manager.has_auth_state('admin')
+
+    def test_compact_format(self, manager):
+        write_state(manager, 'admin', 'old')
+        context = Mock()
+        context.storage_state.return_value = {
+            'cookies': [{'name': 'sid', 'value': 'x'}],
+            'origins': [{'origin': 'https://a.test',
+                         'localStorage': [{'name': 'k', 'value': 'v' * 10000}]}]}
+        path = manager.save_auth_state(context, 'admin', {'username': 'admin'},
+                                       state_format='gzip')
+        assert path.endswith('admin.state') and manager.get_state_path('admin').exists()
+        assert not (manager.auth_dir / 'admin.json').exists()
+        assert os.path.getsize(path) < 2000
+
+        state = manager.load_auth_state('admin')
+        assert state['origins'][0]['localStorage'][0]['value'] == 'v' * 10000
+        assert state['metadata']['cookies_count'] == 1 and 'saved_at' in state
+
+        with patch('pytest_dsl_ui.core.auth_manager._decompress') as decompress:
+            assert manager.list_auth_states()['admin']['username'] == 'admin'
+            decompress.assert_not_called()
+
+        with pytest.raises(ValueError):
+            manager.save_auth_state(context, 'admin', state_format='msgpack')
+
+
+class TestStateValidity:
+    """认证状态有效期测试类"""
+
+    def save(self, manager, expires, state_format='json'):
+        context = Mock()
+        context.storage_state.return_value = {'cookies': [
+            {'name': 'sid', 'expires': expires},
+            {'name': 'tracking', 'expires': time.time() + 10},
+            {'name': 'session', 'expires': -1}], 'origins': []}
+        manager.save_auth_state(context, 'admin', state_format=state_format)
+
+    def test_ttl_from_cookies_and_age(self, manager):
+        assert manager.get_state_ttl('admin') == 0.0
+        self.save(manager, time.time() + 3600, 'gzip')
+        assert 0 < manager.get_state_ttl('admin') <= 10
+        assert 3500 < manager.get_state_ttl('admin', cookie_names=['sid']) <= 3600
+        assert manager.get_state_ttl('admin', max_age=5,
+                                     cookie_names=['sid']) <= 5
+        assert manager.get_state_ttl('admin', cookie_names=['session']) is None
+        assert not manager.is_state_fresh('admin', min_ttl=60)
+        assert manager.is_state_fresh('admin', min_ttl=60, cookie_names=['sid'])
+
+    def test_login_ignores_short_cookies_without_names(self, manager):
+        """未指定Cookie名称时，短期Cookie不会触发重新登录"""
+        self.save(manager, time.time() + 3600)
+        assert manager.acquire_login('admin', refresh_ahead=60) is False
+        assert manager.acquire_login('admin', max_age=30, refresh_ahead=60) is True
+        manager.release_login('admin')
+
+    def test_pre_refresh_does_not_wait(self, manager, tmp_path):
+        self.save(manager, time.time() + 100)
+        assert manager.acquire_login('admin', refresh_ahead=50,
+                                     cookie_names=['sid']) is False
+
+        other = AuthManager(str(tmp_path), watch_interval=0)
+        assert other.acquire_login('admin', refresh_ahead=300,
+                                   cookie_names=['sid']) is True
+        start = time.monotonic()
+        assert manager.acquire_login('admin', refresh_ahead=300,
+                                     cookie_names=['sid'], timeout=5) is False
+        assert time.monotonic() - start < 1
+        other.release_login('admin')
+
+
+WORKER = textwrap.dedent('''
+    import sys, time
+    from unittest.mock import Mock, patch
+    from pytest_dsl_ui.core.auth_manager import AuthManager
+    with patch.object(AuthManager, '_ensure_gitignore'):
+        manager = AuthManager(sys.argv[1])
+    if manager.acquire_login('admin', timeout=20):
+        time.sleep(0.5)
+        context = Mock()
+        context.storage_state.return_value = {'cookies': [], 'origins': []}
+        manager.save_auth_state(context, 'admin')
+        print('login')
+    else:
+        print('reuse')
+''')
+
+
+class TestLoginLock:
+    """一次登录、多处复用测试类"""
+
+    def test_single_login_across_processes(self, tmp_path):
+        workers = [subprocess.Popen([sys.executable, '-c', WORKER, str(tmp_path)],
+                                    stdout=subprocess.PIPE, text=True)
+                   for _ in range(4)]
+        outputs = sorted(w.communicate(timeout=60)[0].strip() for w in workers)
+        assert outputs == ['login', 'reuse', 'reuse', 'reuse']
+
+    def test_fresh_state_and_release(self, manager):
+        write_state(manager, 'admin', '1', time.time() - 100)
+        assert manager.acquire_login('admin') is False
+        assert manager.acquire_login('admin', max_age=10) is True
+        assert manager.release_login('admin') is True
+        assert manager.release_login('admin') is False
@@ -0,0 +1,54 @@
+"""测试性能基准的夹具应用和结果对比"""
+
+import json
+from urllib.request import urlopen
+
+from pytest_dsl_ui.utils.benchmark import (
+    FixtureApp, compare_results, format_results, summarize_timings
+)
+
+
+def fetch(url):
+    with urlopen(url, timeout=5) as response:
+        return response.headers, response.read().decode('utf-8')
+
+
+class TestFixtureApp:
+    """夹具应用测试类"""
+
+    def test_pages(self):
+        with FixtureApp({'rows': 10}) as app:
+            _, table = fetch(f"{app.base_url}/table")
+            assert table.count('<tr ') == 10 and '编辑第9行' in table
+            _, form = fetch(f"{app.base_url}/form?fields=3")
+            assert 'id="field-2"' in form and 'id="field-3"' not in form
+            _, item = fetch(f"{app.base_url}/api/items/7")
+            assert json.loads(item)['id'] == '7'
+            headers, _ = fetch(f"{app.base_url}/login")
+            assert 'session=' in headers['Set-Cookie']
+
+
+class TestResults:
+    """基准结果测试类"""
+
+    def test_summarize_and_compare(self):
+        stats = summarize_timings([float(i) for i in range(1, 21)])
+        assert (stats['runs'], stats['min_ms'], stats['p50_ms'],
+                stats['p95_ms'], stats['max_ms']) == (20, 1.0, 10.5, 19.0, 20.0)
+
+        baseline = {'results': {'click': {'p50_ms': 100.0},
+                                'assert': {'p50_ms': 50.0},
+                                'auth': {'error': 'TimeoutError'}}}
+        current = {'version': '0.2.0', 'python': '3.11', 'playwright': '1.40',
+                   'iterations': 5,
+                   'results': {'click': {**stats, 'p50_ms': 125.0},
+                               'assert': {**stats, 'p50_ms': 52.0},
+                               'auth': stats,
+                               'new': {'error': 'boom'}}}
+        comparison = compare_results(current, baseline, threshold=0.1)
+        assert [(c['case'], c['regression']) for c in comparison] == [
+            ('click', True), ('assert', False)]
+        assert comparison[0]['change'] == 0.25
+
+        text = format_results(current, comparison)
+        assert '回归' in text and '失败: boom' in text
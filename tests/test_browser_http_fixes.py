@@ -395,6 +395,27 @@ class TestBrowserHTTPFixes:
         # 测试状态判断
         assert response.ok is True
 
+    def test_response_parsed_once(self):
+        """多次捕获和断言共用同一次读取和解析的结果"""
+        request = BrowserHTTPRequest({"method": "GET", "url": "https://httpbin.org/get"})
+        request.response = self.browser_response
+
+        for _ in range(5):
+            assert request._extract_value("jsonpath", "$.args.negative") == "-456"
+            assert request._extract_regex(r'"author": "([^"]+)"') == "Yours Truly"
+            assert "slideshow" in request._extract_value("body")
+
+        self.mock_playwright_response.text.assert_called_once()
+        assert self.browser_response.json() is self.browser_response.json()
+
+        invalid = Mock()
+        invalid.text.return_value = "<html></html>"
+        response = BrowserResponse(invalid)
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                response.json()
+        invalid.text.assert_called_once()
+
 def test_basic_functionality():
     """基本功能测试"""
     assert True
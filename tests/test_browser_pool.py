@@ -0,0 +1,119 @@
+"""测试浏览器池功能
+
+使用模拟的浏览器对象验证复用、淘汰、容量限制和健康检查逻辑。
+"""
+
+import time
+from unittest.mock import Mock
+
+from pytest_dsl_ui.core.browser_pool import BrowserPool
+
+
+def make_browser(connected=True):
+    """创建模拟浏览器"""
+    browser = Mock()
+    browser.is_connected.return_value = connected
+    browser.contexts = []
+    return browser
+
+
+class TestBrowserPool:
+    """浏览器池测试类"""
+
+    def setup_method(self):
+        self.launched = []
+
+        def launcher():
+            browser = make_browser()
+            self.launched.append(browser)
+            return browser
+
+        self.launcher = launcher
+        self.key = BrowserPool.make_key('chromium', {'headless': True})
+
+    def test_make_key_is_order_independent(self):
+        """启动参数顺序不影响分组键"""
+        key1 = BrowserPool.make_key('Chromium', {'a': 1, 'b': 2})
+        key2 = BrowserPool.make_key('chromium', {'b': 2, 'a': 1})
+        assert key1 == key2
+
+    def test_release_and_reuse(self):
+        """归还后的浏览器会被复用，上下文被回收"""
+        pool = BrowserPool()
+        browser = pool.acquire(self.key, self.launcher)
+        context = Mock()
+        browser.contexts = [context]
+
+        pool.release(browser)
+        context.close.assert_called_once()
+        browser.close.assert_not_called()
+
+        assert pool.acquire(self.key, self.launcher) is browser
+        assert len(self.launched) == 1
+        assert pool.stats['hits'] == 1
+
+    def test_different_keys_not_shared(self):
+        """不同启动参数的浏览器不会互相复用"""
+        pool = BrowserPool()
+        browser = pool.acquire(self.key, self.launcher)
+        pool.release(browser)
+
+        other_key = BrowserPool.make_key('chromium', {'headless': False})
+        assert pool.acquire(other_key, self.launcher) is not browser
+
+    def test_unhealthy_browser_discarded(self):
+        """断开连接的浏览器不会被复用"""
+        pool = BrowserPool()
+        browser = pool.acquire(self.key, self.launcher)
+        pool.release(browser)
+        browser.is_connected.return_value = False
+
+        assert pool.acquire(self.key, self.launcher) is not browser
+        browser.close.assert_called_once()
+        assert pool.stats['unhealthy'] == 1
+
+    def test_idle_timeout_eviction(self):
+        """空闲超时的浏览器会被关闭"""
+        pool = BrowserPool(idle_timeout=10)
+        browser = pool.acquire(self.key, self.launcher)
+        pool.release(browser)
+        pool._idle[self.key][0].last_used = time.monotonic() - 60
+
+        assert pool.evict_idle() == 1
+        browser.close.assert_called_once()
+        assert pool.size == 0
+
+    def test_max_size_overflow(self):
+        """超过容量上限的浏览器在归还时直接关闭"""
+        pool = BrowserPool(max_size=1)
+        first = pool.acquire(self.key, self.launcher)
+        second = pool.acquire(self.key, self.launcher)
+
+        assert pool.owns(first)
+        assert not pool.owns(second)
+        pool.release(second)
+        second.close.assert_called_once()
+        assert pool.stats['overflow'] == 1
+
+    def test_warm_size_prelaunch(self):
+        """预热数量会补足空闲浏览器"""
+        pool = BrowserPool(warm_size=2, max_size=4)
+        pool.acquire(self.key, self.launcher)
+
+        assert len(self.launched) == 3
+        assert pool.idle_count == 2
+
+        # 复用空闲浏览器时不在获取路径上启动新的预热浏览器
+        pool.acquire(self.key, self.launcher)
+        assert len(self.launched) == 3
+        assert pool.idle_count == 1
+
+    def test_shutdown_closes_all(self):
+        """关闭池会关闭所有浏览器"""
+        pool = BrowserPool(warm_size=1)
+        pool.acquire(self.key, self.launcher)
+        pool.shutdown()
+
+        for browser in self.launched:
+            browser.close.assert_called_once()
+        assert pool.size == 0
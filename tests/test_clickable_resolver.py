@@ -0,0 +1,100 @@
+"""测试智能可点击元素解析的优先级规则
+
+使用模拟页面，驱动解析步骤并直接提供各阶段的元素状态。
+"""
+
+from unittest.mock import Mock
+
+from pytest_dsl_ui.core.clickable_resolver import (
+    CLICKABLE_BASES, clickable_steps, resolve_clickable
+)
+
+
+def run_steps(page, text, *stage_states):
+    """依次把各阶段的元素状态送入解析步骤，返回解析结果和阶段数"""
+    steps = clickable_steps(page, text)
+    next(steps)
+    stages = 0
+    try:
+        for states in stage_states:
+            stages += 1
+            steps.send(states)
+    except StopIteration as stop:
+        return stop.value, stages
+    raise AssertionError("解析步骤未结束")
+
+
+def groups(*matched):
+    """构造交互元素分组匹配标记"""
+    return [base in matched for base in CLICKABLE_BASES]
+
+
+class TestClickableResolver:
+    """智能可点击元素解析测试类"""
+
+    def test_prefers_visible_enabled_interactive(self):
+        """可见且启用的交互元素优先，按分组顺序和组内索引返回"""
+        page = Mock()
+        states = [
+            [True, False, groups("button")],        # button nth(0) 禁用
+            [True, True, groups("a")],              # a nth(0)
+            [True, True, groups("button")],         # button nth(1)
+        ]
+        result, stages = run_steps(page, "保存", states)
+
+        assert stages == 1
+        page.locator.assert_called_with("button:has-text('保存')")
+        page.locator.return_value.nth.assert_called_once_with(1)
+        assert result is page.locator.return_value.nth.return_value
+
+    def test_falls_back_to_visible_interactive(self):
+        """没有可见且启用的交互元素时选择可见的交互元素"""
+        page = Mock()
+        states = [
+            [False, True, groups("button")],
+            [True, False, groups("a", "[role='button']")],
+        ]
+        run_steps(page, "保存", states)
+        page.locator.assert_called_with("a:has-text('保存')")
+        page.locator.return_value.nth.assert_called_once_with(0)
+
+    def test_unique_exact_text(self):
+        """精确文本唯一匹配时直接返回"""
+        page = Mock()
+        result, stages = run_steps(page, "保存", [], [[True, True, []]])
+        assert stages == 2
+        page.get_by_text.assert_called_once_with("保存", exact=True)
+        assert result is page.get_by_text.return_value
+
+    def test_multiple_exact_text_prefers_span(self):
+        """精确文本匹配多个时优先选择span元素"""
+        page = Mock()
+        exact = [[True, True, []], [True, True, []]]
+        fallback = [
+            [True, True, [False, True]],   # div
+            [False, True, [True, False]],  # span nth(0) 不可见
+            [True, True, [True, False]],   # span nth(1)
+        ]
+        result, stages = run_steps(page, "保存", [], exact, fallback)
+        assert stages == 3
+        page.locator.assert_called_with("span:has-text('保存')")
+        page.locator.return_value.nth.assert_called_once_with(1)
+
+    def test_fuzzy_text(self):
+        """精确文本无匹配时使用模糊匹配"""
+        page = Mock()
+        fuzzy = [[False, True, []], [True, True, []]]
+        run_steps(page, "保存", [], [], fuzzy)
+        page.get_by_text.assert_called_with("保存")
+        page.get_by_text.return_value.nth.assert_called_once_with(1)
+
+    def test_sync_driver_uses_evaluate_all(self):
+        """同步驱动每个阶段只调用一次evaluate_all"""
+        page = Mock()
+        union = page.locator.return_value.or_.return_value.or_.return_value \
+            .or_.return_value.or_.return_value
+        union.evaluate_all.return_value = [[True, True, groups("button")]]
+
+        resolve_clickable(page, "保存")
+        union.evaluate_all.assert_called_once()
+        assert union.evaluate_all.call_args[0][1] == list(CLICKABLE_BASES)
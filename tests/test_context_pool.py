@@ -0,0 +1,170 @@
+"""测试浏览器上下文复用池
+
+使用模拟的浏览器和上下文对象验证重置、分组和容量限制逻辑。
+"""
+
+from unittest.mock import Mock
+
+from pytest_dsl_ui.core.browser_manager import BrowserManager
+from pytest_dsl_ui.core.context_pool import ContextPool, RESET_PATH
+
+
+def make_context(origins=None):
+    """创建模拟上下文"""
+    context = Mock()
+    context.storage_state.return_value = {
+        "cookies": [],
+        "origins": [{"origin": o, "localStorage": []} for o in origins or []]
+    }
+    context.pages = [Mock(), Mock()]
+    return context
+
+
+def make_browser():
+    browser = Mock()
+    browser.is_connected.return_value = True
+    return browser
+
+
+class TestContextPool:
+    """上下文复用池测试类"""
+
+    def setup_method(self):
+        self.browser = make_browser()
+        self.config = {"viewport": {"width": 1280, "height": 720},
+                       "ignore_https_errors": True}
+
+    def test_key_ignores_storage_state(self):
+        """storage_state不参与分组"""
+        key1 = ContextPool.make_key(self.browser, self.config)
+        key2 = ContextPool.make_key(
+            self.browser, {**self.config, "storage_state": {"cookies": []}})
+        assert key1 == key2
+
+    def test_release_resets_context(self):
+        """归还时关闭页面并清除cookies和权限"""
+        pool = ContextPool()
+        context = make_context()
+        pages = list(context.pages)
+        pool.track(context, self.config)
+
+        assert pool.release(context, self.browser)
+        for page in pages:
+            page.close.assert_called_once()
+        context.clear_cookies.assert_called_once()
+        context.clear_permissions.assert_called_once()
+        context.close.assert_not_called()
+
+    def test_release_clears_origin_storage(self):
+        """使用过存储的源会通过占位页面清理"""
+        pool = ContextPool()
+        context = make_context(origins=["https://example.com"])
+        scratch = Mock()
+        context.new_page.return_value = scratch
+        pool.track(context, self.config)
+
+        pool.release(context, self.browser)
+        scratch.goto.assert_called_once_with(
+            "https://example.com" + RESET_PATH)
+        scratch.evaluate.assert_called_once()
+        scratch.close.assert_called_once()
+
+    def test_acquire_reuses_and_applies_storage_state(self):
+        """获取时复用同配置上下文并写入cookies"""
+        pool = ContextPool()
+        context = make_context()
+        pool.track(context, self.config)
+        pool.release(context, self.browser)
+
+        cookies = [{"name": "sid", "value": "1", "domain": "example.com",
+                    "path": "/"}]
+        config = {**self.config,
+                  "storage_state": {"cookies": cookies, "origins": []}}
+        assert pool.acquire(self.browser, config) is context
+        context.add_cookies.assert_called_once_with(cookies)
+        assert pool.stats['hits'] == 1
+
+    def test_acquire_miss_for_other_config(self):
+        """不同配置不会复用"""
+        pool = ContextPool()
+        context = make_context()
+        pool.track(context, self.config)
+        pool.release(context, self.browser)
+
+        assert pool.acquire(self.browser, {"user_agent": "x"}) is None
+        assert pool.acquire(make_browser(), self.config) is None
+
+    def test_untracked_context_closed(self):
+        """未记录配置的上下文直接关闭"""
+        pool = ContextPool()
+        context = make_context()
+        assert not pool.release(context, self.browser)
+        context.close.assert_called_once()
+
+    def test_reset_failure_closes_context(self):
+        """重置失败的上下文会被关闭"""
+        pool = ContextPool()
+        context = make_context()
+        context.clear_cookies.side_effect = RuntimeError("closed")
+        pool.track(context, self.config)
+
+        assert not pool.release(context, self.browser)
+        context.close.assert_called_once()
+        assert pool.stats['reset_failures'] == 1
+
+    def test_bounded_free_list(self):
+        """空闲列表超过上限时淘汰最早归还的上下文"""
+        pool = ContextPool(max_per_key=1)
+        first, second = make_context(), make_context()
+        for context in (first, second):
+            pool.track(context, self.config)
+            pool.release(context, self.browser)
+
+        first.close.assert_called_once()
+        assert pool.size == 1
+        assert pool.is_free(second)
+
+    def test_context_ids_not_reused_after_close(self):
+        """关闭上下文后新建的上下文不会覆盖仍存活的上下文"""
+        manager = BrowserManager()
+        self.browser.new_context.side_effect = lambda **kwargs: make_context()
+        manager.browsers['b'] = self.browser
+        manager.current_browser = 'b'
+
+        ids = [manager.create_context() for _ in range(3)]
+        live = manager.contexts[ids[2]]
+        manager.close_context(ids[1])
+        new_ids = [manager.create_context(), manager.create_context()]
+
+        assert len(set(ids + new_ids)) == 5
+        assert manager.contexts[ids[2]] is live
+        assert len(manager.contexts) == 4
+
+    def test_reset_clears_visited_origins_and_context_state(self):
+        """重置清理访问过的源、请求头和地理位置"""
+        pool = ContextPool()
+        context = make_context(["https://a.test"])
+        pool.track(context, self.config)
+        on_page = context.on.call_args[0][1]
+        page = Mock()
+        on_page(page)
+        on_navigated = page.on.call_args[0][1]
+        on_navigated(Mock(url="https://idb.test/app"))
+        on_navigated(Mock(url="about:blank"))
+
+        assert pool.release(context, self.browser)
+        visited = [c.args[0] for c in context.new_page.return_value.goto.call_args_list]
+        assert visited == [f"https://a.test{RESET_PATH}", f"https://idb.test{RESET_PATH}"]
+        context.set_extra_http_headers.assert_called_once_with({})
+        context.set_geolocation.assert_called_once_with(None)
+
+    def test_init_script_context_not_recycled(self):
+        """添加过初始化脚本的上下文归还时直接关闭"""
+        pool = ContextPool()
+        context = make_context()
+        pool.track(context, self.config)
+        context.add_init_script("window.x = 1")
+
+        assert not pool.release(context, self.browser)
+        context.close.assert_called_once()
+        assert pool.stats['unrecyclable'] == 1
@@ -0,0 +1,119 @@
+"""测试批量元素状态查询
+
+使用模拟页面验证选择器到页面内查询的转换，以及无法转换时的回退逻辑。
+"""
+
+from unittest.mock import Mock, patch
+
+from pytest_dsl_ui.core.element_locator import ElementLocator
+from pytest_dsl_ui.core.element_states import build_query
+from pytest_dsl_ui.core.locator_plan import compile_selector
+from pytest_dsl_ui.keywords import assertion_keywords
+from pytest_dsl_ui.keywords.assertion_keywords import (
+    _bulk_assertion_failures, check_multiple_conditions)
+
+
+def query_of(selector):
+    return build_query(compile_selector(selector))
+
+
+class TestElementStates:
+    """批量元素状态查询测试类"""
+
+    def test_build_query(self):
+        """CSS、XPath、testid和元素类型定位可以在页面内执行"""
+        assert query_of("#username") == {
+            "css": "#username", "xpath": None, "hasText": None, "pick": None}
+        assert query_of("//input[@name='q']")["xpath"] == "//input[@name='q']"
+        assert query_of("testid=submit")["css"] == '[data-testid="submit"]'
+
+        query = query_of("span=日志检索")
+        assert (query["css"], query["hasText"], query["pick"]) == ("span", "日志检索", 0)
+        assert query_of(".row&nth=2")["pick"] == 2
+        assert query_of(".row&last=true")["pick"] == -1
+
+    def test_build_query_unsupported(self):
+        """依赖Playwright选择器引擎的写法不能在页面内执行"""
+        assert query_of("text=提交") is None
+        assert query_of("role=button:提交") is None
+        assert query_of("clickable=保存") is None
+        assert query_of(".row&has_text=a") is None
+        assert query_of(".row&first=true&locator=span") is None
+
+    def test_query_states_batches_and_falls_back(self):
+        """可执行的查询合并为一次evaluate，其余各调用一次evaluate_all"""
+        page = Mock()
+        page.evaluate.return_value = [{"count": 1}, None]
+        locator = ElementLocator(page)
+        fallback = page.get_by_role.return_value
+        fallback.evaluate_all.return_value = {"count": 2}
+        page.locator.return_value.evaluate_all.return_value = {"count": 3}
+
+        states = locator.query_states(
+            ["#a", "role=button", "div >> span", "#a"], ["count"])
+
+        page.evaluate.assert_called_once()
+        batch = page.evaluate.call_args[0][1]
+        assert [q["css"] for q in batch["queries"]] == ["#a", "div >> span"]
+        assert batch["properties"] == ["count"]
+        assert states == {
+            "#a": {"count": 1},
+            "role=button": {"count": 2},
+            "div >> span": {"count": 3},
+        }
+
+    def test_bulk_assertion_failures(self):
+        """批量断言列出所有未满足的期望"""
+        states = {
+            "#name": {"visible": True, "value": "admin ", "count": 1,
+                      "attributes": {"maxlength": "20"}},
+            ".error": {"visible": False, "value": None, "count": 2,
+                       "attributes": {"maxlength": None}},
+        }
+        failures = _bulk_assertion_failures([
+            {"selector": "#name", "visible": True, "value": "admin",
+             "attributes": {"maxlength": 20}},
+            {"selector": ".error", "count": 0, "exists": False},
+        ], states)
+        assert failures == [
+            ".error count: 期望 0, 实际 2",
+            ".error exists: 期望 False, 实际 True",
+        ]
+
+    def test_multiple_conditions_polls_until_satisfied(self):
+        """多条件检查在超时时间内重新查询未满足的元素条件"""
+        locator = Mock()
+        locator.query_states.side_effect = [
+            {"#msg": {"text": "加载中"}},
+            {"#msg": {"text": "欢迎回来"}},
+        ]
+        with patch.object(assertion_keywords, '_get_current_locator',
+                          return_value=locator):
+            result = check_multiple_conditions(conditions=[
+                {"type": "text_contains", "selector": "#msg",
+                 "expected_text": "欢迎", "timeout": 2},
+            ])
+
+        assert result["result"] is True
+        assert locator.query_states.call_count == 2
+        assert result["captures"]["details"][0]["details"]["contains_text"] is True
+
+    def test_bulk_assertion_parses_boolean_strings(self):
+        """字符串"false"解析为False"""
+        states = {"#submit": {"enabled": False, "count": 1}}
+        assert _bulk_assertion_failures(
+            [{"selector": "#submit", "enabled": "false", "exists": "true"}],
+            states) == []
+
+    def test_get_elements_state_attachment_is_lazy(self):
+        """批量获取元素状态的附件在报告确定写入时才格式化"""
+        locator = Mock()
+        locator.query_states.return_value = {"#a": {"count": 1}}
+        with patch.object(assertion_keywords, '_get_current_locator',
+                          return_value=locator), \
+                patch.object(assertion_keywords.reporter, 'attach') as attach:
+            result = assertion_keywords.get_elements_state(selectors=["#a"])
+
+        assert result["result"] == {"#a": {"count": 1}}
+        body = attach.call_args[0][0]
+        assert callable(body) and '"count": 1' in body()
@@ -0,0 +1,54 @@
+"""测试提取表达式编译缓存"""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from pytest_dsl_ui.core.browser_http_client import BrowserResponse
+from pytest_dsl_ui.core.browser_http_request import BrowserHTTPRequest
+from pytest_dsl_ui.core.expression_cache import ExpressionCache, expression_cache
+
+
+class TestExpressionCache:
+    """表达式缓存测试类"""
+
+    def test_lru_and_stats(self):
+        cache = ExpressionCache(maxsize=2)
+        pattern = cache.regex(r'\d+')
+        assert cache.regex(r'\d+') is pattern
+        cache.jsonpath('$.a')
+        cache.xpath('//a')
+
+        stats = cache.get_stats()
+        assert (stats['size'], stats['hits'], stats['misses']) == (2, 1, 3)
+        assert stats['by_kind']['regex'] == {'hits': 1, 'misses': 1}
+
+        # 最早的正则表达式已被淘汰，再次获取时重新编译
+        cache.regex(r'\d+')
+        assert cache.get_stats()['by_kind']['regex'] == {'hits': 1, 'misses': 2}
+
+    def test_invalid_expression_not_cached(self):
+        cache = ExpressionCache()
+        with pytest.raises(Exception):
+            cache.regex('(')
+        with pytest.raises(ValueError):
+            cache.get('css', 'div')
+        assert cache.get_stats()['size'] == 0
+
+    def test_request_extractors_share_cache(self):
+        """重复的捕获和断言只编译一次表达式"""
+        expression_cache.clear()
+        playwright_response = Mock(headers={'content-type': 'application/json'})
+        playwright_response.text.return_value = json.dumps({'items': [{'id': 7}]})
+        request = BrowserHTTPRequest({'method': 'GET', 'url': '/items'})
+        request.response = BrowserResponse(playwright_response)
+
+        for _ in range(3):
+            assert request._extract_jsonpath('$.items[0].id') == 7
+            assert request._extract_regex(r'"id": (\d+)') == '7'
+            assert request._perform_assertion('matches', 'matches', 'abc', '^a')
+
+        stats = expression_cache.get_stats()['by_kind']
+        assert stats['jsonpath'] == {'hits': 2, 'misses': 1}
+        assert stats['regex'] == {'hits': 4, 'misses': 2}
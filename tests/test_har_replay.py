@@ -0,0 +1,128 @@
+"""测试HAR回放的请求匹配
+
+使用临时HAR文件和模拟路由对象验证匹配键规范化和未匹配处理。
+"""
+
+import base64
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from pytest_dsl_ui.core.context_pool import ContextPool
+from pytest_dsl_ui.core.har_replay import HarReplayer, normalize_url
+
+
+def entry(method, url, text, post=None, mime='application/json', encoding=None):
+    request = {'method': method, 'url': url, 'headers': []}
+    if post is not None:
+        request['postData'] = {'mimeType': mime, 'text': post}
+    content = {'mimeType': 'application/json', 'text': text}
+    if encoding:
+        content['encoding'] = encoding
+    return {
+        'request': request,
+        'response': {
+            'status': 200,
+            'headers': [
+                {'name': 'Content-Type', 'value': 'application/json'},
+                {'name': 'Content-Encoding', 'value': 'gzip'},
+            ],
+            'content': content,
+        },
+    }
+
+
+@pytest.fixture
+def har_file(tmp_path):
+    path = tmp_path / 'traffic.har'
+    path.write_text(json.dumps({'log': {'entries': [
+        entry('GET', 'https://A.test/api/users?b=2&a=1&_t=1', '{"page": 1}'),
+        entry('POST', 'https://a.test/api/login', '{"user": "a"}',
+              post='{"name": "a", "pwd": "x"}'),
+        entry('POST', 'https://a.test/api/login', '{"user": "b"}',
+              post='{"name": "b", "pwd": "x"}'),
+        entry('GET', 'https://a.test/api/poll', '{"n": 1}'),
+        entry('GET', 'https://a.test/api/poll', '{"n": 2}'),
+        entry('GET', 'https://a.test/logo.png',
+              base64.b64encode(b'\x89PNG').decode(), encoding='base64'),
+    ]}}), encoding='utf-8')
+    return str(path)
+
+
+def make_request(method, url, post_data=None):
+    return Mock(method=method, url=url, post_data=post_data,
+                headers={'content-type': 'application/json'})
+
+
+class TestHarReplay:
+    """HAR回放测试类"""
+
+    def test_normalize_url(self):
+        """查询参数排序，忽略指定参数、片段和主机大小写"""
+        assert normalize_url('https://A.test/x?b=2&a=1#top') == \
+            'https://a.test/x?a=1&b=2'
+        assert normalize_url('https://a.test/x?a=1&_t=9', ['_t']) == \
+            'https://a.test/x?a=1'
+        assert normalize_url('https://a.test', ignore_host=True) == '/'
+
+    def test_lookup(self, har_file):
+        """按规范化URL、请求体匹配，按录制顺序依次返回"""
+        replayer = HarReplayer(har_file, ignore_params='_t')
+
+        assert replayer.lookup('get', 'https://a.test/api/users?a=1&b=2&_t=5')
+        login = replayer.lookup('POST', 'https://a.test/api/login',
+                                '{"pwd": "x", "name": "b"}')
+        assert login['response']['content']['text'] == '{"user": "b"}'
+        # 请求体不匹配时退化为按方法和URL匹配
+        assert replayer.lookup('POST', 'https://a.test/api/login', '{}')
+
+        polls = [replayer.lookup('GET', 'https://a.test/api/poll')
+                 ['response']['content']['text'] for _ in range(3)]
+        assert polls == ['{"n": 1}', '{"n": 2}', '{"n": 2}']
+
+    def test_handle(self, har_file):
+        """命中时直接返回录制的响应，并去掉与解码后响应体不符的响应头"""
+        replayer = HarReplayer(har_file)
+        route = Mock()
+        replayer.handle(route, make_request('GET', 'https://a.test/logo.png'))
+
+        options = route.fulfill.call_args[1]
+        assert options['body'] == b'\x89PNG'
+        assert options['headers'] == {'Content-Type': 'application/json'}
+        assert replayer.stats == {'hits': 1, 'misses': 0}
+
+    def test_duplicate_headers_joined(self, har_file):
+        """同名响应头合并，多个Set-Cookie按换行分隔"""
+        replayer = HarReplayer(har_file)
+        options = replayer._fulfill_options({'response': {
+            'headers': [
+                {'name': 'Set-Cookie', 'value': 'a=1'},
+                {'name': 'set-cookie', 'value': 'b=2'},
+                {'name': 'Vary', 'value': 'Accept'},
+                {'name': 'Vary', 'value': 'Origin'},
+            ],
+            'content': {'text': ''},
+        }})
+        assert options['headers'] == {'Set-Cookie': 'a=1\nb=2',
+                                      'Vary': 'Accept, Origin'}
+
+    @pytest.mark.parametrize('mode, action', [
+        ('fallback', 'fallback'), ('abort', 'abort'), ('404', 'fulfill')])
+    def test_not_found(self, har_file, mode, action):
+        """未匹配的请求按配置继续、中止或返回404"""
+        replayer = HarReplayer(har_file, not_found=mode)
+        route = Mock()
+        replayer.handle(route, make_request('GET', 'https://a.test/other'))
+
+        getattr(route, action).assert_called_once()
+        assert replayer.stats['misses'] == 1
+
+    def test_invalid_mode(self, har_file):
+        with pytest.raises(ValueError):
+            HarReplayer(har_file, not_found='ignore')
+
+    def test_recording_context_not_recyclable(self):
+        """录制HAR的上下文关闭时才写出文件，不能放回上下文池"""
+        assert ContextPool.is_recyclable({'viewport': None})
+        assert not ContextPool.is_recyclable({'record_har_path': 'a.har'})
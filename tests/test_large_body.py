@@ -0,0 +1,69 @@
+"""测试大响应体写入文件和Allure记录截断"""
+
+import json
+from unittest.mock import Mock, patch
+
+from pytest_dsl_ui.core.browser_http_client import BrowserHTTPClient, BrowserResponse
+from pytest_dsl_ui.core.browser_http_request import BrowserHTTPRequest
+
+
+def make_client(**kwargs):
+    request_context = Mock()
+    client = BrowserHTTPClient(request_context=request_context, **kwargs)
+    return client, request_context
+
+
+def make_playwright_response(body: bytes, status=200):
+    response = Mock(status=status, status_text='OK', url='/export')
+    response.headers = {'content-type': 'application/json'}
+    response.body.return_value = body
+    response.text.return_value = body.decode()
+    return response
+
+
+class TestLargeBody:
+    """大响应体测试类"""
+
+    def test_save_to_file(self, tmp_path):
+        """响应体写入文件，提取器使用头部窗口或从文件解析JSON"""
+        items = [{'id': i, 'name': f'item-{i}'} for i in range(2000)]
+        body = json.dumps({'total': 2000, 'items': items}).encode()
+        client, request_context = make_client()
+        playwright_response = make_playwright_response(body)
+        request_context.get.return_value = playwright_response
+        path = tmp_path / 'exports' / 'items.json'
+
+        with patch('allure.attach') as attach:
+            response = client.make_request(
+                'GET', '/export', save_to=str(path), head_size=64)
+
+        assert path.read_bytes() == body
+        assert response.body_size == len(body)
+        assert len(response.text) == 64
+        playwright_response.dispose.assert_called_once()
+        playwright_response.text.assert_not_called()
+        assert 'save_to' not in request_context.get.call_args[1]
+        logged = attach.call_args_list[-1][0][0]
+        assert f'已保存到 {path}' in logged and 'item-1999' not in logged
+
+        request = BrowserHTTPRequest({'method': 'GET', 'url': '/export'})
+        request.response = response
+        assert request._extract_value('jsonpath', '$.items[1999].name') == 'item-1999'
+        assert request._extract_regex(r'"total": (\d+)') == '2000'
+
+    def test_log_body_limit(self):
+        text = 'a' * 50 + 'b' * 50
+        client, _ = make_client(log_body_limit=20)
+        assert client._limit_body(text).startswith('a' * 20 + '\n... <已截断，共 100 字符>')
+
+        client, _ = make_client(log_body_limit=20, log_body_mode='sample')
+        sampled = client._limit_body(text)
+        assert sampled.startswith('a' * 10) and sampled.endswith('b' * 10)
+        assert '省略 80 字符' in sampled
+
+    def test_log_body_off(self):
+        client, _ = make_client(log_body_mode='off')
+        response = BrowserResponse(make_playwright_response(b'{"secret": 1}'))
+        with patch('allure.attach') as attach:
+            client._log_response_to_allure(response)
+        assert 'secret' not in attach.call_args[0][0]
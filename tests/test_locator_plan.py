@@ -0,0 +1,88 @@
+"""测试定位器编译缓存
+
+使用模拟的页面对象验证编译后的定位计划与原有选择器语义一致。
+"""
+
+from unittest.mock import Mock
+
+from pytest_dsl_ui.core.element_locator import ElementLocator
+from pytest_dsl_ui.core.locator_plan import LocatorPlanCache, compile_selector
+
+
+def locate(selector):
+    """在模拟页面上定位，返回页面对象和定位结果"""
+    page = Mock()
+    return page, compile_selector(selector).apply(ElementLocator(page))
+
+
+class TestLocatorPlan:
+    """定位计划测试类"""
+
+    def test_simple_selectors(self):
+        """各类简单选择器编译为对应的Page方法调用"""
+        page, _ = locate("//button[@id='ok']")
+        page.locator.assert_called_once_with("xpath=//button[@id='ok']")
+
+        page, _ = locate("text=提交,exact=true")
+        page.get_by_text.assert_called_once_with("提交", exact=True)
+
+        page, _ = locate("role=button:百度一下")
+        page.get_by_role.assert_called_once_with("button", name="百度一下")
+
+        page, _ = locate("placeholder=请输入用户名")
+        page.get_by_placeholder.assert_called_once_with("请输入用户名")
+
+        page, _ = locate("button.submit")
+        page.locator.assert_called_once_with("button.submit")
+
+    def test_element_type_and_class(self):
+        """元素类型和CSS类定位取第一个匹配元素"""
+        page, result = locate("span=日志检索")
+        page.locator.assert_called_once_with("span:has-text('日志检索')")
+        assert result is page.locator.return_value.first
+
+        page, result = locate("class=item:日志检索")
+        page.locator.assert_called_once_with(".item:has-text('日志检索')")
+        assert result is page.locator.return_value.first
+
+    def test_compound_selector(self):
+        """复合定位器依次应用修饰符，未知修饰符被忽略"""
+        page, result = locate("role=cell:外到内&locator=label&nth=2&foo=bar")
+        page.get_by_role.assert_called_once_with("cell", name="外到内")
+        base = page.get_by_role.return_value
+        base.locator.assert_called_once_with("label")
+        base.locator.return_value.nth.assert_called_once_with(2)
+        assert result is base.locator.return_value.nth.return_value
+
+    def test_clickable_plan(self):
+        """clickable=在应用时调用智能定位"""
+        plan = compile_selector("clickable=保存&first=true")
+        assert plan.is_clickable
+
+        element_locator = Mock()
+        result = plan.apply(element_locator)
+        element_locator.locate_clickable_element.assert_called_once_with("保存")
+        assert result is element_locator.locate_clickable_element.return_value.first
+
+    def test_cache_hits_and_eviction(self):
+        """相同选择器命中缓存，超过容量时淘汰最久未使用的计划"""
+        cache = LocatorPlanCache(maxsize=2)
+        plan = cache.get("text=a")
+        assert cache.get("text=a") is plan
+        cache.get("text=b")
+        cache.get("text=a")
+        cache.get("text=c")
+
+        stats = cache.get_stats()
+        assert stats['size'] == 2
+        assert stats['hits'] == 2
+        assert stats['misses'] == 3
+        assert cache.get("text=a") is plan
+
+    def test_locator_cached_per_page(self):
+        """同一页面复用元素定位器，超时设置得以保留"""
+        page = Mock()
+        locator = ElementLocator.for_page(page)
+        locator.set_default_timeout(5)
+        assert ElementLocator.for_page(page) is locator
+        assert ElementLocator.for_page(page).default_timeout == 5000
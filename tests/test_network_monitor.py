@@ -0,0 +1,146 @@
+"""测试网络监控器的捕获策略
+
+使用模拟页面直接触发request/response事件。
+"""
+
+import json
+from unittest.mock import Mock
+
+from pytest_dsl_ui.core.network_monitor import (
+    CapturePolicy, NetworkMonitor, read_spill_file
+)
+
+
+class FakePage:
+    """记录事件处理函数的模拟页面"""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def remove_listener(self, event, handler):
+        self.handlers.pop(event, None)
+
+    def emit(self, event, payload):
+        self.handlers[event](payload)
+
+
+def make_response(url, body=b'', content_type='application/json', status=200):
+    response = Mock()
+    response.url = url
+    response.status = status
+    response.status_text = 'OK'
+    response.headers = {'content-type': content_type}
+    response.body.return_value = body
+    return response
+
+
+def start(policy):
+    page = FakePage()
+    monitor = NetworkMonitor(page, policy)
+    monitor.start_monitoring()
+    return page, monitor
+
+
+class TestNetworkMonitor:
+    """网络监控器测试类"""
+
+    def test_eager_body_by_default(self):
+        """默认在事件处理中读取响应体，读取失败时记录原因"""
+        page, monitor = start(CapturePolicy())
+        response = make_response('https://a.test/api/user', b'{"id": 1}')
+        page.emit('response', response)
+        response.body.assert_called_once()
+        assert monitor.responses[0]['json'] == {'id': 1}
+
+        broken = make_response('https://a.test/api/gone')
+        broken.body.side_effect = RuntimeError('No resource with given identifier')
+        page.emit('response', broken)
+        result = monitor.get_responses('/gone')[0]
+        assert result['text'] is None
+        assert 'No resource' in result['body_error']
+
+    def test_lazy_body(self):
+        """事件处理中不读取响应体，获取响应时才读取"""
+        page, monitor = start(CapturePolicy(body_mode='lazy'))
+        response = make_response('https://a.test/api/user', b'{"id": 1}')
+        page.emit('response', response)
+
+        response.body.assert_not_called()
+        assert 'text' not in monitor.responses[0]
+
+        result = monitor.get_responses('/api/')
+        assert result[0]['json'] == {'id': 1}
+        monitor.get_responses()
+        response.body.assert_called_once()
+
+        assert monitor.get_responses(include_body=False)[0]['text'] == '{"id": 1}'
+
+    def test_filters(self):
+        """URL和Content-Type过滤"""
+        page, monitor = start(CapturePolicy(
+            url_exclude=r'\.png$', exclude_content_types='javascript'))
+        page.emit('response', make_response('https://a.test/logo.png'))
+        page.emit('response', make_response(
+            'https://a.test/app.js', content_type='application/javascript'))
+        page.emit('response', make_response('https://a.test/api'))
+
+        assert [r['url'] for r in monitor.responses] == ['https://a.test/api']
+
+    def test_max_body_size(self):
+        """超过大小上限的响应体不读取"""
+        page, monitor = start(CapturePolicy(max_body_size=4))
+        page.emit('response', make_response('https://a.test/big', b'0123456789'))
+
+        data = monitor.get_responses()[0]
+        assert data['text'] is None
+        assert 'body_skipped' in data
+
+    def test_ring_buffer_spill(self, tmp_path):
+        """缓冲区满时淘汰最旧记录并写入溢出文件"""
+        spill = tmp_path / 'network.jsonl.gz'
+        page, monitor = start(CapturePolicy(capacity=2, spill_path=str(spill)))
+        for i in range(5):
+            request = Mock(url=f'https://a.test/{i}', method='GET',
+                           headers={}, post_data=None)
+            page.emit('request', request)
+
+        assert [r['url'] for r in monitor.get_requests()] == [
+            'https://a.test/3', 'https://a.test/4']
+        monitor.stop_monitoring()
+
+        spilled = read_spill_file(str(spill))
+        assert [r['url'] for r in spilled] == [
+            f'https://a.test/{i}' for i in range(3)]
+        assert all(r['kind'] == 'request' for r in spilled)
+        assert monitor.get_stats()['dropped'] == 3
+        json.dumps(monitor.get_stats())
+
+    def test_indexed_queries(self):
+        """按方法、状态码、主机、路径前缀和时间窗口组合查询"""
+        page, monitor = start(CapturePolicy(capacity=3))
+        for i, (method, status, url) in enumerate([
+            ('GET', 200, 'https://a.test/api/users'),
+            ('POST', 201, 'https://a.test/api/users'),
+            ('GET', 404, 'https://b.test/api/orders'),
+            ('GET', 200, 'https://a.test/static/app.css'),
+        ]):
+            response = make_response(url, status=status)
+            response.request.method = method
+            monitor._get_timestamp = lambda i=i: 100.0 + i
+            page.emit('response', response)
+
+        # 第一条记录已被淘汰，索引同步更新
+        assert monitor.get_responses(method='POST', include_body=False)[0]['status'] == 201
+        assert monitor.get_responses(status=200, include_body=False)[0]['url'] == \
+            'https://a.test/static/app.css'
+        assert [r['url'] for r in monitor.get_responses(
+            host='a.test', path_prefix='/api/', include_body=False)] == [
+            'https://a.test/api/users']
+        assert len(monitor.get_responses(path_prefix='/ap', include_body=False)) == 2
+        assert [r['status'] for r in monitor.get_responses(
+            method='get', since=102, include_body=False)] == [404, 200]
+        assert monitor.get_responses(status=500, include_body=False) == []
+        assert len(monitor.get_responses(r'users$', include_body=False)) == 1
@@ -0,0 +1,55 @@
+"""测试DSL并行执行器的分片和结果合并功能"""
+
+from pytest_dsl_ui.utils.parallel_runner import (
+    discover_dsl_files, shard_files, merge_allure_results
+)
+
+
+class TestParallelRunner:
+    """并行执行器测试类"""
+
+    def test_discover_skips_hook_files(self, tmp_path):
+        """目录级setup/teardown文件不会被分片"""
+        (tmp_path / "setup.dsl").write_text("")
+        (tmp_path / "teardown.dsl").write_text("")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "b.dsl").write_text("")
+        (tmp_path / "a.auto").write_text("")
+        (tmp_path / "readme.md").write_text("")
+
+        files = discover_dsl_files([str(tmp_path)])
+        assert [f.replace(str(tmp_path), "") for f in files] == [
+            "/a.auto", "/sub/b.dsl"
+        ]
+
+    def test_shard_balances_weights(self):
+        """按权重贪心分配，各分片负载接近"""
+        weights = {"a": 10, "b": 9, "c": 5, "d": 4, "e": 1}
+        shards = shard_files(list(weights), 2, weights)
+
+        loads = sorted(sum(weights[f] for f in shard) for shard in shards)
+        assert loads == [14, 15]
+        assert sorted(f for shard in shards for f in shard) == sorted(weights)
+
+    def test_shard_drops_empty_workers(self):
+        """工作进程多于文件时不会产生空分片"""
+        shards = shard_files(["a", "b"], 8, {"a": 1, "b": 1})
+        assert len(shards) == 2
+
+    def test_merge_allure_results(self, tmp_path):
+        """各工作进程的结果文件被合并到目标目录"""
+        for i in range(2):
+            worker_dir = tmp_path / f"worker-{i}"
+            worker_dir.mkdir()
+            (worker_dir / f"uuid{i}-result.json").write_text("{}")
+
+        target = tmp_path / "allure-results"
+        merged = merge_allure_results(
+            [str(tmp_path / "worker-0"), str(tmp_path / "worker-1"),
+             str(tmp_path / "missing")],
+            str(target)
+        )
+        assert merged == 2
+        assert sorted(p.name for p in target.iterdir()) == [
+            "uuid0-result.json", "uuid1-result.json"
+        ]
@@ -0,0 +1,85 @@
+"""测试关键字耗时分析和耗时报告"""
+
+import json
+import time
+
+import pytest
+from playwright._impl._sync_base import SyncBase
+
+from pytest_dsl_ui.__main__ import profile_command
+from pytest_dsl_ui.core.profiler import KeywordProfiler
+from pytest_dsl_ui.utils.profile_report import build_report, load_records, percentile
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    """驱动调用替换为固定等待10ms的模拟实现"""
+    monkeypatch.setattr(SyncBase, '_sync', lambda base, coro: time.sleep(0.01))
+    profiler = KeywordProfiler()
+    yield profiler
+    profiler.disable()
+
+
+class TestKeywordProfiler:
+    """关键字耗时分析测试类"""
+
+    def test_records_driver_wait(self, profiler, tmp_path):
+        def click(**kwargs):
+            SyncBase._sync(None, None)
+            SyncBase._sync(None, None)
+            return True
+
+        def fail(**kwargs):
+            raise AssertionError('not visible')
+
+        wrapped_click = profiler.wrap('点击元素', click)
+        wrapped_fail = profiler.wrap('断言元素可见', fail)
+        assert wrapped_click(selector='#ok') is True  # 未启用时不记录
+
+        path = tmp_path / 'profile-{pid}.jsonl'
+        profiler.enable(str(path))
+        wrapped_click(selector='#ok')
+        with pytest.raises(AssertionError):
+            wrapped_fail(selector='#missing')
+
+        with open(profiler.output_path, encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f]
+        assert [r['keyword'] for r in rows] == ['点击元素', '断言元素可见']
+        assert rows[0]['driver_calls'] == 2 and rows[0]['wait_ms'] >= 20
+        assert rows[0]['wall_ms'] >= rows[0]['wait_ms']
+        assert rows[0]['target'] == '#ok'
+        assert (rows[1]['status'], rows[1]['error']) == ('failed', 'AssertionError')
+
+    def test_csv_output(self, profiler, tmp_path):
+        path = tmp_path / 'profile.csv'
+        profiler.enable(str(path))
+        profiler.wrap('打开页面', lambda **kw: None)(url='https://a.test')
+        records = load_records([str(tmp_path)])
+        assert records[0]['keyword'] == '打开页面'
+        assert records[0]['target'] == 'https://a.test'
+
+
+class TestProfileReport:
+    """耗时报告测试类"""
+
+    def test_summary(self, tmp_path, capsys):
+        path = tmp_path / 'profile.jsonl'
+        with open(path, 'w', encoding='utf-8') as f:
+            for i in range(1, 101):
+                f.write(json.dumps({'keyword': '点击元素', 'wall_ms': i,
+                                    'wait_ms': i / 2, 'driver_calls': 2,
+                                    'target': f'#b{i}'}) + '\n')
+            f.write(json.dumps({'keyword': '打开页面', 'wall_ms': 6000,
+                                'wait_ms': 5900, 'driver_calls': 1}) + '\n')
+
+        report = build_report(load_records([str(path)]), top=3)
+        click = next(s for s in report['keywords'] if s['keyword'] == '点击元素')
+        assert (click['count'], click['p50_ms'], click['p99_ms']) == (100, 50.5, 99.01)
+        assert click['wait_ratio'] == 0.5
+        assert report['keywords'][0]['keyword'] == '打开页面'
+        assert [r['wall_ms'] for r in report['slowest']] == [6000, 100, 99]
+        assert percentile([], 50) == 0.0
+
+        assert profile_command([str(path), '--top', '3']) == 0
+        assert '最慢的步骤' in capsys.readouterr().out
+        assert profile_command([str(tmp_path / 'missing.jsonl')]) == 1
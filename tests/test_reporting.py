@@ -0,0 +1,65 @@
+"""测试Allure报告门面"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from pytest_dsl_ui.core.reporting import Reporter
+
+
+@pytest.fixture
+def attach():
+    with patch('allure.attach') as attach:
+        yield attach
+
+
+def names(attach):
+    return [c[1]['name'] for c in attach.call_args_list]
+
+
+class TestReporter:
+    """报告门面测试类"""
+
+    def test_failures_only(self, attach):
+        """成功步骤的附件不格式化，失败步骤写入缓存的附件"""
+        reporter = Reporter(level='failures-only')
+        formatter = Mock(return_value='details')
+
+        with reporter.step('成功'):
+            reporter.attach(formatter, name='请求')
+        formatter.assert_not_called()
+        attach.assert_not_called()
+
+        with pytest.raises(AssertionError):
+            with reporter.step('失败'):
+                reporter.attach(formatter, name='请求')
+                try:
+                    raise ValueError('boom')
+                except ValueError:
+                    reporter.attach('error', name='错误')
+                raise AssertionError('failed')
+        assert names(attach) == ['请求', '错误']
+        formatter.assert_called_once()
+
+    def test_sampled_and_off(self, attach):
+        reporter = Reporter(level='sampled', sample_rate=0)
+        with reporter.step('步骤'):
+            reporter.attach('a', name='成功附件')
+            reporter.attach('b', name='失败附件', failure=True)
+        assert names(attach) == ['失败附件']
+
+        reporter.configure(sample_rate=1)
+        with reporter.step('步骤'):
+            reporter.attach(lambda: 'c', name='采样附件')
+        assert attach.call_args[0][0] == 'c'
+
+        reporter.configure(level='off')
+        reporter.attach('d', name='不写入', failure=True)
+        assert names(attach) == ['失败附件', '采样附件']
+
+    def test_formatter_error_ignored(self, attach):
+        reporter = Reporter(level='full')
+        reporter.attach(Mock(side_effect=RuntimeError('bad')), name='坏附件')
+        attach.assert_not_called()
+        with pytest.raises(ValueError):
+            reporter.configure(level='verbose')
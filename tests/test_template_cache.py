@@ -0,0 +1,71 @@
+"""测试请求配置模板和引用文件缓存"""
+
+import json
+import os
+
+import pytest
+
+from pytest_dsl.core.context import TestContext as DSLContext
+
+from pytest_dsl_ui.core.template_cache import CompiledTemplate, TemplateCache
+from pytest_dsl_ui.keywords.browser_http_keywords import _process_request_config
+
+
+def write_json(path, data, mtime):
+    path.write_text(json.dumps(data), encoding='utf-8')
+    os.utime(path, ns=(mtime, mtime))
+
+
+class TestTemplateCache:
+    """模板和文件缓存测试类"""
+
+    def test_file_cached_until_modified(self, tmp_path):
+        path = tmp_path / 'payload.json'
+        write_json(path, {'name': 'a'}, 1_000_000_000)
+        cache = TemplateCache()
+
+        first = cache.load_file(str(path))
+        assert cache.load_file(str(path)) is first
+        write_json(path, {'name': 'b'}, 2_000_000_000)
+        assert cache.load_file(str(path)) == {'name': 'b'}
+
+        stats = cache.get_stats()['files']
+        assert (stats['hits'], stats['misses'], stats['reloads']) == (2, 1, 1)
+        with pytest.raises(FileNotFoundError):
+            cache.load_file(str(tmp_path / 'missing.json'))
+
+    def test_template_file_rendered_per_request(self, tmp_path):
+        """模板文件只编译一次，每次请求替换变量"""
+        path = tmp_path / 'user.json'
+        path.write_text('{"id": ${user_id}, "name": "${name}"}', encoding='utf-8')
+        context = DSLContext()
+        context.set('name', 'tom')
+        config = {'request': {'json': '@file_template:' + str(path)}}
+
+        for user_id in (1, 2):
+            context.set('user_id', user_id)
+            processed = _process_request_config(
+                {'request': dict(config['request'])}, test_context=context)
+            assert processed['request']['json'] == {'id': user_id, 'name': 'tom'}
+
+    def test_compiled_template(self):
+        context = DSLContext()
+        context.set('items', [1, 2])
+        context.set('empty', None)
+        assert CompiledTemplate('${items}').render(context) == [1, 2]
+        assert CompiledTemplate('a=${items[0]}, b=${empty}').render(context) == 'a=1, b=null'
+        assert CompiledTemplate('plain').is_static
+
+    def test_config_parsed_once(self):
+        """相同配置只解析一次，返回的结果互不影响"""
+        cache = TemplateCache()
+        context = DSLContext()
+        context.set('page', 1)
+        text = 'method: GET\nrequest:\n    params:\n        page: ${page}\n'
+
+        first = cache.parse_config(text, context)
+        first['request']['params']['page'] = 99
+        assert cache.parse_config(text, context) == {
+            'method': 'GET', 'request': {'params': {'page': 1}}}
+        assert cache.get_stats()['configs'] == {'size': 1, 'hits': 1, 'misses': 1}
+        assert cache.get_stats()['templates']['misses'] == 1
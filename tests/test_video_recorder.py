@@ -0,0 +1,130 @@
+"""测试视频录制保留策略"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from pytest_dsl_ui.core.browser_manager import BrowserManager
+from pytest_dsl_ui.core.reporting import reporter
+from pytest_dsl_ui.core.video_recorder import VideoRecorder, parse_video_size
+
+
+def recording_context(recorder, tmp_path, count=1):
+    """模拟录制视频的上下文，每个页面的视频在tmp_path下"""
+    context = Mock()
+    recorder.track(context)
+    on_page = context.on.call_args[0][1]
+    paths = []
+    for i in range(count):
+        path = tmp_path / f'{id(context)}_{i}.webm'
+        path.write_bytes(b'webm')
+        page = Mock()
+        page.video.path.return_value = str(path)
+        on_page(page)
+        paths.append(path)
+    return context, paths
+
+
+class TestVideoRecorder:
+    """视频录制保留策略测试类"""
+
+    def test_parse_video_size(self):
+        assert parse_video_size('640x360') == {'width': 640, 'height': 360}
+        assert parse_video_size({'width': 320, 'height': 240}) == {'width': 320, 'height': 240}
+        assert parse_video_size(None) is None
+        with pytest.raises(ValueError):
+            parse_video_size('640')
+
+    def test_passed_videos_deleted(self, tmp_path, monkeypatch):
+        monkeypatch.delenv('PYTEST_CURRENT_TEST', raising=False)
+        recorder = VideoRecorder(retention='on-failure', transcode='')
+        context, paths = recording_context(recorder, tmp_path, count=2)
+        assert recorder.finalize(context) == []
+        assert not any(p.exists() for p in paths)
+        assert recorder.get_stats()['deleted'] == 2
+        assert recorder.finalize(context) == []
+
+    def test_failed_videos_kept(self, tmp_path, monkeypatch):
+        """不在pytest中运行时，步骤失败直接保留视频"""
+        monkeypatch.delenv('PYTEST_CURRENT_TEST', raising=False)
+        recorder = VideoRecorder(retention='on-failure', transcode='')
+        failed, failed_paths = recording_context(recorder, tmp_path)
+        with pytest.raises(AssertionError):
+            with reporter.step('失败步骤'):
+                raise AssertionError('boom')
+        passed, passed_paths = recording_context(recorder, tmp_path)
+
+        assert recorder.finalize(failed) == [str(failed_paths[0])]
+        assert recorder.finalize(passed) == []
+        assert failed_paths[0].exists() and not passed_paths[0].exists()
+
+    def test_caught_step_failure_resolved_by_test_result(self, tmp_path, monkeypatch):
+        """pytest中步骤失败按用例结果确认，用例结束前关闭的上下文等待结果"""
+        recorder = VideoRecorder(retention='on-failure', transcode='')
+        monkeypatch.setenv('PYTEST_CURRENT_TEST', 'tests/a.py::test_ok (call)')
+        caught, caught_paths = recording_context(recorder, tmp_path)
+        recorder.mark_failed()
+        assert recorder.finalize(caught) == []
+        assert caught_paths[0].exists()
+        recorder.test_finished('tests/a.py::test_ok', failed=False)
+        assert not caught_paths[0].exists()
+
+        monkeypatch.setenv('PYTEST_CURRENT_TEST', 'tests/a.py::test_bad (call)')
+        failing, failing_paths = recording_context(recorder, tmp_path)
+        recorder.mark_failed()
+        recorder.test_finished('tests/a.py::test_bad', failed=True)
+        assert recorder.finalize(failing) == [str(failing_paths[0])]
+
+        # 失败用例结束后新的用例不受影响
+        monkeypatch.setenv('PYTEST_CURRENT_TEST', 'tests/a.py::test_later (call)')
+        later, later_paths = recording_context(recorder, tmp_path)
+        assert recorder.finalize(later) == []
+        recorder.test_finished('tests/a.py::test_later', failed=False)
+        assert not later_paths[0].exists()
+
+    def test_failure_outside_steps_keeps_video(self, tmp_path, monkeypatch):
+        """没有步骤失败、用例在UI关键字之外失败时，先关闭的上下文的视频仍然保留"""
+        recorder = VideoRecorder(retention='on-failure', transcode='')
+        monkeypatch.setenv('PYTEST_CURRENT_TEST', 'tests/a.py::test_assert (call)')
+        context, paths = recording_context(recorder, tmp_path)
+        assert recorder.finalize(context) == []
+        assert paths[0].exists()
+        assert recorder.get_stats()['deferred'] == 1
+
+        recorder.test_finished('tests/a.py::test_assert', failed=True)
+        assert paths[0].exists()
+        assert recorder.get_stats()['deferred'] == 0
+
+    def test_retain_moves_to_target(self, tmp_path):
+        recorder = VideoRecorder(retention='on-failure', transcode='mp4')
+        context, _ = recording_context(recorder, tmp_path)
+        target = tmp_path / 'out' / 'checkout.webm'
+        recorder.retain(context, str(target))
+        with patch.object(recorder, '_enqueue') as enqueue:
+            assert recorder.finalize(context) == [str(target)]
+        assert target.exists()
+        enqueue.assert_not_called()
+        with pytest.raises(ValueError):
+            recorder.configure(retention='never')
+
+    def test_always_transcodes(self, tmp_path):
+        recorder = VideoRecorder(retention='always', transcode='mp4')
+        context, paths = recording_context(recorder, tmp_path)
+        with patch.object(recorder, '_enqueue') as enqueue:
+            recorder.finalize(context)
+        enqueue.assert_called_once_with(str(paths[0]))
+
+    def test_context_config(self):
+        config = BrowserManager._build_context_config(
+            {'record_video_dir': 'videos', 'record_video_size': '640x360'})
+        assert config == {'record_video_dir': 'videos',
+                          'record_video_size': {'width': 640, 'height': 360}}
+
+    def test_pytest_plugin_reports_test_result(self):
+        from pytest_dsl_ui import pytest_plugin
+
+        with patch.object(pytest_plugin, 'video_recorder') as recorder:
+            for when, failed in (('setup', False), ('call', True), ('teardown', False)):
+                pytest_plugin.pytest_runtest_logreport(
+                    Mock(nodeid='t.py::test_x', when=when, failed=failed))
+        recorder.test_finished.assert_called_once_with('t.py::test_x', True)